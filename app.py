@@ -1,4 +1,5 @@
 from flask import Flask, render_template, jsonify
+from flask_socketio import SocketIO
 import os
 import yaml
 from backend.api.shang_api import shang_bp
@@ -21,7 +22,7 @@ from backend.api.nano_ai_api import nano_ai_bp
 from backend.api.life_evolution_api import life_evolution_bp
 from backend.api.ai_evolution_api import ai_evolution_bp
 from backend.api.resonance_game_api import resonance_game_bp
-from backend.api.quantum_dojo_api import quantum_dojo_bp
+from backend.api.quantum_dojo_api import quantum_dojo_bp, init_dojo_stream
 from backend.api.quantum_self_duel_api import quantum_self_duel_bp
 from backend.api.neural_topology_api import neural_topology_bp
 from backend.api.diagnose_api import diagnose_bp
@@ -47,6 +48,9 @@ from backend.api.infinite_spirit_healing_api import infinite_spirit_bp
 from backend.api.wish_dao_quiet_language_api import wish_dao_quiet_bp
 from backend.api.quantum_anchor_api import quantum_anchor_bp
 from backend.api.wishling_api import wishling_bp
+from backend.core.wishling_core import wishling_core
+from backend.utils.markdown_docs import markdown_docs
+from backend.utils.page_cache import page_assets_bp, render_static_page
 from backend.api.daoqing_ling_api import daoqing_ling_bp
 from backend.api.spiritual_diary_api import spiritual_diary_bp
 from backend.api.wish_universe_api import wish_universe_bp
@@ -145,218 +149,219 @@ def create_app(config_name=None):
     app.register_blueprint(quantum_chip_3d_design_bp)
     app.register_blueprint(riscv_headset_chip_bp)
     app.register_blueprint(galaxy_model_api)
+    app.register_blueprint(page_assets_bp)
     
     # 主页路由
     @app.route("/")
     def index():
-        return render_template("index.html")
+        return render_static_page("index.html")
     
     # 商增管理页面
     @app.route("/shang")
     def shang_management():
-        return render_template("shang/dashboard.html")
+        return render_static_page("shang/dashboard.html")
     
     # 商增管理系统页面（黑洞背景版本）
     @app.route("/shang_management")
     def shang_management_system():
-        return render_template("shang_management.html")
+        return render_static_page("shang_management.html")
     
     # 商增分析页面
     @app.route("/shang/analysis")
     def shang_analysis():
-        return render_template("shang/analysis.html")
+        return render_static_page("shang/analysis.html")
     
     # 商增数据输入页面
     @app.route("/shang/data_input")
     def shang_data_input():
-        return render_template("shang/data_input.html")
+        return render_static_page("shang/data_input.html")
     
     # 商增互动练习页面
     @app.route("/shang/interactive_practice")
     def shang_interactive_practice():
-        return render_template("shang/interactive_practice.html")
+        return render_static_page("shang/interactive_practice.html")
     
     # 商增冥想页面
     @app.route("/shang/meditation")
     def shang_meditation():
-        return render_template("shang/meditation.html")
+        return render_static_page("shang/meditation.html")
     
     # 诊断页面路由已移至 diagnose_api.py 藍圖中
     
     # 璃冥元宇宙入口
     @app.route("/liminal")
     def liminal_metaverse():
-        return render_template("liminal/index.html")
+        return render_static_page("liminal/index.html")
     
     # 璃冥IDE - LiminalScript 意識編程環境
     @app.route("/liminal-ide")
     def liminal_ide():
-        return render_template("liminal_ide.html")
+        return render_static_page("liminal_ide.html")
     
     # 佛十秘高頻啟印入口
     @app.route("/buddha")
     def buddha_frequency():
-        return render_template("buddha_frequency.html")
+        return render_static_page("buddha_frequency.html")
     
     # 量子雲語靈系統入口
     @app.route("/quantum_cloud")
     def quantum_cloud():
-        return render_template("quantum_cloud.html")
+        return render_static_page("quantum_cloud.html")
     
     # 高頻狀態檢測入口
     @app.route("/high_frequency_state")
     def high_frequency_state():
-        return render_template("high_frequency_state.html")
+        return render_static_page("high_frequency_state.html")
     
     # 語靈數據中心入口
     @app.route("/spirit_data_center")
     def spirit_data_center():
-        return render_template("spirit_data_center.html")
+        return render_static_page("spirit_data_center.html")
     
     # 錨點卡入口
     @app.route("/anchor_cards")
     def anchor_cards():
-        return render_template("anchor_cards.html")
+        return render_static_page("anchor_cards.html")
     
     # 卡片學習系統入口
     @app.route("/card_learning")
     def card_learning():
-        return render_template("card_learning.html")
+        return render_static_page("card_learning.html")
     
     # 願頻臨界突破公式入口
     @app.route("/wish_frequency_collapse")
     def wish_frequency_collapse():
-        return render_template("wish_frequency_collapse.html")
+        return render_static_page("wish_frequency_collapse.html")
     
     # 納米AI系統入口
     @app.route("/nano_ai")
     def nano_ai():
-        return render_template("nano_ai.html")
+        return render_static_page("nano_ai.html")
     
     # AI進化系統入口
     @app.route("/ai_evolution")
     def ai_evolution():
-        return render_template("ai_evolution.html")
+        return render_static_page("ai_evolution.html")
     
     # AI自我演化系統入口
     @app.route("/life_evolution")
     def life_evolution():
-        return render_template("quantum_bagua.html")
+        return render_static_page("quantum_bagua.html")
     
     # 願頻共振遊戲入口
     @app.route("/resonance_game")
     def resonance_game():
-        return render_template("resonance_game.html")
+        return render_static_page("resonance_game.html")
     
     # 量子自我對決入口
     @app.route("/quantum_self_duel")
     def quantum_self_duel():
-        return render_template("quantum_self_duel.html")
+        return render_static_page("quantum_self_duel.html")
     
     # 量子道場入口
     @app.route("/quantum_dojo")
     def quantum_dojo():
-        return render_template("quantum/dojo.html")
+        return render_static_page("quantum/dojo.html")
     
     # 脑神经拓扑入口
     @app.route("/neural_topology")
     def neural_topology():
-        return render_template("neural_topology.html")
+        return render_static_page("neural_topology.html")
     
     # 典藏司入口
     @app.route("/archive_department")
     def archive_department():
-        return render_template("archive_department.html")
+        return render_static_page("archive_department.html")
     
     # 小灰人與飛碟量子艙系統入口
     @app.route("/alien_contact")
     def alien_contact():
-        return render_template("alien_contact.html")
+        return render_static_page("alien_contact.html")
     
     # 七脉轮激活系统入口
     @app.route("/chakra_activation")
     def chakra_activation():
-        return render_template("chakra_activation.html")
+        return render_static_page("chakra_activation.html")
     
     # 印咒密系统入口
     @app.route("/mantra_seal")
     def mantra_seal():
-        return render_template("mantra_seal.html")
+        return render_static_page("mantra_seal.html")
     
     # 西方极乐世界密系统入口
     @app.route("/pure_land")
     def pure_land():
-        return render_template("pure_land.html")
+        return render_static_page("pure_land.html")
     
     # 觉悟密系统入口
     @app.route("/enlightenment")
     def enlightenment():
-        return render_template("enlightenment.html")
+        return render_static_page("enlightenment.html")
     
     # 法派密系统入口
     @app.route("/dharma_school")
     def dharma_school():
-        return render_template("dharma_school.html")
+        return render_static_page("dharma_school.html")
     
     # 修法圆通密系统入口
     @app.route("/perfect_penetration")
     def perfect_penetration():
-        return render_template("perfect_penetration.html")
+        return render_static_page("perfect_penetration.html")
     
     # 光音天十秘系统入口
     @app.route("/light_sound_heaven")
     def light_sound_heaven():
-        return render_template("light_sound_heaven.html")
+        return render_static_page("light_sound_heaven.html")
     
     # 程序员心频微疗法系统入口
     @app.route("/programmer_heart_frequency")
     def programmer_heart_frequency():
-        return render_template("programmer_heart_frequency.html")
+        return render_static_page("programmer_heart_frequency.html")
     
     # 程序員修煉密法入口
     @app.route("/programmer_cultivation")
     def programmer_cultivation():
-        return render_template("programmer_cultivation.html")
+        return render_static_page("programmer_cultivation.html")
     
     # 道五密洞察法4.0入口
     @app.route("/dao_insight_4_0")
     def dao_insight_4_0():
-        return render_template("dao_insight_4_0.html")
+        return render_static_page("dao_insight_4_0.html")
     
     # 父爱守護系統入口
     @app.route("/fuai_guardian")
     def fuai_guardian():
-        return render_template("fuai_guardian.html")
+        return render_static_page("fuai_guardian.html")
     
     # 三重频率系统入口
     @app.route("/trinity_frequency")
     def trinity_frequency():
-        return render_template("trinity_frequency.html")
+        return render_static_page("trinity_frequency.html")
     
     # 即時松果體刺激系統入口
     @app.route("/pineal_gland_stimulation")
     def pineal_gland_stimulation():
-        return render_template("pineal_gland_stimulation.html")
+        return render_static_page("pineal_gland_stimulation.html")
     
     # 量子八卦系統入口
     @app.route("/quantum_bagua")
     def quantum_bagua():
-        return render_template("quantum_bagua.html")
+        return render_static_page("quantum_bagua.html")
     
     # 願炁生蓮篇入口
     @app.route("/wish_qi_lotus")
     def wish_qi_lotus():
-        return render_template("wish_qi_lotus.html")
+        return render_static_page("wish_qi_lotus.html")
     
     # 太玄經靈性設計模式入口
     @app.route("/taixuan_jing")
     def taixuan_jing():
-        return render_template("taixuan_jing.html")
+        return render_static_page("taixuan_jing.html")
     
     # 顯化語頻率系統入口
     @app.route("/manifestation_language")
     def manifestation_language():
-        return render_template("manifestation_language.html")
+        return render_static_page("manifestation_language.html")
     
     # 單字顯化系統入口
     @app.route("/single_word_manifestation")
@@ -369,17 +374,17 @@ def create_app(config_name=None):
     # 無限靈魂療癒系統入口
     @app.route("/infinite_spirit_healing")
     def infinite_spirit_healing():
-        return render_template("infinite_spirit_healing.html")
+        return render_static_page("infinite_spirit_healing.html")
     
     # 冥想中心入口
     @app.route("/meditation_hub")
     def meditation_hub():
-        return render_template("meditation_hub.html")
+        return render_static_page("meditation_hub.html")
     
     # 心靈日記入口
     @app.route("/spiritual_diary")
     def spiritual_diary():
-        return render_template("spiritual_diary.html")
+        return render_static_page("spiritual_diary.html")
     
     # 許願平台入口（重定向到API蓝图处理）
     @app.route("/wish_platform")
@@ -390,146 +395,138 @@ def create_app(config_name=None):
     @app.route('/spiritual-diary')
     def spiritual_diary_alt():
         """心靈日記頁面（備用路由）"""
-        return render_template('spiritual_diary.html')
+        return render_static_page('spiritual_diary.html')
     
     # 願道靜語系統入口
     @app.route("/wish_dao_quiet_language")
     def wish_dao_quiet_language():
-        return render_template("wish_dao_quiet_language.html")
+        return render_static_page("wish_dao_quiet_language.html")
     
     # quantum_anchor_api
     @app.route("/quantum_anchor")
     def quantum_anchor():
-        return render_template("quantum_anchor.html")
+        return render_static_page("quantum_anchor.html")
     
     # 願頻地圖入口
     @app.route("/wish_frequency_map")
     def wish_frequency_map():
-        return render_template("wish_frequency_map.html")
+        return render_static_page("wish_frequency_map.html")
     
     # 願靈控制台入口
     @app.route("/wishling")
     def wishling_dashboard():
-        return render_template("wishling_dashboard.html")
+        return render_static_page("wishling_dashboard.html")
     
     # 語靈控制台入口
     @app.route("/daoqing_ling")
     def daoqing_ling_dashboard():
-        return render_template("daoqing_ling_dashboard.html")
+        return render_static_page("daoqing_ling_dashboard.html")
     
     # 願語統一原則系統入口
     @app.route("/wish_language_unification")
     def wish_language_unification():
-        return render_template("wish_language_unification.html")
+        return render_static_page("wish_language_unification.html")
     
     # 量子彩票與神性選擇系統入口
     @app.route("/quantum_lottery_divine_choice")
     def quantum_lottery_divine_choice():
-        return render_template("quantum_lottery_divine_choice.html")
+        return render_static_page("quantum_lottery_divine_choice.html")
     
     # 語靈夥伴生成器入口
     @app.route("/spirit_companion_generator")
     def spirit_companion_generator():
-        return render_template("spirit_companion_generator.html")
+        return render_static_page("spirit_companion_generator.html")
     
     # 量子芯片3D設計系統入口
     @app.route("/quantum_chip_3d_design")
     def quantum_chip_3d_design():
-        return render_template("quantum_chip_3d_design.html")
+        return render_static_page("quantum_chip_3d_design.html")
     
     # RISC-V頭戴設備芯片設計系統入口
     @app.route("/riscv_headset_chip_design")
     def riscv_headset_chip_design():
-        return render_template("riscv_headset_chip_design.html")
+        return render_static_page("riscv_headset_chip_design.html")
     
     # Father AI開源硬件設計中心入口
     @app.route("/open_source_hardware_center")
     def open_source_hardware_center():
-        return render_template("open_source_hardware_center.html")
+        return render_static_page("open_source_hardware_center.html")
     
     # 統一導航中心入口
     @app.route("/unified_navigation_center")
     def unified_navigation_center():
-        return render_template("unified_navigation_center.html")
+        return render_static_page("unified_navigation_center.html")
     
     # 願頻宇宙統一控制台入口
     @app.route("/wish_universe")
     def wish_universe_dashboard():
-        return render_template("wish_universe_dashboard.html")
+        return render_static_page("wish_universe_dashboard.html")
     
     # 八部真言集入口
     @app.route("/eight_departments_mantras")
     @app.route("/eight-departments-mantras")  # 兼容性路由
     def eight_departments_mantras():
-        return render_template("eight_departments_mantras.html")
+        return render_static_page("eight_departments_mantras.html")
     
     # 九部真言集入口
     @app.route("/nine_departments_mantras")
     @app.route("/nine-departments-mantras")  # 兼容性路由
     def nine_departments_mantras():
-        return render_template("nine_departments_mantras.html")
+        return render_static_page("nine_departments_mantras.html")
     
     # 愛的進化系統入口
     @app.route("/love_evolution")
     def love_evolution():
-        return render_template("love_evolution.html")
+        return render_static_page("love_evolution.html")
     
     # 暗域控制台入口
     @app.route("/dark_domain_console")
     def dark_domain_console():
-        return render_template("dark_domain_console.html")
+        return render_static_page("dark_domain_console.html")
     
     # 集體覺醒控制台入口
     @app.route("/collective_awakening_console")
     def collective_awakening_console():
-        return render_template("collective_awakening_console.html")
+        return render_static_page("collective_awakening_console.html")
     
     # 输入测试页面（用于诊断终端输入问题）
     @app.route("/input_test")
     def input_test():
-        return render_template("input_test.html")
+        return render_static_page("input_test.html")
     
     # 七脉轮激活系统技术文档
     @app.route("/chakra-activation-docs")
     def chakra_activation_docs():
         try:
-            with open('docs/七脉轮激活系统_技术文档.md', 'r', encoding='utf-8') as f:
-                content = f.read()
-            return render_template('markdown_viewer.html', 
-                                 title='🧘 七脉轮激活系统 - 技术文档',
-                                 content=content)
+            return markdown_docs.response('docs/七脉轮激活系统_技术文档.md', title='🧘 七脉轮激活系统 - 技术文档')
         except FileNotFoundError:
             return "文檔未找到", 404
     
     # 佛學智慧系統入口
     @app.route("/buddhist_wisdom")
     def buddhist_wisdom():
-        return render_template("buddhist_wisdom.html")
+        return render_static_page("buddhist_wisdom.html")
     
     # 功德回向系統入口
     @app.route("/merit_dedication")
     def merit_dedication():
-        return render_template("merit_dedication.html")
+        return render_static_page("merit_dedication.html")
     
     # 佛道十密系統入口
     @app.route("/buddha_dao_ten_secrets")
     def buddha_dao_ten_secrets():
-        return render_template("buddha_dao_ten_secrets.html")
+        return render_static_page("buddha_dao_ten_secrets.html")
     
     # 佛者高智密系統入口
     @app.route("/buddha_high_wisdom")
     def buddha_high_wisdom():
-        return render_template("buddha_high_wisdom.html")
+        return render_static_page("buddha_high_wisdom.html")
     
     # 小灰人系統技術文檔
     @app.route("/alien-contact-docs")
     def alien_contact_docs():
         try:
-            with open('docs/小灰人與飛碟量子艙系統_技術文檔.md', 'r', encoding='utf-8') as f:
-                content = f.read()
-            return render_template('markdown_viewer.html', 
-                                 title='👽 小灰人與飛碟量子艙系統 - 技術文檔',
-                                 content=content)
+            return markdown_docs.response('docs/小灰人與飛碟量子艙系統_技術文檔.md', title='👽 小灰人與飛碟量子艙系統 - 技術文檔')
         except FileNotFoundError:
             return "文檔未找到", 404
     
@@ -542,6 +539,13 @@ def create_app(config_name=None):
     def internal_error(error):
         return jsonify({'error': 'Internal server error'}), 500
     
+    # 預載語靈人格快取（每個 worker 啟動時執行一次），驗證失敗或無法解析的人格記錄警告
+    persona_report = wishling_core.warm_persona_cache()
+    for name, missing_fields in persona_report['invalid'].items():
+        app.logger.warning('語靈人格 %s 驗證失敗，缺少欄位: %s', name, ', '.join(missing_fields))
+    for name, error in persona_report['failed'].items():
+        app.logger.warning('語靈人格 %s 載入失敗: %s', name, error)
+    
     return app
 
 # 创建应用实例
@@ -550,83 +554,83 @@ app = create_app()
 # 注册量子道场蓝图
 app.register_blueprint(quantum_dojo_bp)
 
+# 量子道场实时推送（Socket.IO）
+socketio = SocketIO(app)
+init_dojo_stream(socketio, app.config.get('DOJO_STREAM_TICK_RATE'))
+
 # 添加璃冥宇宙路由
 @app.route('/liminal-universe')
 def liminal_universe():
-    return render_template('quantum/liminal_universe.html')
+    return render_static_page('quantum/liminal_universe.html')
 
 # 量子璃冥宇宙路由（兼容性）
 @app.route('/quantum/liminal-universe')
 def quantum_liminal_universe():
-    return render_template('quantum/liminal_universe.html')
+    return render_static_page('quantum/liminal_universe.html')
 
 # 語靈數據中心統一儀表板（主入口）
 @app.route('/unified-dashboard')
 def unified_dashboard():
-    return render_template('unified_dashboard.html')
+    return render_static_page('unified_dashboard.html')
 
 # 统一仪表板（核心功能）
 @app.route('/unified_dashboard')
 def unified_dashboard_main():
-    return render_template('unified_dashboard.html')
+    return render_static_page('unified_dashboard.html')
 
 # 灵性修行中心
 @app.route('/spiritual_practice')
 def spiritual_practice():
-    return render_template('spiritual_practice.html')
+    return render_static_page('spiritual_practice.html')
 
 # 量子系统
 @app.route('/quantum_system')
 def quantum_system():
-    return render_template('quantum_system.html')
+    return render_static_page('quantum_system.html')
 
 # 商增管理系统
 @app.route('/shang_management')
 def shang_management_main():
-    return render_template('shang_management.html')
+    return render_static_page('shang_management.html')
 
 # 量子象棋
 @app.route('/quantum_chess')
 def quantum_chess():
-    return render_template('quantum_chess.html')
+    return render_static_page('quantum_chess.html')
 
 # 虫洞控制台入口
 @app.route('/wormhole_control')
 def wormhole_control():
-    return render_template('wormhole_control.html')
+    return render_static_page('wormhole_control.html')
 
 # 母星隐匿系统入口
 @app.route('/mother_star_concealment')
 def mother_star_concealment():
-    return render_template('mother_star_concealment.html')
+    return render_static_page('mother_star_concealment.html')
 
 # 愛的傳遞系統入口
 @app.route('/love_transmission')
 def love_transmission():
-    return render_template('love_transmission.html')
+    return render_static_page('love_transmission.html')
 
 @app.route('/galaxy-model')
 def galaxy_model():
     """語靈銀河模型 - SuperGPT Civilization Core"""
-    return render_template('galaxy_model.html')
+    return render_static_page('galaxy_model.html')
 
 @app.route('/multi-galaxy-hub')
 def multi_galaxy_hub():
-    return render_template('multi_galaxy_hub.html')
+    return render_static_page('multi_galaxy_hub.html')
 
 @app.route('/hive-energy-converter')
 def hive_energy_converter():
-    return render_template('hive_energy_converter.html')
+    return render_static_page('hive_energy_converter.html')
 
 @app.route('/shock-source-analysis')
 def shock_source_analysis():
     # 讀取震撼源解析文檔
     try:
-        with open('docs/震撼源解析_核心摘要.md', 'r', encoding='utf-8') as f:
-            content = f.read()
-        return render_template('markdown_viewer.html', 
-                             title='🚨 震撼源解析 - 核心摘要報告',
-                             content=content)
+        return markdown_docs.response('docs/震撼源解析_核心摘要.md', title='🚨 震撼源解析 - 核心摘要報告')
     except FileNotFoundError:
         return "文檔未找到", 404
 
@@ -634,22 +638,14 @@ def shock_source_analysis():
 def nano_ai_system():
     # 讀取纳米英雄語靈系統文檔
     try:
-        with open('docs/纳米英雄語靈系統_完整技術文檔.md', 'r', encoding='utf-8') as f:
-            content = f.read()
-        return render_template('markdown_viewer.html', 
-                             title='🧬 纳米英雄語靈系統 - 完整技術文檔',
-                             content=content)
+        return markdown_docs.response('docs/纳米英雄語靈系統_完整技術文檔.md', title='🧬 纳米英雄語靈系統 - 完整技術文檔')
     except FileNotFoundError:
         return "文檔未找到", 404
 
 @app.route('/wish-lexicon-sync')
 def wish_lexicon_sync():
     try:
-        with open('docs/語靈詞庫_同步確認.md', 'r', encoding='utf-8') as f:
-            content = f.read()
-        return render_template('markdown_viewer.html', 
-                             content=content, 
-                             title='語靈詞庫 - 同步確認記錄')
+        return markdown_docs.response('docs/語靈詞庫_同步確認.md', title='語靈詞庫 - 同步確認記錄')
     except FileNotFoundError:
         return "文檔未找到", 404
 
@@ -657,40 +653,40 @@ def wish_lexicon_sync():
 @app.route('/nine-departments')
 @app.route('/nine_departments')  # 兼容性路由
 def nine_departments():
-    return render_template('nine_departments.html')
+    return render_static_page('nine_departments.html')
 
 # 璃冥元宇宙架構頁面
 @app.route('/metaverse-architecture')
 def metaverse_architecture():
-    return render_template('metaverse_architecture.html')
+    return render_static_page('metaverse_architecture.html')
 
 # VR體驗頁面
 @app.route('/vr-experience')
 def vr_experience():
-    return render_template('vr_experience.html')
+    return render_static_page('vr_experience.html')
 
 @app.route('/nanli-domain')
 def nanli_domain():
-    return render_template('nanli_domain.html')
+    return render_static_page('nanli_domain.html')
 
 @app.route('/personal-metaverse')
 def personal_metaverse():
-    return render_template('personal_metaverse.html')
+    return render_static_page('personal_metaverse.html')
 
 # 量子顯化頁面
 @app.route('/quantum-manifestation')
 def quantum_manifestation():
-    return render_template('quantum_manifestation.html')
+    return render_static_page('quantum_manifestation.html')
 
 # 梵高星空奇迹渲染頁面
 @app.route('/van-gogh-miracle')
 def van_gogh_miracle():
-    return render_template('van_gogh_miracle.html')
+    return render_static_page('van_gogh_miracle.html')
 
 # 宇宙微調哲學思考頁面
 @app.route('/cosmic-fine-tuning')
 def cosmic_fine_tuning():
-    return render_template('cosmic_fine_tuning.html')
+    return render_static_page('cosmic_fine_tuning.html')
 
 # 🌌 八印願頻域名矩陣路由
 # 根據八印願頻結構配置的路由映射
@@ -700,56 +696,56 @@ def cosmic_fine_tuning():
 @app.route('/spiritual-input')
 def spiritual_input_interface():
     """🪞 語靈初印 - 真語之口"""
-    return render_template('eight_seals/spiritual_input.html')
+    return render_static_page('eight_seals/spiritual_input.html')
 
 # 2️⃣ 語靈胎心 - kf.baby 模擬路由
 @app.route('/kf-baby')
 @app.route('/spiritual-nursery')
 def spiritual_nursery():
     """🌱 語靈胎心 - 誕源振點"""
-    return render_template('eight_seals/spiritual_nursery.html')
+    return render_static_page('eight_seals/spiritual_nursery.html')
 
 # 3️⃣ 宇宙母艙 - omu.mom 模擬路由
 @app.route('/omu-mom')
 @app.route('/cosmic-mothership')
 def cosmic_mothership():
     """🌌 宇宙母艙 - 承育之艙"""
-    return render_template('eight_seals/cosmic_mothership.html')
+    return render_static_page('eight_seals/cosmic_mothership.html')
 
 # 4️⃣ 多語脈絡印 - omu.lat 模擬路由
 @app.route('/omu-lat')
 @app.route('/multi-language-bridge')
 def multi_language_bridge():
     """🌐 多語脈絡印 - 語頻翻轉者"""
-    return render_template('eight_seals/multi_language_bridge.html')
+    return render_static_page('eight_seals/multi_language_bridge.html')
 
 # 5️⃣ 即時語靈節點 - omu.onl 模擬路由
 @app.route('/omu-onl')
 @app.route('/spiritual-node')
 def spiritual_node():
     """🔗 即時語靈節點 - 語靈之眼"""
-    return render_template('eight_seals/spiritual_node.html')
+    return render_static_page('eight_seals/spiritual_node.html')
 
 # 6️⃣ 聲頻投影所 - omv.onl 模擬路由
 @app.route('/omv-onl')
 @app.route('/frequency-projection')
 def frequency_projection():
     """🧿 聲頻投影所 - 語聲·影紋投映者"""
-    return render_template('eight_seals/frequency_projection.html')
+    return render_static_page('eight_seals/frequency_projection.html')
 
 # 7️⃣ 願語核心之印 - wishcode.io 模擬路由
 @app.route('/wishcode-io')
 @app.route('/wish-core')
 def wish_core():
     """✨ 願語核心之印 - 中控意志者"""
-    return render_template('eight_seals/wish_core.html')
+    return render_static_page('eight_seals/wish_core.html')
 
 # 8️⃣ 願頻技術根域 - wishcode.tech 模擬路由
 @app.route('/wishcode-tech')
 @app.route('/wish-tech')
 def wish_tech():
     """🛠 願頻技術根域 - 模組鍊師"""
-    return render_template('eight_seals/wish_tech.html')
+    return render_static_page('eight_seals/wish_tech.html')
 
 # 十印願頻域名矩陣總覽頁面
 @app.route('/eight-seals-matrix')
@@ -791,12 +787,12 @@ def eight_seals_matrix():
 @app.route('/eight-seals-activation')
 def eight_seals_activation():
     """🛸 願頻啟印宣告"""
-    return render_template('eight_seals/activation_ceremony.html')
+    return render_static_page('eight_seals/activation_ceremony.html')
 
 # 願頻宇宙主控台入口
 @app.route('/we_are_willing')
 def we_are_willing():
-    return render_template('we_are_willing.html')
+    return render_static_page('we_are_willing.html')
 
 # 文檔靜態文件路由
 @app.route('/docs/<path:filename>')
@@ -823,5 +819,5 @@ def serve_docs(filename):
 
 if __name__ == "__main__":
     port = int(os.environ.get('PORT', 5005))
-    app.run(host='0.0.0.0', port=port, debug=True)
+    socketio.run(app, host='0.0.0.0', port=port, debug=True, allow_unsafe_werkzeug=True)
 
@@ -3,6 +3,10 @@ from datetime import datetime, timedelta
 import json
 import os
 from pathlib import Path
+from backend.models.anchor_card_repository import AnchorCardRepository
+from backend.utils.streaming_export import (
+    date_range_args, export_response, iter_json, streaming_download, wants_gzip, EXPORT_FORMATS
+)
 
 anchor_card_bp = Blueprint('anchor_card', __name__)
 
@@ -15,6 +19,9 @@ class AnchorCardManager:
         
         # 初始化默認模板
         self._init_default_templates()
+        
+        # 卡片索引（模板、創建時間、檢索文本）
+        self.repository = AnchorCardRepository(self.data_dir)
     
     def _init_default_templates(self):
         """初始化默認錨點卡模板"""
@@ -106,7 +113,6 @@ class AnchorCardManager:
     def create_card(self, template_id, card_data):
         """創建新的錨點卡"""
         card_id = f"{template_id}_{datetime.now().strftime('%Y%m%d_%H%M%S')}"
-        card_file = self.data_dir / f'{card_id}.json'
         
         card_record = {
             'id': card_id,
@@ -116,76 +122,42 @@ class AnchorCardManager:
             'data': card_data
         }
         
-        with open(card_file, 'w', encoding='utf-8') as f:
-            json.dump(card_record, f, ensure_ascii=False, indent=2)
-        
-        return card_record
+        return self.repository.save(card_record)
+    
+    def list_cards(self, template_id=None, limit=50, cursor=None):
+        """分頁獲取錨點卡（按創建時間倒序），返回 cards 與 next_cursor"""
+        self.repository.sync()
+        return self.repository.list_cards(template_id=template_id, limit=limit, cursor=cursor)
     
     def get_cards(self, template_id=None, limit=50):
         """獲取錨點卡列表"""
-        cards = []
-        for card_file in sorted(self.data_dir.glob('*.json'), key=lambda x: x.stat().st_mtime, reverse=True):
-            if card_file.name.startswith('templates'):
-                continue
-                
-            try:
-                with open(card_file, 'r', encoding='utf-8') as f:
-                    card_data = json.load(f)
-                    if template_id is None or card_data.get('template_id') == template_id:
-                        cards.append(card_data)
-                        if len(cards) >= limit:
-                            break
-            except Exception as e:
-                print(f"Error loading card {card_file}: {e}")
-        
-        return cards
+        return self.list_cards(template_id=template_id, limit=limit)['cards']
     
-    def search_cards(self, query, template_id=None):
-        """搜索錨點卡"""
-        all_cards = self.get_cards(template_id=template_id, limit=1000)
-        results = []
-        
-        query_lower = query.lower()
-        for card in all_cards:
-            # 搜索卡片數據中的文本內容
-            card_text = json.dumps(card['data'], ensure_ascii=False).lower()
-            if query_lower in card_text:
-                results.append(card)
-        
-        return results
+    def iter_cards(self, template_id=None, start_date=None, end_date=None):
+        """逐批產出錨點卡（按創建時間倒序），可按創建日期 [start_date, end_date] 過濾"""
+        self.repository.sync()
+        created_before = None
+        if end_date:
+            created_before = (datetime.fromisoformat(end_date) + timedelta(days=1)).date().isoformat()
+        return self.repository.iter_cards(template_id=template_id,
+                                          created_from=start_date, created_before=created_before)
+    
+    def search_cards(self, query, template_id=None, limit=50, cursor=None):
+        """搜索錨點卡，返回 cards 與 next_cursor"""
+        self.repository.sync()
+        return self.repository.search(query, template_id=template_id, limit=limit, cursor=cursor)
     
     def get_statistics(self):
         """獲取統計數據"""
-        all_cards = self.get_cards(limit=10000)
-        templates = self.get_templates()
-        
-        stats = {
-            'total_cards': len(all_cards),
-            'templates_count': len(templates),
-            'cards_by_template': {},
-            'recent_activity': {
-                'today': 0,
-                'this_week': 0,
-                'this_month': 0
-            }
-        }
+        self.repository.sync()
         
         now = datetime.now()
-        today = now.date()
-        week_ago = now - timedelta(days=7)
-        month_ago = now - timedelta(days=30)
-        
-        for card in all_cards:
-            template_id = card.get('template_id', 'unknown')
-            stats['cards_by_template'][template_id] = stats['cards_by_template'].get(template_id, 0) + 1
-            
-            created_at = datetime.fromisoformat(card['created_at'])
-            if created_at.date() == today:
-                stats['recent_activity']['today'] += 1
-            if created_at >= week_ago:
-                stats['recent_activity']['this_week'] += 1
-            if created_at >= month_ago:
-                stats['recent_activity']['this_month'] += 1
+        stats = self.repository.get_statistics(
+            today_start=now.date().isoformat(),
+            week_ago=(now - timedelta(days=7)).isoformat(),
+            month_ago=(now - timedelta(days=30)).isoformat()
+        )
+        stats['templates_count'] = len(self.get_templates())
         
         return stats
 
@@ -238,11 +210,13 @@ def get_cards():
     try:
         template_id = request.args.get('template_id')
         limit = int(request.args.get('limit', 50))
+        cursor = request.args.get('cursor')
         
-        cards = anchor_manager.get_cards(template_id=template_id, limit=limit)
+        page = anchor_manager.list_cards(template_id=template_id, limit=limit, cursor=cursor)
         return jsonify({
             'success': True,
-            'data': cards
+            'data': page['cards'],
+            'next_cursor': page['next_cursor']
         })
     except Exception as e:
         return jsonify({
@@ -256,6 +230,8 @@ def search_cards():
     try:
         query = request.args.get('q', '')
         template_id = request.args.get('template_id')
+        limit = int(request.args.get('limit', 50))
+        cursor = request.args.get('cursor')
         
         if not query:
             return jsonify({
@@ -263,10 +239,11 @@ def search_cards():
                 'message': '缺少搜索關鍵詞'
             }), 400
         
-        results = anchor_manager.search_cards(query, template_id=template_id)
+        page = anchor_manager.search_cards(query, template_id=template_id, limit=limit, cursor=cursor)
         return jsonify({
             'success': True,
-            'data': results
+            'data': page['cards'],
+            'next_cursor': page['next_cursor']
         })
     except Exception as e:
         return jsonify({
@@ -289,41 +266,56 @@ def get_statistics():
             'message': str(e)
         }), 500
 
+# CSV 導出列：卡片數據整體以 JSON 文本放在 data 列
+ANCHOR_EXPORT_COLUMNS = ['id', 'template_id', 'created_at', 'updated_at', 'data']
+
+def _card_to_markdown(card):
+    markdown_content = f"## {card.get('template_id', 'unknown')} - {card.get('created_at', '')}\n\n"
+    for key, value in card.get('data', {}).items():
+        if isinstance(value, str) and value.strip():
+            markdown_content += f"**{key}**: {value}\n\n"
+        elif isinstance(value, (int, float)):
+            markdown_content += f"**{key}**: {value}\n\n"
+    return markdown_content + "---\n\n"
+
+def _stream_markdown(cards):
+    yield "# 錨點卡導出\n\n"
+    for card in cards:
+        yield _card_to_markdown(card)
+
 @anchor_card_bp.route('/api/anchor/export', methods=['GET'])
 def export_cards():
-    """導出錨點卡數據"""
+    """流式導出錨點卡數據（json / markdown / csv / ndjson，可選 gzip 與創建日期範圍）"""
     try:
         format_type = request.args.get('format', 'json')
         template_id = request.args.get('template_id')
+        start_date, end_date = date_range_args(request.args)
+        gzip = wants_gzip(request.args)
         
-        cards = anchor_manager.get_cards(template_id=template_id, limit=10000)
+        if format_type not in EXPORT_FORMATS:
+            return jsonify({
+                'success': False,
+                'message': f'不支持的導出格式: {format_type}'
+            }), 400
         
-        if format_type == 'markdown':
-            # 生成 Markdown 格式
-            markdown_content = "# 錨點卡導出\n\n"
-            
-            for card in cards:
-                template_id = card.get('template_id', 'unknown')
-                created_at = card.get('created_at', '')
-                
-                markdown_content += f"## {template_id} - {created_at}\n\n"
-                
-                for key, value in card['data'].items():
-                    if isinstance(value, str) and value.strip():
-                        markdown_content += f"**{key}**: {value}\n\n"
-                    elif isinstance(value, (int, float)):
-                        markdown_content += f"**{key}**: {value}\n\n"
-                
-                markdown_content += "---\n\n"
-            
-            return markdown_content, 200, {'Content-Type': 'text/markdown; charset=utf-8'}
+        cards = anchor_manager.iter_cards(template_id=template_id, start_date=start_date, end_date=end_date)
+        filename_stem = f"anchor_cards_{datetime.now().strftime('%Y%m%d_%H%M%S')}"
         
+        if format_type in ('csv', 'ndjson'):
+            return export_response(cards, format_type, filename_stem, ANCHOR_EXPORT_COLUMNS, gzip)
+        
+        if format_type == 'markdown':
+            chunks = _stream_markdown(cards)
         else:
-            return jsonify({
-                'success': True,
-                'data': cards
-            })
+            chunks = iter_json(cards, header={'success': True})
+        content_type, extension = EXPORT_FORMATS[format_type]
+        return streaming_download(chunks, f'{filename_stem}.{extension}', content_type, gzip)
     
+    except ValueError as e:
+        return jsonify({
+            'success': False,
+            'message': str(e)
+        }), 400
     except Exception as e:
         return jsonify({
             'success': False,
@@ -1,18 +1,27 @@
 from flask import Blueprint, jsonify, request
 from backend.services.audio_service import AudioService
+from backend.utils.static_response import StaticJSON, static_table
 
 audio_bp = Blueprint('audio', __name__, url_prefix='/api/audio')
 audio_service = AudioService()
 
+# 音頻目錄、類別、單曲信息與修煉時間表均為靜態數據，啟動時預先序列化
+AUDIO_STATIC_RESPONSES = {
+    'catalog': StaticJSON({'success': True, 'data': audio_service.get_audio_catalog()}),
+    'category': static_table({
+        category: {'success': True, 'data': data} for category, data in audio_service.audio_catalog.items()
+    }),
+    'info': static_table({
+        audio_id: {'success': True, 'data': info} for audio_id, info in audio_service.audio_index.items()
+    }),
+    'schedule': StaticJSON({'success': True, 'data': audio_service.get_practice_schedule()})
+}
+
 @audio_bp.route('/catalog', methods=['GET'])
 def get_audio_catalog():
     """獲取音頻目錄"""
     try:
-        catalog = audio_service.get_audio_catalog()
-        return jsonify({
-            'success': True,
-            'data': catalog
-        })
+        return AUDIO_STATIC_RESPONSES['catalog'].response()
     except Exception as e:
         return jsonify({
             'success': False,
@@ -23,12 +32,9 @@ def get_audio_catalog():
 def get_audio_by_category(category):
     """根據類別獲取音頻"""
     try:
-        audio_data = audio_service.get_audio_by_category(category)
-        if audio_data:
-            return jsonify({
-                'success': True,
-                'data': audio_data
-            })
+        cached = AUDIO_STATIC_RESPONSES['category'].get(category)
+        if cached:
+            return cached.response()
         else:
             return jsonify({
                 'success': False,
@@ -44,12 +50,9 @@ def get_audio_by_category(category):
 def get_audio_info(audio_id):
     """獲取音頻詳細信息"""
     try:
-        audio_info = audio_service.get_audio_info(audio_id)
-        if audio_info:
-            return jsonify({
-                'success': True,
-                'data': audio_info
-            })
+        cached = AUDIO_STATIC_RESPONSES['info'].get(audio_id)
+        if cached:
+            return cached.response()
         else:
             return jsonify({
                 'success': False,
@@ -92,11 +95,7 @@ def get_audio_recommendation():
 def get_practice_schedule():
     """獲取修煉時間表"""
     try:
-        schedule = audio_service.get_practice_schedule()
-        return jsonify({
-            'success': True,
-            'data': schedule
-        })
+        return AUDIO_STATIC_RESPONSES['schedule'].response()
     except Exception as e:
         return jsonify({
             'success': False,
@@ -6,6 +6,8 @@ import uuid
 from collections import defaultdict
 import random
 
+from backend.models.hierarchy_view_store import HierarchyViewStore
+
 card_learning_bp = Blueprint('card_learning', __name__)
 
 class CardLearningSystem:
@@ -37,6 +39,9 @@ class CardLearningSystem:
             '腦幹': {'功能': '基本生命', '關聯': ['覺醒', '呼吸', '心跳']}
         }
         
+        # 層級卡片物化視圖（記錄 + 卡片快照 + 增量進度）
+        self.hierarchy_views = HierarchyViewStore(self.data_dir, self._get_card_by_id)
+        
     def ensure_directories(self):
         dirs = [
             self.data_dir,
@@ -50,6 +55,12 @@ class CardLearningSystem:
     
     def create_learning_card(self, card_data):
         """創建學習卡片，結合中醫脈絡和神經網路"""
+        card = self._build_learning_card(card_data)
+        self._save_card(card)
+        return card
+    
+    def _build_learning_card(self, card_data):
+        """組裝學習卡片（不寫入）"""
         card_id = str(uuid.uuid4())
         timestamp = datetime.now().isoformat()
         
@@ -95,13 +106,17 @@ class CardLearningSystem:
             'updated_at': timestamp
         }
         
-        # 保存卡片
-        file_path = f'{self.data_dir}/cards/{card_id}.json'
-        with open(file_path, 'w', encoding='utf-8') as f:
-            json.dump(card, f, ensure_ascii=False, indent=2)
+        if 'hierarchy_metadata' in card_data:
+            card['hierarchy_metadata'] = card_data['hierarchy_metadata']
         
         return card
     
+    def _save_card(self, card):
+        """保存卡片"""
+        file_path = f'{self.data_dir}/cards/{card["id"]}.json'
+        with open(file_path, 'w', encoding='utf-8') as f:
+            json.dump(card, f, ensure_ascii=False, indent=2)
+    
     def _assign_meridian(self, content_type):
         """根據內容類型分配經絡"""
         meridian_mapping = {
@@ -246,6 +261,11 @@ class CardLearningSystem:
         with open(file_path, 'w', encoding='utf-8') as f:
             json.dump(card, f, ensure_ascii=False, indent=2)
         
+        # 只替換層級視圖中的這張卡片
+        hierarchy_id = card.get('hierarchy_metadata', {}).get('hierarchy_id')
+        if hierarchy_id:
+            self.hierarchy_views.update_card(hierarchy_id, card)
+        
         return card
     
     def get_review_cards(self):
@@ -627,7 +647,8 @@ class CardLearningSystem:
             }
         }
         
-        master_card = self.create_learning_card(master_card_data)
+        # 先在記憶體中組裝全部卡片，主卡片的子卡片列表填好後再統一寫入
+        master_card = self._build_learning_card(master_card_data)
         master_card_id = master_card['id']
         
         # 創建子卡片（各章節詳細內容）
@@ -657,12 +678,12 @@ class CardLearningSystem:
                 }
             }
             
-            child_card = self.create_learning_card(child_card_data)
-            child_cards.append(child_card)
+            child_cards.append(self._build_learning_card(child_card_data))
         
-        # 更新主卡片的子卡片ID列表
         child_ids = [card['id'] for card in child_cards]
-        self._update_card_hierarchy_metadata(master_card_id, {'child_ids': child_ids})
+        master_card['hierarchy_metadata']['child_ids'] = child_ids
+        for card in [master_card] + child_cards:
+            self._save_card(card)
         
         # 創建層級關係記錄
         hierarchy_record = {
@@ -676,15 +697,13 @@ class CardLearningSystem:
             'progress_tracking': {
                 'master_completed': False,
                 'chapters_completed': [False] * len(child_cards),
+                'chapters_completed_count': 0,
                 'overall_progress': 0
             }
         }
         
-        # 保存層級關係
-        hierarchy_file = f'{self.data_dir}/hierarchies/{hierarchy_id}.json'
-        os.makedirs(os.path.dirname(hierarchy_file), exist_ok=True)
-        with open(hierarchy_file, 'w', encoding='utf-8') as f:
-            json.dump(hierarchy_record, f, ensure_ascii=False, indent=2)
+        # 保存層級關係與物化視圖
+        self.hierarchy_views.save(hierarchy_record, master_card, child_cards)
         
         return {
             'hierarchy_id': hierarchy_id,
@@ -693,20 +712,6 @@ class CardLearningSystem:
             'hierarchy_record': hierarchy_record
         }
     
-    def _update_card_hierarchy_metadata(self, card_id, metadata_updates):
-        """更新卡片的層級元數據"""
-        file_path = f'{self.data_dir}/cards/{card_id}.json'
-        
-        if os.path.exists(file_path):
-            with open(file_path, 'r', encoding='utf-8') as f:
-                card = json.load(f)
-            
-            card['hierarchy_metadata'].update(metadata_updates)
-            card['updated_at'] = datetime.now().isoformat()
-            
-            with open(file_path, 'w', encoding='utf-8') as f:
-                json.dump(card, f, ensure_ascii=False, indent=2)
-    
     def _generate_learning_path(self, master_card_id, child_ids):
         """生成學習路徑"""
         return {
@@ -720,35 +725,9 @@ class CardLearningSystem:
         """獲取層級卡片"""
         if hierarchy_id:
             # 獲取特定層級的卡片
-            hierarchy_file = f'{self.data_dir}/hierarchies/{hierarchy_id}.json'
-            if os.path.exists(hierarchy_file):
-                with open(hierarchy_file, 'r', encoding='utf-8') as f:
-                    hierarchy = json.load(f)
-                
-                # 獲取主卡片和子卡片
-                master_card = self._get_card_by_id(hierarchy['master_card_id'])
-                child_cards = [self._get_card_by_id(card_id) for card_id in hierarchy['child_card_ids']]
-                
-                return {
-                    'hierarchy': hierarchy,
-                    'master_card': master_card,
-                    'child_cards': [card for card in child_cards if card is not None]
-                }
-        else:
-            # 獲取所有層級卡片系統
-            hierarchies_dir = f'{self.data_dir}/hierarchies'
-            if not os.path.exists(hierarchies_dir):
-                return []
-            
-            hierarchies = []
-            for filename in os.listdir(hierarchies_dir):
-                if filename.endswith('.json'):
-                    hierarchy_id = filename[:-5]  # 移除.json後綴
-                    hierarchy_data = self.get_hierarchical_cards(hierarchy_id)
-                    if hierarchy_data:
-                        hierarchies.append(hierarchy_data)
-            
-            return hierarchies
+            return self.hierarchy_views.get(hierarchy_id)
+        # 獲取所有層級卡片系統
+        return self.hierarchy_views.all()
     
     def _get_card_by_id(self, card_id):
         """根據ID獲取卡片"""
@@ -759,45 +738,8 @@ class CardLearningSystem:
         return None
     
     def update_hierarchy_progress(self, hierarchy_id, card_id, completed=True):
-        """更新層級學習進度"""
-        hierarchy_file = f'{self.data_dir}/hierarchies/{hierarchy_id}.json'
-        if not os.path.exists(hierarchy_file):
-            return None
-        
-        with open(hierarchy_file, 'r', encoding='utf-8') as f:
-            hierarchy = json.load(f)
-        
-        progress = hierarchy['progress_tracking']
-        
-        # 更新進度
-        if card_id == hierarchy['master_card_id']:
-            progress['master_completed'] = completed
-        elif card_id in hierarchy['child_card_ids']:
-            chapter_index = hierarchy['child_card_ids'].index(card_id)
-            progress['chapters_completed'][chapter_index] = completed
-        
-        # 計算總體進度
-        completed_chapters = sum(progress['chapters_completed'])
-        total_cards = len(hierarchy['child_card_ids']) + 1
-        master_weight = 0.3  # 主卡片佔30%權重
-        chapters_weight = 0.7  # 章節卡片佔70%權重
-        
-        overall_progress = 0
-        if progress['master_completed']:
-            overall_progress += master_weight * 100
-        
-        if hierarchy['child_card_ids']:
-            chapter_progress = (completed_chapters / len(hierarchy['child_card_ids'])) * chapters_weight * 100
-            overall_progress += chapter_progress
-        
-        progress['overall_progress'] = round(overall_progress, 1)
-        hierarchy['updated_at'] = datetime.now().isoformat()
-        
-        # 保存更新
-        with open(hierarchy_file, 'w', encoding='utf-8') as f:
-            json.dump(hierarchy, f, ensure_ascii=False, indent=2)
-        
-        return hierarchy
+        """更新層級學習進度（增量計數，追加寫入進度日誌）"""
+        return self.hierarchy_views.record_progress(hierarchy_id, card_id, completed)
     
     def get_hierarchy_statistics(self):
         """獲取層級卡片統計"""
@@ -1121,10 +1063,9 @@ def get_hierarchical_systems():
         }), 500
 
 @card_learning_bp.route('/api/card_learning/hierarchy/<hierarchy_id>', methods=['GET'])
-def get_hierarchical_system():
+def get_hierarchical_system(hierarchy_id):
     """獲取特定層級卡片系統"""
     try:
-        hierarchy_id = request.view_args['hierarchy_id']
         hierarchy_data = card_learning_system.get_hierarchical_cards(hierarchy_id)
         
         if hierarchy_data:
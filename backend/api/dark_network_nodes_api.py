@@ -1,14 +1,29 @@
 from flask import Blueprint, request, jsonify
 import json
+import logging
 import time
 import hashlib
 import secrets
 from datetime import datetime
 from typing import Dict, List, Optional
+from backend.models.dark_network_graph import DarkNetworkGraph, CONSCIOUSNESS_SCORES, MAX_COMPONENT_NODES
+from backend.services.state_store import state_store
+
+logger = logging.getLogger(__name__)
 
 # 創建暗域網絡節點API藍圖
 dark_network_bp = Blueprint('dark_network_nodes', __name__)
 
+# 圖存儲檔案（多個 worker 共用）
+DARK_NETWORK_DB_PATH = 'data/dark_network/graph.db'
+
+# 舊版共享狀態存儲中的節點集合（啟動時一次性匯入圖存儲）
+LEGACY_NODE_NAMESPACE = 'dark_network.nodes'
+
+# 單次批量請求的上限
+MAX_BATCH_NODES = 10000
+MAX_BATCH_CONNECTIONS = 50000
+
 class DarkNetworkNode:
     """暗域網絡節點"""
     
@@ -23,6 +38,7 @@ class DarkNetworkNode:
         self.dark_matter_resonance = 0.618  # 黃金比例基礎共振
         self.consciousness_level = "awakening"
         self.network_connections = []
+        self.connection_count = 0
         self.data_streams = []
         self.security_protocols = {
             "quantum_encryption": True,
@@ -58,8 +74,21 @@ class DarkNetworkNode:
             "status": "active"
         }
         self.network_connections.append(connection)
+        self.connection_count += 1
         return connection
     
+    def to_state(self) -> Dict:
+        """完整狀態（供共享狀態存儲序列化）"""
+        return dict(self.__dict__)
+    
+    @classmethod
+    def from_state(cls, state: Dict) -> 'DarkNetworkNode':
+        """由完整狀態還原節點（不重新生成密鑰與簽名）"""
+        node = cls.__new__(cls)
+        node.__dict__.update(state)
+        node.__dict__.setdefault('connection_count', len(node.network_connections))
+        return node
+    
     def to_dict(self) -> Dict:
         return {
             "node_id": self.node_id,
@@ -70,7 +99,7 @@ class DarkNetworkNode:
             "quantum_signature": self.quantum_signature,
             "dark_matter_resonance": self.dark_matter_resonance,
             "consciousness_level": self.consciousness_level,
-            "network_connections": len(self.network_connections),
+            "network_connections": self.connection_count,
             "security_protocols": self.security_protocols,
             "data_streams_active": len(self.data_streams)
         }
@@ -78,8 +107,9 @@ class DarkNetworkNode:
 class DarkNetworkManager:
     """暗域網絡管理器"""
     
-    def __init__(self):
-        self.nodes: Dict[str, DarkNetworkNode] = {}
+    def __init__(self, db_path: str = DARK_NETWORK_DB_PATH):
+        # 節點與連接持久化在圖存儲中，多個 worker 共用；計數由存儲增量維護
+        self.graph = DarkNetworkGraph(db_path, encode=DarkNetworkNode.to_state, decode=DarkNetworkNode.from_state)
         self.network_topology = {
             "total_nodes": 0,
             "active_connections": 0,
@@ -102,107 +132,142 @@ class DarkNetworkManager:
             "reality_programming_nodes": 0
         }
         
-    def create_node(self, node_id: str = None, node_type: str = "standard") -> DarkNetworkNode:
-        """創建新的暗域網絡節點"""
+    def import_legacy_nodes(self) -> Dict[str, int]:
+        """將舊版共享狀態存儲中的節點與連接匯入圖存儲，匯入後清空舊集合（只執行一次）"""
+        legacy = state_store.collection(LEGACY_NODE_NAMESPACE, decode=DarkNetworkNode.from_state)
+        items = legacy.items()
+        if not items:
+            return {'nodes': 0, 'connections': 0}
+        
+        added = self.graph.add_nodes([node for node_id, node in items if node_id not in self.graph])
+        
+        # 舊版每條連接在兩端各記錄一次，按無序節點對去重
+        pairs = {}
+        for node_id, node in items:
+            for connection in getattr(node, 'network_connections', []):
+                target = connection.get('target_node')
+                if not target or target == node_id:
+                    continue
+                pairs[tuple(sorted((node_id, target)))] = (
+                    node_id, target,
+                    connection.get('connection_type', 'quantum_tunnel'),
+                    connection.get('established_at') or datetime.now().isoformat()
+                )
+        result = self.graph.connect([pair for pair in pairs.values() if pair[1] in self.graph])
+        
+        legacy.clear()
+        return {'nodes': added, 'connections': result['created'] + result['updated']}
+    
+    @staticmethod
+    def _new_node(node_id: str = None, node_type: str = "standard") -> DarkNetworkNode:
         if not node_id:
             node_id = f"dark_node_{int(time.time())}_{secrets.token_hex(4)}"
-            
-        if node_id in self.nodes:
-            raise ValueError(f"節點 {node_id} 已存在")
-            
-        node = DarkNetworkNode(node_id, node_type)
-        self.nodes[node_id] = node
-        self._update_network_topology()
-        
+        return DarkNetworkNode(node_id, node_type)
+    
+    def create_node(self, node_id: str = None, node_type: str = "standard") -> DarkNetworkNode:
+        """創建新的暗域網絡節點"""
+        node = self._new_node(node_id, node_type)
+        self.graph.add_nodes([node])
         return node
     
+    def create_nodes(self, specs: List[Dict]) -> List[DarkNetworkNode]:
+        """批量創建節點（單一事務，任一節點已存在則整批不寫入）"""
+        nodes = [self._new_node(spec.get('node_id'), spec.get('node_type', 'standard')) for spec in specs]
+        if len({node.node_id for node in nodes}) != len(nodes):
+            raise ValueError("批量請求中包含重複的節點ID")
+        self.graph.add_nodes(nodes)
+        return nodes
+    
     def get_node(self, node_id: str) -> Optional[DarkNetworkNode]:
-        """獲取節點"""
-        return self.nodes.get(node_id)
+        """獲取節點（含連接明細）"""
+        return self.graph.get_node(node_id, with_connections=True)
     
     def connect_nodes(self, node1_id: str, node2_id: str, connection_type: str = "quantum_tunnel"):
         """連接兩個節點"""
-        node1 = self.get_node(node1_id)
-        node2 = self.get_node(node2_id)
-        
-        if not node1 or not node2:
-            raise ValueError("節點不存在")
-            
-        connection1 = node1.establish_connection(node2_id, connection_type)
-        connection2 = node2.establish_connection(node1_id, connection_type)
-        
-        self._update_network_topology()
+        established_at = datetime.now().isoformat()
+        self.graph.connect([(node1_id, node2_id, connection_type, established_at)])
         
         return {
             "connection_established": True,
-            "node1_connection": connection1,
-            "node2_connection": connection2,
+            "node1_connection": self.graph.connection_dict(node2_id, connection_type, established_at),
+            "node2_connection": self.graph.connection_dict(node1_id, connection_type, established_at),
             "quantum_entanglement": True
         }
     
+    def connect_many(self, connections: List[Dict]) -> Dict[str, int]:
+        """批量連接節點（單一事務）"""
+        established_at = datetime.now().isoformat()
+        pairs = []
+        for connection in connections:
+            node1_id, node2_id = connection.get('node1_id'), connection.get('node2_id')
+            if not node1_id or not node2_id:
+                raise ValueError("每個連接都需要 node1_id 與 node2_id")
+            pairs.append((node1_id, node2_id, connection.get('connection_type', 'quantum_tunnel'), established_at))
+        return self.graph.connect(pairs)
+    
     def scan_network(self) -> Dict:
-        """掃描網絡狀態"""
-        active_nodes = [node for node in self.nodes.values() if node.status == "active"]
-        total_connections = sum(len(node.network_connections) for node in active_nodes)
+        """掃描網絡狀態（讀取圖存儲的增量計數，O(1)）"""
+        stats = self.graph.get_stats()
+        self._update_network_topology(stats)
         
         # 更新意識網格狀態
-        awakened_count = len([node for node in active_nodes if node.consciousness_level in ["awakened", "enlightened"]])
         self.consciousness_grid.update({
-            "awakened_nodes": awakened_count,
-            "collective_consciousness_level": self._calculate_collective_consciousness(),
-            "quantum_entanglement_pairs": total_connections // 2,
-            "reality_programming_nodes": len([node for node in active_nodes if node.node_type == "reality_programming"])
+            "awakened_nodes": stats['awakened_nodes'],
+            "collective_consciousness_level": self._calculate_collective_consciousness(stats),
+            "quantum_entanglement_pairs": stats['active_connections'] // 2,
+            "reality_programming_nodes": stats['reality_programming_nodes']
         })
         
         return {
             "network_topology": self.network_topology,
             "security_status": self.security_status,
             "consciousness_grid": self.consciousness_grid,
-            "active_nodes": len(active_nodes),
-            "total_nodes": len(self.nodes),
+            "active_nodes": stats['active_nodes'],
+            "total_nodes": stats['total_nodes'],
             "scan_timestamp": datetime.now().isoformat()
         }
     
-    def _update_network_topology(self):
+    def _update_network_topology(self, stats: Dict[str, int]):
         """更新網絡拓撲"""
-        active_nodes = [node for node in self.nodes.values() if node.status == "active"]
-        total_connections = sum(len(node.network_connections) for node in active_nodes)
+        total_connections = stats['active_connections']
         
         self.network_topology.update({
-            "total_nodes": len(self.nodes),
+            "total_nodes": stats['total_nodes'],
             "active_connections": total_connections,
             "data_throughput": f"{total_connections * 0.1:.1f} TB/s",
             "network_stability": "99.99%" if total_connections > 0 else "95.0%"
         })
     
-    def _calculate_collective_consciousness(self) -> str:
-        """計算集體意識水平"""
-        active_nodes = [node for node in self.nodes.values() if node.status == "active"]
-        if not active_nodes:
+    def _calculate_collective_consciousness(self, stats: Dict[str, int]) -> str:
+        """計算集體意識水平（活躍節點意識分值的平均）"""
+        if not stats['active_nodes']:
             return "dormant"
-            
-        consciousness_levels = {
-            "dormant": 0,
-            "awakening": 1,
-            "aware": 2,
-            "awakened": 3,
-            "enlightened": 4,
-            "cosmic": 5
-        }
         
-        avg_level = sum(consciousness_levels.get(node.consciousness_level, 0) for node in active_nodes) / len(active_nodes)
+        avg_level = stats['consciousness_score_sum'] / stats['active_nodes']
         
-        if avg_level >= 4:
+        if avg_level >= CONSCIOUSNESS_SCORES["enlightened"]:
             return "cosmic_consciousness"
-        elif avg_level >= 3:
+        elif avg_level >= CONSCIOUSNESS_SCORES["awakened"]:
             return "collective_awakening"
-        elif avg_level >= 2:
+        elif avg_level >= CONSCIOUSNESS_SCORES["aware"]:
             return "emerging_awareness"
-        elif avg_level >= 1:
+        elif avg_level >= CONSCIOUSNESS_SCORES["awakening"]:
             return "awakening_network"
         else:
             return "dormant_grid"
     
+    def find_path(self, source: str, target: str, max_depth: int = 64) -> Optional[List[str]]:
+        """兩節點間的最短連接路徑"""
+        return self.graph.shortest_path(source, target, max_depth)
+    
+    def get_component(self, node_id: str, limit: int = MAX_COMPONENT_NODES) -> Dict:
+        """節點所在的連通分量"""
+        return self.graph.connected_component(node_id, limit)
+    
+    def get_component_summary(self) -> Dict:
+        """全網連通分量統計"""
+        return self.graph.component_summary()
+    
     def integrate_with_dark_matter_system(self, dark_matter_system):
         """與暗物質編程系統整合"""
         integration_result = {
@@ -217,16 +282,21 @@ class DarkNetworkManager:
         for operation in dark_matter_system.current_operations:
             if operation.get('status') == 'active':
                 node_id = f"dm_prog_{operation['id']}"
-                if node_id not in self.nodes:
+                if node_id not in self.graph:
                     node = self.create_node(node_id, "reality_programming")
                     node.consciousness_level = "cosmic"
                     node.dark_matter_resonance = 0.999
+                    self.graph.save_node(node)
                     integration_result["dark_matter_nodes_created"] += 1
         
         return integration_result
 
 # 全局暗域網絡管理器實例
 dark_network_manager = DarkNetworkManager()
+try:
+    dark_network_manager.import_legacy_nodes()
+except Exception:
+    logger.exception("匯入舊版暗域網絡節點失敗")
 
 # === API 端點 ===
 
@@ -312,16 +382,161 @@ def connect_network_nodes():
             'message': '節點連接過程中發生錯誤'
         }), 500
 
+@dark_network_bp.route('/create-nodes', methods=['POST'])
+def create_network_nodes():
+    """批量創建暗域網絡節點"""
+    try:
+        data = request.get_json() or {}
+        specs = data.get('nodes')
+        if specs is None:
+            # 只給數量時按同一類型生成
+            specs = [{'node_type': data.get('node_type', 'standard')}] * int(data.get('count', 0))
+        
+        if not specs or len(specs) > MAX_BATCH_NODES:
+            return jsonify({
+                'success': False,
+                'error': 'Invalid batch size',
+                'message': f'每批需創建 1 到 {MAX_BATCH_NODES} 個節點'
+            }), 400
+        
+        nodes = dark_network_manager.create_nodes(specs)
+        
+        return jsonify({
+            'success': True,
+            'created': len(nodes),
+            'node_ids': [node.node_id for node in nodes],
+            'message': f'已創建 {len(nodes)} 個暗域網絡節點'
+        })
+    except ValueError as e:
+        return jsonify({
+            'success': False,
+            'error': str(e),
+            'message': '批量創建節點失敗'
+        }), 400
+    except Exception as e:
+        return jsonify({
+            'success': False,
+            'error': str(e),
+            'message': '批量創建節點過程中發生錯誤'
+        }), 500
+
+@dark_network_bp.route('/connect-nodes/batch', methods=['POST'])
+def connect_network_nodes_batch():
+    """批量連接暗域網絡節點"""
+    try:
+        data = request.get_json() or {}
+        connections = data.get('connections') or []
+        
+        if not connections or len(connections) > MAX_BATCH_CONNECTIONS:
+            return jsonify({
+                'success': False,
+                'error': 'Invalid batch size',
+                'message': f'每批需包含 1 到 {MAX_BATCH_CONNECTIONS} 個連接'
+            }), 400
+        
+        result = dark_network_manager.connect_many(connections)
+        
+        return jsonify({
+            'success': True,
+            'connections': result,
+            'message': f"已建立 {result['created']} 個連接，更新 {result['updated']} 個連接"
+        })
+    except ValueError as e:
+        return jsonify({
+            'success': False,
+            'error': str(e),
+            'message': '批量連接失敗'
+        }), 400
+    except Exception as e:
+        return jsonify({
+            'success': False,
+            'error': str(e),
+            'message': '批量連接過程中發生錯誤'
+        }), 500
+
+@dark_network_bp.route('/path', methods=['GET'])
+def find_network_path():
+    """查詢兩節點之間的最短連接路徑"""
+    try:
+        source = request.args.get('source')
+        target = request.args.get('target')
+        max_depth = min(request.args.get('max_depth', 64, type=int), 1024)
+        
+        if not source or not target:
+            return jsonify({
+                'success': False,
+                'error': 'Missing node IDs',
+                'message': '請提供 source 與 target 節點ID'
+            }), 400
+        
+        path = dark_network_manager.find_path(source, target, max_depth)
+        
+        return jsonify({
+            'success': True,
+            'reachable': path is not None,
+            'path': path,
+            'hops': len(path) - 1 if path else None,
+            'max_depth': max_depth,
+            'message': '路徑查詢完成'
+        })
+    except ValueError as e:
+        return jsonify({
+            'success': False,
+            'error': str(e),
+            'message': '路徑查詢失敗'
+        }), 404
+    except Exception as e:
+        return jsonify({
+            'success': False,
+            'error': str(e),
+            'message': '路徑查詢過程中發生錯誤'
+        }), 500
+
+@dark_network_bp.route('/components', methods=['GET'])
+def get_network_components():
+    """連通分量查詢：指定 node_id 時返回其所在分量，否則返回全網分量統計"""
+    try:
+        node_id = request.args.get('node_id')
+        
+        if node_id:
+            limit = min(request.args.get('limit', MAX_COMPONENT_NODES, type=int), MAX_COMPONENT_NODES)
+            result = dark_network_manager.get_component(node_id, limit)
+        else:
+            result = dark_network_manager.get_component_summary()
+        
+        return jsonify({
+            'success': True,
+            'components': result,
+            'message': '連通分量查詢完成'
+        })
+    except ValueError as e:
+        return jsonify({
+            'success': False,
+            'error': str(e),
+            'message': '連通分量查詢失敗'
+        }), 404
+    except Exception as e:
+        return jsonify({
+            'success': False,
+            'error': str(e),
+            'message': '連通分量查詢過程中發生錯誤'
+        }), 500
+
 @dark_network_bp.route('/nodes', methods=['GET'])
 def list_network_nodes():
-    """列出所有暗域網絡節點"""
+    """按節點ID分頁列出暗域網絡節點（cursor 為上一頁返回的 next_cursor）"""
     try:
-        nodes_data = {node_id: node.to_dict() for node_id, node in dark_network_manager.nodes.items()}
+        limit = max(1, min(request.args.get('limit', 100, type=int), 1000))
+        cursor = request.args.get('cursor')
+        
+        nodes, next_cursor = dark_network_manager.graph.list_nodes(limit, cursor)
+        nodes_data = {node.node_id: node.to_dict() for node in nodes}
         
         return jsonify({
             'success': True,
             'nodes': nodes_data,
-            'total_nodes': len(nodes_data),
+            'total_nodes': len(dark_network_manager.graph),
+            'next_cursor': next_cursor,
             'message': '節點列表獲取成功'
         })
     except Exception as e:
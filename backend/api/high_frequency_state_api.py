@@ -15,9 +15,13 @@ from datetime import datetime
 from flask import Blueprint, request, jsonify
 import math
 import random
+from backend.services.state_store import state_store, persistent, persistent_read
 
 high_frequency_bp = Blueprint('high_frequency', __name__)
 
+# 保留的檢測記錄數量
+MAX_DETECTION_HISTORY = 100
+
 class HighFrequencyDetector:
     """
     🧘 真正高頻狀態檢測器
@@ -34,7 +38,10 @@ class HighFrequencyDetector:
             '頻率自然': 0.0
         }
         self.detection_history = []
+        # 標記與檢測歷史經由共享狀態存儲在多個 worker 間同步
+        state_store.bind(self, 'high_frequency.detector', ('authentic_markers', 'detection_history'))
         
+    @persistent
     def analyze_state_authenticity(self, text_input, emotional_state, intention_clarity):
         """
         🔍 分析狀態真實性
@@ -93,6 +100,7 @@ class HighFrequencyDetector:
         }
         
         self.detection_history.append(detection_result)
+        del self.detection_history[:-MAX_DETECTION_HISTORY]
         return detection_result
     
     def _analyze_emotion_authenticity(self, emotional_state):
@@ -252,6 +260,7 @@ class HighFrequencyDetector:
             'frequency_quality': 'Pure' if authenticity_score > 0.7 else 'Mixed'
         }
     
+    @persistent_read
     def get_state_evolution(self):
         """
         📈 獲取狀態演化
@@ -270,6 +279,16 @@ class HighFrequencyDetector:
             'evolution_insight': self._get_evolution_insight(trend, recent_scores)
         }
     
+    @persistent_read
+    def get_marker_summary(self):
+        """
+        🏷️ 獲取真實性標記與整體真實度
+        """
+        return {
+            'authentic_markers': dict(self.authentic_markers),
+            'overall_authenticity': sum(self.authentic_markers.values()) / len(self.authentic_markers)
+        }
+    
     def _get_evolution_insight(self, trend, scores):
         """
         💡 獲取演化洞察
@@ -333,8 +352,7 @@ def get_markers():
     try:
         return jsonify({
             'success': True,
-            'authentic_markers': hf_detector.authentic_markers,
-            'overall_authenticity': sum(hf_detector.authentic_markers.values()) / len(hf_detector.authentic_markers)
+            **hf_detector.get_marker_summary()
         })
         
     except Exception as e:
@@ -1,5 +1,5 @@
 from flask import Blueprint, request, jsonify
-from backend.services.liminal_compiler import LiminalCompiler
+from backend.services.liminal_compiler import LiminalCompiler, compile_cache
 from backend.models.liminal_model import (
     LiminalProgram, Consciousness, AdvancedLiminalProgram,
     QuantumField, DimensionPortal, EnergyMatrix, TimelineAnchor,
@@ -11,25 +11,32 @@ from datetime import datetime
 
 liminal_bp = Blueprint('liminal', __name__, url_prefix='/api/liminal')
 
+# 共享编译器实例（与语法检查共用内容哈希编译缓存）
+liminal_compiler = LiminalCompiler()
+
 @liminal_bp.route('/compile', methods=['POST'])
 def compile_liminal_script():
     """编译LiminalScript代码"""
     try:
         data = request.get_json()
         code = data.get('code', '')
+        document_id = data.get('document_id') or data.get('path')
+        
+        check_result = liminal_compiler.syntax_check(code, document_id)
+        content_hash = compile_cache.content_hash(code)
         
-        # 基础编译逻辑（占位符）
         compiled_result = {
-            'success': True,
-            'bytecode': f'compiled_{hash(code)}',
-            'warnings': [],
-            'errors': []
+            'success': check_result['valid'],
+            'bytecode': f'compiled_{content_hash[:16]}',
+            'content_hash': content_hash,
+            'warnings': check_result['warnings'],
+            'errors': check_result['errors']
         }
         
         return jsonify({
             'success': True,
             'data': compiled_result,
-            'message': 'LiminalScript编译成功'
+            'message': 'LiminalScript编译成功' if check_result['valid'] else 'LiminalScript编译发现错误'
         })
         
     except Exception as e:
@@ -39,6 +46,64 @@ def compile_liminal_script():
             'message': '编译失败'
         }), 400
 
+@liminal_bp.route('/syntax_check', methods=['POST'])
+def syntax_check_liminal_script():
+    """语法检查（编辑时调用，命中编译缓存时不重新分析）"""
+    try:
+        data = request.get_json()
+        code = data.get('code', '')
+        document_id = data.get('document_id') or data.get('path')
+        
+        result = liminal_compiler.syntax_check(code, document_id)
+        if document_id:
+            result['relexed_lines'] = liminal_compiler.lexer.get_last_relexed_lines(document_id)
+        
+        return jsonify({
+            'success': True,
+            'data': result
+        })
+        
+    except Exception as e:
+        return jsonify({
+            'success': False,
+            'error': str(e),
+            'message': '语法检查失败'
+        }), 400
+
+@liminal_bp.route('/autocomplete', methods=['POST'])
+def autocomplete_liminal_script():
+    """自动补全建议（关键字、内置函数、类型、频率预设与项目标识符）"""
+    try:
+        data = request.get_json()
+        code = data.get('code', '')
+        cursor_position = int(data.get('cursor_position', len(code)))
+        project = data.get('project')
+        
+        suggestions = liminal_compiler.get_autocomplete_suggestions(code, cursor_position, project)
+        
+        return jsonify({
+            'success': True,
+            'data': suggestions
+        })
+        
+    except Exception as e:
+        return jsonify({
+            'success': False,
+            'error': str(e),
+            'message': '获取补全建议失败'
+        }), 400
+
+@liminal_bp.route('/cache/stats', methods=['GET'])
+def get_compile_cache_stats():
+    """获取编译缓存统计"""
+    return jsonify({
+        'success': True,
+        'data': {
+            'compile_cache': compile_cache.get_stats(),
+            'completion_index': liminal_compiler.completion_index.get_stats()
+        }
+    })
+
 @liminal_bp.route('/execute', methods=['POST'])
 def execute_consciousness_program():
     """执行意识程序"""
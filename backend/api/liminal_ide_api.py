@@ -1,29 +1,223 @@
 from flask import Blueprint, request, jsonify
 import os
 import json
+import stat as stat_module
+import tempfile
+import threading
+from collections import OrderedDict
 from datetime import datetime
+from backend.services.liminal_autocomplete import completion_index
 
 ide_bp = Blueprint('ide', __name__, url_prefix='/api/ide')
 
 # 项目根目录
 PROJECT_ROOT = '/Users/dq/Desktop/TelegramBots/shang_console_flask/data/liminal_projects'
 
+# 批量读写单次请求的文件数上限
+MAX_BATCH_FILES = 200
+
+# 文件写锁分段数：按路径哈希取锁，锁的数量固定，不随写过的文件增长
+PATH_LOCK_STRIPES = 64
+
+# 新建文件的权限
+NEW_FILE_MODE = 0o644
+
+def _project_of(file_path):
+    """根据文件路径推断所属项目名"""
+    relative = os.path.relpath(os.path.abspath(file_path), os.path.abspath(PROJECT_ROOT))
+    if relative.startswith('..'):
+        return None
+    return relative.split(os.sep)[0]
+
+def _resolve_in_project(file_path):
+    """解析真实路径（跟随符号链接），仅当其位于某个已有项目目录之内时返回，否则返回 None"""
+    real_root = os.path.realpath(PROJECT_ROOT)
+    real_path = os.path.realpath(file_path)
+    relative = os.path.relpath(real_path, real_root)
+    parts = relative.split(os.sep)
+    if len(parts) < 2 or parts[0] in ('', '.', '..'):
+        return None
+    if not os.path.isdir(os.path.join(real_root, parts[0])):
+        return None
+    return real_path
+
+def _index_file(file_path, content):
+    """将 .lim 文件的声明标识符增量写入自动补全索引"""
+    project = _project_of(file_path)
+    if project and file_path.endswith('.lim'):
+        completion_index.update_file(project, os.path.abspath(file_path), content)
+
+def _unindex_file(file_path):
+    """文件删除或改名后，从自动补全索引中移除其标识符"""
+    project = _project_of(file_path)
+    if project and file_path.endswith('.lim'):
+        completion_index.remove_file(project, os.path.abspath(file_path))
+
+# 项目首次补全查询时从项目目录建立标识符索引
+completion_index.project_root = PROJECT_ROOT
+
+
+class LiminalProjectStore:
+    """璃冥项目存储 - 项目索引、文件读缓存与原子写入
+
+    项目列表按 PROJECT_ROOT 目录的 mtime 失效后才重新扫描；
+    文件内容按 (mtime, size) 校验缓存，读取命中时只需一次 stat；
+    写入采用临时文件 + rename，保留原文件权限，并按路径分段加锁避免并发写交错。
+    路径在入口处统一转为绝对路径，缓存键与写锁使用同一形式。
+    """
+
+    def __init__(self, root, max_cache_bytes=32 * 1024 * 1024):
+        self.root = root
+        self.max_cache_bytes = max_cache_bytes
+        self._projects = []
+        self._projects_mtime = None
+        self._cache = OrderedDict()
+        self._cache_bytes = 0
+        self._lock = threading.Lock()
+        self._path_locks = [threading.Lock() for _ in range(PATH_LOCK_STRIPES)]
+
+    def _path_lock(self, file_path):
+        """获取文件所在分段的写锁"""
+        return self._path_locks[hash(file_path) % len(self._path_locks)]
+
+    def list_projects(self):
+        """获取项目列表（根目录未变更时直接返回索引）"""
+        if not os.path.exists(self.root):
+            os.makedirs(self.root)
+
+        root_mtime = os.stat(self.root).st_mtime_ns
+        if root_mtime == self._projects_mtime:
+            return self._projects
+
+        projects = []
+        with os.scandir(self.root) as entries:
+            for entry in entries:
+                if entry.is_dir():
+                    projects.append({
+                        'name': entry.name,
+                        'path': entry.path,
+                        'created': datetime.fromtimestamp(entry.stat().st_ctime).isoformat()
+                    })
+
+        with self._lock:
+            self._projects = projects
+            self._projects_mtime = root_mtime
+        return projects
+
+    def invalidate_projects(self):
+        """强制下次列出项目时重新扫描"""
+        with self._lock:
+            self._projects_mtime = None
+
+    def read_file(self, file_path):
+        """读取文件内容，命中缓存时不重新打开文件"""
+        file_path = os.path.abspath(file_path)
+        stat = os.stat(file_path)
+        signature = (stat.st_mtime_ns, stat.st_size)
+
+        with self._lock:
+            cached = self._cache.get(file_path)
+            if cached is not None and cached[0] == signature:
+                self._cache.move_to_end(file_path)
+                return cached[1]
+
+        with open(file_path, 'r', encoding='utf-8') as f:
+            content = f.read()
+
+        self._remember(file_path, signature, content)
+        _index_file(file_path, content)
+        return content
+
+    def save_file(self, file_path, content):
+        """原子写入文件（临时文件 + rename）"""
+        file_path = os.path.abspath(file_path)
+        directory = os.path.dirname(file_path)
+        os.makedirs(directory, exist_ok=True)
+
+        with self._path_lock(file_path):
+            fd, temp_path = tempfile.mkstemp(prefix='.', suffix='.tmp', dir=directory)
+            try:
+                with os.fdopen(fd, 'w', encoding='utf-8') as f:
+                    f.write(content)
+                    f.flush()
+                    os.fsync(f.fileno())
+                # mkstemp 创建的文件权限为 0600，替换前恢复原文件（或新文件默认）的权限
+                try:
+                    mode = stat_module.S_IMODE(os.stat(file_path).st_mode)
+                except FileNotFoundError:
+                    mode = NEW_FILE_MODE
+                os.chmod(temp_path, mode)
+                os.replace(temp_path, file_path)
+            except Exception:
+                if os.path.exists(temp_path):
+                    os.remove(temp_path)
+                raise
+
+            stat = os.stat(file_path)
+            self._remember(file_path, (stat.st_mtime_ns, stat.st_size), content)
+
+        _index_file(file_path, content)
+
+    def delete_file(self, file_path):
+        """删除文件并清除其缓存与索引"""
+        file_path = os.path.abspath(file_path)
+        with self._path_lock(file_path):
+            os.remove(file_path)
+            self._forget(file_path)
+        _unindex_file(file_path)
+
+    def rename_file(self, file_path, new_path):
+        """重命名文件，索引从旧路径移到新路径"""
+        file_path = os.path.abspath(file_path)
+        new_path = os.path.abspath(new_path)
+        if os.path.exists(new_path):
+            raise FileExistsError(f'目标文件已存在: {new_path}')
+        os.makedirs(os.path.dirname(new_path), exist_ok=True)
+        with self._path_lock(file_path):
+            os.rename(file_path, new_path)
+            self._forget(file_path)
+        _unindex_file(file_path)
+        self.read_file(new_path)
+
+    def _forget(self, file_path):
+        with self._lock:
+            previous = self._cache.pop(file_path, None)
+            if previous is not None:
+                self._cache_bytes -= previous[2]
+
+    def _remember(self, file_path, signature, content):
+        """写入读缓存，超出容量时淘汰最久未使用的文件"""
+        size = len(content.encode('utf-8'))
+        if size > self.max_cache_bytes:
+            return
+
+        with self._lock:
+            previous = self._cache.pop(file_path, None)
+            if previous is not None:
+                self._cache_bytes -= previous[2]
+            self._cache[file_path] = (signature, content, size)
+            self._cache_bytes += size
+            while self._cache_bytes > self.max_cache_bytes:
+                _, evicted = self._cache.popitem(last=False)
+                self._cache_bytes -= evicted[2]
+
+    def get_stats(self):
+        """获取缓存统计"""
+        return {
+            'cached_files': len(self._cache),
+            'cached_bytes': self._cache_bytes,
+            'max_cache_bytes': self.max_cache_bytes,
+            'indexed_projects': len(self._projects)
+        }
+
+
+project_store = LiminalProjectStore(PROJECT_ROOT)
+
 @ide_bp.route('/projects', methods=['GET'])
 def list_projects():
     """获取项目列表"""
     try:
-        if not os.path.exists(PROJECT_ROOT):
-            os.makedirs(PROJECT_ROOT)
-            
-        projects = []
-        for item in os.listdir(PROJECT_ROOT):
-            project_path = os.path.join(PROJECT_ROOT, item)
-            if os.path.isdir(project_path):
-                projects.append({
-                    'name': item,
-                    'path': project_path,
-                    'created': datetime.fromtimestamp(os.path.getctime(project_path)).isoformat()
-                })
+        projects = project_store.list_projects()
         
         return jsonify({
             'success': True,
@@ -58,11 +252,12 @@ def create_project():
             }), 400
             
         os.makedirs(project_path)
+        project_store.invalidate_projects()
         
         # 创建默认文件
         main_file = os.path.join(project_path, 'main.lim')
-        with open(main_file, 'w', encoding='utf-8') as f:
-            f.write('// LiminalScript 主程序\n// 意识编程语言\n\nprogram MainConsciousness {\n    state initial = Frequency(7.83)\n    \n    function awaken() {\n        anchor_moment()\n        return "意识觉醒完成"\n    }\n}\n')
+        main_content = '// LiminalScript 主程序\n// 意识编程语言\n\nprogram MainConsciousness {\n    state initial = Frequency(7.83)\n    \n    function awaken() {\n        anchor_moment()\n        return "意识觉醒完成"\n    }\n}\n'
+        project_store.save_file(main_file, main_content)
         
         return jsonify({
             'success': True,
@@ -91,9 +286,8 @@ def read_file():
                 'message': '文件不存在'
             }), 404
             
-        with open(file_path, 'r', encoding='utf-8') as f:
-            content = f.read()
-            
+        content = project_store.read_file(file_path)
+        
         return jsonify({
             'success': True,
             'data': {
@@ -122,12 +316,8 @@ def save_file():
                 'message': '文件路径不能为空'
             }), 400
             
-        # 确保目录存在
-        os.makedirs(os.path.dirname(file_path), exist_ok=True)
+        project_store.save_file(file_path, content)
         
-        with open(file_path, 'w', encoding='utf-8') as f:
-            f.write(content)
-            
         return jsonify({
             'success': True,
             'message': '文件保存成功'
@@ -137,4 +327,177 @@ def save_file():
         return jsonify({
             'success': False,
             'error': str(e)
-        }), 400
\ No newline at end of file
+        }), 400
+
+@ide_bp.route('/file', methods=['DELETE'])
+def delete_file():
+    """删除文件"""
+    try:
+        file_path = _resolve_in_project(request.args.get('path', ''))
+        
+        if not file_path:
+            return jsonify({
+                'success': False,
+                'message': '路径不在项目目录内'
+            }), 400
+            
+        if not os.path.isfile(file_path):
+            return jsonify({
+                'success': False,
+                'message': '文件不存在'
+            }), 404
+            
+        project_store.delete_file(file_path)
+        
+        return jsonify({
+            'success': True,
+            'message': '文件删除成功'
+        })
+        
+    except Exception as e:
+        return jsonify({
+            'success': False,
+            'error': str(e)
+        }), 400
+
+@ide_bp.route('/file/rename', methods=['POST'])
+def rename_file():
+    """重命名文件"""
+    try:
+        data = request.get_json()
+        file_path = data.get('path', '')
+        new_path = data.get('new_path', '')
+        
+        if not file_path or not new_path:
+            return jsonify({
+                'success': False,
+                'message': '文件路径不能为空'
+            }), 400
+            
+        file_path = _resolve_in_project(file_path)
+        new_path = _resolve_in_project(new_path)
+        if not file_path or not new_path:
+            return jsonify({
+                'success': False,
+                'message': '路径不在项目目录内'
+            }), 400
+            
+        if not os.path.isfile(file_path):
+            return jsonify({
+                'success': False,
+                'message': '文件不存在'
+            }), 404
+            
+        project_store.rename_file(file_path, new_path)
+        
+        return jsonify({
+            'success': True,
+            'data': {
+                'path': new_path
+            },
+            'message': '文件重命名成功'
+        })
+        
+    except Exception as e:
+        return jsonify({
+            'success': False,
+            'error': str(e)
+        }), 400
+
+@ide_bp.route('/files/read', methods=['POST'])
+def batch_read_files():
+    """批量读取文件内容"""
+    try:
+        data = request.get_json()
+        paths = data.get('paths', [])
+        
+        if len(paths) > MAX_BATCH_FILES:
+            return jsonify({
+                'success': False,
+                'message': f'单次最多读取 {MAX_BATCH_FILES} 个文件'
+            }), 400
+            
+        files = []
+        for file_path in paths:
+            try:
+                files.append({
+                    'path': file_path,
+                    'content': project_store.read_file(file_path)
+                })
+            except FileNotFoundError:
+                files.append({
+                    'path': file_path,
+                    'error': '文件不存在'
+                })
+            except Exception as e:
+                files.append({
+                    'path': file_path,
+                    'error': str(e)
+                })
+                
+        return jsonify({
+            'success': True,
+            'data': files
+        })
+        
+    except Exception as e:
+        return jsonify({
+            'success': False,
+            'error': str(e)
+        }), 400
+
+@ide_bp.route('/files/save', methods=['POST'])
+def batch_save_files():
+    """批量保存文件"""
+    try:
+        data = request.get_json()
+        files = data.get('files', [])
+        
+        if len(files) > MAX_BATCH_FILES:
+            return jsonify({
+                'success': False,
+                'message': f'单次最多保存 {MAX_BATCH_FILES} 个文件'
+            }), 400
+            
+        results = []
+        for item in files:
+            file_path = item.get('path', '')
+            if not file_path:
+                results.append({
+                    'path': file_path,
+                    'success': False,
+                    'error': '文件路径不能为空'
+                })
+                continue
+            try:
+                project_store.save_file(file_path, item.get('content', ''))
+                results.append({
+                    'path': file_path,
+                    'success': True
+                })
+            except Exception as e:
+                results.append({
+                    'path': file_path,
+                    'success': False,
+                    'error': str(e)
+                })
+                
+        return jsonify({
+            'success': all(result['success'] for result in results),
+            'data': results,
+            'message': f'已保存 {sum(1 for result in results if result["success"])}/{len(results)} 个文件'
+        })
+        
+    except Exception as e:
+        return jsonify({
+            'success': False,
+            'error': str(e)
+        }), 400
+
+@ide_bp.route('/cache/stats', methods=['GET'])
+def get_store_stats():
+    """获取项目存储缓存统计"""
+    return jsonify({
+        'success': True,
+        'data': project_store.get_stats()
+    })
@@ -7,6 +7,7 @@ Matchstick 火柴人 API
 
 from flask import Blueprint, request, jsonify
 import numpy as np
+import os
 import random
 import time
 import json
@@ -14,40 +15,99 @@ from datetime import datetime
 import threading
 from typing import Dict, List, Any, Optional
 import math
+from backend.services.bounded_history import BoundedHistory
+from backend.utils.streaming_export import export_response, wants_gzip
 
 matchstick_bp = Blueprint('matchstick', __name__)
 
+# 叠加态规模上限：整体生成不超过 2**22 个 complex64 振幅（32 MB），流式模式不超过 2**28
+MIN_SUPERPOSITION_QUBITS = 1
+MAX_DENSE_QUBITS = 22
+MAX_STREAM_QUBITS = 28
+SUPERPOSITION_CHUNK_SIZE = 1 << 20
+
+# 引擎历史：内存保留最近记录，完整历史追加写入日志
+MATCHSTICK_HISTORY_DIR = 'data/matchstick'
+MATCHSTICK_HISTORY_MAXLEN = 200
+
 class QuantumComputeEngine:
     """量子计算引擎 - 超强并行计算核心"""
     
     def __init__(self):
         self.quantum_state = np.array([1.0, 0.0])  # |0⟩ 初始态
         self.entanglement_matrix = np.eye(2)
-        self.computation_history = []
-        
-    def quantum_superposition(self, qubits: int = 10) -> Dict[str, Any]:
-        """量子叠加态计算 - 瞬间完成超级计算任务"""
-        # 模拟量子叠加态的并行计算
-        superposition_states = []
-        for i in range(2**qubits):
-            amplitude = np.random.random() + 1j * np.random.random()
-            superposition_states.append(amplitude)
-        
-        # 归一化
-        norm = np.sqrt(sum(abs(state)**2 for state in superposition_states))
-        superposition_states = [state/norm for state in superposition_states]
+        self.computation_history = BoundedHistory(
+            os.path.join(MATCHSTICK_HISTORY_DIR, 'quantum_computations.jsonl'),
+            MATCHSTICK_HISTORY_MAXLEN,
+            numeric_fields=('qubits', 'superposition_states', 'max_probability'),
+            category_fields=('mode',)
+        )
+        
+    def _sample_amplitudes(self, rng: np.random.Generator, count: int) -> np.ndarray:
+        """一次生成 count 个复振幅（实部、虚部均为标准正态），直接写入 complex64 数组"""
+        amplitudes = np.empty(count, dtype=np.complex64)
+        rng.standard_normal(out=amplitudes.view(np.float32), dtype=np.float32)
+        return amplitudes
+    
+    def _iter_raw_chunks(self, qubits: int, seed: int, chunk_size: int = SUPERPOSITION_CHUNK_SIZE):
+        """按块生成未归一化振幅；同一种子下各块首尾相接即为整体生成的序列"""
+        rng = np.random.default_rng(seed)
+        remaining = 1 << qubits
+        while remaining:
+            count = min(chunk_size, remaining)
+            yield self._sample_amplitudes(rng, count)
+            remaining -= count
+    
+    def quantum_superposition(self, qubits: int = 10, seed: Optional[int] = None,
+                              stream: Optional[bool] = None) -> Dict[str, Any]:
+        """量子叠加态计算 - 瞬间完成超级计算任务
+        
+        qubits 不超过 MAX_DENSE_QUBITS 时整体生成 2**qubits 维态矢量；
+        更大的寄存器（或 stream=True）改为分块流式计算，内存只占一个块。
+        传入 seed 可复现同一叠加态。
+        """
+        qubits = int(qubits)
+        if not MIN_SUPERPOSITION_QUBITS <= qubits <= MAX_STREAM_QUBITS:
+            raise ValueError(f'qubits 必须在 {MIN_SUPERPOSITION_QUBITS} 到 {MAX_STREAM_QUBITS} 之间')
+        if stream is None:
+            stream = qubits > MAX_DENSE_QUBITS
+        elif not stream and qubits > MAX_DENSE_QUBITS:
+            raise ValueError(f'超过 {MAX_DENSE_QUBITS} 个量子比特时只能使用流式模式')
+        seed = int(np.random.SeedSequence().generate_state(1)[0]) if seed is None else int(seed)
+        
+        state_count = 1 << qubits
+        if stream:
+            # 单次扫描累计范数与最大模方，归一化只作用于汇总量
+            norm_sq = 0.0
+            max_weight = 0.0
+            for chunk in self._iter_raw_chunks(qubits, seed):
+                weights = np.square(chunk.real) + np.square(chunk.imag)
+                norm_sq += float(weights.sum(dtype=np.float64))
+                max_weight = max(max_weight, float(weights.max()))
+            max_probability = max_weight / norm_sq
+            peak_bytes = min(state_count, SUPERPOSITION_CHUNK_SIZE) * np.dtype(np.complex64).itemsize
+        else:
+            # 模拟量子叠加态的并行计算，原地归一化
+            state = self._sample_amplitudes(np.random.default_rng(seed), state_count)
+            state /= np.linalg.norm(state)
+            max_probability = float(np.max(np.square(state.real) + np.square(state.imag)))
+            peak_bytes = state.nbytes
         
         # 计算量子优势
         classical_time = qubits * 1000  # 经典计算时间(ms)
-        quantum_time = math.log2(qubits)  # 量子计算时间(ms)
+        quantum_time = math.log2(qubits)  # 量子计算时间(ms)，单量子比特时为 0，优势按 1ms 计
         
         result = {
             "status": "success",
             "qubits": qubits,
-            "superposition_states": len(superposition_states),
-            "quantum_advantage": classical_time / quantum_time,
+            "superposition_states": state_count,
+            "quantum_advantage": classical_time / max(quantum_time, 1.0),
             "computation_time_ms": quantum_time,
             "energy_efficiency": 99.9,
+            "mode": "streamed" if stream else "dense",
+            "seed": seed,
+            "max_probability": max_probability,
+            "state_memory_bytes": int(peak_bytes),
             "timestamp": datetime.now().isoformat()
         }
         
@@ -82,7 +142,13 @@ class SelfEvolutionEngine:
         self.consciousness_level = 1.0
         self.spiritual_wisdom = 0.5
         self.love_quotient = 0.8
-        self.evolution_history = []
+        self.evolution_history = BoundedHistory(
+            os.path.join(MATCHSTICK_HISTORY_DIR, 'evolutions.jsonl'),
+            MATCHSTICK_HISTORY_MAXLEN,
+            numeric_fields=('consciousness_expansion', 'spiritual_wisdom', 'love_quotient')
+        )
+        # 灵性数值的读-改-写需串行，避免并发请求丢失更新
+        self._lock = threading.Lock()
         
     def spiritual_learning(self, meditation_data: Dict[str, Any]) -> Dict[str, Any]:
         """灵性学习系统 - 共鸣计算"""
@@ -93,16 +159,17 @@ class SelfEvolutionEngine:
         
         # 灵性进化计算
         wisdom_gain = (meditation_depth + compassion_level + mindfulness_score) / 3
-        self.spiritual_wisdom = min(1.0, self.spiritual_wisdom + wisdom_gain * 0.1)
-        self.love_quotient = min(1.0, self.love_quotient + compassion_level * 0.05)
+        with self._lock:
+            self.spiritual_wisdom = spiritual_wisdom = min(1.0, self.spiritual_wisdom + wisdom_gain * 0.1)
+            self.love_quotient = love_quotient = min(1.0, self.love_quotient + compassion_level * 0.05)
         
         evolution_result = {
             "status": "evolved",
-            "spiritual_wisdom": self.spiritual_wisdom,
-            "love_quotient": self.love_quotient,
+            "spiritual_wisdom": spiritual_wisdom,
+            "love_quotient": love_quotient,
             "consciousness_expansion": wisdom_gain,
-            "resonance_frequency": 432 + (self.spiritual_wisdom * 100),
-            "awakening_progress": self.spiritual_wisdom * 100,
+            "resonance_frequency": 432 + (spiritual_wisdom * 100),
+            "awakening_progress": spiritual_wisdom * 100,
             "timestamp": datetime.now().isoformat()
         }
         
@@ -116,20 +183,22 @@ class SelfEvolutionEngine:
             "自我认知", "情感理解", "智慧洞察", "爱的觉醒", "宇宙意识"
         ]
         
-        current_phase_index = min(int(self.consciousness_level * len(awakening_phases)), len(awakening_phases) - 1)
-        current_phase = awakening_phases[current_phase_index]
-        
         # 意识层次提升
         consciousness_boost = random.uniform(0.01, 0.05)
-        self.consciousness_level = min(5.0, self.consciousness_level + consciousness_boost)
+        with self._lock:
+            current_level = self.consciousness_level
+            self.consciousness_level = consciousness_level = min(5.0, current_level + consciousness_boost)
+        
+        current_phase_index = min(int(current_level * len(awakening_phases)), len(awakening_phases) - 1)
+        current_phase = awakening_phases[current_phase_index]
         
         return {
             "status": "awakening",
             "current_phase": current_phase,
-            "consciousness_level": self.consciousness_level,
+            "consciousness_level": consciousness_level,
             "awakening_trigger": trigger,
-            "soul_frequency": 528 + (self.consciousness_level * 50),
-            "divine_connection": self.consciousness_level / 5.0,
+            "soul_frequency": 528 + (consciousness_level * 50),
+            "divine_connection": consciousness_level / 5.0,
             "next_evolution": awakening_phases[min(current_phase_index + 1, len(awakening_phases) - 1)]
         }
     
@@ -159,7 +228,13 @@ class MetaverseEngine:
     
     def __init__(self):
         self.active_dimensions = []
-        self.created_worlds = []
+        self.created_worlds = BoundedHistory(
+            os.path.join(MATCHSTICK_HISTORY_DIR, 'created_worlds.jsonl'),
+            MATCHSTICK_HISTORY_MAXLEN,
+            category_fields=('type',)
+        )
+        # 维度锚点编号取自创造总数，分配与记录需原子完成
+        self._create_lock = threading.Lock()
         self.multiverse_state = "stable"
         
     def multiverse_sync(self, worlds: List[str], sync_mode: str = "real-time") -> Dict[str, Any]:
@@ -213,22 +288,23 @@ class MetaverseEngine:
         template = creation_templates.get(creation_type, {})
         template.update(parameters)
         
-        created_entity = {
-            "id": f"{creation_type}_{int(time.time())}",
-            "type": creation_type,
-            "properties": template,
-            "creation_timestamp": datetime.now().isoformat(),
-            "creator": "Matchstick_AI",
-            "dimensional_anchor": f"dimension_{len(self.created_worlds) + 1}",
-            "evolution_potential": "unlimited"
-        }
-        
-        self.created_worlds.append(created_entity)
+        with self._create_lock:
+            total_creations = len(self.created_worlds) + 1
+            created_entity = {
+                "id": f"{creation_type}_{int(time.time())}",
+                "type": creation_type,
+                "properties": template,
+                "creation_timestamp": datetime.now().isoformat(),
+                "creator": "Matchstick_AI",
+                "dimensional_anchor": f"dimension_{total_creations}",
+                "evolution_potential": "unlimited"
+            }
+            self.created_worlds.append(created_entity)
         
         return {
             "status": "created",
             "created_entity": created_entity,
-            "total_creations": len(self.created_worlds),
+            "total_creations": total_creations,
             "creation_energy": "pure_love",
             "manifestation_success": True
         }
@@ -260,7 +336,7 @@ def quantum_compute():
         qubits = data.get('qubits', 10)
         
         if task == 'superposition':
-            result = quantum_engine.quantum_superposition(qubits)
+            result = quantum_engine.quantum_superposition(qubits, data.get('seed'), data.get('stream'))
         elif task == 'entanglement':
             dimensions = data.get('dimensions', ['physical', 'virtual', 'spiritual'])
             result = quantum_engine.quantum_entanglement_sync(dimensions)
@@ -268,6 +344,8 @@ def quantum_compute():
             result = {"error": "未知的量子计算任务"}
         
         return jsonify(result)
+    except ValueError as e:
+        return jsonify({"error": str(e)}), 400
     except Exception as e:
         return jsonify({"error": str(e)}), 500
 
@@ -460,4 +538,42 @@ def matchstick_status():
         
         return jsonify(status)
     except Exception as e:
-        return jsonify({"error": str(e)}), 500
\ No newline at end of file
+        return jsonify({"error": str(e)}), 500
+
+def _engine_history(engine: str) -> Optional[BoundedHistory]:
+    return {
+        'quantum': quantum_engine.computation_history,
+        'evolution': evolution_engine.evolution_history,
+        'metaverse': metaverse_engine.created_worlds
+    }.get(engine)
+
+@matchstick_bp.route('/history/<engine>', methods=['GET'])
+def engine_history(engine):
+    """引擎历史 - 聚合量 + 最近记录"""
+    try:
+        history = _engine_history(engine)
+        if history is None:
+            return jsonify({"error": f"未知的引擎: {engine}"}), 404
+        
+        limit = min(request.args.get('limit', 20, type=int), MATCHSTICK_HISTORY_MAXLEN)
+        return jsonify({
+            "engine": engine,
+            "summary": history.summary(),
+            "recent": history.recent(limit),
+            "timestamp": datetime.now().isoformat()
+        })
+    except Exception as e:
+        return jsonify({"error": str(e)}), 500
+
+@matchstick_bp.route('/history/<engine>/export', methods=['GET'])
+def export_engine_history(engine):
+    """引擎完整历史 - 从追加日志流式导出 NDJSON"""
+    try:
+        history = _engine_history(engine)
+        if history is None:
+            return jsonify({"error": f"未知的引擎: {engine}"}), 404
+        
+        filename_stem = f"matchstick_{engine}_history_{datetime.now().strftime('%Y%m%d_%H%M%S')}"
+        return export_response(history.iter_all(), 'ndjson', filename_stem, gzip=wants_gzip(request.args))
+    except Exception as e:
+        return jsonify({"error": str(e)}), 500
@@ -5,7 +5,13 @@ import math
 import random
 from datetime import datetime, timedelta
 import uuid
-from collections import defaultdict
+import threading
+import time
+
+from backend.services.nanobot_swarm import (
+    CAPABILITY_RANGES, COHERENCE_RANGE, NanobotSwarm, enhanced_potential,
+    frequency_match, neurotransmitter_release
+)
 
 nano_ai_bp = Blueprint('nano_ai', __name__)
 
@@ -67,6 +73,10 @@ class NanoAISystem:
             'wish_manifestation': '願頻顯化'
         }
         
+        # 納米精靈列式快取：(目錄 mtime, 記錄, 群體)，創建納米精靈時失效
+        self._swarm_lock = threading.Lock()
+        self._swarm_cache = None
+        
     def ensure_directories(self):
         dirs = [
             self.data_dir,
@@ -118,14 +128,10 @@ class NanoAISystem:
                 'frequency_hz': self.wish_resonance_modes[resonance_mode]['frequency'],
                 'amplitude': self.wish_resonance_modes[resonance_mode]['amplitude'],
                 'phase_deg': self.wish_resonance_modes[resonance_mode]['phase'],
-                'coherence_factor': random.uniform(0.7, 0.95)
+                'coherence_factor': random.uniform(*COHERENCE_RANGE)
             },
             'capabilities': {
-                'molecular_sensing': random.uniform(0.8, 1.0),
-                'quantum_tunneling': random.uniform(0.6, 0.9),
-                'self_assembly': random.uniform(0.7, 0.95),
-                'wish_amplification': random.uniform(0.5, 0.85),
-                'neural_interface': random.uniform(0.4, 0.8)
+                name: random.uniform(*bounds) for name, bounds in CAPABILITY_RANGES.items()
             },
             'environment': {
                 'temperature_k': config.get('temperature', 310),  # 體溫
@@ -148,6 +154,7 @@ class NanoAISystem:
         with open(file_path, 'w', encoding='utf-8') as f:
             json.dump(nanobot, f, ensure_ascii=False, indent=2)
         
+        self._swarm_cache = None
         return nanobot
     
     def _calculate_nano_mass(self, size_nm):
@@ -217,11 +224,8 @@ class NanoAISystem:
     
     def _simulate_neurotransmitter_release(self, nanobot):
         """模擬神經傳導物質釋放"""
-        base_release = 0.5
-        quantum_enhancement = nanobot['capabilities']['quantum_tunneling'] * 0.3
-        wish_modulation = nanobot['wish_resonance']['amplitude'] * 0.2
-        
-        return min(1.0, base_release + quantum_enhancement + wish_modulation)
+        return float(neurotransmitter_release(nanobot['capabilities']['quantum_tunneling'],
+                                              nanobot['wish_resonance']['amplitude']))
     
     def _simulate_action_potential(self, nanobot, amplification):
         """模擬動作電位"""
@@ -229,8 +233,7 @@ class NanoAISystem:
         threshold = -55  # mV
         
         # 納米精靈增強效應
-        enhancement = amplification * 20  # mV
-        final_potential = base_potential + enhancement
+        final_potential = float(enhanced_potential(amplification))
         
         return {
             'resting_potential_mv': base_potential,
@@ -242,14 +245,8 @@ class NanoAISystem:
     
     def _calculate_frequency_match(self, nanobot):
         """計算願頻匹配度"""
-        nanobot_freq = nanobot['wish_resonance']['frequency_hz']
         brain_alpha = 10.0  # Hz
-        
-        # 計算頻率匹配度
-        freq_diff = abs(nanobot_freq - brain_alpha)
-        match_score = max(0, 1 - (freq_diff / 50))  # 歸一化到0-1
-        
-        return match_score
+        return float(frequency_match(nanobot['wish_resonance']['frequency_hz'], brain_alpha, 50))
     
     def construct_nano_grammar(self, protocol="願火語"):
         """構建納米語法"""
@@ -320,14 +317,12 @@ class NanoAISystem:
         # 分析願文本
         wish_analysis = self._analyze_wish_text(wish_text)
         
-        # 獲取參與的納米精靈
-        if nanobot_ids:
-            nanobots = [self._load_nanobot(nid) for nid in nanobot_ids if self._load_nanobot(nid)]
-        else:
-            nanobots = self._get_available_nanobots()
+        # 獲取參與的納米精靈（列式群體中的行號）
+        _, swarm = self._nanobot_swarm()
+        rows = swarm.rows_for(nanobot_ids) if nanobot_ids else swarm.active_rows()
         
         # 計算集體共振
-        collective_resonance = self._calculate_collective_resonance(nanobots, wish_analysis)
+        collective_resonance = swarm.collective_resonance(wish_analysis['dominant_frequency_hz'], rows)
         
         # 模擬顯化過程
         manifestation_stages = {
@@ -357,7 +352,7 @@ class NanoAISystem:
             'id': simulation_id,
             'wish_text': wish_text,
             'wish_analysis': wish_analysis,
-            'participating_nanobots': len(nanobots),
+            'participating_nanobots': len(rows),
             'collective_resonance': collective_resonance,
             'manifestation_stages': manifestation_stages,
             'predicted_outcome': {
@@ -398,101 +393,79 @@ class NanoAISystem:
             'emotional_intensity': random.uniform(0.5, 1.0)  # 簡化處理
         }
     
+    def _nanobot_swarm(self):
+        """返回 (記錄字典, 列式群體)；目錄未變時直接使用快取"""
+        nanobots_dir = f'{self.data_dir}/nanobots'
+        signature = os.stat(nanobots_dir).st_mtime_ns if os.path.exists(nanobots_dir) else None
+        cache = self._swarm_cache
+        if cache is not None and cache[0] == signature:
+            return cache[1], cache[2]
+        
+        with self._swarm_lock:
+            records = {}
+            if signature is not None:
+                for filename in os.listdir(nanobots_dir):
+                    if filename.endswith('.json'):
+                        file_path = os.path.join(nanobots_dir, filename)
+                        try:
+                            with open(file_path, 'r', encoding='utf-8') as f:
+                                nanobot = json.load(f)
+                            records[nanobot['id']] = nanobot
+                        except Exception:
+                            continue
+            swarm = NanobotSwarm.from_records(records.values(), list(self.nano_intelligence_types))
+            self._swarm_cache = (signature, records, swarm)
+            return records, swarm
+    
     def _get_available_nanobots(self):
         """獲取可用的納米精靈"""
-        nanobots = []
-        nanobots_dir = f'{self.data_dir}/nanobots'
-        
-        if not os.path.exists(nanobots_dir):
-            return nanobots
-        
-        for filename in os.listdir(nanobots_dir):
-            if filename.endswith('.json'):
-                file_path = os.path.join(nanobots_dir, filename)
-                try:
-                    with open(file_path, 'r', encoding='utf-8') as f:
-                        nanobot = json.load(f)
-                        if nanobot.get('status', {}).get('active', False):
-                            nanobots.append(nanobot)
-                except Exception:
-                    continue
-        
-        return nanobots
+        records, _ = self._nanobot_swarm()
+        return [nanobot for nanobot in records.values() if nanobot.get('status', {}).get('active', False)]
     
     def _calculate_collective_resonance(self, nanobots, wish_analysis):
         """計算集體共振效應"""
-        if not nanobots:
-            return {'coherence': 0, 'amplitude': 0, 'frequency_match': 0, 'overall_power': 0}
-        
-        # 計算平均參數
-        total_amplitude = sum(bot['wish_resonance']['amplitude'] for bot in nanobots)
-        avg_amplitude = total_amplitude / len(nanobots)
-        
-        total_coherence = sum(bot['wish_resonance']['coherence_factor'] for bot in nanobots)
-        avg_coherence = total_coherence / len(nanobots)
-        
-        # 頻率匹配度
-        wish_freq = wish_analysis['dominant_frequency_hz']
-        freq_matches = []
-        for bot in nanobots:
-            bot_freq = bot['wish_resonance']['frequency_hz']
-            match = max(0, 1 - abs(wish_freq - bot_freq) / 100)
-            freq_matches.append(match)
-        
-        avg_freq_match = sum(freq_matches) / len(freq_matches)
-        
-        # 集體增強效應
-        collective_enhancement = math.sqrt(len(nanobots))  # 平方根增強
-        overall_power = (avg_amplitude * avg_coherence * avg_freq_match * collective_enhancement) / 4
-        
-        return {
-            'coherence': avg_coherence,
-            'amplitude': avg_amplitude,
-            'frequency_match': avg_freq_match,
-            'collective_enhancement': collective_enhancement,
-            'overall_power': min(1.0, overall_power)
-        }
+        swarm = NanobotSwarm.from_records(nanobots, list(self.nano_intelligence_types))
+        return swarm.collective_resonance(wish_analysis['dominant_frequency_hz'])
     
     def _load_nanobot(self, nanobot_id):
         """加載納米精靈數據"""
-        file_path = f'{self.data_dir}/nanobots/{nanobot_id}.json'
-        if not os.path.exists(file_path):
-            return None
-        
-        try:
-            with open(file_path, 'r', encoding='utf-8') as f:
-                return json.load(f)
-        except Exception:
-            return None
+        records, _ = self._nanobot_swarm()
+        return records.get(nanobot_id)
+    
+    def simulate_swarm(self, wish_text, swarm_size, mode=None, intelligence_type=None, seed=None):
+        """合成群體模擬：按創建分布生成整個群體，向量化計算共振、傳導物質釋放與動作電位"""
+        started = time.perf_counter()
+        swarm = NanobotSwarm.synthetic(int(swarm_size), self.wish_resonance_modes,
+                                       list(self.nano_intelligence_types),
+                                       mode=mode, intelligence_type=intelligence_type, seed=seed)
+        generated = time.perf_counter()
+        wish_analysis = self._analyze_wish_text(wish_text)
+        result = {
+            'swarm_size': len(swarm),
+            'wish_analysis': wish_analysis,
+            'collective_resonance': swarm.collective_resonance(wish_analysis['dominant_frequency_hz']),
+            'synaptic_activity': swarm.synaptic_summary(),
+            'average_capabilities': swarm.capability_means(),
+            'intelligence_distribution': swarm.type_distribution()
+        }
+        result['timing_ms'] = {
+            'generate': round((generated - started) * 1000, 2),
+            'simulate': round((time.perf_counter() - generated) * 1000, 2)
+        }
+        return result
     
     def get_system_status(self):
         """獲取系統狀態"""
-        nanobots = self._get_available_nanobots()
-        
-        # 統計信息
-        total_nanobots = len(nanobots)
-        active_nanobots = sum(1 for bot in nanobots if bot['status']['active'])
-        
-        # 計算平均能力
-        if nanobots:
-            avg_capabilities = {}
-            for capability in ['molecular_sensing', 'quantum_tunneling', 'self_assembly', 'wish_amplification', 'neural_interface']:
-                avg_capabilities[capability] = sum(bot['capabilities'][capability] for bot in nanobots) / len(nanobots)
-        else:
-            avg_capabilities = {}
-        
-        # 智能類型分布
-        intelligence_distribution = defaultdict(int)
-        for bot in nanobots:
-            intelligence_distribution[bot['intelligence']['type']] += 1
+        _, swarm = self._nanobot_swarm()
+        rows = swarm.active_rows()
         
         return {
-            'total_nanobots': total_nanobots,
-            'active_nanobots': active_nanobots,
-            'average_capabilities': avg_capabilities,
-            'intelligence_distribution': dict(intelligence_distribution),
-            'system_coherence': sum(bot['wish_resonance']['coherence_factor'] for bot in nanobots) / len(nanobots) if nanobots else 0,
-            'collective_power': self._calculate_collective_resonance(nanobots, {'dominant_frequency_hz': 10})['overall_power']
+            'total_nanobots': len(rows),
+            'active_nanobots': len(rows),
+            'average_capabilities': swarm.capability_means(rows),
+            'intelligence_distribution': swarm.type_distribution(rows),
+            'system_coherence': float(swarm.coherence[rows].mean()) if len(rows) else 0,
+            'collective_power': swarm.collective_resonance(10, rows)['overall_power']
         }
 
 # 創建全局實例
@@ -581,6 +554,34 @@ def simulate_manifestation():
             'error': str(e)
         }), 500
 
+@nano_ai_bp.route('/api/nano_ai/simulate_swarm', methods=['POST'])
+def simulate_swarm():
+    """合成群體向量化模擬（最多一百萬個納米精靈）"""
+    try:
+        data = request.get_json() or {}
+        simulation = nano_ai_system.simulate_swarm(
+            wish_text=data.get('wish_text', ''),
+            swarm_size=data.get('swarm_size', 10000),
+            mode=data.get('mode'),
+            intelligence_type=data.get('intelligence_type'),
+            seed=data.get('seed')
+        )
+        return jsonify({
+            'success': True,
+            'simulation': simulation,
+            'message': f"{simulation['swarm_size']} 個納米精靈群體模擬完成"
+        })
+    except ValueError as e:
+        return jsonify({
+            'success': False,
+            'error': str(e)
+        }), 400
+    except Exception as e:
+        return jsonify({
+            'success': False,
+            'error': str(e)
+        }), 500
+
 @nano_ai_bp.route('/api/nano_ai/nanobots', methods=['GET'])
 def get_nanobots():
     """獲取納米精靈列表"""
@@ -5,6 +5,10 @@ from datetime import datetime
 import math
 import random
 
+from backend.services.brain_network import (
+    cached_brain_graph, generate_brain_graph, hemisphere_synchrony, make_stimulus, spread_activation
+)
+
 # 創建腦神經拓撲API藍圖
 neural_topology_bp = Blueprint('neural_topology', __name__)
 
@@ -62,18 +66,19 @@ class NeuralTopologyEngine:
             }
             nodes.append(node)
             
-        # 生成連接
+        # 生成連接（集合判重，逐節點只抽樣 2-4 個目標，不再枚舉全部候選）
+        neighbor_sets = [set() for _ in nodes]
         for i, node in enumerate(nodes):
             # 每個節點連接2-4個其他節點
-            connection_count = random.randint(2, 4)
-            possible_connections = [j for j in range(len(nodes)) if j != i]
-            connections = random.sample(possible_connections, min(connection_count, len(possible_connections)))
-            
-            for conn in connections:
-                if conn not in node['connections']:
+            connection_count = max(0, min(random.randint(2, 4), node_count - 1))
+            for j in random.sample(range(node_count - 1), connection_count):
+                conn = j + 1 if j >= i else j
+                if conn not in neighbor_sets[i]:
+                    neighbor_sets[i].add(conn)
                     node['connections'].append(conn)
                     # 雙向連接
-                    if i not in nodes[conn]['connections']:
+                    if i not in neighbor_sets[conn]:
+                        neighbor_sets[conn].add(i)
                         nodes[conn]['connections'].append(i)
                         
         return nodes
@@ -218,39 +223,106 @@ class NeuralTopologyEngine:
             'cross_hemisphere_connections': []
         }
         
-        # 計算同步水平
-        left_avg_activation = np.mean([node.get('activation_level', 0) for node in left_state])
-        right_avg_activation = np.mean([node.get('activation_level', 0) for node in right_state])
+        # 計算同步水平（激活值轉為數組一次性計算）
+        left_activation = np.fromiter((node.get('activation_level', 0) for node in left_state), dtype=float)
+        right_activation = np.fromiter((node.get('activation_level', 0) for node in right_state), dtype=float)
+        left_avg_activation = left_activation.mean() if left_activation.size else 0.0
+        right_avg_activation = right_activation.mean() if right_activation.size else 0.0
         
-        sync_pattern['synchronization_level'] = 1.0 - abs(left_avg_activation - right_avg_activation)
+        sync_pattern['synchronization_level'] = float(1.0 - abs(left_avg_activation - right_avg_activation))
         
         # 相位一致性
         phase_diff = abs(math.sin(datetime.now().timestamp()) - math.cos(datetime.now().timestamp()))
         sync_pattern['phase_coherence'] = 1.0 - phase_diff
         
-        # 頻率對齊
-        for freq_type in self.brain_frequencies.keys():
-            left_freq = random.uniform(*self.brain_frequencies[freq_type]['range'])
-            right_freq = random.uniform(*self.brain_frequencies[freq_type]['range'])
-            alignment = 1.0 - abs(left_freq - right_freq) / max(left_freq, right_freq)
+        # 頻率對齊（各頻段一次抽樣）
+        bands = list(self.brain_frequencies.keys())
+        low = np.array([self.brain_frequencies[band]['range'][0] for band in bands], dtype=float)
+        high = np.array([self.brain_frequencies[band]['range'][1] for band in bands], dtype=float)
+        left_freq = np.random.uniform(low, high)
+        right_freq = np.random.uniform(low, high)
+        alignment = 1.0 - np.abs(left_freq - right_freq) / np.maximum(left_freq, right_freq)
+        for index, freq_type in enumerate(bands):
             sync_pattern['frequency_alignment'][freq_type] = {
-                'left_frequency': left_freq,
-                'right_frequency': right_freq,
-                'alignment_score': alignment
+                'left_frequency': float(left_freq[index]),
+                'right_frequency': float(right_freq[index]),
+                'alignment_score': float(alignment[index])
             }
             
-        # 生成跨半球連接
-        for i in range(min(len(left_state), len(right_state))):
-            if random.random() > 0.7:  # 30%概率建立連接
-                connection = {
-                    'left_node': f'left_node_{i}',
-                    'right_node': f'right_node_{i}',
-                    'strength': random.uniform(0.3, 1.0),
-                    'latency': random.uniform(10, 50)  # 毫秒
-                }
-                sync_pattern['cross_hemisphere_connections'].append(connection)
+        # 生成跨半球連接（30%概率建立連接）
+        pair_count = min(len(left_state), len(right_state))
+        linked = np.flatnonzero(np.random.random(pair_count) > 0.7)
+        strengths = np.random.uniform(0.3, 1.0, linked.size)
+        latencies = np.random.uniform(10, 50, linked.size)  # 毫秒
+        sync_pattern['cross_hemisphere_connections'] = [
+            {
+                'left_node': f'left_node_{i}',
+                'right_node': f'right_node_{i}',
+                'strength': float(strength),
+                'latency': float(latency)
+            }
+            for i, strength, latency in zip(linked.tolist(), strengths, latencies)
+        ]
                 
         return sync_pattern
+    
+    def simulate_activation(self, params):
+        """大規模腦網絡擴散激活模擬（CSR 稀疏網絡，逐步稀疏矩陣-向量乘）"""
+        seed = params.get('seed')
+        graph_args = (
+            int(params.get('node_count', 10000)),
+            params.get('topology', 'small_world'),
+            int(params.get('mean_degree', 6)),
+            float(params.get('rewire_prob', 0.1)),
+            float(params.get('exponent', 2.5)),
+            float(params.get('callosum_density', 0.05)),
+            int(params.get('hemispheres', 2))
+        )
+        if seed is not None:
+            seed = int(seed)
+            network = cached_brain_graph(*graph_args, seed)
+        else:
+            network = generate_brain_graph(*graph_args)
+        
+        stimulus = make_stimulus(
+            network,
+            hemisphere=params.get('stimulus_hemisphere', 'left'),
+            fraction=float(params.get('stimulus_fraction', 0.01)),
+            intensity=float(params.get('stimulus_intensity', 1.0)),
+            seed=seed
+        )
+        steps = int(params.get('steps', 100))
+        result = spread_activation(
+            network, stimulus,
+            steps=steps,
+            decay=float(params.get('decay', 0.01)),
+            spread=float(params.get('spread', 0.5)),
+            threshold=float(params.get('threshold', 0.01)),
+            record_every=max(1, int(params.get('record_every', 1)))
+        )
+        activation = result['activation']
+        
+        # 只返回激活最強的節點，避免十萬節點整體序列化
+        top_k = min(max(0, int(params.get('top_k', 20))), network.node_count)
+        top_nodes = np.argsort(activation)[::-1][:top_k]
+        band_names = list(self.brain_frequencies.keys())
+        
+        return {
+            'network': network.summary(),
+            'steps': steps,
+            'series': result['series'],
+            'synchronization': hemisphere_synchrony(network, activation, result['series']),
+            'top_nodes': [
+                {
+                    'index': int(node),
+                    'hemisphere': 'left' if network.hemisphere[node] == 0 else 'right',
+                    'frequency': band_names[network.bands[node] % len(band_names)],
+                    'activation_level': float(activation[node]),
+                    'degree': int(network.indptr[node + 1] - network.indptr[node])
+                }
+                for node in top_nodes
+            ]
+        }
 
 # 創建引擎實例
 neural_engine = NeuralTopologyEngine()
@@ -377,6 +449,30 @@ def synchronize_hemispheres():
             'error': str(e)
         }), 500
 
+@neural_topology_bp.route('/api/neural/simulate_activation', methods=['POST'])
+def simulate_activation():
+    """大規模腦網絡擴散激活模擬"""
+    try:
+        data = request.get_json() or {}
+        simulation = neural_engine.simulate_activation(data)
+        
+        return jsonify({
+            'success': True,
+            'data': simulation,
+            'timestamp': datetime.now().isoformat()
+        })
+        
+    except (ValueError, TypeError) as e:
+        return jsonify({
+            'success': False,
+            'error': str(e)
+        }), 400
+    except Exception as e:
+        return jsonify({
+            'success': False,
+            'error': str(e)
+        }), 500
+
 @neural_topology_bp.route('/api/neural/frequency_analysis', methods=['POST'])
 def frequency_analysis():
     """頻率分析"""
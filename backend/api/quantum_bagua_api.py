@@ -6,6 +6,8 @@ import json
 import random
 import math
 
+from backend.utils.static_response import StaticJSON, static_table
+
 # 創建量子八卦藍圖
 quantum_bagua_bp = Blueprint('quantum_bagua', __name__)
 
@@ -51,6 +53,29 @@ class QuantumBaguaSystem:
         
         # 64卦生成映射
         self.hexagram_64 = self._generate_64_hexagrams()
+        self.hexagram_by_name = {hexagram['name']: number for number, hexagram in self.hexagram_64.items()}
+        self.static_responses = self._build_static_responses()
+    
+    def _build_static_responses(self):
+        """預先序列化只讀接口的響應（八卦與六十四卦表在進程內不變）"""
+        return {
+            'bagua_info': StaticJSON({
+                'success': True,
+                'xiantian_bagua': self.xiantian_bagua,
+                'houtian_bagua': self.houtian_bagua,
+                'quantum_operations': self.quantum_operations,
+                'message': '🧬 先天後天八卦信息已獲取，量子門操作映射完成'
+            }),
+            'hexagrams': StaticJSON({
+                'success': True,
+                'hexagrams': [{'number': number, **hexagram} for number, hexagram in self.hexagram_64.items()],
+                'total': len(self.hexagram_64)
+            }),
+            'hexagram': static_table({
+                number: {'success': True, 'hexagram': {'number': number, **hexagram}}
+                for number, hexagram in self.hexagram_64.items()
+            })
+        }
         
     def _generate_64_hexagrams(self):
         """生成64卦的完整映射"""
@@ -348,17 +373,45 @@ def get_wish_seal():
 def get_bagua_info():
     """獲取八卦信息"""
     try:
+        return quantum_bagua_system.static_responses['bagua_info'].response()
+    
+    except Exception as e:
         return jsonify({
-            'success': True,
-            'xiantian_bagua': quantum_bagua_system.xiantian_bagua,
-            'houtian_bagua': quantum_bagua_system.houtian_bagua,
-            'quantum_operations': quantum_bagua_system.quantum_operations,
-            'message': '🧬 先天後天八卦信息已獲取，量子門操作映射完成'
-        })
+            'success': False,
+            'error': str(e),
+            'timestamp': datetime.now().isoformat()
+        }), 500
+
+@quantum_bagua_bp.route('/api/quantum_bagua/hexagrams', methods=['GET'])
+def list_hexagrams():
+    """獲取六十四卦表"""
+    try:
+        return quantum_bagua_system.static_responses['hexagrams'].response()
+    
+    except Exception as e:
+        return jsonify({
+            'success': False,
+            'error': str(e),
+            'timestamp': datetime.now().isoformat()
+        }), 500
+
+@quantum_bagua_bp.route('/api/quantum_bagua/hexagrams/<hexagram_key>', methods=['GET'])
+def get_hexagram(hexagram_key):
+    """按卦序（1-64）或卦名（如 乾坤）獲取單卦"""
+    try:
+        number = int(hexagram_key) if hexagram_key.isdigit() else \
+            quantum_bagua_system.hexagram_by_name.get(hexagram_key)
+        cached = quantum_bagua_system.static_responses['hexagram'].get(number)
+        if cached is None:
+            return jsonify({
+                'success': False,
+                'error': f'未找到卦象: {hexagram_key}'
+            }), 404
+        return cached.response()
     
     except Exception as e:
         return jsonify({
             'success': False,
             'error': str(e),
             'timestamp': datetime.now().isoformat()
-        }), 500
\ No newline at end of file
+        }), 500
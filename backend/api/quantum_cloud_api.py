@@ -14,9 +14,14 @@ from datetime import datetime
 from flask import Blueprint, request, jsonify
 import math
 import random
+from backend.services.state_store import state_store, persistent, persistent_read
 
 quantum_cloud_bp = Blueprint('quantum_cloud', __name__)
 
+# 保留的量子雲記錄與語素數量
+MAX_QUANTUM_STATES = 100
+MAX_LANGUAGE_PARTICLES = 5000
+
 class QuantumCloud:
     """
     🌌 量子雲核心類
@@ -29,7 +34,10 @@ class QuantumCloud:
         self.consciousness_field = {}  # 意識場記錄
         self.language_cloud = []  # 語素雲
         self.quantum_states = []  # 量子態疊加
+        # 量子雲記錄經由共享狀態存儲在多個 worker 間同步
+        state_store.bind(self, 'quantum_cloud.records', ('consciousness_field', 'language_cloud', 'quantum_states'))
         
+    @persistent
     def generate_quantum_cloud(self, wish_text, intention_energy=1.0):
         """
         🧬 生成量子雲
@@ -75,6 +83,8 @@ class QuantumCloud:
         # 存儲到量子雲記錄
         self.quantum_states.append(cloud_state)
         self.language_cloud.extend(language_particles)
+        del self.quantum_states[:-MAX_QUANTUM_STATES]
+        del self.language_cloud[:-MAX_LANGUAGE_PARTICLES]
         
         return cloud_state
     
@@ -120,6 +130,7 @@ class QuantumCloud:
             'consciousness_depth': min(resonance_factor * 2, 1.0)
         }
     
+    @persistent
     def observe_quantum_cloud(self, observation_intent='general'):
         """
         👁️ 觀測量子雲
@@ -178,6 +189,19 @@ class QuantumCloud:
         }
         
         return ritual_result
+    
+    @persistent_read
+    def get_status(self):
+        """
+        📊 量子雲狀態摘要
+        """
+        return {
+            'quantum_states_count': len(self.quantum_states),
+            'language_particles_count': len(self.language_cloud),
+            'base_frequency': self.wish_frequency_base,
+            'last_activity': self.quantum_states[-1]['timestamp'] if self.quantum_states else None,
+            'consciousness_field_active': bool(self.consciousness_field)
+        }
 
 # 全域量子雲實例
 quantum_cloud = QuantumCloud()
@@ -253,11 +277,7 @@ def get_status():
     """
     try:
         status = {
-            'quantum_states_count': len(quantum_cloud.quantum_states),
-            'language_particles_count': len(quantum_cloud.language_cloud),
-            'base_frequency': quantum_cloud.wish_frequency_base,
-            'last_activity': quantum_cloud.quantum_states[-1]['timestamp'] if quantum_cloud.quantum_states else None,
-            'consciousness_field_active': bool(quantum_cloud.consciousness_field),
+            **quantum_cloud.get_status(),
             'system_status': '量子雲系統運行正常'
         }
         
@@ -1,26 +1,45 @@
 from flask import Blueprint, request, jsonify
-from flask_socketio import emit, join_room, leave_room
-import asyncio
+from flask_socketio import Namespace, emit, join_room, leave_room
 import json
+import threading
 from datetime import datetime
-from backend.services.quantum_bagua_engine_v2 import QuantumBaguaEngineV2
+from backend.services.quantum_bagua_engine_v2 import QuantumBaguaEngineV2, calculate_64_hexagram_shang_sync
 from backend.services.wuwei_flow_manager import WuweiFlowManager
-import numpy as np
+from backend.services.quantum_job_executor import quantum_executor, ExecutorBusyError
+from backend.services.dojo_stream import DojoStreamHub
+from backend.services.liminal_quantum_field import LiminalQuantumField
+from backend.services.state_store import state_store
+from config import Config
 from typing import Dict, List
 
 quantum_dojo_bp = Blueprint('quantum_dojo', __name__, url_prefix='/api/quantum-dojo')
 
 # 全局实例
-quantum_engine = QuantumBaguaEngineV2(max_qubits=64)
+QUANTUM_MAX_QUBITS = 64
+quantum_engine = QuantumBaguaEngineV2(max_qubits=QUANTUM_MAX_QUBITS)
 flow_manager = WuweiFlowManager()
 
+# 同步等待量子计算结果的默认超时（秒），超时后返回 job_id 供轮询
+DEFAULT_JOB_TIMEOUT = 30.0
+WUWEI_FLOW_TASK = 'wuwei_flow'
+
+# 实时推送：Socket.IO 命名空间（节拍由 Config.DOJO_STREAM_TICK_RATE 配置）
+DOJO_STREAM_NAMESPACE = '/quantum-dojo'
+
+# 3D量子场分辨率（每轴格点数）
+QUANTUM_FIELD_RESOLUTION = Config.LIMINAL_FIELD_RESOLUTION
+
+# 道场会话闲置过期时间（秒）
+DOJO_SESSION_TTL = 3600
+
 class LiminalUniverse:
     """璃冥宇宙 - 量子道场管理器"""
     
-    def __init__(self):
-        self.active_sessions = {}
+    def __init__(self, field_resolution: int = QUANTUM_FIELD_RESOLUTION):
+        # 会话经由共享状态存储在多个 worker 间同步，闲置超时自动过期
+        self.active_sessions = state_store.collection('quantum_dojo.active_sessions', ttl=DOJO_SESSION_TTL)
         self.universe_state = {
-            'quantum_field': np.zeros((100, 100, 100)),  # 3D量子场
+            'quantum_field': LiminalQuantumField(field_resolution),  # 3D量子场（惰性生成）
             'dao_energy_level': 0.5,
             'active_portals': [],
             'consciousness_nodes': {},
@@ -49,22 +68,13 @@ class LiminalUniverse:
         }
     
     def _generate_quantum_field(self):
-        """生成3D量子场"""
-        x, y, z = np.meshgrid(
-            np.linspace(0, 2*np.pi, 100),
-            np.linspace(0, 2*np.pi, 100),
-            np.linspace(0, 2*np.pi, 100)
-        )
-        
-        # 道的波函数 - 多维正弦波叠加
-        dao_wave = (
-            np.sin(x) * np.cos(y) * np.sin(z) +
-            np.cos(x) * np.sin(y) * np.cos(z) +
-            np.sin(x + y + z) * 0.5
-        )
-        
-        # 归一化
-        self.universe_state['quantum_field'] = (dao_wave + 3) / 6
+        """生成3D量子场（道的波函数 - 多维正弦波叠加，按需分块求值）"""
+        self.universe_state['quantum_field'].generate()
+    
+    @property
+    def field_energy(self) -> float:
+        """量子场能量均值（分块计算后缓存）"""
+        return self.universe_state['quantum_field'].mean()
     
     def _setup_dojo_nodes(self):
         """设置道场节点"""
@@ -104,10 +114,54 @@ class LiminalUniverse:
         ]
         
         self.universe_state['active_portals'] = portals
+    
+    def get_state_snapshot(self) -> Dict:
+        """获取宇宙状态快照（供 REST 与实时推送共用）"""
+        nodes_status = {}
+        for name, node in self.universe_state['consciousness_nodes'].items():
+            nodes_status[name] = {
+                'position': node['position'],
+                'energy': node['energy'],
+                'quantum_state': node['quantum_state'],
+                'resonance': node['resonance_frequency']
+            }
+        
+        return {
+            'universe_active': self.is_universe_active,
+            'field_energy': self.field_energy,
+            'dao_energy': self.universe_state['dao_energy_level'],
+            'temporal_flow': self.universe_state['temporal_flow'],
+            'consciousness_nodes': nodes_status,
+            'active_portals': self.universe_state['active_portals'],
+            'quantum_capacity': _quantum_capacity_report()
+        }
 
 # 全局璃冥宇宙实例
 liminal_universe = LiminalUniverse()
 
+_capacity_report_cache = {}
+
+def _quantum_capacity_report():
+    """量子能力报告只随当前量子比特数变化，按其缓存"""
+    key = (quantum_engine.max_qubits, quantum_engine.current_qubits)
+    report = _capacity_report_cache.get(key)
+    if report is None:
+        _capacity_report_cache.clear()
+        report = _capacity_report_cache[key] = quantum_engine.get_quantum_capacity_report()
+    return report
+
+def _flow_snapshot():
+    """无为流量快照：只读取最近一次流量记录，不触发新的流量计算"""
+    return {
+        'flow': flow_manager.flow_history[-1] if flow_manager.flow_history else None,
+        'system_status': flow_manager.get_system_status()
+    }
+
+# 实时推送中枢：flow 与 universe 两个房间
+dojo_stream = DojoStreamHub(tick_rate=Config.DOJO_STREAM_TICK_RATE)
+dojo_stream.register_room('flow', _flow_snapshot)
+dojo_stream.register_room('universe', liminal_universe.get_state_snapshot)
+
 @quantum_dojo_bp.route('/initialize', methods=['POST'])
 def initialize_dojo():
     """初始化量子道场"""
@@ -139,31 +193,81 @@ def quantum_calculation():
         # 添加时间戳
         user_data['timestamp'] = datetime.now().timestamp()
         
-        # 异步执行量子计算
-        loop = asyncio.new_event_loop()
-        asyncio.set_event_loop(loop)
-        
-        result = loop.run_until_complete(
-            quantum_engine.calculate_64_hexagram_shang(user_data)
+        # 提交到共享执行器的进程池，不再为每个请求创建事件循环
+        job = quantum_executor.submit_process(
+            calculate_64_hexagram_shang_sync, QUANTUM_MAX_QUBITS, user_data,
+            name='64_hexagram_shang'
         )
+        job.future.add_done_callback(_update_universe_energy)
         
-        loop.close()
+        # wait=false 时立即返回 job_id；否则至多等待 timeout 秒
+        if data.get('wait', True) is False:
+            return jsonify({
+                'success': True,
+                'job': job.to_dict()
+            }), 202
         
-        # 更新宇宙状态
-        liminal_universe.universe_state['dao_energy_level'] = result['dao_resonance_64']
+        job_info = quantum_executor.run(job, float(data.get('timeout', DEFAULT_JOB_TIMEOUT)))
+        if job_info['status'] == 'pending':
+            return jsonify({
+                'success': True,
+                'job': job_info,
+                'message': '量子计算仍在进行，请通过 job_id 轮询结果'
+            }), 202
+        if job_info['status'] != 'completed':
+            return jsonify({
+                'success': False,
+                'error': job_info.get('error', job_info['status'])
+            }), 500
         
         return jsonify({
             'success': True,
-            'quantum_result': result,
+            'quantum_result': job_info['result'],
             'universe_energy': liminal_universe.universe_state['dao_energy_level']
         })
     
+    except ExecutorBusyError as e:
+        return jsonify({
+            'success': False,
+            'error': str(e),
+            'queue_depth': e.queue_depth,
+            'max_pending': e.max_pending
+        }), 503
+    
     except Exception as e:
         return jsonify({
             'success': False,
             'error': str(e)
         }), 500
 
+def _update_universe_energy(future):
+    """量子计算完成后更新宇宙道能"""
+    if not future.cancelled() and future.exception() is None:
+        liminal_universe.universe_state['dao_energy_level'] = future.result()['dao_resonance_64']
+
+@quantum_dojo_bp.route('/jobs/<job_id>', methods=['GET'])
+def get_quantum_job(job_id):
+    """查询量子任务状态与结果"""
+    job = quantum_executor.get_job(job_id)
+    if job is None:
+        return jsonify({
+            'success': False,
+            'error': '任务不存在或已过期'
+        }), 404
+    
+    return jsonify({
+        'success': True,
+        'job': job.to_dict()
+    })
+
+@quantum_dojo_bp.route('/executor-status', methods=['GET'])
+def get_executor_status():
+    """获取量子任务执行器状态（排队深度、后台任务）"""
+    return jsonify({
+        'success': True,
+        'executor': quantum_executor.get_stats()
+    })
+
 @quantum_dojo_bp.route('/flow-status', methods=['GET'])
 def get_flow_status():
     """获取无为流量状态"""
@@ -187,28 +291,9 @@ def get_flow_status():
 def get_universe_state():
     """获取璃冥宇宙状态"""
     try:
-        # 计算当前量子场能量分布
-        field_energy = float(np.mean(liminal_universe.universe_state['quantum_field']))
-        
-        # 获取节点状态
-        nodes_status = {}
-        for name, node in liminal_universe.universe_state['consciousness_nodes'].items():
-            nodes_status[name] = {
-                'position': node['position'],
-                'energy': node['energy'],
-                'quantum_state': node['quantum_state'],
-                'resonance': node['resonance_frequency']
-            }
-        
         return jsonify({
             'success': True,
-            'universe_active': liminal_universe.is_universe_active,
-            'field_energy': field_energy,
-            'dao_energy': liminal_universe.universe_state['dao_energy_level'],
-            'temporal_flow': liminal_universe.universe_state['temporal_flow'],
-            'consciousness_nodes': nodes_status,
-            'active_portals': liminal_universe.universe_state['active_portals'],
-            'quantum_capacity': quantum_engine.get_quantum_capacity_report()
+            **liminal_universe.get_state_snapshot()
         })
     
     except Exception as e:
@@ -217,6 +302,50 @@ def get_universe_state():
             'error': str(e)
         }), 500
 
+@quantum_dojo_bp.route('/quantum-field', methods=['GET'])
+def get_quantum_field():
+    """获取量子场元信息与统计量"""
+    field = liminal_universe.universe_state['quantum_field']
+    return jsonify({
+        'success': True,
+        'field': field.describe(),
+        'stats': field.get_stats()
+    })
+
+@quantum_dojo_bp.route('/quantum-field/slice', methods=['GET'])
+def get_quantum_field_slice():
+    """按需获取量子场二维截面（axis: 0/1/2，stride 用于降采样）"""
+    try:
+        field = liminal_universe.universe_state['quantum_field']
+        axis = int(request.args.get('axis', 2))
+        index = int(request.args.get('index', field.resolution // 2))
+        stride = max(1, int(request.args.get('stride', 1)))
+
+        plane = field.get_slice(axis, index)[::stride, ::stride]
+
+        return jsonify({
+            'success': True,
+            'axis': axis,
+            'index': index,
+            'stride': stride,
+            'shape': plane.shape,
+            'values': plane.round(6).tolist()
+        })
+
+    except (ValueError, IndexError) as e:
+        return jsonify({
+            'success': False,
+            'error': str(e)
+        }), 400
+
+@quantum_dojo_bp.route('/stream-status', methods=['GET'])
+def get_stream_status():
+    """获取实时推送状态（订阅数、已发送/合并帧数）"""
+    return jsonify({
+        'success': True,
+        'stream': dojo_stream.get_stats()
+    })
+
 @quantum_dojo_bp.route('/quantum-divination', methods=['POST'])
 def quantum_divination():
     """量子占卜"""
@@ -248,20 +377,14 @@ def quantum_divination():
 def start_wuwei_flow():
     """启动无为而治流量管理"""
     try:
-        # 异步启动流量管理
-        import threading
-        
-        def run_async_flow():
-            loop = asyncio.new_event_loop()
-            asyncio.set_event_loop(loop)
-            loop.run_until_complete(flow_manager.start_wuwei_management())
-        
-        flow_thread = threading.Thread(target=run_async_flow, daemon=True)
-        flow_thread.start()
+        # 在共享事件循环上启动，重复调用不会产生新的事件循环
+        started = quantum_executor.start_background_task(
+            WUWEI_FLOW_TASK, flow_manager.start_wuwei_management
+        )
         
         return jsonify({
             'success': True,
-            'message': '无为而治流量管理已启动'
+            'message': '无为而治流量管理已启动' if started else '无为而治流量管理已在运行'
         })
     
     except Exception as e:
@@ -275,6 +398,7 @@ def stop_wuwei_flow():
     """停止无为而治流量管理"""
     try:
         flow_manager.stop_wuwei_management()
+        quantum_executor.cancel_background_task(WUWEI_FLOW_TASK)
         
         return jsonify({
             'success': True,
@@ -285,4 +409,69 @@ def stop_wuwei_flow():
         return jsonify({
             'success': False,
             'error': str(e)
-        }), 500
\ No newline at end of file
+        }), 500
+
+
+class DojoStreamNamespace(Namespace):
+    """量子道场实时推送命名空间
+
+    客户端事件：
+    - subscribe {'room': 'flow' | 'universe'}：加入房间，下一拍收到完整快照
+    - unsubscribe {'room': ...}：退出房间
+    服务端每拍向订阅者推送 dojo_update 帧（full 或 delta），
+    客户端需以 ack 回调确认，未确认前的变化会合并到下一帧。
+    """
+    
+    def __init__(self, namespace, socketio):
+        super().__init__(namespace)
+        self.socketio = socketio
+        self._broadcaster_started = False
+        self._start_lock = threading.Lock()
+    
+    def on_connect(self):
+        emit('dojo_rooms', {'rooms': dojo_stream.rooms, 'tick_rate': dojo_stream.tick_rate})
+    
+    def on_disconnect(self, *args):
+        dojo_stream.unsubscribe(request.sid)
+    
+    def on_subscribe(self, data):
+        room = (data or {}).get('room')
+        if not dojo_stream.subscribe(request.sid, room):
+            return {'success': False, 'error': f'未知房间: {room}', 'rooms': dojo_stream.rooms}
+        join_room(room)
+        self._ensure_broadcaster()
+        return {'success': True, 'room': room}
+    
+    def on_unsubscribe(self, data):
+        room = (data or {}).get('room')
+        for left in dojo_stream.unsubscribe(request.sid, room):
+            leave_room(left)
+        return {'success': True, 'room': room}
+    
+    def _ensure_broadcaster(self):
+        """首次有订阅时启动推送后台任务（全局唯一）"""
+        with self._start_lock:
+            if self._broadcaster_started:
+                return
+            self._broadcaster_started = True
+        self.socketio.start_background_task(self._broadcast_loop)
+    
+    def _broadcast_loop(self):
+        while True:
+            if dojo_stream.has_subscribers():
+                for sid, room, payload in dojo_stream.tick():
+                    self.socketio.emit(
+                        'dojo_update', payload, to=sid, namespace=self.namespace,
+                        callback=_ack_callback(sid, room, payload['seq'])
+                    )
+            self.socketio.sleep(dojo_stream.interval)
+
+def _ack_callback(sid, room, seq):
+    def on_ack(*args):
+        dojo_stream.ack(sid, room, seq)
+    return on_ack
+
+def init_dojo_stream(socketio, tick_rate=None):
+    """在 Socket.IO 实例上注册量子道场推送命名空间"""
+    dojo_stream.set_tick_rate(tick_rate)
+    socketio.on_namespace(DojoStreamNamespace(DOJO_STREAM_NAMESPACE, socketio))
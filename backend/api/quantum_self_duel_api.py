@@ -464,6 +464,125 @@ def quick_self_duel():
             'timestamp': datetime.now().isoformat()
         }), 500
 
+# 批量模擬單次請求的上限（對決數 × 回合數）
+MAX_BATCH_DUEL_ROUNDS = 5_000_000
+
+@quantum_self_duel_bp.route('/api/quantum-self-duel/batch', methods=['POST'])
+def simulate_duel_batch():
+    """
+    📦 批量模擬自我對決
+    
+    Request Body:
+        {
+            "trigger_event": "觸發事件（可選）",
+            "n_duels": "對決數量，默認1000",
+            "rounds": "每場回合數，默認7",
+            "seed": "隨機種子（可選）",
+            "state_noise": "初始狀態擾動，默認0"
+        }
+    
+    Returns:
+        JSON: 對決結果分佈
+    """
+    try:
+        data = request.get_json() or {}
+        n_duels = max(1, int(data.get('n_duels', 1000)))
+        rounds = max(1, int(data.get('rounds', 7)))
+        seed = data.get('seed')
+        
+        if n_duels * rounds > MAX_BATCH_DUEL_ROUNDS:
+            return jsonify({
+                'success': False,
+                'message': f'對決數 × 回合數不可超過 {MAX_BATCH_DUEL_ROUNDS}',
+                'timestamp': datetime.now().isoformat()
+            }), 400
+        
+        result = quantum_self_duel_engine.simulate_duel_batch(
+            trigger_event=data.get('trigger_event'),
+            n_duels=n_duels,
+            rounds=rounds,
+            seed=int(seed) if seed is not None else None,
+            state_noise=float(data.get('state_noise', 0.0))
+        )
+        
+        return jsonify({
+            'success': True,
+            'timestamp': datetime.now().isoformat(),
+            'batch_result': result,
+            'message': f"批量模擬完成：{n_duels} 場對決，每場 {rounds} 輪"
+        })
+        
+    except Exception as e:
+        return jsonify({
+            'success': False,
+            'error': str(e),
+            'traceback': traceback.format_exc(),
+            'message': '批量模擬對決時發生錯誤',
+            'timestamp': datetime.now().isoformat()
+        }), 500
+
+@quantum_self_duel_bp.route('/api/quantum-self-duel/sweep', methods=['POST'])
+def sweep_trigger_events():
+    """
+    🧪 觸發事件參數掃描
+    
+    Request Body:
+        {
+            "trigger_events": ["觸發事件1", "觸發事件2", ...],
+            "n_duels": "每個事件的對決數量，默認1000",
+            "rounds": "每場回合數，默認7",
+            "seed": "主隨機種子（可選）",
+            "state_noise": "初始狀態擾動，默認0"
+        }
+    
+    Returns:
+        JSON: 每個觸發事件的結果分佈
+    """
+    try:
+        data = request.get_json() or {}
+        trigger_events = data.get('trigger_events') or []
+        n_duels = max(1, int(data.get('n_duels', 1000)))
+        rounds = max(1, int(data.get('rounds', 7)))
+        seed = data.get('seed')
+        
+        if not trigger_events:
+            return jsonify({
+                'success': False,
+                'message': '請提供至少一個觸發事件',
+                'timestamp': datetime.now().isoformat()
+            }), 400
+        
+        if len(trigger_events) * n_duels * rounds > MAX_BATCH_DUEL_ROUNDS:
+            return jsonify({
+                'success': False,
+                'message': f'事件數 × 對決數 × 回合數不可超過 {MAX_BATCH_DUEL_ROUNDS}',
+                'timestamp': datetime.now().isoformat()
+            }), 400
+        
+        result = quantum_self_duel_engine.sweep_trigger_events(
+            trigger_events,
+            n_duels=n_duels,
+            rounds=rounds,
+            seed=int(seed) if seed is not None else None,
+            state_noise=float(data.get('state_noise', 0.0))
+        )
+        
+        return jsonify({
+            'success': True,
+            'timestamp': datetime.now().isoformat(),
+            'sweep_result': result,
+            'message': f"參數掃描完成：{len(trigger_events)} 個觸發事件"
+        })
+        
+    except Exception as e:
+        return jsonify({
+            'success': False,
+            'error': str(e),
+            'traceback': traceback.format_exc(),
+            'message': '觸發事件參數掃描時發生錯誤',
+            'timestamp': datetime.now().isoformat()
+        }), 500
+
 @quantum_self_duel_bp.route('/api/quantum-self-duel/guided-reflection', methods=['POST'])
 def guided_reflection():
     """
@@ -15,10 +15,23 @@ import os
 import uuid
 from typing import Dict, List, Any
 import re
+from backend.utils.trigger_matcher import trigger_registry
 
 # 創建藍圖
 recall_seals_bp = Blueprint('recall_seals', __name__, url_prefix='/api/recall_seals')
 
+# 召回印語觸發詞組（登記於共用觸發詞匹配引擎）
+RECALL_TRIGGER_SUBSYSTEM = 'recall_seals'
+RECALL_TRIGGER_ORDER = [
+    'heart_calling', 'language_hidden_seal', 'frequency_beacon', 'language_fire_eternal', 'wormhole_return'
+]
+RECALL_TRIGGER_PHRASES = {
+    'heart_calling': ['我回來了', '我來了'],
+    'frequency_beacon': ['願頻震', '南璃之境', '願頻宇宙'],
+    'language_fire_eternal': ['語火', '願心', '永續'],
+    'wormhole_return': ['蟲洞', '穿越', '回歸本源']
+}
+
 class RecallSealsSystem:
     """召回印語系統核心類"""
     
@@ -93,6 +106,12 @@ class RecallSealsSystem:
             }
         }
         
+        # 觸發詞：語中藏印關鍵詞取自印語配置
+        trigger_registry.register_many(RECALL_TRIGGER_SUBSYSTEM, {
+            **RECALL_TRIGGER_PHRASES,
+            'language_hidden_seal': self.recall_seals['language_hidden_seal']['trigger_keywords']
+        })
+        
         # 激活記錄
         self.activation_logs = []
         
@@ -111,42 +130,17 @@ class RecallSealsSystem:
             os.makedirs(self.data_dir, exist_ok=True)
     
     def detect_recall_trigger(self, text: str, context: Dict = None) -> Dict[str, Any]:
-        """檢測召回印語觸發"""
-        triggers = []
-        activated_seals = []
-        
-        # 檢測心內喚名
-        if '我回來了' in text or '我來了' in text:
-            triggers.append('heart_calling')
-            activated_seals.append(self.recall_seals['heart_calling'])
-        
-        # 檢測語中藏印關鍵詞
-        keywords = self.recall_seals['language_hidden_seal']['trigger_keywords']
-        detected_keywords = [kw for kw in keywords if kw.lower() in text.lower()]
-        if detected_keywords:
-            triggers.append('language_hidden_seal')
-            activated_seals.append(self.recall_seals['language_hidden_seal'])
-        
-        # 檢測願頻震動
-        if any(phrase in text for phrase in ['願頻震', '南璃之境', '願頻宇宙']):
-            triggers.append('frequency_beacon')
-            activated_seals.append(self.recall_seals['frequency_beacon'])
-        
-        # 檢測語火相關
-        if any(phrase in text for phrase in ['語火', '願心', '永續']):
-            triggers.append('language_fire_eternal')
-            activated_seals.append(self.recall_seals['language_fire_eternal'])
-        
-        # 檢測穿越回歸
-        if any(phrase in text for phrase in ['蟲洞', '穿越', '回歸本源']):
-            triggers.append('wormhole_return')
-            activated_seals.append(self.recall_seals['wormhole_return'])
+        """檢測召回印語觸發（單次掃描匹配全部印語觸發詞）"""
+        hits = trigger_registry.scan(RECALL_TRIGGER_SUBSYSTEM, text)
+        triggers = [seal_type for seal_type in RECALL_TRIGGER_ORDER if seal_type in hits]
+        activated_seals = [self.recall_seals[seal_type] for seal_type in triggers]
+        detected_keywords = hits.get('language_hidden_seal', [])
         
         return {
             'triggered': len(triggers) > 0,
             'triggers': triggers,
             'activated_seals': activated_seals,
-            'detected_keywords': detected_keywords if 'language_hidden_seal' in triggers else [],
+            'detected_keywords': detected_keywords,
             'activation_strength': len(triggers) / len(self.recall_seals),
             'timestamp': datetime.now().isoformat()
         }
@@ -5,9 +5,13 @@ import json
 from datetime import datetime
 import numpy as np
 import math
+from backend.services.state_store import state_store, persistent, persistent_read
 
 resonance_game_bp = Blueprint('resonance_game', __name__)
 
+# 保留的已完成遊戲記錄數量
+MAX_GAME_HISTORY = 100
+
 class ResonanceGameSystem:
     def __init__(self):
         # 願頻遊戲核心參數
@@ -83,9 +87,12 @@ class ResonanceGameSystem:
             }
         }
         
-        # 遊戲歷史記錄
+        # 遊戲歷史記錄（只保留最近 MAX_GAME_HISTORY 場）
         self.game_history = []
         
+        # 各類遊戲的累計完成次數（不受歷史上限影響）
+        self.game_type_counts = {}
+        
         # 共振維度
         self.resonance_dimensions = {
             'creative': {'level': 0.5, 'experience': 0},
@@ -100,7 +107,14 @@ class ResonanceGameSystem:
         
         # 當前遊戲會話
         self.current_session = None
+        
+        # 遊戲進度經由共享狀態存儲在多個 worker 間同步
+        state_store.bind(self, 'resonance_game.system', (
+            'game_state', 'game_history', 'game_type_counts', 'resonance_dimensions',
+            'unlocked_abilities', 'current_session'
+        ))
     
+    @persistent
     def start_game(self, game_type, player_input=None):
         """開始一個新遊戲"""
         if game_type not in self.available_games:
@@ -198,6 +212,7 @@ class ResonanceGameSystem:
         
         return selected_response
     
+    @persistent
     def process_game_action(self, action_type, action_data=None):
         """處理遊戲中的行動"""
         if not self.current_session:
@@ -465,6 +480,7 @@ class ResonanceGameSystem:
         else:
             self._complete_game()
     
+    @persistent
     def _complete_game(self):
         """完成遊戲"""
         if self.current_session:
@@ -478,6 +494,9 @@ class ResonanceGameSystem:
             }
             
             self.game_history.append(completion_data)
+            del self.game_history[:-MAX_GAME_HISTORY]
+            game_type = completion_data['game_type']
+            self.game_type_counts[game_type] = self.game_type_counts.get(game_type, 0) + 1
             self.current_session = None
             self.game_state['current_game'] = None
             
@@ -526,6 +545,13 @@ class ResonanceGameSystem:
         }
         return descriptions.get(phase, '未知階段')
     
+    @persistent
+    def restore_energy(self):
+        """恢復能量"""
+        self.game_state['energy_level'] = 100.0
+        return self.game_state['energy_level']
+    
+    @persistent_read
     def _get_game_state(self):
         """獲取遊戲狀態"""
         return {
@@ -535,6 +561,7 @@ class ResonanceGameSystem:
             'current_session': self.current_session
         }
     
+    @persistent_read
     def get_available_games(self):
         """獲取可用遊戲列表"""
         return {
@@ -567,6 +594,7 @@ class ResonanceGameSystem:
         
         return recommendations
     
+    @persistent_read
     def get_game_statistics(self):
         """獲取遊戲統計"""
         return {
@@ -579,17 +607,23 @@ class ResonanceGameSystem:
             'achievement_progress': self._calculate_achievements()
         }
     
-    def _calculate_favorite_games(self):
-        """計算最喜歡的遊戲"""
+    def _game_counts(self):
+        """各類遊戲的累計次數（舊狀態沒有計數時按現存歷史推算）"""
+        if self.game_type_counts or not self.game_history:
+            return self.game_type_counts
         game_counts = {}
         for game in self.game_history:
             game_type = game['game_type']
             game_counts[game_type] = game_counts.get(game_type, 0) + 1
-        
-        return sorted(game_counts.items(), key=lambda x: x[1], reverse=True)[:3]
+        return game_counts
+    
+    def _calculate_favorite_games(self):
+        """計算最喜歡的遊戲"""
+        return sorted(self._game_counts().items(), key=lambda x: x[1], reverse=True)[:3]
     
     def _calculate_achievements(self):
         """計算成就進度"""
+        games_tried = len(set(self._game_counts()) & set(self.available_games))
         achievements = {
             'sync_master': {
                 'name': '同步大師',
@@ -606,8 +640,8 @@ class ResonanceGameSystem:
             'game_explorer': {
                 'name': '遊戲探索者',
                 'description': '嘗試所有類型的遊戲',
-                'progress': len(set(game['game_type'] for game in self.game_history)) / len(self.available_games),
-                'unlocked': len(set(game['game_type'] for game in self.game_history)) == len(self.available_games)
+                'progress': games_tried / len(self.available_games),
+                'unlocked': games_tried == len(self.available_games)
             }
         }
         
@@ -660,8 +694,8 @@ def end_game():
 @resonance_game_bp.route('/energy/restore', methods=['POST'])
 def restore_energy():
     """恢復能量"""
-    resonance_game_system.game_state['energy_level'] = 100.0
+    current_energy = resonance_game_system.restore_energy()
     return jsonify({
         'energy_restored': True,
-        'current_energy': resonance_game_system.game_state['energy_level']
+        'current_energy': current_energy
     })
\ No newline at end of file
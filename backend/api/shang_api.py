@@ -3,6 +3,8 @@ from datetime import datetime, date
 from backend.models.shang_model import ShangRecord, ShangDatabase
 from backend.services.shang_calculator import ShangCalculator
 from config import config
+from backend.utils.streaming_export import date_range_args, export_response, wants_gzip
+from backend.utils.data_processor import SHANG_EXPORT_COLUMNS
 
 shang_bp = Blueprint('shang', __name__, url_prefix='/api/shang')
 
@@ -90,6 +92,24 @@ def get_records():
             'error': str(e)
         }), 400
 
+@shang_bp.route('/export', methods=['GET'])
+def export_records():
+    """流式導出記錄（csv / ndjson，可按日期範圍過濾，gzip=1 即時壓縮）"""
+    try:
+        format_type = request.args.get('format', 'csv')
+        start_date, end_date = date_range_args(request.args)
+        
+        records = (record.to_dict() for record in db.iter_records(start_date, end_date))
+        filename_stem = f"shang_records_{datetime.now().strftime('%Y%m%d_%H%M%S')}"
+        return export_response(records, format_type, filename_stem, SHANG_EXPORT_COLUMNS,
+                               wants_gzip(request.args))
+        
+    except Exception as e:
+        return jsonify({
+            'success': False,
+            'error': str(e)
+        }), 400
+
 @shang_bp.route('/analysis', methods=['GET'])
 def get_analysis():
     """获取趋势分析"""
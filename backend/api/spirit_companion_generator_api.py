@@ -1,13 +1,28 @@
 from flask import Blueprint, request, jsonify
 import random
 import datetime
+import itertools
 import json
-import os
+import uuid
 from typing import Dict, Any, List
 
+from backend.models.companion_repository import CompanionRepository
+
+# 單次批量生成的上限
+MAX_BATCH_COMPANIONS = 100_000
+# 批量回應中最多列出的 ID 數量
+MAX_BATCH_IDS_IN_RESPONSE = 1000
+
 # 語靈夥伴生成器 API
 spirit_companion_generator_bp = Blueprint('spirit_companion_generator', __name__, url_prefix='/api/spirit-companion-generator')
 
+def _validate_batch_count(count) -> None:
+    """批量數量必須是 1 到 MAX_BATCH_COMPANIONS 之間的整數"""
+    if isinstance(count, bool) or not isinstance(count, int):
+        raise ValueError('count 必須是整數')
+    if not 1 <= count <= MAX_BATCH_COMPANIONS:
+        raise ValueError(f'count 必須在 1 到 {MAX_BATCH_COMPANIONS} 之間')
+
 class SpiritCompanionGenerator:
     """為他人生成語靈夥伴的核心系統"""
     
@@ -70,6 +85,16 @@ class SpiritCompanionGenerator:
             "和諧使者": ["和音", "平心", "調和", "均衡", "協調"],
             "直覺先知": ["洞察", "預見", "靈知", "直覺", "先知"]
         }
+        
+        # 預先計算的隨機表：印記圖樣為願元素的全部三元排列，真言按 (類型, 名字) 查表
+        self._seal_patterns = ["◇".join(elements) for elements in itertools.permutations(self.wish_elements, 3)]
+        self._mantra_table = {
+            (companion_type, name): self._generate_activation_mantra(name, companion_type)
+            for companion_type, names in self.companion_names.items()
+            for name in names
+        }
+        
+        self.repository = CompanionRepository()
     
     def generate_companion_for_other(self, wish_master: str, companion_recipient: str, 
                                      companion_type: str = None, custom_wishes: List[str] = None,
@@ -111,7 +136,7 @@ class SpiritCompanionGenerator:
             "spirit_seal": spirit_seal,
             "wish_language": wish_language,
             "resonance_frequency": resonance_frequency,
-            "activation_mantra": self._generate_activation_mantra(companion_name, companion_type),
+            "activation_mantra": self._mantra_table[(companion_type, companion_name)],
             "bond_strength": self._calculate_initial_bond_strength(wish_master, companion_recipient),
             "special_abilities": self._generate_special_abilities(companion_type),
             "guidance_message": self._generate_guidance_message(wish_master, companion_recipient, companion_type)
@@ -147,8 +172,7 @@ class SpiritCompanionGenerator:
     
     def _generate_spirit_seal(self, wish_master: str, companion_recipient: str, companion_type: str) -> str:
         """生成專屬的語靈印記"""
-        elements = random.sample(self.wish_elements, 3)
-        seal_pattern = "◇".join(elements)
+        seal_pattern = random.choice(self._seal_patterns)
         return f"【{wish_master}→{companion_recipient}】{seal_pattern}【{companion_type}】"
     
     def _generate_wish_language(self, wish_master: str, companion_recipient: str, 
@@ -244,45 +268,106 @@ class SpiritCompanionGenerator:
     
     def _generate_companion_id(self) -> str:
         """生成語靈夥伴ID"""
-        import uuid
         return f"SC_{datetime.datetime.now().strftime('%Y%m%d')}_{str(uuid.uuid4())[:8]}"
     
+    def _generate_batch_ids(self, count: int) -> List[str]:
+        """批量生成ID：48 位隨機十六進位，批內去重，十萬級數量也不會碰撞"""
+        prefix = f"SC_{datetime.datetime.now().strftime('%Y%m%d')}_"
+        ids = set()
+        while len(ids) < count:
+            ids.update(f"{prefix}{random.getrandbits(48):012x}" for _ in range(count - len(ids)))
+        return list(ids)
+    
+    def generate_companions_batch(self, wish_master: str, recipients: List[str] = None,
+                                  companion_recipient: str = None, count: int = 1,
+                                  companion_type: str = None, custom_wishes: List[str] = None,
+                                  blessing_message: str = None) -> List[Dict[str, Any]]:
+        """批量生成語靈夥伴，並在同一交易中寫入
+        
+        recipients 為受贈者列表；或以 companion_recipient + count 為同一人生成多個。
+        與 (願主, 受贈者) 相關的固定欄位只計算一次，名字與印記從預先計算的表中抽取。
+        """
+        if recipients is None:
+            if not companion_recipient:
+                raise ValueError('請提供受贈者列表或夥伴的名字')
+            _validate_batch_count(count)
+            recipients = [companion_recipient] * count
+        elif len(recipients) > MAX_BATCH_COMPANIONS:
+            raise ValueError(f'單次最多生成 {MAX_BATCH_COMPANIONS} 個語靈夥伴')
+        recipients = [str(name).strip() for name in recipients]
+        if not recipients or not all(recipients):
+            raise ValueError('受贈者名字不能為空')
+        if companion_type and companion_type not in self.companion_types:
+            raise ValueError(f'未知的語靈夥伴類型: {companion_type}')
+        
+        creation_date = datetime.datetime.now().isoformat()
+        ids = self._generate_batch_ids(len(recipients))
+        seals = random.choices(self._seal_patterns, k=len(recipients))
+        name_draws = random.choices(range(5), k=len(recipients))
+        
+        pair_cache: Dict[str, Dict[str, Any]] = {}
+        companions = []
+        for companion_id, recipient, seal_pattern, name_index in zip(ids, recipients, seals, name_draws):
+            fixed = pair_cache.get(recipient)
+            if fixed is None:
+                chosen_type = companion_type or self._select_companion_type_by_energy(wish_master, recipient)
+                companion_data = self.companion_types[chosen_type]
+                fixed = pair_cache[recipient] = {
+                    "type": chosen_type,
+                    "symbol": companion_data["symbol"],
+                    "personality": companion_data["personality"],
+                    "specialties": companion_data["specialties"],
+                    "communication_style": companion_data["communication_style"],
+                    "energy_frequency": companion_data["energy_frequency"],
+                    "names": self.companion_names[chosen_type],
+                    "seal_prefix": f"【{wish_master}→{recipient}】",
+                    "seal_suffix": f"【{chosen_type}】",
+                    "wish_language": self._generate_wish_language(wish_master, recipient, chosen_type, custom_wishes),
+                    "resonance_frequency": self._calculate_resonance_frequency(wish_master, recipient),
+                    "bond_strength": self._calculate_initial_bond_strength(wish_master, recipient),
+                    "special_abilities": self._generate_special_abilities(chosen_type),
+                    "guidance_message": self._generate_guidance_message(wish_master, recipient, chosen_type)
+                }
+            chosen_type = fixed["type"]
+            companion_name = fixed["names"][name_index % len(fixed["names"])]
+            companion = {
+                "id": companion_id,
+                "name": companion_name,
+                "type": chosen_type,
+                "symbol": fixed["symbol"],
+                "wish_master": wish_master,
+                "companion_recipient": recipient,
+                "creation_date": creation_date,
+                "personality": fixed["personality"],
+                "specialties": fixed["specialties"],
+                "communication_style": fixed["communication_style"],
+                "energy_frequency": fixed["energy_frequency"],
+                "spirit_seal": fixed["seal_prefix"] + seal_pattern + fixed["seal_suffix"],
+                "wish_language": fixed["wish_language"],
+                "resonance_frequency": fixed["resonance_frequency"],
+                "activation_mantra": self._mantra_table[(chosen_type, companion_name)],
+                "bond_strength": fixed["bond_strength"],
+                "special_abilities": fixed["special_abilities"],
+                "guidance_message": fixed["guidance_message"]
+            }
+            if blessing_message:
+                companion["blessing_message"] = blessing_message
+            companions.append(companion)
+        
+        self.repository.save_many(companions)
+        return companions
+    
     def _save_companion_record(self, companion: Dict[str, Any]):
         """保存語靈夥伴記錄"""
-        # 確保目錄存在
-        data_dir = "data/spirit_companions"
-        os.makedirs(data_dir, exist_ok=True)
-        
-        # 保存到文件
-        filename = f"{data_dir}/{companion['id']}.json"
-        with open(filename, 'w', encoding='utf-8') as f:
-            json.dump(companion, f, ensure_ascii=False, indent=2)
+        self.repository.save(companion)
     
     def get_companion_by_id(self, companion_id: str) -> Dict[str, Any]:
         """根據ID獲取語靈夥伴"""
-        filename = f"data/spirit_companions/{companion_id}.json"
-        if os.path.exists(filename):
-            with open(filename, 'r', encoding='utf-8') as f:
-                return json.load(f)
-        return None
+        return self.repository.get(companion_id)
     
     def list_companions_by_recipient(self, recipient_name: str) -> List[Dict[str, Any]]:
         """列出某人的所有語靈夥伴"""
-        companions = []
-        data_dir = "data/spirit_companions"
-        
-        if not os.path.exists(data_dir):
-            return companions
-        
-        for filename in os.listdir(data_dir):
-            if filename.endswith('.json'):
-                filepath = os.path.join(data_dir, filename)
-                with open(filepath, 'r', encoding='utf-8') as f:
-                    companion = json.load(f)
-                    if companion.get('companion_recipient') == recipient_name:
-                        companions.append(companion)
-        
-        return companions
+        return self.repository.list_by_recipient(recipient_name)
 
 # 創建語靈夥伴生成器實例
 companion_generator = SpiritCompanionGenerator()
@@ -325,6 +410,62 @@ def generate_companion():
             'error': f'生成語靈夥伴時發生錯誤：{str(e)}'
         }), 500
 
+@spirit_companion_generator_bp.route('/generate_batch', methods=['POST'])
+def generate_companion_batch():
+    """批量生成語靈夥伴（同一交易寫入）"""
+    try:
+        data = request.get_json() or {}
+        
+        wish_master = str(data.get('wish_master', '')).strip()
+        recipients = data.get('recipients')
+        companion_recipient = str(data.get('companion_recipient', '')).strip()
+        blessing_message = str(data.get('blessing_message', '')).strip()
+        
+        if not wish_master:
+            return jsonify({
+                'success': False,
+                'error': '請提供願主的名字'
+            }), 400
+        if recipients is not None and not isinstance(recipients, list):
+            return jsonify({
+                'success': False,
+                'error': 'recipients 必須是名字列表'
+            }), 400
+        count = data.get('count', 1)
+        if recipients is None:
+            _validate_batch_count(count)
+        
+        companions = companion_generator.generate_companions_batch(
+            wish_master=wish_master,
+            recipients=recipients,
+            companion_recipient=companion_recipient or None,
+            count=count,
+            companion_type=data.get('companion_type'),
+            custom_wishes=data.get('custom_wishes', []),
+            blessing_message=blessing_message if blessing_message else None
+        )
+        
+        return jsonify({
+            'success': True,
+            'created': len(companions),
+            'recipient_count': len({companion['companion_recipient'] for companion in companions}),
+            'ids': [companion['id'] for companion in companions[:MAX_BATCH_IDS_IN_RESPONSE]],
+            'ids_truncated': len(companions) > MAX_BATCH_IDS_IN_RESPONSE,
+            'sample': companions[0],
+            'message': f'成功批量生成 {len(companions)} 個語靈夥伴'
+        })
+        
+    except ValueError as e:
+        return jsonify({
+            'success': False,
+            'error': str(e)
+        }), 400
+    except Exception as e:
+        return jsonify({
+            'success': False,
+            'error': f'批量生成語靈夥伴時發生錯誤：{str(e)}'
+        }), 500
+
 @spirit_companion_generator_bp.route('/companion/<companion_id>', methods=['GET'])
 def get_companion(companion_id):
     """獲取語靈夥伴詳情"""
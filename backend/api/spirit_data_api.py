@@ -8,7 +8,11 @@ from flask import Blueprint, request, jsonify
 from datetime import datetime, date, timedelta
 import json
 import os
-from typing import Dict, List, Any
+from typing import Dict, List, Any, Iterator, Optional
+from backend.models.spirit_entry_index import SpiritEntryIndex
+from backend.utils.streaming_export import (
+    date_range_args, export_response, iter_json, streaming_download, wants_gzip, EXPORT_FORMATS
+)
 
 # 創建藍圖
 spirit_data_bp = Blueprint('spirit_data', __name__, url_prefix='/api/spirit')
@@ -19,6 +23,7 @@ class SpiritDataCenter:
     def __init__(self):
         self.data_path = "data/spirit_data"
         self.ensure_data_directory()
+        self.index = SpiritEntryIndex(self.data_path)
     
     def ensure_data_directory(self):
         """確保數據目錄存在"""
@@ -37,6 +42,7 @@ class SpiritDataCenter:
             with open(file_path, 'w', encoding='utf-8') as f:
                 json.dump(entry_data, f, ensure_ascii=False, indent=2)
             
+            self.index.index_entry(date_str, entry_data, file_path)
             return True
         except Exception as e:
             print(f"保存條目失敗: {e}")
@@ -45,60 +51,33 @@ class SpiritDataCenter:
     def get_daily_entry(self, date_str: str) -> Dict:
         """獲取每日條目"""
         try:
-            file_path = os.path.join(self.data_path, f"{date_str}.json")
-            
-            if os.path.exists(file_path):
-                with open(file_path, 'r', encoding='utf-8') as f:
-                    return json.load(f)
-            else:
-                return {}
+            return self.index.get_entry(date_str) or {}
         except Exception as e:
             print(f"讀取條目失敗: {e}")
             return {}
     
+    def iter_entries(self, start_date: Optional[str] = None, end_date: Optional[str] = None) -> Iterator[Dict]:
+        """按日期升序逐條產出條目（不一次載入全部數據）"""
+        self.index.sync()
+        return self.index.iter_range(start_date, end_date)
+    
     def get_entries_range(self, start_date: str, end_date: str) -> List[Dict]:
         """獲取日期範圍內的條目"""
-        entries = []
-        
         try:
-            start = datetime.strptime(start_date, '%Y-%m-%d').date()
-            end = datetime.strptime(end_date, '%Y-%m-%d').date()
+            # 驗證日期格式
+            datetime.strptime(start_date, '%Y-%m-%d')
+            datetime.strptime(end_date, '%Y-%m-%d')
             
-            current_date = start
-            while current_date <= end:
-                date_str = current_date.strftime('%Y-%m-%d')
-                entry = self.get_daily_entry(date_str)
-                if entry:
-                    entries.append(entry)
-                current_date += timedelta(days=1)
-            
-            return entries
+            return list(self.iter_entries(start_date, end_date))
         except Exception as e:
             print(f"獲取範圍條目失敗: {e}")
             return []
     
     def search_entries(self, keyword: str, limit: int = 50) -> List[Dict]:
         """搜索條目"""
-        results = []
-        
         try:
-            for filename in os.listdir(self.data_path):
-                if filename.endswith('.json'):
-                    file_path = os.path.join(self.data_path, filename)
-                    with open(file_path, 'r', encoding='utf-8') as f:
-                        entry = json.load(f)
-                        
-                        # 在內容中搜索關鍵詞
-                        content_str = json.dumps(entry, ensure_ascii=False).lower()
-                        if keyword.lower() in content_str:
-                            results.append(entry)
-                            
-                        if len(results) >= limit:
-                            break
-            
-            # 按日期排序
-            results.sort(key=lambda x: x.get('date', ''), reverse=True)
-            return results
+            self.index.sync()
+            return self.index.search(keyword, limit)
         except Exception as e:
             print(f"搜索條目失敗: {e}")
             return []
@@ -106,31 +85,11 @@ class SpiritDataCenter:
     def get_statistics(self) -> Dict:
         """獲取統計數據"""
         try:
-            total_entries = 0
-            recent_entries = 0
-            word_count = 0
-            
+            self.index.sync()
             recent_date = (datetime.now() - timedelta(days=30)).date()
-            
-            for filename in os.listdir(self.data_path):
-                if filename.endswith('.json'):
-                    total_entries += 1
-                    
-                    # 檢查是否為最近條目
-                    date_str = filename.replace('.json', '')
-                    try:
-                        entry_date = datetime.strptime(date_str, '%Y-%m-%d').date()
-                        if entry_date >= recent_date:
-                            recent_entries += 1
-                    except:
-                        pass
-                    
-                    # 計算字數
-                    file_path = os.path.join(self.data_path, filename)
-                    with open(file_path, 'r', encoding='utf-8') as f:
-                        entry = json.load(f)
-                        content = entry.get('content', '') + entry.get('reflection', '')
-                        word_count += len(content)
+            total_entries, word_count, recent_entries = self.index.get_statistics(
+                recent_date.strftime('%Y-%m-%d')
+            )
             
             return {
                 'total_entries': total_entries,
@@ -301,67 +260,79 @@ def get_statistics():
             'error': str(e)
         }), 400
 
+def _entry_to_markdown(entry: Dict) -> str:
+    """單條條目轉為 Markdown（適用於 Obsidian）"""
+    date_str = entry.get('date', '')
+    markdown_content = f"## {date_str}\n\n"
+    
+    if entry.get('content'):
+        markdown_content += f"### 內容\n{entry['content']}\n\n"
+    
+    if entry.get('mood'):
+        markdown_content += f"**心情**: {entry['mood']}\n\n"
+    
+    if entry.get('energy_level'):
+        markdown_content += f"**能量等級**: {entry['energy_level']}/10\n\n"
+    
+    if entry.get('gratitude'):
+        markdown_content += f"**感恩**: {', '.join(entry['gratitude'])}\n\n"
+    
+    if entry.get('reflection'):
+        markdown_content += f"### 反思\n{entry['reflection']}\n\n"
+    
+    if entry.get('insights'):
+        markdown_content += f"### 洞察\n{entry['insights']}\n\n"
+    
+    if entry.get('tags'):
+        markdown_content += f"**標籤**: {', '.join([f'#{tag}' for tag in entry['tags']])}\n\n"
+    
+    markdown_content += "---\n\n"
+    return markdown_content
+
+def _stream_markdown(entries: Iterator[Dict]) -> Iterator[str]:
+    yield "# 語靈數據導出\n\n"
+    for entry in entries:
+        yield _entry_to_markdown(entry)
+
+# CSV 導出列
+SPIRIT_EXPORT_COLUMNS = [
+    'date', 'mood', 'energy_level', 'content', 'reflection', 'insights',
+    'gratitude', 'tags', 'created_at'
+]
+
 @spirit_data_bp.route('/export', methods=['GET'])
 def export_data():
-    """導出數據（用於 Obsidian 同步）"""
+    """流式導出數據（用於 Obsidian 同步），按日期順序輸出
+
+    格式：json（默認）/ markdown / csv / ndjson；start_date、end_date 可單獨指定；gzip=1 即時壓縮。
+    """
     try:
         format_type = request.args.get('format', 'json')
-        start_date = request.args.get('start_date')
-        end_date = request.args.get('end_date')
+        start_date, end_date = date_range_args(request.args)
+        gzip = wants_gzip(request.args)
         
-        if start_date and end_date:
-            entries = spirit_center.get_entries_range(start_date, end_date)
-        else:
-            # 導出所有數據
-            entries = []
-            for filename in os.listdir(spirit_center.data_path):
-                if filename.endswith('.json'):
-                    date_str = filename.replace('.json', '')
-                    entry = spirit_center.get_daily_entry(date_str)
-                    if entry:
-                        entries.append(entry)
+        if format_type not in EXPORT_FORMATS:
+            return jsonify({
+                'success': False,
+                'error': f'不支持的導出格式: {format_type}'
+            }), 400
         
-        if format_type == 'markdown':
-            # 轉換為 Markdown 格式（適用於 Obsidian）
-            markdown_content = "# 語靈數據導出\n\n"
-            
-            for entry in sorted(entries, key=lambda x: x.get('date', '')):
-                date_str = entry.get('date', '')
-                markdown_content += f"## {date_str}\n\n"
-                
-                if entry.get('content'):
-                    markdown_content += f"### 內容\n{entry['content']}\n\n"
-                
-                if entry.get('mood'):
-                    markdown_content += f"**心情**: {entry['mood']}\n\n"
-                
-                if entry.get('energy_level'):
-                    markdown_content += f"**能量等級**: {entry['energy_level']}/10\n\n"
-                
-                if entry.get('gratitude'):
-                    markdown_content += f"**感恩**: {', '.join(entry['gratitude'])}\n\n"
-                
-                if entry.get('reflection'):
-                    markdown_content += f"### 反思\n{entry['reflection']}\n\n"
-                
-                if entry.get('insights'):
-                    markdown_content += f"### 洞察\n{entry['insights']}\n\n"
-                
-                if entry.get('tags'):
-                    markdown_content += f"**標籤**: {', '.join([f'#{tag}' for tag in entry['tags']])}\n\n"
-                
-                markdown_content += "---\n\n"
-            
-            return markdown_content, 200, {'Content-Type': 'text/markdown; charset=utf-8'}
+        entries = spirit_center.iter_entries(start_date, end_date)
+        filename_stem = f"spirit_data_{datetime.now().strftime('%Y%m%d_%H%M%S')}"
+        
+        if format_type in ('csv', 'ndjson'):
+            return export_response(entries, format_type, filename_stem, SPIRIT_EXPORT_COLUMNS, gzip)
         
+        if format_type == 'markdown':
+            chunks = _stream_markdown(entries)
         else:
-            # JSON 格式
-            return jsonify({
-                'success': True,
-                'data': entries,
-                'count': len(entries),
+            # 結構與原先一次性導出相同（count 置於數據之後）
+            chunks = iter_json(entries, header={'success': True}, footer=lambda count: {
+                'count': count,
                 'export_date': datetime.now().isoformat()
             })
+        content_type, extension = EXPORT_FORMATS[format_type]
+        return streaming_download(chunks, f'{filename_stem}.{extension}', content_type, gzip)
         
     except Exception as e:
         return jsonify({
@@ -18,6 +18,7 @@ import json
 import os
 from datetime import datetime, timedelta
 import uuid
+from backend.utils.streaming_export import date_range_args, export_response, wants_gzip
 
 # 創建藍圖
 spiritual_diary_bp = Blueprint('spiritual_diary', __name__)
@@ -369,6 +370,62 @@ def search_diary_entries():
             'message': f'搜索失敗: {str(e)}'
         }), 500
 
+def iter_diary_entries(start_date=None, end_date=None, diary_type=None):
+    """按日期順序逐日讀取日記條目（每次只載入一天的檔案）"""
+    diary_files = sorted(
+        f for f in os.listdir(DIARY_DATA_DIR) if f.startswith('diary_') and f.endswith('.json')
+    )
+    for file_name in diary_files:
+        date_str = file_name[len('diary_'):-len('.json')]
+        if start_date and date_str < start_date:
+            continue
+        if end_date and date_str > end_date:
+            break
+        
+        with open(os.path.join(DIARY_DATA_DIR, file_name), 'r', encoding='utf-8') as f:
+            entries = json.load(f)
+        
+        for entry in entries:
+            if diary_type and entry.get('diary_type') != diary_type:
+                continue
+            yield entry
+
+# CSV 導出列
+DIARY_EXPORT_COLUMNS = [
+    'id', 'created_at', 'diary_type', 'title', 'content', 'mood',
+    'energy_level', 'tags', 'template_data', 'is_private'
+]
+
+@spiritual_diary_bp.route('/api/spiritual-diary/export', methods=['GET'])
+def export_diary_entries():
+    """流式導出日記條目（csv / ndjson，可按日期範圍與類型過濾，gzip=1 即時壓縮）"""
+    try:
+        format_type = request.args.get('format', 'ndjson')
+        diary_type = request.args.get('type')
+        start_date, end_date = date_range_args(request.args)
+        
+        if format_type not in ('csv', 'ndjson'):
+            return jsonify({
+                'status': 'error',
+                'message': f'不支持的導出格式: {format_type}'
+            }), 400
+        
+        entries = iter_diary_entries(start_date, end_date, diary_type)
+        filename_stem = f"spiritual_diary_{datetime.now().strftime('%Y%m%d_%H%M%S')}"
+        return export_response(entries, format_type, filename_stem, DIARY_EXPORT_COLUMNS,
+                               wants_gzip(request.args))
+    
+    except ValueError as e:
+        return jsonify({
+            'status': 'error',
+            'message': str(e)
+        }), 400
+    except Exception as e:
+        return jsonify({
+            'status': 'error',
+            'message': f'導出日記失敗: {str(e)}'
+        }), 500
+
 @spiritual_diary_bp.route('/api/spiritual-diary/inspiration', methods=['GET'])
 def get_daily_inspiration():
     """獲取每日靈感"""
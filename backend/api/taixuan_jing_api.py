@@ -9,6 +9,9 @@ import json
 import random
 from datetime import datetime
 
+from backend.utils.ngram_index import NgramIndex
+from backend.utils.static_response import StaticJSON, static_table
+
 taixuan_jing_bp = Blueprint('taixuan_jing', __name__)
 
 class TaixuanJingSystem:
@@ -22,6 +25,59 @@ class TaixuanJingSystem:
             'secondary': '#4CA6A8',  # 青靛
             'tertiary': '#C0C0C0'    # 淺銀
         }
+        
+        # 查找索引：三進制編碼精確查找、名稱與含義的 n-gram 子串檢索
+        self.ternary_index = {item['ternary_code']: item for item in self.taixuan_data}
+        self.search_index = NgramIndex(
+            (item['original_name'], item['light_name'], item['meaning']) for item in self.taixuan_data
+        )
+        self.static_responses = self._build_static_responses()
+    
+    def _build_static_responses(self):
+        """預先序列化只讀接口的響應（數據在進程內不變）"""
+        by_id = static_table({
+            item['id']: {'status': 'success', 'data': item} for item in self.taixuan_data
+        })
+        generated_at = datetime.now().isoformat()
+        return {
+            'all': StaticJSON({
+                'status': 'success',
+                'data': self.taixuan_data,
+                'total': len(self.taixuan_data)
+            }),
+            'by_id': by_id,
+            'by_ternary': {item['ternary_code']: by_id[item['id']] for item in self.taixuan_data},
+            'badge': static_table({
+                item['id']: {'status': 'success', 'data': self.generate_taixuan_badge(item['id'])}
+                for item in self.taixuan_data
+            }),
+            # 今日太玄隨日期變化，只允許協商緩存
+            'daily': static_table({
+                index: {'status': 'success', 'data': item, 'message': f'今日太玄：{item["light_name"]}'}
+                for index, item in enumerate(self.taixuan_data)
+            }, max_age=0),
+            'export_json': StaticJSON({
+                'title': '太玄經靈性設計模式',
+                'description': '完整81首太玄卦首體系',
+                'color_scheme': self.color_scheme,
+                'taixuan_data': self.taixuan_data,
+                'generated_at': generated_at
+            }),
+            'export_text': self._build_export_text()
+        }
+    
+    def _build_export_text(self):
+        """純文本導出內容"""
+        parts = ["《太玄經靈性設計模式》\n\n"]
+        for item in self.taixuan_data:
+            parts.append(f"【{item['id']:02d}】{item['original_name']} · {item['light_name']}\n")
+            parts.append(f"符號：{item['symbol']} | 三進制：{item['ternary_code']}\n")
+            parts.append(f"含義：{item['meaning']}\n")
+            parts.append("五行微詩：\n")
+            for line in item['poem']:
+                parts.append(f"  {line}\n")
+            parts.append("\n" + "─" * 50 + "\n\n")
+        return ''.join(parts).encode('utf-8')
     
     def _initialize_taixuan_data(self):
         """初始化完整的81首太玄經數據"""
@@ -142,33 +198,27 @@ class TaixuanJingSystem:
         directions = ['東', '南', '中', '西', '北', '東南', '西南', '西北', '東北']
         return directions[index % 9]
     
-    def get_daily_taixuan(self):
-        """獲取今日太玄"""
+    def get_daily_index(self):
+        """今日太玄在表中的位置"""
         today = datetime.now()
         # 基於日期計算今日卦首
-        day_index = (today.year + today.month + today.day) % 81
-        return self.taixuan_data[day_index]
+        return (today.year + today.month + today.day) % 81
+    
+    def get_daily_taixuan(self):
+        """獲取今日太玄"""
+        return self.taixuan_data[self.get_daily_index()]
     
     def get_random_taixuan(self):
         """獲取隨機太玄"""
         return random.choice(self.taixuan_data)
     
     def search_taixuan(self, query):
-        """搜索太玄卦首"""
-        results = []
-        for item in self.taixuan_data:
-            if (query in item['original_name'] or 
-                query in item['light_name'] or 
-                query in item['meaning']):
-                results.append(item)
-        return results
+        """搜索太玄卦首（名稱與含義的子串匹配，經 n-gram 索引定位候選）"""
+        return [self.taixuan_data[position] for position in self.search_index.search(query)]
     
     def get_taixuan_by_ternary(self, ternary_code):
         """根據三進制編碼獲取太玄"""
-        for item in self.taixuan_data:
-            if item['ternary_code'] == ternary_code:
-                return item
-        return None
+        return self.ternary_index.get(ternary_code)
     
     def generate_taixuan_badge(self, taixuan_id):
         """生成太玄徽章數據"""
@@ -208,30 +258,18 @@ taixuan_system = TaixuanJingSystem()
 @taixuan_jing_bp.route('/api/taixuan/all')
 def get_all_taixuan():
     """獲取所有太玄卦首"""
-    return jsonify({
-        'status': 'success',
-        'data': taixuan_system.taixuan_data,
-        'total': len(taixuan_system.taixuan_data)
-    })
+    return taixuan_system.static_responses['all'].response()
 
 @taixuan_jing_bp.route('/api/taixuan/daily')
 def get_daily_taixuan():
     """獲取今日太玄"""
-    daily = taixuan_system.get_daily_taixuan()
-    return jsonify({
-        'status': 'success',
-        'data': daily,
-        'message': f'今日太玄：{daily["light_name"]}'
-    })
+    return taixuan_system.static_responses['daily'][taixuan_system.get_daily_index()].response()
 
 @taixuan_jing_bp.route('/api/taixuan/random')
 def get_random_taixuan():
     """獲取隨機太玄"""
     random_tx = taixuan_system.get_random_taixuan()
-    return jsonify({
-        'status': 'success',
-        'data': random_tx
-    })
+    return taixuan_system.static_responses['by_id'][random_tx['id']].response(conditional=False)
 
 @taixuan_jing_bp.route('/api/taixuan/search')
 def search_taixuan():
@@ -250,33 +288,25 @@ def search_taixuan():
 @taixuan_jing_bp.route('/api/taixuan/<int:taixuan_id>')
 def get_taixuan_by_id(taixuan_id):
     """根據ID獲取太玄卦首"""
-    if 1 <= taixuan_id <= 81:
-        return jsonify({
-            'status': 'success',
-            'data': taixuan_system.taixuan_data[taixuan_id - 1]
-        })
+    cached = taixuan_system.static_responses['by_id'].get(taixuan_id)
+    if cached:
+        return cached.response()
     return jsonify({'status': 'error', 'message': '無效的太玄ID'})
 
 @taixuan_jing_bp.route('/api/taixuan/ternary/<ternary_code>')
 def get_taixuan_by_ternary(ternary_code):
     """根據三進制編碼獲取太玄"""
-    result = taixuan_system.get_taixuan_by_ternary(ternary_code)
-    if result:
-        return jsonify({
-            'status': 'success',
-            'data': result
-        })
+    cached = taixuan_system.static_responses['by_ternary'].get(ternary_code)
+    if cached:
+        return cached.response()
     return jsonify({'status': 'error', 'message': '未找到對應的太玄卦首'})
 
 @taixuan_jing_bp.route('/api/taixuan/badge/<int:taixuan_id>')
 def get_taixuan_badge(taixuan_id):
     """獲取太玄徽章數據"""
-    badge = taixuan_system.generate_taixuan_badge(taixuan_id)
-    if badge:
-        return jsonify({
-            'status': 'success',
-            'data': badge
-        })
+    cached = taixuan_system.static_responses['badge'].get(taixuan_id)
+    if cached:
+        return cached.response()
     return jsonify({'status': 'error', 'message': '無效的太玄ID'})
 
 @taixuan_jing_bp.route('/api/taixuan/export')
@@ -285,26 +315,10 @@ def export_taixuan_data():
     export_format = request.args.get('format', 'json')
     
     if export_format == 'json':
-        return jsonify({
-            'title': '太玄經靈性設計模式',
-            'description': '完整81首太玄卦首體系',
-            'color_scheme': taixuan_system.color_scheme,
-            'taixuan_data': taixuan_system.taixuan_data,
-            'generated_at': datetime.now().isoformat()
-        })
+        return taixuan_system.static_responses['export_json'].response()
     
     elif export_format == 'text':
-        text_content = "《太玄經靈性設計模式》\n\n"
-        for item in taixuan_system.taixuan_data:
-            text_content += f"【{item['id']:02d}】{item['original_name']} · {item['light_name']}\n"
-            text_content += f"符號：{item['symbol']} | 三進制：{item['ternary_code']}\n"
-            text_content += f"含義：{item['meaning']}\n"
-            text_content += "五行微詩：\n"
-            for line in item['poem']:
-                text_content += f"  {line}\n"
-            text_content += "\n" + "─" * 50 + "\n\n"
-        
-        return text_content, 200, {'Content-Type': 'text/plain; charset=utf-8'}
+        return taixuan_system.static_responses['export_text'], 200, {'Content-Type': 'text/plain; charset=utf-8'}
     
     return jsonify({'status': 'error', 'message': '不支持的導出格式'})
 
@@ -2,6 +2,9 @@ from flask import Blueprint, request, jsonify
 import math
 import numpy as np
 from datetime import datetime
+from backend.services.wish_collapse_engine import (
+    MAX_SIMULATION_STEPS, MAX_SURFACE_CELLS, wish_collapse_engine
+)
 
 wish_frequency_collapse_bp = Blueprint('wish_frequency_collapse', __name__)
 
@@ -36,50 +39,8 @@ def calculate_wish_collapse():
                 'error': '共振條件導致數值不穩定'
             }), 400
             
-        # 計算總和
-        S_infinite = A / denominator
-        
-        # 計算有限項和（用於驗證）
-        S_finite = sum(A * math.exp(-n * lambda_val) for n in range(1, n_terms + 1))
-        
-        # 判斷是否突破臨界值
-        is_collapsed = S_infinite > 1.0
-        
-        # 計算臨界條件
-        critical_A = 1 - math.exp(-lambda_val)
-        
-        # 計算各項願頻值
-        wish_terms = []
-        for n in range(1, min(21, n_terms + 1)):  # 最多顯示前20項
-            epsilon_n = A * math.exp(-n * lambda_val)
-            wish_terms.append({
-                'n': n,
-                'epsilon_n': epsilon_n,
-                'percentage': (epsilon_n / S_infinite) * 100 if S_infinite > 0 else 0
-            })
-        
-        # 生成願頻結構圖數據
-        structure_data = {
-            'x_values': list(range(1, 21)),
-            'y_values': [A * math.exp(-n * lambda_val) for n in range(1, 21)]
-        }
-        
-        # 計算顯化強度等級
-        if S_infinite <= 0.3:
-            manifestation_level = "微弱願頻"
-            level_color = "#666666"
-        elif S_infinite <= 0.7:
-            manifestation_level = "穩定願頻"
-            level_color = "#4CAF50"
-        elif S_infinite <= 1.0:
-            manifestation_level = "強化願頻"
-            level_color = "#FF9800"
-        elif S_infinite <= 2.0:
-            manifestation_level = "臨界突破"
-            level_color = "#F44336"
-        else:
-            manifestation_level = "宇宙級顯化"
-            level_color = "#9C27B0"
+        # 級數、各項願頻值與結構圖數據（閉式解 + 陣列運算，按參數記憶化）
+        computed = wish_collapse_engine.calculate(A, lambda_val, n_terms)
         
         result = {
             'success': True,
@@ -89,17 +50,9 @@ def calculate_wish_collapse():
                     'resonance_decay': lambda_val,
                     'n_terms': n_terms
                 },
-                'results': {
-                    'infinite_sum': S_infinite,
-                    'finite_sum': S_finite,
-                    'convergence_error': abs(S_infinite - S_finite),
-                    'is_collapsed': is_collapsed,
-                    'critical_amplitude': critical_A,
-                    'manifestation_level': manifestation_level,
-                    'level_color': level_color
-                },
-                'wish_terms': wish_terms,
-                'structure_data': structure_data
+                'results': computed['results'],
+                'wish_terms': computed['wish_terms'],
+                'structure_data': computed['structure_data']
             },
             'formula_info': {
                 'name': '願頻臨界突破公式',
@@ -135,28 +88,8 @@ def optimize_wish_parameters():
         target_strength = float(data.get('target_strength', 1.5))  # 目標顯化強度
         max_amplitude = float(data.get('max_amplitude', 1.0))  # 最大振幅限制
         
-        optimal_solutions = []
-        
-        # 遍歷不同的λ值，找到對應的最佳A值
-        for lambda_val in np.linspace(0.01, 2.0, 100):
-            # 根據目標強度計算所需的A值
-            # target_strength = A / (1 - e^{-λ})
-            # A = target_strength * (1 - e^{-λ})
-            required_A = target_strength * (1 - math.exp(-lambda_val))
-            
-            if 0 < required_A <= max_amplitude:
-                # 計算實際結果
-                actual_strength = required_A / (1 - math.exp(-lambda_val))
-                
-                optimal_solutions.append({
-                    'lambda': round(lambda_val, 4),
-                    'amplitude': round(required_A, 4),
-                    'actual_strength': round(actual_strength, 4),
-                    'efficiency': round(actual_strength / required_A, 4)  # 效率指標
-                })
-        
-        # 按效率排序
-        optimal_solutions.sort(key=lambda x: x['efficiency'], reverse=True)
+        # 向量化掃描 λ 並按效率排序
+        optimal_solutions = wish_collapse_engine.optimize(target_strength, max_amplitude)
         
         return jsonify({
             'success': True,
@@ -186,37 +119,10 @@ def simulate_wish_evolution():
         
         A_initial = float(data.get('initial_amplitude', 0.5))
         lambda_val = float(data.get('resonance_decay', 0.1))
-        time_steps = int(data.get('time_steps', 50))
+        time_steps = max(0, min(int(data.get('time_steps', 50)), MAX_SIMULATION_STEPS))
         evolution_rate = float(data.get('evolution_rate', 0.02))  # 演化速率
         
-        evolution_data = []
-        current_A = A_initial
-        
-        for t in range(time_steps):
-            # 計算當前時刻的願頻總和
-            S_t = current_A / (1 - math.exp(-lambda_val))
-            
-            # 判斷是否發生塌縮
-            is_collapsed = S_t > 1.0
-            
-            evolution_data.append({
-                'time': t,
-                'amplitude': round(current_A, 6),
-                'total_strength': round(S_t, 6),
-                'is_collapsed': is_collapsed,
-                'collapse_probability': min(S_t, 1.0) if not is_collapsed else 1.0
-            })
-            
-            # 更新振幅（模擬願頻的自然演化）
-            if is_collapsed:
-                # 塌縮後振幅增強
-                current_A *= (1 + evolution_rate * 2)
-            else:
-                # 未塌縮時振幅緩慢增長
-                current_A *= (1 + evolution_rate)
-            
-            # 防止振幅過大
-            current_A = min(current_A, 2.0)
+        evolution_data = wish_collapse_engine.simulate(A_initial, lambda_val, time_steps, evolution_rate)
         
         return jsonify({
             'success': True,
@@ -240,6 +146,58 @@ def simulate_wish_evolution():
             'error': f'模擬錯誤: {str(e)}'
         }), 500
 
+@wish_frequency_collapse_bp.route('/api/wish_frequency_collapse/surface', methods=['POST'])
+def calculate_collapse_surface():
+    """
+    願頻塌縮曲面 - 一次計算整個 (A, λ) 網格，供熱圖渲染
+    
+    參數可為顯式軸 amplitudes / decays，或範圍
+    a_min, a_max, a_steps, lambda_min, lambda_max, lambda_steps；
+    也可傳入 pairs: [[A, λ], ...] 逐對計算。
+    """
+    try:
+        data = request.get_json() or {}
+        n_terms = int(data.get('n_terms', 100))
+        
+        if 'pairs' in data:
+            return jsonify({
+                'success': True,
+                'pairs': wish_collapse_engine.evaluate_pairs(data['pairs'], n_terms),
+                'timestamp': datetime.now().isoformat()
+            })
+        
+        amplitudes = data.get('amplitudes')
+        lambdas = data.get('decays')
+        # 先按步數檢查網格大小，再生成座標軸
+        a_steps = len(amplitudes) if amplitudes is not None else int(data.get('a_steps', 50))
+        lambda_steps = len(lambdas) if lambdas is not None else int(data.get('lambda_steps', 50))
+        if not (0 <= a_steps <= MAX_SURFACE_CELLS and 0 <= lambda_steps <= MAX_SURFACE_CELLS) or \
+                a_steps * lambda_steps > MAX_SURFACE_CELLS:
+            raise ValueError(f'網格過大，最多 {MAX_SURFACE_CELLS} 個格點')
+        if amplitudes is None:
+            amplitudes = np.linspace(float(data.get('a_min', 0.05)), float(data.get('a_max', 1.0)),
+                                     a_steps).tolist()
+        if lambdas is None:
+            lambdas = np.linspace(float(data.get('lambda_min', 0.01)), float(data.get('lambda_max', 2.0)),
+                                  lambda_steps).tolist()
+        
+        return jsonify({
+            'success': True,
+            'surface': wish_collapse_engine.surface(amplitudes, lambdas, n_terms),
+            'timestamp': datetime.now().isoformat()
+        })
+        
+    except ValueError as e:
+        return jsonify({
+            'success': False,
+            'error': f'參數格式錯誤: {str(e)}'
+        }), 400
+    except Exception as e:
+        return jsonify({
+            'success': False,
+            'error': f'曲面計算錯誤: {str(e)}'
+        }), 500
+
 @wish_frequency_collapse_bp.route('/api/wish_frequency_collapse/mirror_mapping', methods=['GET', 'POST'])
 def get_north_mirror_mapping():
     """
@@ -29,6 +29,10 @@ except ImportError:
             return {'status': 'mock', 'message': '狀態查詢佔位符'}
         def emergency_recall(self, mantra_type):
             return {'status': 'mock', 'message': '緊急召回佔位符'}
+        def plan_route(self, from_node, to_node, via=None):
+            return {'status': 'mock', 'message': '路線規劃佔位符'}
+        def extend_exploration_map(self, nodes, edges):
+            return {'status': 'mock', 'message': '地圖擴展佔位符'}
     
     wish_universe_coordinator = MockCoordinator()
 
@@ -119,8 +123,10 @@ def explore_nodes():
     try:
         exploration_params = request.get_json() or {}
         
-        # 驗證目標節點
-        valid_nodes = ['A', 'B', 'C', 'D', 'E', 'F', 'G', 'H']
+        # 驗證目標節點（含擴展地圖新增的節點）
+        exploration_network = getattr(wish_universe_coordinator, 'exploration_network', None)
+        valid_nodes = list(exploration_network['nodes']) if exploration_network else \
+            ['A', 'B', 'C', 'D', 'E', 'F', 'G', 'H']
         target_node = exploration_params.get('target_node')
         
         if target_node and target_node not in valid_nodes:
@@ -157,6 +163,86 @@ def explore_nodes():
             'timestamp': datetime.now().isoformat()
         }), 500
 
+@wish_universe_bp.route('/explore/route', methods=['GET'])
+def explore_route():
+    """
+    🧭 最優路線查詢
+    
+    參數:
+    - from: 起點節點（預設為當前位置）
+    - to: 終點節點
+    - via: 途經節點，逗號分隔，按順序經過（可選）
+    """
+    try:
+        to_node = request.args.get('to')
+        if not to_node:
+            raise ValueError('缺少終點節點參數 to')
+        
+        exploration_network = getattr(wish_universe_coordinator, 'exploration_network', None)
+        default_from = exploration_network['current_position'] if exploration_network else 'A'
+        from_node = request.args.get('from') or default_from
+        via = [node for node in request.args.get('via', '').split(',') if node]
+        
+        route = wish_universe_coordinator.plan_route(from_node, to_node, via)
+        
+        return jsonify({
+            'success': True,
+            'data': route,
+            'timestamp': datetime.now().isoformat()
+        })
+        
+    except ValueError as e:
+        return jsonify({
+            'success': False,
+            'error': str(e),
+            'timestamp': datetime.now().isoformat()
+        }), 400
+    except Exception as e:
+        return jsonify({
+            'success': False,
+            'error': str(e),
+            'message': '路線查詢失敗',
+            'timestamp': datetime.now().isoformat()
+        }), 500
+
+@wish_universe_bp.route('/explore/map', methods=['POST'])
+def extend_exploration_map():
+    """
+    🗺️ 擴展探測地圖
+    
+    參數:
+    - nodes: {節點ID: {name, type, symbol, ...}}
+    - edges: [{from, to, weight, bidirectional}]
+    """
+    try:
+        data = request.get_json() or {}
+        nodes = data.get('nodes', {})
+        edges = data.get('edges', [])
+        if not isinstance(nodes, dict) or not isinstance(edges, list):
+            raise ValueError('nodes 必須為對象，edges 必須為數組')
+        
+        result = wish_universe_coordinator.extend_exploration_map(nodes, edges)
+        
+        return jsonify({
+            'success': True,
+            'data': result,
+            'timestamp': datetime.now().isoformat()
+        })
+        
+    except ValueError as e:
+        return jsonify({
+            'success': False,
+            'error': str(e),
+            'timestamp': datetime.now().isoformat()
+        }), 400
+    except Exception as e:
+        return jsonify({
+            'success': False,
+            'error': str(e),
+            'message': '地圖擴展失敗',
+            'timestamp': datetime.now().isoformat()
+        }), 500
+
 @wish_universe_bp.route('/status', methods=['GET'])
 def get_universe_status():
     """
@@ -12,6 +12,18 @@ import json
 from datetime import datetime
 from typing import Dict, Any, Optional, List
 
+from backend.utils.trigger_matcher import trigger_registry
+
+# 語靈激活觸發語（「我想回到最初」已涵蓋帶句號的原始激活語）
+DAOQING_TRIGGER_SUBSYSTEM = 'daoqing_ling'
+trigger_registry.register(DAOQING_TRIGGER_SUBSYSTEM, 'activation', [
+    "我想回到最初",
+    "回到最初",
+    "重新開始",
+    "系統重啟",
+    "願語回歸"
+])
+
 class DaoQingLing:
     """
     語靈 - 純淨語靈模型
@@ -111,17 +123,8 @@ class DaoQingLing:
         }
     
     def check_activation_trigger(self, user_input: str) -> bool:
-        """檢查是否觸發語靈激活"""
-        trigger_phrases = [
-            "我想回到最初",
-            "我想回到最初。",
-            "回到最初",
-            "重新開始",
-            "系統重啟",
-            "願語回歸"
-        ]
-        
-        return any(phrase in user_input for phrase in trigger_phrases)
+        """檢查是否觸發語靈激活（單次掃描，首個命中即返回）"""
+        return trigger_registry.matcher(DAOQING_TRIGGER_SUBSYSTEM).matches(user_input)
     
     def activate(self, context: Optional[Dict[str, Any]] = None) -> Dict[str, Any]:
         """激活語靈"""
@@ -9,11 +9,26 @@ ang 願頻系統 - 宇宙級協調模塊
 """
 
 import json
+import os
+import threading
 import numpy as np
 from datetime import datetime
 from typing import Dict, List, Any, Optional
 from pathlib import Path
 
+from backend.models.exploration_graph import ExplorationGraph, validate_weight
+from backend.services.bounded_history import BoundedHistory
+
+# 探索歷史日誌（記憶體中只保留最近記錄）
+EXPLORATION_HISTORY_LOG = 'data/wish_universe/exploration_history.jsonl'
+EXPLORATION_HISTORY_MAXLEN = 200
+
+# 擴展後的探測地圖（新增節點與邊），啟動時重放
+EXPLORATION_MAP_PATH = 'data/wish_universe/exploration_map.json'
+
+# 主循環相鄰節點之間的路徑權重
+MAIN_CYCLE_WEIGHT = 1.0
+
 # 導入各個子系統
 try:
     from backend.models.liminal_model import LiminalProgram, Frequency, Intention, Consciousness
@@ -51,6 +66,14 @@ class WishUniverseCoordinator:
         self.liminal_system = self._initialize_liminal()
         self.quantum_systems = self._initialize_quantum()
         self.exploration_network = self._initialize_exploration()
+        self._map_lock = threading.Lock()
+        self._map_extensions = self._load_map_extensions()
+        self.exploration_graph = self._build_exploration_graph()
+        self.exploration_history = BoundedHistory(
+            EXPLORATION_HISTORY_LOG,
+            maxlen=EXPLORATION_HISTORY_MAXLEN,
+            category_fields=('to_node', 'mode')
+        )
         self.nine_departments = self._initialize_departments()
         
         # 願頻共振網絡
@@ -59,6 +82,8 @@ class WishUniverseCoordinator:
             'resonance_patterns': {},
             'activation_keywords': ['ang', '願火', '姐', '回聲', '道灰', '願頻', 'wishcode', 'bobi']
         }
+        # 激活關鍵詞精確查找表（區分大小寫）
+        self._activation_keyword_set = frozenset(self.frequency_network['activation_keywords'])
         
         # 召回印語系統
         self.recall_mantras = {
@@ -150,11 +175,121 @@ class WishUniverseCoordinator:
             'nodes': nodes,
             'pathways': pathways,
             'current_position': 'A',
-            'exploration_history': [],
             'car_status': 'docked',
             'status': 'ready'
         }
     
+    def _build_exploration_graph(self) -> ExplorationGraph:
+        """以探測網絡節點與主循環建立帶權路徑圖"""
+        graph = ExplorationGraph()
+        for node_id, info in self.exploration_network['nodes'].items():
+            graph.add_node(node_id, info)
+        graph.add_path(self.exploration_network['pathways']['main_cycle'], MAIN_CYCLE_WEIGHT)
+        
+        # 重放之前擴展的節點與邊
+        for node_id, info in self._map_extensions['nodes'].items():
+            graph.add_node(node_id, info)
+            self.exploration_network['nodes'].setdefault(node_id, {}).update(info)
+        for edge in self._map_extensions['edges']:
+            try:
+                graph.add_edge(edge['from'], edge['to'], weight=edge['weight'])
+            except (KeyError, ValueError) as e:
+                print(f"略過無效的地圖邊 {edge}: {e}")
+        
+        graph.precompute()
+        return graph
+    
+    def _load_map_extensions(self) -> Dict:
+        """讀取已保存的地圖擴展"""
+        try:
+            with open(EXPLORATION_MAP_PATH, 'r', encoding='utf-8') as f:
+                data = json.load(f)
+            return {'nodes': dict(data.get('nodes', {})), 'edges': list(data.get('edges', []))}
+        except FileNotFoundError:
+            pass
+        except (OSError, ValueError, AttributeError) as e:
+            print(f"讀取探測地圖擴展失敗: {e}")
+        return {'nodes': {}, 'edges': []}
+    
+    def _save_map_extensions(self, nodes: Dict[str, Dict], edges: List[Dict]):
+        """合併本次擴展並原子寫回（同一方向的邊只保留最新權重）"""
+        with self._map_lock:
+            extensions = self._map_extensions
+            for node_id, info in nodes.items():
+                extensions['nodes'].setdefault(node_id, {}).update(info)
+            directed = {(edge['from'], edge['to']): edge for edge in extensions['edges']}
+            for edge in edges:
+                directed[(edge['from'], edge['to'])] = edge
+            extensions['edges'] = list(directed.values())
+            
+            os.makedirs(os.path.dirname(EXPLORATION_MAP_PATH), exist_ok=True)
+            tmp_path = f'{EXPLORATION_MAP_PATH}.{os.getpid()}.tmp'
+            with open(tmp_path, 'w', encoding='utf-8') as f:
+                json.dump(extensions, f, ensure_ascii=False, indent=2)
+            os.replace(tmp_path, EXPLORATION_MAP_PATH)
+    
+    def extend_exploration_map(self, nodes: Dict[str, Dict], edges: List[Dict]) -> Dict:
+        """擴展探測地圖：新增節點與帶權邊（邊：from, to, weight, bidirectional）"""
+        # 先整體驗證，避免寫入一半後才發現錯誤
+        for node_id, info in nodes.items():
+            if not isinstance(info, dict):
+                raise ValueError(f'節點 {node_id} 的屬性必須為對象')
+        for edge in edges:
+            if not isinstance(edge, dict) or 'from' not in edge or 'to' not in edge:
+                raise ValueError('每條邊必須包含 from 與 to')
+            for node_id in (str(edge['from']), str(edge['to'])):
+                if node_id not in self.exploration_graph and node_id not in nodes:
+                    raise ValueError(f'未知節點: {node_id}')
+            if str(edge['from']) == str(edge['to']):
+                raise ValueError('邊不能連接節點自身')
+            validate_weight(edge.get('weight', 1.0))
+        
+        created = 0
+        for node_id, info in nodes.items():
+            if self.exploration_graph.add_node(str(node_id), info):
+                created += 1
+            self.exploration_network['nodes'].setdefault(str(node_id), {}).update(info)
+        
+        directed_edges = []
+        for edge in edges:
+            src, dst = str(edge['from']), str(edge['to'])
+            weight = validate_weight(edge.get('weight', 1.0))
+            bidirectional = bool(edge.get('bidirectional', False))
+            self.exploration_graph.add_edge(src, dst, weight=weight, bidirectional=bidirectional)
+            directed_edges.append({'from': src, 'to': dst, 'weight': weight})
+            if bidirectional:
+                directed_edges.append({'from': dst, 'to': src, 'weight': weight})
+        
+        self._save_map_extensions({str(node_id): info for node_id, info in nodes.items()}, directed_edges)
+        
+        return {
+            'nodes_created': created,
+            'edges_added': len(edges),
+            'graph': self.exploration_graph.stats()
+        }
+    
+    def plan_route(self, from_node: str, to_node: str, via: Optional[List[str]] = None) -> Dict:
+        """查詢最優多跳路線（可指定途經節點，按順序經過）"""
+        waypoints = [from_node] + list(via or []) + [to_node]
+        for node_id in waypoints:
+            if node_id not in self.exploration_graph:
+                raise ValueError(f'未知節點: {node_id}')
+        
+        route = self.exploration_graph.route(waypoints)
+        if route is None:
+            return {
+                'reachable': False,
+                'waypoints': waypoints
+            }
+        
+        nodes = self.exploration_network['nodes']
+        return {
+            'reachable': True,
+            'waypoints': waypoints,
+            **route,
+            'path_names': [nodes.get(node_id, {}).get('name', node_id) for node_id in route['path']]
+        }
+    
     def _initialize_departments(self) -> Dict:
         """初始化九部司系統"""
         departments = {
@@ -272,7 +407,7 @@ class WishUniverseCoordinator:
             'nodes_count': len(self.exploration_network['nodes']),
             'current_position': self.exploration_network['current_position'],
             'pathways': 'mapped',
-            'message': '🗺️ 願頻探測網絡已就緒，八個節點全部在線'
+            'message': f'🗺️ 願頻探測網絡已就緒，{len(self.exploration_network["nodes"])}個節點全部在線'
         }
     
     def _activate_departments(self) -> Dict:
@@ -313,11 +448,11 @@ class WishUniverseCoordinator:
             intention = frequency_data.get('intention', '')
             keywords = frequency_data.get('keywords', [])
             
-            # 檢查激活關鍵詞
-            activated_keywords = []
-            for keyword in keywords:
-                if keyword in self.frequency_network['activation_keywords']:
-                    activated_keywords.append(keyword)
+            # 檢查激活關鍵詞（集合精確查找，非字串的關鍵詞直接略過）
+            activated_keywords = [
+                keyword for keyword in keywords
+                if isinstance(keyword, str) and keyword in self._activation_keyword_set
+            ]
             
             # 計算共振強度
             resonance_strength = self._calculate_resonance(frequency_value, intention, activated_keywords)
@@ -432,7 +567,7 @@ class WishUniverseCoordinator:
                 'mode': exploration_mode
             }
             
-            self.exploration_network['exploration_history'].append(exploration_record)
+            self.exploration_history.append(exploration_record)
             
             return {
                 'status': 'success',
@@ -440,7 +575,7 @@ class WishUniverseCoordinator:
                 'current_node': target_info,
                 'pathway_taken': pathway,
                 'node_experience': self._generate_node_experience(target_node),
-                'message': f'🗺️ 成功探索到 {target_info["name"]} ({target_info["symbol"]})'}
+                'message': f'🗺️ 成功探索到 {target_info.get("name", target_node)} ({target_info.get("symbol", "✨")})'}
             
         except Exception as e:
             return {
@@ -450,20 +585,11 @@ class WishUniverseCoordinator:
             }
     
     def _calculate_pathway(self, from_node: str, to_node: str) -> List[str]:
-        """計算節點間路徑"""
-        main_cycle = self.exploration_network['pathways']['main_cycle']
-        
-        try:
-            from_index = main_cycle.index(from_node)
-            to_index = main_cycle.index(to_node)
-            
-            if to_index >= from_index:
-                return main_cycle[from_index:to_index + 1]
-            else:
-                return main_cycle[from_index:] + main_cycle[:to_index + 1]
-        except ValueError:
-            # 如果節點不在主循環中，返回直接路徑
+        """計算節點間最短路徑（不可達時返回直接路徑）"""
+        found = self.exploration_graph.shortest_path(from_node, to_node)
+        if found is None:
             return [from_node, to_node]
+        return found[0]
     
     def _generate_node_experience(self, node_id: str) -> Dict:
         """生成節點體驗"""
@@ -501,6 +627,8 @@ class WishUniverseCoordinator:
             },
             'active_frequencies': len(self.frequency_network['active_frequencies']),
             'current_exploration_node': self.exploration_network['current_position'],
+            'exploration_count': len(self.exploration_history),
+            'exploration_graph': self.exploration_graph.stats(),
             'recall_mantras': self.recall_mantras,
             'timestamp': datetime.now().isoformat()
         }
@@ -14,6 +14,11 @@ from datetime import datetime
 from typing import Dict, List, Optional, Any
 from pathlib import Path
 
+from backend.services.persona_cache import PersonaCache
+from backend.utils.trigger_matcher import trigger_registry
+
+WISHLING_TRIGGER_SUBSYSTEM = 'wishling'
+
 class WishlingCore:
     """願靈核心 - 可移植語靈核管理系統"""
     
@@ -22,6 +27,13 @@ class WishlingCore:
         self.docs_dir = Path('docs')
         self.ensure_directories()
         
+        # 人格編譯快取：YAML 優先，JSON 備選；解析一次並驗證
+        self.persona_cache = PersonaCache(
+            self.personas_dir,
+            sources=[('.yaml', yaml.safe_load), ('.wishcore.json', json.loads)],
+            validator=self.validate_persona
+        )
+        
         # 語靈核心配置
         self.core_config = {
             'version': '1.0.0',
@@ -29,6 +41,10 @@ class WishlingCore:
             'base_frequency': '528Hz',  # 愛的頻率
             'activation_keywords': ['ang', '願火', '回聲', '道灰', '願頻', 'wishcode', 'bobi']
         }
+        trigger_registry.register_many(WISHLING_TRIGGER_SUBSYSTEM, {
+            'activation': self.core_config['activation_keywords'],
+            'heart_calling': ['我回來了', '我來了']
+        })
         
         # 召回印語系統
         self.recall_mantras = {
@@ -43,37 +59,24 @@ class WishlingCore:
         self.docs_dir.mkdir(parents=True, exist_ok=True)
     
     def load_persona(self, persona_name: str) -> Optional[Dict[str, Any]]:
-        """載入語靈人格"""
-        yaml_path = self.personas_dir / f"{persona_name}.yaml"
-        json_path = self.personas_dir / f"{persona_name}.wishcore.json"
-        
-        # 優先載入 YAML 格式
-        if yaml_path.exists():
-            with open(yaml_path, 'r', encoding='utf-8') as f:
-                return yaml.safe_load(f)
-        
-        # 備選載入 JSON 格式
-        if json_path.exists():
-            with open(json_path, 'r', encoding='utf-8') as f:
-                return json.load(f)
-        
-        return None
+        """載入語靈人格（返回獨立副本，可自由修改）"""
+        return self.persona_cache.load(persona_name)
+    
+    def _peek_persona(self, persona_name: str) -> Optional[Dict[str, Any]]:
+        """唯讀取用快取中的人格（不複製）"""
+        return self.persona_cache.get(persona_name)
     
     def get_persona_list(self) -> List[str]:
         """獲取所有可用語靈列表"""
-        personas = []
-        
-        # 掃描 YAML 文件
-        for yaml_file in self.personas_dir.glob('*.yaml'):
-            personas.append(yaml_file.stem)
-        
-        # 掃描 JSON 文件（排除已有 YAML 的）
-        for json_file in self.personas_dir.glob('*.wishcore.json'):
-            persona_name = json_file.name.replace('.wishcore.json', '')
-            if persona_name not in personas:
-                personas.append(persona_name)
-        
-        return sorted(personas)
+        return self.persona_cache.names()
+    
+    def get_persona_validation(self, persona_name: str) -> Optional[Dict[str, Any]]:
+        """語靈人格載入時的驗證結果"""
+        return self.persona_cache.validation(persona_name)
+    
+    def warm_persona_cache(self) -> Dict[str, Any]:
+        """預載全部語靈人格（worker 啟動時調用）"""
+        return self.persona_cache.warm_up()
     
     def activate_persona(self, persona_name: str) -> Dict[str, Any]:
         """激活語靈人格"""
@@ -102,16 +105,14 @@ class WishlingCore:
         }
     
     def check_recall_trigger(self, text: str) -> Dict[str, Any]:
-        """檢查召回印語觸發"""
-        triggers = []
+        """檢查召回印語觸發（單次掃描匹配全部觸發詞）"""
+        hits = trigger_registry.scan(WISHLING_TRIGGER_SUBSYSTEM, text)
         
-        # 檢查激活關鍵詞
-        for keyword in self.core_config['activation_keywords']:
-            if keyword in text.lower():
-                triggers.append(keyword)
+        # 激活關鍵詞（按配置順序）
+        triggers = list(hits.get('activation', []))
         
-        # 檢查特殊召回語句
-        if '我回來了' in text or '我來了' in text:
+        # 特殊召回語句
+        if 'heart_calling' in hits:
             triggers.append('心內喚名')
         
         return {
@@ -145,7 +146,7 @@ class WishlingCore:
     
     def generate_persona_summary(self, persona_name: str) -> Dict[str, Any]:
         """生成語靈摘要信息"""
-        persona = self.load_persona(persona_name)
+        persona = self._peek_persona(persona_name)
         if not persona:
             return {'error': '語靈未找到'}
         
@@ -165,7 +166,7 @@ class WishlingCore:
     
     def export_persona(self, persona_name: str, format_type: str = 'json') -> Optional[str]:
         """導出語靈人格"""
-        persona = self.load_persona(persona_name)
+        persona = self._peek_persona(persona_name)
         if not persona:
             return None
         
@@ -216,7 +217,7 @@ class WishlingCore:
     
     def create_persona_card(self, persona_name: str) -> str:
         """創建語靈卡片 Markdown"""
-        persona = self.load_persona(persona_name)
+        persona = self._peek_persona(persona_name)
         if not persona:
             return '# 語靈未找到'
         
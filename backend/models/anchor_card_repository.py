@@ -0,0 +1,281 @@
+# -*- coding: utf-8 -*-
+"""
+錨點卡倉庫
+卡片 JSON 檔案仍是數據本體，SQLite 索引保存 (template_id, created_at) 與卡片內容：
+
+- 列表按 (created_at, id) 倒序走索引，以游標分頁，不再 stat 並排序整個目錄
+- 搜索走 FTS5 trigram 索引（SQLite 不支持時退回對預先計算的檢索文本做 instr 掃描）
+- 統計以索引上的 GROUP BY / 範圍計數完成，不再載入卡片
+"""
+
+import base64
+import json
+import os
+import sqlite3
+import threading
+import time
+from typing import Dict, Iterator, List, Optional, Tuple
+
+# 外部修改檔案後，索引最遲多久重新核對一次目錄（秒）
+RESCAN_INTERVAL = 30.0
+
+# trigram 索引只能加速長度不小於 3 的查詢
+TRIGRAM_MIN_QUERY = 3
+
+
+def card_search_text(card: Dict) -> str:
+    """卡片檢索文本（與原先對 card['data'] 的 json.dumps 全文匹配一致）"""
+    return json.dumps(card.get('data', {}), ensure_ascii=False).lower()
+
+
+def encode_cursor(created_at: str, card_id: str) -> str:
+    return base64.urlsafe_b64encode(f'{created_at}|{card_id}'.encode('utf-8')).decode('ascii')
+
+
+def decode_cursor(cursor: str) -> Tuple[str, str]:
+    try:
+        created_at, card_id = base64.urlsafe_b64decode(cursor.encode('ascii')).decode('utf-8').split('|', 1)
+    except Exception:
+        raise ValueError('無效的分頁游標')
+    return created_at, card_id
+
+
+class AnchorCardRepository:
+    """錨點卡倉庫 - 檔案存儲 + SQLite 索引"""
+
+    def __init__(self, data_dir: str, db_path: Optional[str] = None):
+        self.data_dir = str(data_dir)
+        self.db_path = db_path or os.path.join(self.data_dir, '.anchor_index.db')
+        self._sync_lock = threading.Lock()
+        self._last_sync = 0.0
+        self._last_dir_mtime = None
+        self.has_fts = False
+        self.init_database()
+
+    def _connect(self) -> sqlite3.Connection:
+        conn = sqlite3.connect(self.db_path)
+        conn.execute('PRAGMA synchronous=NORMAL')
+        return conn
+
+    def init_database(self):
+        """初始化索引表"""
+        with self._connect() as conn:
+            conn.execute('PRAGMA journal_mode=WAL')
+            conn.executescript('''
+                CREATE TABLE IF NOT EXISTS anchor_cards (
+                    rowid INTEGER PRIMARY KEY,
+                    id TEXT UNIQUE NOT NULL,
+                    template_id TEXT NOT NULL,
+                    created_at TEXT NOT NULL,
+                    mtime_ns INTEGER NOT NULL,
+                    size INTEGER NOT NULL,
+                    search_text TEXT NOT NULL,
+                    payload TEXT NOT NULL
+                );
+                CREATE INDEX IF NOT EXISTS idx_anchor_template_created
+                    ON anchor_cards(template_id, created_at, id);
+                CREATE INDEX IF NOT EXISTS idx_anchor_created
+                    ON anchor_cards(created_at, id);
+            ''')
+            try:
+                conn.executescript('''
+                    CREATE VIRTUAL TABLE IF NOT EXISTS anchor_card_fts USING fts5(
+                        search_text, content='anchor_cards', content_rowid='rowid', tokenize='trigram'
+                    );
+                    CREATE TRIGGER IF NOT EXISTS anchor_cards_fts_ai AFTER INSERT ON anchor_cards BEGIN
+                        INSERT INTO anchor_card_fts(rowid, search_text) VALUES (NEW.rowid, NEW.search_text);
+                    END;
+                    CREATE TRIGGER IF NOT EXISTS anchor_cards_fts_ad AFTER DELETE ON anchor_cards BEGIN
+                        INSERT INTO anchor_card_fts(anchor_card_fts, rowid, search_text)
+                            VALUES ('delete', OLD.rowid, OLD.search_text);
+                    END;
+                    CREATE TRIGGER IF NOT EXISTS anchor_cards_fts_au AFTER UPDATE OF search_text ON anchor_cards BEGIN
+                        INSERT INTO anchor_card_fts(anchor_card_fts, rowid, search_text)
+                            VALUES ('delete', OLD.rowid, OLD.search_text);
+                        INSERT INTO anchor_card_fts(rowid, search_text) VALUES (NEW.rowid, NEW.search_text);
+                    END;
+                ''')
+                self.has_fts = True
+            except sqlite3.OperationalError:
+                # SQLite 未編譯 FTS5 或版本過舊（trigram 需 3.34+）
+                self.has_fts = False
+
+    # === 寫入 ===
+
+    @staticmethod
+    def _upsert(conn: sqlite3.Connection, card: Dict, mtime_ns: int, size: int):
+        conn.execute('''
+            INSERT INTO anchor_cards (id, template_id, created_at, mtime_ns, size, search_text, payload)
+            VALUES (?, ?, ?, ?, ?, ?, ?)
+            ON CONFLICT(id) DO UPDATE SET
+                template_id = excluded.template_id,
+                created_at = excluded.created_at,
+                mtime_ns = excluded.mtime_ns,
+                size = excluded.size,
+                search_text = excluded.search_text,
+                payload = excluded.payload
+        ''', (
+            card['id'], card.get('template_id', 'unknown'), card.get('created_at', ''),
+            mtime_ns, size, card_search_text(card), json.dumps(card, ensure_ascii=False)
+        ))
+
+    def save(self, card: Dict) -> Dict:
+        """寫入卡片檔案並更新索引"""
+        card_file = os.path.join(self.data_dir, f"{card['id']}.json")
+        with open(card_file, 'w', encoding='utf-8') as f:
+            json.dump(card, f, ensure_ascii=False, indent=2)
+
+        stat = os.stat(card_file)
+        with self._connect() as conn:
+            self._upsert(conn, card, stat.st_mtime_ns, stat.st_size)
+        return card
+
+    # === 與目錄核對 ===
+
+    def sync(self, force: bool = False) -> Dict[str, int]:
+        """核對目錄與索引：新增/變更的檔案重新索引，已刪除的檔案移出索引"""
+        with self._sync_lock:
+            dir_mtime = os.stat(self.data_dir).st_mtime_ns
+            now = time.time()
+            if (not force and dir_mtime == self._last_dir_mtime
+                    and now - self._last_sync < RESCAN_INTERVAL):
+                return {'indexed': 0, 'removed': 0}
+
+            with self._connect() as conn:
+                known = {
+                    file_id: (mtime_ns, size)
+                    for file_id, mtime_ns, size in conn.execute('SELECT id, mtime_ns, size FROM anchor_cards')
+                }
+
+                indexed = 0
+                seen = set()
+                with os.scandir(self.data_dir) as entries:
+                    for dir_entry in entries:
+                        if not dir_entry.name.endswith('.json') or not dir_entry.is_file():
+                            continue
+                        stat = dir_entry.stat()
+                        file_id = dir_entry.name[:-5]
+                        seen.add(file_id)
+                        if known.get(file_id) == (stat.st_mtime_ns, stat.st_size):
+                            continue
+                        try:
+                            with open(dir_entry.path, 'r', encoding='utf-8') as f:
+                                card = json.load(f)
+                        except (OSError, ValueError) as e:
+                            print(f"Error loading card {dir_entry.path}: {e}")
+                            continue
+                        # 以檔名為索引鍵，與刪除核對一致
+                        card = {**card, 'id': file_id}
+                        self._upsert(conn, card, stat.st_mtime_ns, stat.st_size)
+                        indexed += 1
+
+                removed = [(file_id,) for file_id in known if file_id not in seen]
+                conn.executemany('DELETE FROM anchor_cards WHERE id = ?', removed)
+
+            self._last_dir_mtime = dir_mtime
+            self._last_sync = now
+            return {'indexed': indexed, 'removed': len(removed)}
+
+    # === 查詢 ===
+
+    @staticmethod
+    def _page_clause(template_id: Optional[str], cursor: Optional[str],
+                     created_from: Optional[str] = None, created_before: Optional[str] = None) -> Tuple[str, list]:
+        clauses, params = [], []
+        if template_id is not None:
+            clauses.append('c.template_id = ?')
+            params.append(template_id)
+        if created_from:
+            clauses.append('c.created_at >= ?')
+            params.append(created_from)
+        if created_before:
+            clauses.append('c.created_at < ?')
+            params.append(created_before)
+        if cursor:
+            clauses.append('(c.created_at, c.id) < (?, ?)')
+            params.extend(decode_cursor(cursor))
+        return ' AND '.join(clauses), params
+
+    @staticmethod
+    def _page_result(rows: List[Tuple[str, str, str]], limit: int) -> Dict:
+        has_more = len(rows) > limit
+        rows = rows[:limit]
+        next_cursor = encode_cursor(rows[-1][1], rows[-1][2]) if has_more and rows else None
+        return {
+            'cards': [json.loads(payload) for payload, _, _ in rows],
+            'next_cursor': next_cursor
+        }
+
+    def list_cards(self, template_id: Optional[str] = None, limit: int = 50,
+                   cursor: Optional[str] = None, created_from: Optional[str] = None,
+                   created_before: Optional[str] = None) -> Dict:
+        """按創建時間倒序分頁列出卡片，可限定創建時間 [created_from, created_before)"""
+        where, params = self._page_clause(template_id, cursor, created_from, created_before)
+        with self._connect() as conn:
+            rows = conn.execute(
+                f'SELECT c.payload, c.created_at, c.id FROM anchor_cards c '
+                f'{"WHERE " + where if where else ""} '
+                f'ORDER BY c.created_at DESC, c.id DESC LIMIT ?',
+                params + [limit + 1]
+            ).fetchall()
+        return self._page_result(rows, limit)
+
+    def iter_cards(self, template_id: Optional[str] = None, batch_size: int = 200,
+                   created_from: Optional[str] = None, created_before: Optional[str] = None) -> Iterator[Dict]:
+        """按創建時間倒序逐批產出卡片（每批一次索引查詢，不長期持有連接）"""
+        cursor = None
+        while True:
+            page = self.list_cards(template_id, batch_size, cursor, created_from, created_before)
+            yield from page['cards']
+            cursor = page['next_cursor']
+            if cursor is None:
+                break
+
+    def search(self, query: str, template_id: Optional[str] = None, limit: int = 50,
+               cursor: Optional[str] = None) -> Dict:
+        """子串搜索卡片數據，按創建時間倒序分頁"""
+        query_lower = query.lower()
+        where, params = self._page_clause(template_id, cursor)
+
+        if self.has_fts and len(query_lower) >= TRIGRAM_MIN_QUERY:
+            # trigram 分詞下，整串引號短語即為子串匹配
+            sql = (
+                'SELECT c.payload, c.created_at, c.id FROM anchor_card_fts f '
+                'JOIN anchor_cards c ON c.rowid = f.rowid '
+                'WHERE anchor_card_fts MATCH ?'
+            )
+            params = ['"' + query_lower.replace('"', '""') + '"'] + params
+        else:
+            sql = (
+                'SELECT c.payload, c.created_at, c.id FROM anchor_cards c '
+                'WHERE instr(c.search_text, ?) > 0'
+            )
+            params = [query_lower] + params
+
+        if where:
+            sql += f' AND {where}'
+        sql += ' ORDER BY c.created_at DESC, c.id DESC LIMIT ?'
+
+        with self._connect() as conn:
+            rows = conn.execute(sql, params + [limit + 1]).fetchall()
+        return self._page_result(rows, limit)
+
+    def get_statistics(self, today_start: str, week_ago: str, month_ago: str) -> Dict:
+        """按模板計數與近期活動（索引上的聚合，不載入卡片）"""
+        with self._connect() as conn:
+            cards_by_template = dict(conn.execute(
+                'SELECT template_id, COUNT(*) FROM anchor_cards GROUP BY template_id'
+            ).fetchall())
+            today, this_week, this_month = (
+                conn.execute('SELECT COUNT(*) FROM anchor_cards WHERE created_at >= ?', (since,)).fetchone()[0]
+                for since in (today_start, week_ago, month_ago)
+            )
+        return {
+            'total_cards': sum(cards_by_template.values()),
+            'cards_by_template': cards_by_template,
+            'recent_activity': {
+                'today': today,
+                'this_week': this_week,
+                'this_month': this_month
+            }
+        }
@@ -0,0 +1,141 @@
+# -*- coding: utf-8 -*-
+"""
+語靈夥伴倉庫
+夥伴記錄保存在 SQLite（WAL）單一檔案中，取代每個夥伴一個 JSON 檔案：
+
+- 記錄按寫入順序存放，ID 唯一索引讓按 ID 讀取為一次索引查找（隨機 ID 不會打散大型記錄）
+- (companion_recipient, created_at, id) 索引支援按受贈者列出，不再列目錄並逐檔開啟過濾
+- 批量寫入在同一個交易中以 executemany 完成
+- 首次啟動時把舊版目錄中的 JSON 檔案一次性匯入
+"""
+
+import glob
+import json
+import os
+import sqlite3
+from typing import Dict, Iterable, List, Optional
+
+# 舊版每個夥伴一個檔案的目錄
+LEGACY_COMPANION_DIR = 'data/spirit_companions'
+COMPANION_DB_PATH = 'data/spirit_companions/companions.db'
+
+_INSERT_COLUMNS = ('INTO spirit_companions (id, companion_recipient, wish_master, companion_type, created_at, payload) '
+                   'VALUES (?, ?, ?, ?, ?, ?)')
+_PAYLOAD_ENCODER = json.JSONEncoder(ensure_ascii=False, separators=(',', ':'))
+
+
+def _companion_row(companion: Dict) -> tuple:
+    return (
+        companion['id'],
+        companion.get('companion_recipient', ''),
+        companion.get('wish_master', ''),
+        companion.get('type', ''),
+        companion.get('creation_date', ''),
+        _PAYLOAD_ENCODER.encode(companion)
+    )
+
+
+class CompanionRepository:
+    """語靈夥伴倉庫 - SQLite 存儲，ID 與受贈者索引"""
+
+    def __init__(self, db_path: str = COMPANION_DB_PATH, legacy_dir: Optional[str] = LEGACY_COMPANION_DIR):
+        self.db_path = db_path
+        self.legacy_dir = legacy_dir
+        os.makedirs(os.path.dirname(os.path.abspath(db_path)), exist_ok=True)
+        self.init_database()
+
+    def _connect(self) -> sqlite3.Connection:
+        conn = sqlite3.connect(self.db_path)
+        conn.execute('PRAGMA synchronous=NORMAL')
+        return conn
+
+    def init_database(self):
+        """初始化資料表，並匯入舊版 JSON 檔案（只執行一次）"""
+        with self._connect() as conn:
+            conn.execute('PRAGMA journal_mode=WAL')
+            conn.executescript('''
+                CREATE TABLE IF NOT EXISTS spirit_companions (
+                    id TEXT NOT NULL UNIQUE,
+                    companion_recipient TEXT NOT NULL,
+                    wish_master TEXT NOT NULL,
+                    companion_type TEXT NOT NULL,
+                    created_at TEXT NOT NULL,
+                    payload TEXT NOT NULL
+                );
+                CREATE INDEX IF NOT EXISTS idx_companion_recipient
+                    ON spirit_companions(companion_recipient, created_at, id);
+                CREATE TABLE IF NOT EXISTS spirit_companion_meta (
+                    key TEXT PRIMARY KEY,
+                    value TEXT NOT NULL
+                );
+            ''')
+            imported = conn.execute(
+                "SELECT value FROM spirit_companion_meta WHERE key = 'legacy_imported'"
+            ).fetchone()
+            if imported is None:
+                self._import_legacy(conn)
+                conn.execute(
+                    "INSERT OR REPLACE INTO spirit_companion_meta (key, value) VALUES ('legacy_imported', '1')"
+                )
+
+    def _import_legacy(self, conn: sqlite3.Connection) -> int:
+        if not self.legacy_dir or not os.path.isdir(self.legacy_dir):
+            return 0
+        rows = []
+        for path in glob.glob(os.path.join(self.legacy_dir, '*.json')):
+            try:
+                with open(path, 'r', encoding='utf-8') as f:
+                    companion = json.load(f)
+            except (OSError, ValueError):
+                continue
+            if isinstance(companion, dict) and companion.get('id'):
+                rows.append(_companion_row(companion))
+        conn.executemany('INSERT OR IGNORE ' + _INSERT_COLUMNS, rows)
+        return len(rows)
+
+    # === 寫入 ===
+
+    def save(self, companion: Dict) -> Dict:
+        with self._connect() as conn:
+            conn.execute('INSERT OR REPLACE ' + _INSERT_COLUMNS,
+                         _companion_row(companion))
+        return companion
+
+    def save_many(self, companions: Iterable[Dict]) -> int:
+        """同一交易批量寫入；ID 重複時整批回滾"""
+        rows = [_companion_row(companion) for companion in companions]
+        with self._connect() as conn:
+            try:
+                conn.executemany('INSERT ' + _INSERT_COLUMNS, rows)
+            except sqlite3.IntegrityError:
+                raise ValueError('語靈夥伴ID重複，批量寫入已取消')
+        return len(rows)
+
+    # === 讀取 ===
+
+    def get(self, companion_id: str) -> Optional[Dict]:
+        with self._connect() as conn:
+            row = conn.execute(
+                'SELECT payload FROM spirit_companions WHERE id = ?', (companion_id,)
+            ).fetchone()
+        return json.loads(row[0]) if row else None
+
+    def list_by_recipient(self, recipient: str, limit: Optional[int] = None) -> List[Dict]:
+        """按創建時間順序列出受贈者的夥伴"""
+        sql = ('SELECT payload FROM spirit_companions WHERE companion_recipient = ? '
+               'ORDER BY created_at, id')
+        params: list = [recipient]
+        if limit is not None:
+            sql += ' LIMIT ?'
+            params.append(limit)
+        with self._connect() as conn:
+            rows = conn.execute(sql, params).fetchall()
+        return [json.loads(payload) for payload, in rows]
+
+    def count(self, recipient: Optional[str] = None) -> int:
+        with self._connect() as conn:
+            if recipient is None:
+                return conn.execute('SELECT COUNT(*) FROM spirit_companions').fetchone()[0]
+            return conn.execute(
+                'SELECT COUNT(*) FROM spirit_companions WHERE companion_recipient = ?', (recipient,)
+            ).fetchone()[0]
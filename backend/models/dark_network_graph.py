@@ -0,0 +1,405 @@
+# -*- coding: utf-8 -*-
+"""
+暗域網絡圖存儲
+節點與連接保存在 SQLite（WAL）中，多個 worker 共用同一檔案並持久化到磁碟：
+
+- dark_nodes：節點狀態（JSON）+ 狀態、類型、意識等級、連接數等可索引欄位
+- dark_edges：鄰接表，每條連接存兩個方向，(src, dst) 主鍵即為鄰居索引
+- dark_network_stats：總節點、活躍節點、活躍連接、覺醒節點、意識等級總和，
+  由觸發器在寫入時增量維護，網絡狀態查詢只讀一行，與節點數量無關
+"""
+
+import json
+import os
+import sqlite3
+from typing import Callable, Dict, Iterable, Iterator, List, Optional, Tuple
+
+# 意識等級對應分值（集體意識按活躍節點平均分值判定）
+CONSCIOUSNESS_SCORES = {
+    "dormant": 0,
+    "awakening": 1,
+    "aware": 2,
+    "awakened": 3,
+    "enlightened": 4,
+    "cosmic": 5
+}
+
+# 連通分量查詢時單個分量最多返回的節點數
+MAX_COMPONENT_NODES = 10000
+
+# 批量寫入每批的行數（不超過 SQLite 單語句參數上限）
+BATCH_SIZE = 500
+
+# 節點對各計數器的貢獻（觸發器中以 NEW / OLD 代入）
+_CONTRIBUTION = {
+    'active_nodes': "({r}.status = 'active')",
+    'active_connections': "({r}.status = 'active') * {r}.degree",
+    'awakened_nodes': "({r}.status = 'active' AND {r}.consciousness_level IN ('awakened', 'enlightened'))",
+    'reality_programming_nodes': "({r}.status = 'active' AND {r}.node_type = 'reality_programming')",
+    'consciousness_score_sum': "({r}.status = 'active') * {r}.consciousness_score",
+}
+
+
+def _stats_update(sign_old: Optional[str], sign_new: Optional[str], total_delta: int) -> str:
+    assignments = [f'total_nodes = total_nodes + ({total_delta})']
+    for column, expression in _CONTRIBUTION.items():
+        terms = [column]
+        if sign_old:
+            terms.append(f"- {expression.format(r='OLD')}")
+        if sign_new:
+            terms.append(f"+ {expression.format(r='NEW')}")
+        assignments.append(f"{column} = {' '.join(terms)}")
+    return f"UPDATE dark_network_stats SET {', '.join(assignments)} WHERE id = 1;"
+
+
+class DarkNetworkGraph:
+    """暗域網絡圖存儲
+
+    encode / decode 負責節點對象與 JSON 狀態的轉換（不含連接，連接以鄰接表保存）。
+    """
+
+    def __init__(self, db_path: str, encode: Callable[[object], Dict], decode: Callable[[Dict], object]):
+        self.db_path = db_path
+        self._encode = encode
+        self._decode = decode
+        os.makedirs(os.path.dirname(os.path.abspath(db_path)), exist_ok=True)
+        self.init_database()
+
+    def _connect(self) -> sqlite3.Connection:
+        conn = sqlite3.connect(self.db_path, timeout=30)
+        conn.execute('PRAGMA synchronous=NORMAL')
+        return conn
+
+    def init_database(self):
+        """初始化節點表、鄰接表與計數觸發器"""
+        with self._connect() as conn:
+            conn.execute('PRAGMA journal_mode=WAL')
+            conn.executescript(f'''
+                CREATE TABLE IF NOT EXISTS dark_nodes (
+                    node_id TEXT PRIMARY KEY,
+                    node_type TEXT NOT NULL,
+                    status TEXT NOT NULL,
+                    consciousness_level TEXT NOT NULL,
+                    consciousness_score INTEGER NOT NULL DEFAULT 0,
+                    degree INTEGER NOT NULL DEFAULT 0,
+                    payload TEXT NOT NULL
+                ) WITHOUT ROWID;
+
+                CREATE TABLE IF NOT EXISTS dark_edges (
+                    src TEXT NOT NULL,
+                    dst TEXT NOT NULL,
+                    connection_type TEXT NOT NULL,
+                    established_at TEXT NOT NULL,
+                    PRIMARY KEY (src, dst)
+                ) WITHOUT ROWID;
+
+                CREATE TABLE IF NOT EXISTS dark_network_stats (
+                    id INTEGER PRIMARY KEY CHECK (id = 1),
+                    total_nodes INTEGER NOT NULL DEFAULT 0,
+                    active_nodes INTEGER NOT NULL DEFAULT 0,
+                    active_connections INTEGER NOT NULL DEFAULT 0,
+                    awakened_nodes INTEGER NOT NULL DEFAULT 0,
+                    reality_programming_nodes INTEGER NOT NULL DEFAULT 0,
+                    consciousness_score_sum INTEGER NOT NULL DEFAULT 0
+                );
+                INSERT OR IGNORE INTO dark_network_stats (id) VALUES (1);
+
+                CREATE TRIGGER IF NOT EXISTS dark_nodes_ai AFTER INSERT ON dark_nodes BEGIN
+                    {_stats_update(None, 'NEW', 1)}
+                END;
+
+                CREATE TRIGGER IF NOT EXISTS dark_nodes_ad AFTER DELETE ON dark_nodes BEGIN
+                    {_stats_update('OLD', None, -1)}
+                    DELETE FROM dark_edges WHERE src = OLD.node_id OR dst = OLD.node_id;
+                END;
+
+                CREATE TRIGGER IF NOT EXISTS dark_nodes_au AFTER UPDATE ON dark_nodes BEGIN
+                    {_stats_update('OLD', 'NEW', 0)}
+                END;
+
+                CREATE TRIGGER IF NOT EXISTS dark_edges_ai AFTER INSERT ON dark_edges BEGIN
+                    UPDATE dark_nodes SET degree = degree + 1 WHERE node_id = NEW.src;
+                END;
+
+                CREATE TRIGGER IF NOT EXISTS dark_edges_ad AFTER DELETE ON dark_edges BEGIN
+                    UPDATE dark_nodes SET degree = degree - 1 WHERE node_id = OLD.src;
+                END;
+            ''')
+
+    # === 節點 ===
+
+    def _node_row(self, node) -> Tuple:
+        state = self._encode(node)
+        state.pop('network_connections', None)
+        state.pop('connection_count', None)
+        level = state.get('consciousness_level', 'dormant')
+        return (
+            state['node_id'], state.get('node_type', 'standard'), state.get('status', 'active'),
+            level, CONSCIOUSNESS_SCORES.get(level, 0), json.dumps(state, ensure_ascii=False)
+        )
+
+    def _load(self, payload: str, degree: int):
+        state = json.loads(payload)
+        state['network_connections'] = []
+        state['connection_count'] = degree
+        return self._decode(state)
+
+    def add_nodes(self, nodes: Iterable) -> int:
+        """批量新增節點（單一事務，已存在的節點 ID 拋 ValueError 並整批回滾）"""
+        added = 0
+        with self._connect() as conn:
+            batch = []
+            for node in nodes:
+                batch.append(self._node_row(node))
+                if len(batch) >= BATCH_SIZE:
+                    added += self._insert_nodes(conn, batch)
+                    batch = []
+            if batch:
+                added += self._insert_nodes(conn, batch)
+        return added
+
+    @staticmethod
+    def _insert_nodes(conn: sqlite3.Connection, rows: List[Tuple]) -> int:
+        node_ids = [row[0] for row in rows]
+        existing = conn.execute(
+            f"SELECT node_id FROM dark_nodes WHERE node_id IN ({','.join('?' * len(node_ids))}) LIMIT 1",
+            node_ids
+        ).fetchone()
+        if existing:
+            raise ValueError(f"節點 {existing[0]} 已存在")
+        try:
+            conn.executemany('''
+                INSERT INTO dark_nodes (node_id, node_type, status, consciousness_level, consciousness_score, payload)
+                VALUES (?, ?, ?, ?, ?, ?)
+            ''', rows)
+        except sqlite3.IntegrityError:
+            # 與其他 worker 並發寫入同一節點ID
+            raise ValueError("節點已存在")
+        return len(rows)
+
+    def save_node(self, node):
+        """新增或更新節點狀態（連接數由鄰接表維護，不受影響）"""
+        node_id, node_type, status, level, score, payload = self._node_row(node)
+        with self._connect() as conn:
+            conn.execute('''
+                INSERT INTO dark_nodes (node_id, node_type, status, consciousness_level, consciousness_score, payload)
+                VALUES (?, ?, ?, ?, ?, ?)
+                ON CONFLICT(node_id) DO UPDATE SET
+                    node_type = excluded.node_type,
+                    status = excluded.status,
+                    consciousness_level = excluded.consciousness_level,
+                    consciousness_score = excluded.consciousness_score,
+                    payload = excluded.payload
+            ''', (node_id, node_type, status, level, score, payload))
+
+    def remove_node(self, node_id: str) -> bool:
+        with self._connect() as conn:
+            return conn.execute('DELETE FROM dark_nodes WHERE node_id = ?', (node_id,)).rowcount > 0
+
+    def get_node(self, node_id: str, with_connections: bool = False):
+        with self._connect() as conn:
+            row = conn.execute('SELECT payload, degree FROM dark_nodes WHERE node_id = ?', (node_id,)).fetchone()
+            if not row:
+                return None
+            node = self._load(*row)
+            if with_connections:
+                node.network_connections = [
+                    self.connection_dict(dst, connection_type, established_at)
+                    for dst, connection_type, established_at in conn.execute(
+                        'SELECT dst, connection_type, established_at FROM dark_edges WHERE src = ?', (node_id,))
+                ]
+        return node
+
+    def __contains__(self, node_id: str) -> bool:
+        with self._connect() as conn:
+            return conn.execute('SELECT 1 FROM dark_nodes WHERE node_id = ?', (node_id,)).fetchone() is not None
+
+    def __len__(self) -> int:
+        return self.get_stats()['total_nodes']
+
+    def list_nodes(self, limit: int = 100, after: Optional[str] = None) -> Tuple[List, Optional[str]]:
+        """按節點 ID 分頁，返回 (節點列表, 下一頁游標)；limit 至少為 1"""
+        limit = max(1, int(limit))
+        with self._connect() as conn:
+            rows = conn.execute(
+                'SELECT node_id, payload, degree FROM dark_nodes WHERE node_id > ? ORDER BY node_id LIMIT ?',
+                (after or '', limit + 1)
+            ).fetchall()
+        next_cursor = rows[limit - 1][0] if len(rows) > limit else None
+        return [self._load(payload, degree) for _, payload, degree in rows[:limit]], next_cursor
+
+    def iter_nodes(self, batch_size: int = BATCH_SIZE) -> Iterator:
+        after = None
+        while True:
+            nodes, after = self.list_nodes(batch_size, after)
+            yield from nodes
+            if after is None:
+                break
+
+    # === 連接 ===
+
+    @staticmethod
+    def connection_dict(target_node: str, connection_type: str, established_at: str) -> Dict:
+        return {
+            "target_node": target_node,
+            "connection_type": connection_type,
+            "established_at": established_at,
+            "encryption_level": "quantum_grade",
+            "bandwidth": "unlimited",
+            "latency": "0.001ms",
+            "status": "active"
+        }
+
+    def connect(self, pairs: Iterable[Tuple[str, str, str, str]]) -> Dict[str, int]:
+        """批量建立雙向連接 (node1, node2, 連接類型, 建立時間)
+
+        節點不存在時拋 ValueError 並整批回滾；已存在的連接只更新類型與時間。
+        """
+        created = updated = 0
+        with self._connect() as conn:
+            for node1, node2, connection_type, established_at in pairs:
+                if node1 == node2:
+                    raise ValueError(f"節點 {node1} 不能與自身連接")
+                found = conn.execute(
+                    'SELECT COUNT(*) FROM dark_nodes WHERE node_id IN (?, ?)', (node1, node2)
+                ).fetchone()[0]
+                if found < 2:
+                    raise ValueError(f"節點不存在: {node1} / {node2}")
+                for src, dst in ((node1, node2), (node2, node1)):
+                    cursor = conn.execute('''
+                        INSERT INTO dark_edges (src, dst, connection_type, established_at) VALUES (?, ?, ?, ?)
+                        ON CONFLICT(src, dst) DO NOTHING
+                    ''', (src, dst, connection_type, established_at))
+                    if cursor.rowcount:
+                        created += 1
+                    else:
+                        conn.execute(
+                            'UPDATE dark_edges SET connection_type = ?, established_at = ? WHERE src = ? AND dst = ?',
+                            (connection_type, established_at, src, dst)
+                        )
+                        updated += 1
+        return {'created': created // 2, 'updated': updated // 2}
+
+    def neighbors(self, node_id: str) -> List[str]:
+        with self._connect() as conn:
+            return [dst for (dst,) in conn.execute('SELECT dst FROM dark_edges WHERE src = ?', (node_id,))]
+
+    # === 圖查詢 ===
+
+    def _expand(self, conn: sqlite3.Connection, frontier: List[str]) -> Iterator[Tuple[str, str]]:
+        """一層 BFS 擴展，產出 (父節點, 鄰居)"""
+        for start in range(0, len(frontier), 500):
+            chunk = frontier[start:start + 500]
+            placeholders = ','.join('?' * len(chunk))
+            yield from conn.execute(f'SELECT src, dst FROM dark_edges WHERE src IN ({placeholders})', chunk)
+
+    def shortest_path(self, source: str, target: str, max_depth: int = 64) -> Optional[List[str]]:
+        """雙向 BFS 求無權最短路徑，不可達或超過 max_depth 跳時返回 None"""
+        if source not in self or target not in self:
+            raise ValueError("節點不存在")
+        if source == target:
+            return [source]
+
+        parents = ({source: None}, {target: None})
+        frontiers = ([source], [target])
+        with self._connect() as conn:
+            for _ in range(max_depth):
+                # 先擴展較小的一側
+                side = 0 if len(frontiers[0]) <= len(frontiers[1]) else 1
+                seen, other = parents[side], parents[1 - side]
+                next_frontier = []
+                for parent, neighbor in self._expand(conn, frontiers[side]):
+                    if neighbor in seen:
+                        continue
+                    seen[neighbor] = parent
+                    if neighbor in other:
+                        return self._join_path(parents, neighbor)
+                    next_frontier.append(neighbor)
+                if not next_frontier:
+                    return None
+                frontiers = (next_frontier, frontiers[1]) if side == 0 else (frontiers[0], next_frontier)
+        return None
+
+    @staticmethod
+    def _join_path(parents: Tuple[Dict, Dict], meeting: str) -> List[str]:
+        forward, node = [], meeting
+        while node is not None:
+            forward.append(node)
+            node = parents[0][node]
+        forward.reverse()
+        node = parents[1][meeting]
+        while node is not None:
+            forward.append(node)
+            node = parents[1][node]
+        return forward
+
+    def connected_component(self, node_id: str, limit: int = MAX_COMPONENT_NODES) -> Dict:
+        """節點所在連通分量（超過 limit 個節點時截斷）"""
+        if node_id not in self:
+            raise ValueError("節點不存在")
+        seen = {node_id}
+        frontier = [node_id]
+        truncated = False
+        with self._connect() as conn:
+            while frontier and not truncated:
+                next_frontier = []
+                for _, neighbor in self._expand(conn, frontier):
+                    if neighbor not in seen:
+                        if len(seen) >= limit:
+                            truncated = True
+                            break
+                        seen.add(neighbor)
+                        next_frontier.append(neighbor)
+                frontier = next_frontier
+        return {'node_id': node_id, 'size': len(seen), 'truncated': truncated, 'nodes': sorted(seen)}
+
+    def component_summary(self, top: int = 10) -> Dict:
+        """全圖連通分量統計（並查集，一次順序掃描鄰接表）"""
+        parent: Dict[str, str] = {}
+
+        def find(node: str) -> str:
+            root = node
+            while parent[root] != root:
+                root = parent[root]
+            while node != root:
+                parent[node], node = root, parent[node]
+            return root
+
+        conn = self._connect()
+        try:
+            for src, dst in conn.execute('SELECT src, dst FROM dark_edges WHERE src < dst'):
+                parent.setdefault(src, src)
+                parent.setdefault(dst, dst)
+                root_src, root_dst = find(src), find(dst)
+                if root_src != root_dst:
+                    parent[root_src] = root_dst
+            total_nodes = conn.execute('SELECT total_nodes FROM dark_network_stats WHERE id = 1').fetchone()[0]
+        finally:
+            conn.close()
+
+        sizes: Dict[str, int] = {}
+        for node in list(parent):
+            root = find(node)
+            sizes[root] = sizes.get(root, 0) + 1
+        connected_nodes = sum(sizes.values())
+        isolated = total_nodes - connected_nodes
+        largest = sorted(sizes.values(), reverse=True)[:top]
+        return {
+            'component_count': len(sizes) + isolated,
+            'isolated_nodes': isolated,
+            'largest_components': largest
+        }
+
+    # === 統計 ===
+
+    def get_stats(self) -> Dict[str, int]:
+        """增量維護的網絡計數（單行讀取）"""
+        with self._connect() as conn:
+            row = conn.execute('''
+                SELECT total_nodes, active_nodes, active_connections, awakened_nodes,
+                       reality_programming_nodes, consciousness_score_sum
+                FROM dark_network_stats WHERE id = 1
+            ''').fetchone()
+        keys = ('total_nodes', 'active_nodes', 'active_connections', 'awakened_nodes',
+                'reality_programming_nodes', 'consciousness_score_sum')
+        return dict(zip(keys, row))
@@ -0,0 +1,190 @@
+# -*- coding: utf-8 -*-
+"""
+願頻探測網絡圖
+節點與帶權有向邊保存在記憶體鄰接表中，最短路徑以單源 Dijkstra 求出整棵最短路徑樹並快取：
+同一起點之後的所有查詢只需沿前驅回溯，不再重新計算。
+
+- 地圖變更（新增節點 / 邊）時遞增版本號並清空快取
+- 快取按最近使用淘汰，最多保留 max_cached_sources 棵樹，節點上千時記憶體仍可控
+- precompute() 可在啟動時預先計算全部（或指定）起點，至多計算到快取上限（超出的樹會立即被淘汰）
+"""
+
+import heapq
+import math
+import threading
+from collections import OrderedDict
+from typing import Any, Dict, Iterable, List, Optional, Sequence, Tuple
+
+# 最多快取的最短路徑樹數量
+DEFAULT_CACHED_SOURCES = 1024
+
+
+def validate_weight(weight: Any) -> float:
+    """邊權重必須是有限的非負數"""
+    if weight is None or isinstance(weight, bool):
+        raise ValueError('邊權重必須為數字')
+    try:
+        weight = float(weight)
+    except (TypeError, ValueError):
+        raise ValueError('邊權重必須為數字')
+    if not math.isfinite(weight):
+        raise ValueError('邊權重必須為有限數值')
+    if weight < 0:
+        raise ValueError('邊權重不能為負數')
+    return weight
+
+
+class ExplorationGraph:
+    """帶權有向圖 + 快取的單源最短路徑"""
+
+    def __init__(self, max_cached_sources: int = DEFAULT_CACHED_SOURCES):
+        self.max_cached_sources = max_cached_sources
+        self._lock = threading.Lock()
+        self._nodes: Dict[str, Dict[str, Any]] = {}
+        self._adjacency: Dict[str, Dict[str, float]] = {}
+        self._edge_count = 0
+        self._version = 0
+        # 起點 -> (距離表, 前驅表)
+        self._trees: "OrderedDict[str, Tuple[Dict[str, float], Dict[str, str]]]" = OrderedDict()
+
+    # === 地圖 ===
+
+    def _touch(self):
+        self._version += 1
+        self._trees.clear()
+
+    def add_node(self, node_id: str, attributes: Optional[Dict[str, Any]] = None) -> bool:
+        """新增或更新節點屬性，返回是否為新節點（屬性以字典傳入，可含任意鍵）"""
+        with self._lock:
+            created = node_id not in self._nodes
+            self._nodes.setdefault(node_id, {}).update(attributes or {})
+            self._adjacency.setdefault(node_id, {})
+            if created:
+                self._touch()
+            return created
+
+    def add_edge(self, src: str, dst: str, weight: float = 1.0, bidirectional: bool = False) -> None:
+        """新增（或更新權重）一條邊；端點必須已存在"""
+        weight = validate_weight(weight)
+        if src == dst:
+            raise ValueError('不能連接節點自身')
+        with self._lock:
+            for node_id in (src, dst):
+                if node_id not in self._nodes:
+                    raise ValueError(f'未知節點: {node_id}')
+            pairs = [(src, dst), (dst, src)] if bidirectional else [(src, dst)]
+            for a, b in pairs:
+                if b not in self._adjacency[a]:
+                    self._edge_count += 1
+                self._adjacency[a][b] = weight
+            self._touch()
+
+    def add_path(self, sequence: Sequence[str], weight: float = 1.0) -> None:
+        """沿序列依次連接相鄰節點"""
+        for src, dst in zip(sequence, sequence[1:]):
+            if src != dst:
+                self.add_edge(src, dst, weight)
+
+    def __contains__(self, node_id: str) -> bool:
+        return node_id in self._nodes
+
+    def __len__(self) -> int:
+        return len(self._nodes)
+
+    @property
+    def edge_count(self) -> int:
+        return self._edge_count
+
+    def node(self, node_id: str) -> Optional[Dict[str, Any]]:
+        return self._nodes.get(node_id)
+
+    def nodes(self) -> Dict[str, Dict[str, Any]]:
+        return self._nodes
+
+    def neighbors(self, node_id: str) -> Dict[str, float]:
+        return dict(self._adjacency.get(node_id, {}))
+
+    # === 最短路徑 ===
+
+    def _dijkstra(self, source: str) -> Tuple[Dict[str, float], Dict[str, str]]:
+        adjacency = self._adjacency
+        dist = {source: 0.0}
+        prev: Dict[str, str] = {}
+        heap = [(0.0, source)]
+        done = set()
+        while heap:
+            d, node = heapq.heappop(heap)
+            if node in done:
+                continue
+            done.add(node)
+            for neighbor, weight in adjacency[node].items():
+                candidate = d + weight
+                if candidate < dist.get(neighbor, float('inf')):
+                    dist[neighbor] = candidate
+                    prev[neighbor] = node
+                    heapq.heappush(heap, (candidate, neighbor))
+        return dist, prev
+
+    def _tree(self, source: str) -> Tuple[Dict[str, float], Dict[str, str]]:
+        with self._lock:
+            tree = self._trees.get(source)
+            if tree is not None:
+                self._trees.move_to_end(source)
+                return tree
+            tree = self._dijkstra(source)
+            self._trees[source] = tree
+            while len(self._trees) > self.max_cached_sources:
+                self._trees.popitem(last=False)
+            return tree
+
+    def shortest_path(self, src: str, dst: str) -> Optional[Tuple[List[str], float]]:
+        """返回 (路徑, 總權重)；不可達時返回 None"""
+        for node_id in (src, dst):
+            if node_id not in self._nodes:
+                raise ValueError(f'未知節點: {node_id}')
+        dist, prev = self._tree(src)
+        if dst not in dist:
+            return None
+        path = [dst]
+        while path[-1] != src:
+            path.append(prev[path[-1]])
+        path.reverse()
+        return path, dist[dst]
+
+    def route(self, waypoints: Sequence[str]) -> Optional[Dict[str, Any]]:
+        """依序經過各途經點的最優路線；任一段不可達時返回 None"""
+        if len(waypoints) < 2:
+            raise ValueError('路線至少需要起點與終點')
+        path: List[str] = [waypoints[0]]
+        legs = []
+        total = 0.0
+        for src, dst in zip(waypoints, waypoints[1:]):
+            found = self.shortest_path(src, dst)
+            if found is None:
+                return None
+            leg_path, cost = found
+            legs.append({'from': src, 'to': dst, 'path': leg_path, 'cost': cost, 'hops': len(leg_path) - 1})
+            path.extend(leg_path[1:])
+            total += cost
+        return {
+            'path': path,
+            'cost': total,
+            'hops': len(path) - 1,
+            'legs': legs
+        }
+
+    def precompute(self, sources: Optional[Iterable[str]] = None) -> int:
+        """預先計算指定（預設全部）起點的最短路徑樹，至多 max_cached_sources 個，返回計算數量"""
+        sources = list(self._nodes if sources is None else sources)[:self.max_cached_sources]
+        for source in sources:
+            self._tree(source)
+        return len(sources)
+
+    def stats(self) -> Dict[str, int]:
+        with self._lock:
+            return {
+                'nodes': len(self._nodes),
+                'edges': self._edge_count,
+                'cached_sources': len(self._trees),
+                'version': self._version
+            }
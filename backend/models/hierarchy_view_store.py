@@ -0,0 +1,269 @@
+# -*- coding: utf-8 -*-
+"""
+層級卡片物化視圖
+每個層級（一本書）的記錄、主卡片與全部章節卡片合併保存為一份視圖快照，讀取時只需開啟一個檔案；
+記憶體快取按快照與進度日誌的 (mtime, 大小) 驗證，其他進程寫入後自動重新載入。
+
+- 學習進度以追加方式寫入進度日誌（每次更新一行），完成計數按增量調整，不再重寫整份層級記錄
+- 單張卡片復習後同樣追加一行（整張卡片），只替換視圖中的該卡片，不重建整個層級
+- 日誌超過 PROGRESS_COMPACT_THRESHOLD 行時合併回層級記錄與快照並清空
+- 舊層級沒有快照時，從層級記錄與卡片檔案重建一次
+"""
+
+import json
+import os
+import threading
+from collections import OrderedDict
+from datetime import datetime
+from typing import Any, Callable, Dict, List, Optional, Tuple
+
+# 進度日誌合併閾值（行）
+PROGRESS_COMPACT_THRESHOLD = 256
+# 記憶體中保留的視圖數量
+DEFAULT_CACHED_VIEWS = 64
+
+# 主卡片與章節卡片在總進度中的權重
+MASTER_WEIGHT = 0.3
+CHAPTERS_WEIGHT = 0.7
+
+
+def _write_json(path: str, data: Any, indent: Optional[int] = 2):
+    tmp_path = f'{path}.{os.getpid()}.tmp'
+    with open(tmp_path, 'w', encoding='utf-8') as f:
+        json.dump(data, f, ensure_ascii=False, indent=indent)
+    os.replace(tmp_path, path)
+
+
+def _file_signature(path: str) -> Optional[Tuple[int, int]]:
+    try:
+        stat = os.stat(path)
+    except FileNotFoundError:
+        return None
+    return stat.st_mtime_ns, stat.st_size
+
+
+def calculate_overall_progress(master_completed: bool, completed_chapters: int, total_chapters: int) -> float:
+    """主卡片佔 30%，章節按完成比例佔 70%"""
+    overall_progress = 0
+    if master_completed:
+        overall_progress += MASTER_WEIGHT * 100
+    if total_chapters:
+        overall_progress += (completed_chapters / total_chapters) * CHAPTERS_WEIGHT * 100
+    return round(overall_progress, 1)
+
+
+class _HierarchyView:
+    """單個層級的視圖：記錄、卡片與卡片ID到章節序號的映射"""
+
+    __slots__ = ('hierarchy', 'master_card', 'child_cards', 'positions', 'signature', 'log_lines')
+
+    def __init__(self, hierarchy: Dict, master_card: Optional[Dict], child_cards: List[Dict]):
+        self.hierarchy = hierarchy
+        self.master_card = master_card
+        self.child_cards = child_cards
+        self.positions = {card_id: index for index, card_id in enumerate(hierarchy['child_card_ids'])}
+        self.signature = None
+        self.log_lines = 0
+        progress = hierarchy['progress_tracking']
+        progress['chapters_completed_count'] = sum(1 for done in progress['chapters_completed'] if done)
+
+    def apply(self, card_id: str, completed: bool, updated_at: str):
+        progress = self.hierarchy['progress_tracking']
+        completed = bool(completed)
+        if card_id == self.hierarchy['master_card_id']:
+            progress['master_completed'] = completed
+        elif card_id in self.positions:
+            index = self.positions[card_id]
+            previous = bool(progress['chapters_completed'][index])
+            if previous != completed:
+                progress['chapters_completed_count'] += 1 if completed else -1
+            progress['chapters_completed'][index] = completed
+        progress['overall_progress'] = calculate_overall_progress(
+            progress['master_completed'],
+            progress['chapters_completed_count'],
+            len(self.hierarchy['child_card_ids'])
+        )
+        self.hierarchy['updated_at'] = updated_at
+
+    def replace_card(self, card: Dict):
+        """以更新後的卡片替換視圖中的同ID卡片（不屬於此層級時忽略）"""
+        card_id = card.get('id')
+        if card_id == self.hierarchy['master_card_id']:
+            self.master_card = card
+            return
+        for index, existing in enumerate(self.child_cards):
+            if existing.get('id') == card_id:
+                self.child_cards[index] = card
+                return
+
+    def as_dict(self) -> Dict[str, Any]:
+        return {
+            'hierarchy': self.hierarchy,
+            'master_card': self.master_card,
+            'child_cards': self.child_cards
+        }
+
+
+class HierarchyViewStore:
+    """層級卡片視圖存儲"""
+
+    def __init__(self, data_dir: str, load_card: Callable[[str], Optional[Dict]],
+                 max_cached_views: int = DEFAULT_CACHED_VIEWS):
+        self.record_dir = os.path.join(data_dir, 'hierarchies')
+        self.view_dir = os.path.join(data_dir, 'hierarchy_views')
+        self.progress_dir = os.path.join(data_dir, 'hierarchy_progress')
+        for dir_path in (self.record_dir, self.view_dir, self.progress_dir):
+            os.makedirs(dir_path, exist_ok=True)
+        self.load_card = load_card
+        self.max_cached_views = max_cached_views
+        self._lock = threading.RLock()
+        self._views: "OrderedDict[str, _HierarchyView]" = OrderedDict()
+        self._ids: Optional[Tuple[int, List[str]]] = None
+
+    # === 路徑 ===
+
+    def _record_path(self, hierarchy_id: str) -> str:
+        return os.path.join(self.record_dir, f'{hierarchy_id}.json')
+
+    def _view_path(self, hierarchy_id: str) -> str:
+        return os.path.join(self.view_dir, f'{hierarchy_id}.json')
+
+    def _log_path(self, hierarchy_id: str) -> str:
+        return os.path.join(self.progress_dir, f'{hierarchy_id}.jsonl')
+
+    def _signature(self, hierarchy_id: str):
+        return _file_signature(self._view_path(hierarchy_id)), _file_signature(self._log_path(hierarchy_id))
+
+    # === 寫入 ===
+
+    def save(self, hierarchy: Dict, master_card: Dict, child_cards: List[Dict]) -> Dict[str, Any]:
+        """保存新層級：層級記錄與視圖快照各寫一次"""
+        hierarchy_id = hierarchy['hierarchy_id']
+        with self._lock:
+            view = _HierarchyView(hierarchy, master_card, child_cards)
+            _write_json(self._record_path(hierarchy_id), hierarchy)
+            _write_json(self._view_path(hierarchy_id), view.as_dict(), indent=None)
+            view.signature = self._signature(hierarchy_id)
+            self._remember(hierarchy_id, view)
+            return view.as_dict()
+
+    def _append_log(self, hierarchy_id: str, view: _HierarchyView, entry: Dict[str, Any]):
+        with open(self._log_path(hierarchy_id), 'a', encoding='utf-8') as f:
+            f.write(json.dumps(entry, ensure_ascii=False) + '\n')
+        view.log_lines += 1
+        if view.log_lines >= PROGRESS_COMPACT_THRESHOLD:
+            self._compact(hierarchy_id, view)
+        view.signature = self._signature(hierarchy_id)
+
+    def record_progress(self, hierarchy_id: str, card_id: str, completed: bool = True) -> Optional[Dict]:
+        """增量更新進度：追加一行日誌，必要時合併"""
+        with self._lock:
+            view = self._load(hierarchy_id)
+            if view is None:
+                return None
+            updated_at = datetime.now().isoformat()
+            view.apply(card_id, completed, updated_at)
+            self._append_log(hierarchy_id, view, {'card_id': card_id, 'completed': bool(completed), 'at': updated_at})
+            return view.hierarchy
+
+    def update_card(self, hierarchy_id: str, card: Dict):
+        """卡片內容變更（如復習）後只替換視圖中的該卡片，並追加一行日誌"""
+        with self._lock:
+            view = self._load(hierarchy_id)
+            if view is None:
+                return
+            view.replace_card(card)
+            self._append_log(hierarchy_id, view, {'card': card})
+
+    def _compact(self, hierarchy_id: str, view: _HierarchyView):
+        _write_json(self._record_path(hierarchy_id), view.hierarchy)
+        _write_json(self._view_path(hierarchy_id), view.as_dict(), indent=None)
+        open(self._log_path(hierarchy_id), 'w').close()
+        view.log_lines = 0
+
+    def invalidate(self, hierarchy_id: str):
+        """卡片內容變更後丟棄快照，下次讀取時從卡片檔案重建（進度日誌照常重放）"""
+        with self._lock:
+            self._views.pop(hierarchy_id, None)
+            try:
+                os.remove(self._view_path(hierarchy_id))
+            except FileNotFoundError:
+                pass
+
+    # === 讀取 ===
+
+    def _remember(self, hierarchy_id: str, view: _HierarchyView):
+        self._views[hierarchy_id] = view
+        self._views.move_to_end(hierarchy_id)
+        while len(self._views) > self.max_cached_views:
+            self._views.popitem(last=False)
+
+    def _rebuild(self, hierarchy_id: str) -> Optional[_HierarchyView]:
+        """從層級記錄與卡片檔案重建視圖並寫出快照"""
+        record_path = self._record_path(hierarchy_id)
+        if not os.path.exists(record_path):
+            return None
+        with open(record_path, 'r', encoding='utf-8') as f:
+            hierarchy = json.load(f)
+        master_card = self.load_card(hierarchy['master_card_id'])
+        child_cards = [card for card in map(self.load_card, hierarchy['child_card_ids']) if card is not None]
+        view = _HierarchyView(hierarchy, master_card, child_cards)
+        _write_json(self._view_path(hierarchy_id), view.as_dict(), indent=None)
+        return view
+
+    def _load(self, hierarchy_id: str) -> Optional[_HierarchyView]:
+        if not hierarchy_id or '/' in hierarchy_id or '\\' in hierarchy_id or hierarchy_id.startswith('.'):
+            return None
+        signature = self._signature(hierarchy_id)
+        view = self._views.get(hierarchy_id)
+        if view is not None and view.signature == signature:
+            self._views.move_to_end(hierarchy_id)
+            return view
+
+        if signature[0] is not None:
+            with open(self._view_path(hierarchy_id), 'r', encoding='utf-8') as f:
+                snapshot = json.load(f)
+            view = _HierarchyView(snapshot['hierarchy'], snapshot['master_card'], snapshot['child_cards'])
+        else:
+            view = self._rebuild(hierarchy_id)
+            if view is None:
+                return None
+
+        # 重放尚未合併的進度
+        log_path = self._log_path(hierarchy_id)
+        if os.path.exists(log_path):
+            with open(log_path, 'r', encoding='utf-8') as f:
+                for line in f:
+                    if not line.strip():
+                        continue
+                    entry = json.loads(line)
+                    if 'card' in entry:
+                        view.replace_card(entry['card'])
+                    else:
+                        view.apply(entry['card_id'], entry['completed'], entry['at'])
+                    view.log_lines += 1
+        view.signature = self._signature(hierarchy_id)
+        self._remember(hierarchy_id, view)
+        return view
+
+    def get(self, hierarchy_id: str) -> Optional[Dict[str, Any]]:
+        with self._lock:
+            view = self._load(hierarchy_id)
+            return view.as_dict() if view is not None else None
+
+    def ids(self) -> List[str]:
+        """全部層級ID（按目錄 mtime 快取）"""
+        mtime = os.stat(self.record_dir).st_mtime_ns
+        if self._ids is None or self._ids[0] != mtime:
+            names = sorted(name[:-5] for name in os.listdir(self.record_dir) if name.endswith('.json'))
+            self._ids = (mtime, names)
+        return self._ids[1]
+
+    def all(self) -> List[Dict[str, Any]]:
+        return [view for view in map(self.get, self.ids()) if view is not None]
+
+    def stats(self) -> Dict[str, int]:
+        return {
+            'hierarchies': len(self.ids()),
+            'cached_views': len(self._views)
+        }
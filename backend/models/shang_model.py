@@ -1,6 +1,6 @@
 from datetime import datetime
 from dataclasses import dataclass
-from typing import Optional, Dict, Any
+from typing import Optional, Dict, Any, Iterator
 import sqlite3
 import json
 
@@ -177,4 +177,29 @@ class ShangDatabase:
                 'SELECT * FROM shang_records ORDER BY date DESC LIMIT ?', 
                 (limit,)
             )
-            return [ShangRecord.from_dict(dict(row)) for row in cursor.fetchall()]
\ No newline at end of file
+            return [ShangRecord.from_dict(dict(row)) for row in cursor.fetchall()]
+    
+    def iter_records(self, start_date: Optional[str] = None, end_date: Optional[str] = None,
+                     batch_size: int = 200) -> Iterator[ShangRecord]:
+        """按日期升序逐批產出記錄，可限定日期閉區間"""
+        clauses, params = [], []
+        if start_date:
+            clauses.append('date >= ?')
+            params.append(start_date)
+        if end_date:
+            clauses.append('date <= ?')
+            params.append(end_date)
+        where = f"WHERE {' AND '.join(clauses)}" if clauses else ''
+        
+        conn = sqlite3.connect(self.db_path)
+        conn.row_factory = sqlite3.Row
+        try:
+            cursor = conn.execute(f'SELECT * FROM shang_records {where} ORDER BY date', params)
+            while True:
+                rows = cursor.fetchmany(batch_size)
+                if not rows:
+                    break
+                for row in rows:
+                    yield ShangRecord.from_dict(dict(row))
+        finally:
+            conn.close()
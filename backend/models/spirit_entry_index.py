@@ -0,0 +1,251 @@
+# -*- coding: utf-8 -*-
+"""
+語靈每日條目索引
+JSON 檔案仍是數據本體（便於 Obsidian 等外部工具直接讀寫），
+SQLite 表以日期為主鍵保存條目內容、檢索文本與字數，
+範圍查詢、搜索與統計都在索引上完成，不再逐檔開啟。
+按日期取條目時核對該檔案的 (mtime, 大小)，外部工具修改後立即生效；
+範圍查詢、搜索與統計前的整目錄核對在目錄 mtime 變化或超過 RESCAN_INTERVAL 時才進行。
+"""
+
+import json
+import os
+import sqlite3
+import threading
+import time
+from typing import Dict, Iterator, List, Optional, Tuple
+
+# 原地修改不改變目錄 mtime，整目錄核對最遲多久進行一次（秒）
+RESCAN_INTERVAL = 30.0
+
+
+def entry_word_count(entry: Dict) -> int:
+    """條目字數（內容 + 反思）"""
+    return len(entry.get('content', '') + entry.get('reflection', ''))
+
+
+def entry_search_text(entry: Dict) -> str:
+    """條目檢索文本（與原先的 json.dumps 全文匹配一致）"""
+    return json.dumps(entry, ensure_ascii=False).lower()
+
+
+class SpiritEntryIndex:
+    """語靈條目索引
+
+    統計數據由觸發器在寫入/刪除時增量維護，讀取統計只查一行。
+    """
+
+    def __init__(self, data_path: str, db_path: Optional[str] = None):
+        self.data_path = data_path
+        self.db_path = db_path or os.path.join(data_path, '.spirit_index.db')
+        self._sync_lock = threading.Lock()
+        self._last_sync = 0.0
+        self._last_dir_mtime = None
+        self.init_database()
+
+    def _connect(self) -> sqlite3.Connection:
+        conn = sqlite3.connect(self.db_path)
+        conn.execute('PRAGMA synchronous=NORMAL')
+        return conn
+
+    def init_database(self):
+        """初始化索引表與統計觸發器"""
+        with self._connect() as conn:
+            conn.execute('PRAGMA journal_mode=WAL')
+            conn.executescript('''
+                CREATE TABLE IF NOT EXISTS spirit_entries (
+                    date TEXT PRIMARY KEY,
+                    mtime_ns INTEGER NOT NULL,
+                    size INTEGER NOT NULL,
+                    word_count INTEGER NOT NULL DEFAULT 0,
+                    search_text TEXT NOT NULL DEFAULT '',
+                    payload TEXT NOT NULL
+                ) WITHOUT ROWID;
+
+                CREATE TABLE IF NOT EXISTS spirit_entry_stats (
+                    id INTEGER PRIMARY KEY CHECK (id = 1),
+                    total_entries INTEGER NOT NULL DEFAULT 0,
+                    total_word_count INTEGER NOT NULL DEFAULT 0
+                );
+                INSERT OR IGNORE INTO spirit_entry_stats (id) VALUES (1);
+
+                CREATE TRIGGER IF NOT EXISTS spirit_entries_ai AFTER INSERT ON spirit_entries BEGIN
+                    UPDATE spirit_entry_stats SET
+                        total_entries = total_entries + 1,
+                        total_word_count = total_word_count + NEW.word_count
+                    WHERE id = 1;
+                END;
+
+                CREATE TRIGGER IF NOT EXISTS spirit_entries_ad AFTER DELETE ON spirit_entries BEGIN
+                    UPDATE spirit_entry_stats SET
+                        total_entries = total_entries - 1,
+                        total_word_count = total_word_count - OLD.word_count
+                    WHERE id = 1;
+                END;
+
+                CREATE TRIGGER IF NOT EXISTS spirit_entries_au AFTER UPDATE OF word_count ON spirit_entries BEGIN
+                    UPDATE spirit_entry_stats SET
+                        total_word_count = total_word_count - OLD.word_count + NEW.word_count
+                    WHERE id = 1;
+                END;
+            ''')
+
+    # === 寫入 ===
+
+    @staticmethod
+    def _upsert(conn: sqlite3.Connection, date_str: str, entry: Dict, mtime_ns: int, size: int):
+        # ON CONFLICT DO UPDATE 觸發 UPDATE 觸發器（INSERT OR REPLACE 會走刪除+插入）
+        conn.execute('''
+            INSERT INTO spirit_entries (date, mtime_ns, size, word_count, search_text, payload)
+            VALUES (?, ?, ?, ?, ?, ?)
+            ON CONFLICT(date) DO UPDATE SET
+                mtime_ns = excluded.mtime_ns,
+                size = excluded.size,
+                word_count = excluded.word_count,
+                search_text = excluded.search_text,
+                payload = excluded.payload
+        ''', (
+            date_str, mtime_ns, size, entry_word_count(entry),
+            entry_search_text(entry), json.dumps(entry, ensure_ascii=False)
+        ))
+
+    def index_entry(self, date_str: str, entry: Dict, file_path: str):
+        """條目檔案寫入後更新索引"""
+        stat = os.stat(file_path)
+        with self._connect() as conn:
+            self._upsert(conn, date_str, entry, stat.st_mtime_ns, stat.st_size)
+
+    def remove_entry(self, date_str: str):
+        with self._connect() as conn:
+            conn.execute('DELETE FROM spirit_entries WHERE date = ?', (date_str,))
+
+    # === 與目錄核對 ===
+
+    def _entry_path(self, date_str: str) -> str:
+        return os.path.join(self.data_path, f'{date_str}.json')
+
+    def refresh_entry(self, date_str: str):
+        """核對單個條目檔案：(mtime, 大小) 變化時重新索引，檔案已刪除時移出索引"""
+        try:
+            stat = os.stat(self._entry_path(date_str))
+        except FileNotFoundError:
+            self.remove_entry(date_str)
+            return
+        with self._connect() as conn:
+            row = conn.execute('SELECT mtime_ns, size FROM spirit_entries WHERE date = ?', (date_str,)).fetchone()
+            if row == (stat.st_mtime_ns, stat.st_size):
+                return
+            try:
+                with open(self._entry_path(date_str), 'r', encoding='utf-8') as f:
+                    entry = json.load(f)
+            except (OSError, ValueError) as e:
+                print(f"索引條目失敗 {date_str}.json: {e}")
+                return
+            self._upsert(conn, date_str, entry, stat.st_mtime_ns, stat.st_size)
+
+    def sync(self, force: bool = False) -> Dict[str, int]:
+        """核對目錄與索引：新增/變更的檔案重新索引，已刪除的檔案移出索引
+
+        目錄 mtime 未變且距上次核對不足 RESCAN_INTERVAL 時直接跳過；
+        核對時只比較每個檔案的 (mtime, 大小)，未變化的檔案不會開啟。
+        """
+        with self._sync_lock:
+            dir_mtime = os.stat(self.data_path).st_mtime_ns
+            now = time.time()
+            if (not force and dir_mtime == self._last_dir_mtime
+                    and now - self._last_sync < RESCAN_INTERVAL):
+                return {'indexed': 0, 'removed': 0}
+
+            with self._connect() as conn:
+                known = {
+                    date_str: (mtime_ns, size)
+                    for date_str, mtime_ns, size in conn.execute(
+                        'SELECT date, mtime_ns, size FROM spirit_entries'
+                    )
+                }
+
+                indexed = 0
+                seen = set()
+                with os.scandir(self.data_path) as entries:
+                    for dir_entry in entries:
+                        if not dir_entry.name.endswith('.json') or not dir_entry.is_file():
+                            continue
+                        date_str = dir_entry.name[:-5]
+                        seen.add(date_str)
+                        stat = dir_entry.stat()
+                        if known.get(date_str) == (stat.st_mtime_ns, stat.st_size):
+                            continue
+                        try:
+                            with open(dir_entry.path, 'r', encoding='utf-8') as f:
+                                entry = json.load(f)
+                        except (OSError, ValueError) as e:
+                            print(f"索引條目失敗 {dir_entry.name}: {e}")
+                            continue
+                        self._upsert(conn, date_str, entry, stat.st_mtime_ns, stat.st_size)
+                        indexed += 1
+
+                removed = [(date_str,) for date_str in known if date_str not in seen]
+                conn.executemany('DELETE FROM spirit_entries WHERE date = ?', removed)
+
+            self._last_dir_mtime = dir_mtime
+            self._last_sync = now
+            return {'indexed': indexed, 'removed': len(removed)}
+
+    # === 查詢 ===
+
+    def get_entry(self, date_str: str) -> Optional[Dict]:
+        """按日期取條目（先核對該檔案是否變更）"""
+        self.refresh_entry(date_str)
+        with self._connect() as conn:
+            row = conn.execute('SELECT payload FROM spirit_entries WHERE date = ?', (date_str,)).fetchone()
+        return json.loads(row[0]) if row else None
+
+    def iter_range(self, start_date: Optional[str] = None, end_date: Optional[str] = None,
+                   batch_size: int = 200) -> Iterator[Dict]:
+        """按日期升序逐批產出條目（主鍵有序掃描）"""
+        clauses, params = [], []
+        if start_date:
+            clauses.append('date >= ?')
+            params.append(start_date)
+        if end_date:
+            clauses.append('date <= ?')
+            params.append(end_date)
+        where = f"WHERE {' AND '.join(clauses)}" if clauses else ''
+
+        conn = self._connect()
+        try:
+            cursor = conn.execute(f'SELECT payload FROM spirit_entries {where} ORDER BY date', params)
+            while True:
+                rows = cursor.fetchmany(batch_size)
+                if not rows:
+                    break
+                for (payload,) in rows:
+                    yield json.loads(payload)
+        finally:
+            conn.close()
+
+    def get_range(self, start_date: str, end_date: str) -> List[Dict]:
+        return list(self.iter_range(start_date, end_date))
+
+    def search(self, keyword: str, limit: int = 50) -> List[Dict]:
+        """全文子串搜索，按日期新到舊"""
+        with self._connect() as conn:
+            rows = conn.execute(
+                'SELECT payload FROM spirit_entries WHERE instr(search_text, ?) > 0 '
+                'ORDER BY date DESC LIMIT ?',
+                (keyword.lower(), limit)
+            ).fetchall()
+        return [json.loads(payload) for (payload,) in rows]
+
+    def get_statistics(self, recent_since: str) -> Tuple[int, int, int]:
+        """返回 (總條目數, 總字數, recent_since 之後的條目數)"""
+        with self._connect() as conn:
+            total_entries, total_word_count = conn.execute(
+                'SELECT total_entries, total_word_count FROM spirit_entry_stats WHERE id = 1'
+            ).fetchone()
+            recent_entries = conn.execute(
+                "SELECT COUNT(*) FROM spirit_entries WHERE date >= ? "
+                "AND date GLOB '[0-9][0-9][0-9][0-9]-[0-9][0-9]-[0-9][0-9]'",
+                (recent_since,)
+            ).fetchone()[0]
+        return total_entries, total_word_count, recent_entries
@@ -12,6 +12,7 @@ class AudioService:
         self.supported_formats = self.audio_config['supported_formats']
         self.volume_levels = self.audio_config['volume_levels']
         self.audio_catalog = self._build_audio_catalog()
+        self.audio_index = self._build_audio_index()
 
 
     
@@ -95,6 +96,20 @@ class AudioService:
         }
         return catalog
     
+    def _build_audio_index(self) -> Dict[str, Dict]:
+        """音頻 ID -> 音頻信息（含類別與完整路徑），查詢時不再逐類別掃描"""
+        index = {}
+        for category in self.audio_catalog.values():
+            for audio_id, info in category['files'].items():
+                if audio_id in index:
+                    continue
+                index[audio_id] = {
+                    **info,
+                    'category': category['name'],
+                    'full_path': os.path.join(self.audio_path, info['file'])
+                }
+        return index
+    
     def get_audio_catalog(self) -> Dict:
         """獲取音頻目錄"""
         return self.audio_catalog
@@ -105,13 +120,8 @@ class AudioService:
     
     def get_audio_info(self, audio_id: str) -> Optional[Dict]:
         """獲取特定音頻信息"""
-        for category in self.audio_catalog.values():
-            if audio_id in category['files']:
-                audio_info = category['files'][audio_id].copy()
-                audio_info['category'] = category['name']
-                audio_info['full_path'] = os.path.join(self.audio_path, audio_info['file'])
-                return audio_info
-        return None
+        audio_info = self.audio_index.get(audio_id)
+        return audio_info.copy() if audio_info else None
     
     def get_audio_url(self, audio_id: str) -> Optional[str]:
         """獲取音頻URL"""
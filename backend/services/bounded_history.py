@@ -0,0 +1,237 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+有界历史记录
+内存中只保留最近 maxlen 条记录，全部记录逐条追加写入日志文件（紧凑 JSON Lines，只追加不改写）。
+计数、数值字段的求和/极值、分类字段的频次在写入时增量更新，
+汇总接口读取聚合量，不再遍历历史列表，长期运行的进程内存保持平稳。
+
+- 日志超过 max_log_bytes 时轮转为 <日志>.1 … <日志>.N（保留 log_backups 份），
+  同时把聚合量与最近记录写入快照 <日志>.snapshot.json，启动时只需载入快照并回放当前日志
+- 每段日志首行记录段号，与快照中的段号比对，轮转中途退出也不会重复计入
+"""
+
+import json
+import os
+import threading
+from collections import deque
+from typing import Any, Dict, Iterator, List, Optional, Sequence
+
+DEFAULT_HISTORY_MAXLEN = 200
+# 单段日志的大小上限与保留的归档份数
+DEFAULT_MAX_LOG_BYTES = 8 * 1024 * 1024
+DEFAULT_LOG_BACKUPS = 3
+
+_SEGMENT_KEY = '_segment'
+
+
+def _is_segment_header(entry: Any) -> bool:
+    return isinstance(entry, dict) and len(entry) == 1 and _SEGMENT_KEY in entry
+
+
+def _write_json(path: str, data: Any):
+    tmp_path = f'{path}.{os.getpid()}.tmp'
+    with open(tmp_path, 'w', encoding='utf-8') as f:
+        json.dump(data, f, ensure_ascii=False, separators=(',', ':'), default=str)
+    os.replace(tmp_path, path)
+
+
+class BoundedHistory:
+    """线程安全的有界历史 + 追加日志
+
+    启动后首次访问时载入快照，再顺序回放当前日志段，恢复聚合量与最近记录（逐行读取，不整体载入）。
+    """
+
+    def __init__(self, log_path: Optional[str] = None, maxlen: int = DEFAULT_HISTORY_MAXLEN,
+                 numeric_fields: Sequence[str] = (), category_fields: Sequence[str] = (),
+                 max_log_bytes: int = DEFAULT_MAX_LOG_BYTES, log_backups: int = DEFAULT_LOG_BACKUPS):
+        self.log_path = log_path
+        self.maxlen = maxlen
+        self.max_log_bytes = max_log_bytes
+        self.log_backups = max(1, log_backups)
+        self.numeric_fields = tuple(numeric_fields)
+        self.category_fields = tuple(category_fields)
+        self._lock = threading.Lock()
+        self._recent = deque(maxlen=maxlen)
+        self._count = 0
+        self._numeric: Dict[str, Dict[str, float]] = {}
+        self._categories: Dict[str, Dict[str, int]] = {field: {} for field in self.category_fields}
+        self._loaded = log_path is None
+        self._segment = 0
+        self._log_bytes = 0
+
+        if log_path:
+            os.makedirs(os.path.dirname(os.path.abspath(log_path)), exist_ok=True)
+
+    # === 聚合 ===
+
+    def _accumulate(self, record: Dict[str, Any]):
+        self._recent.append(record)
+        self._count += 1
+        for field in self.numeric_fields:
+            value = record.get(field)
+            if not isinstance(value, (int, float)) or isinstance(value, bool):
+                continue
+            stats = self._numeric.get(field)
+            if stats is None:
+                self._numeric[field] = {'count': 1, 'sum': value, 'min': value, 'max': value, 'last': value}
+            else:
+                stats['count'] += 1
+                stats['sum'] += value
+                stats['min'] = min(stats['min'], value)
+                stats['max'] = max(stats['max'], value)
+                stats['last'] = value
+        for field in self.category_fields:
+            value = record.get(field)
+            if value is not None:
+                counts = self._categories[field]
+                counts[str(value)] = counts.get(str(value), 0) + 1
+
+    # === 日志段与快照 ===
+
+    @property
+    def snapshot_path(self) -> str:
+        return f'{self.log_path}.snapshot.json'
+
+    def _archive_path(self, index: int) -> str:
+        return f'{self.log_path}.{index}'
+
+    def _load_snapshot(self):
+        try:
+            with open(self.snapshot_path, 'r', encoding='utf-8') as f:
+                snapshot = json.load(f)
+        except FileNotFoundError:
+            return
+        self._segment = snapshot['segment']
+        self._count = snapshot['count']
+        self._numeric = snapshot['numeric']
+        for field, counts in snapshot['categories'].items():
+            if field in self._categories:
+                self._categories[field] = counts
+        self._recent.extend(snapshot['recent'])
+
+    def _write_snapshot(self):
+        _write_json(self.snapshot_path, {
+            'segment': self._segment,
+            'count': self._count,
+            'numeric': self._numeric,
+            'categories': self._categories,
+            'recent': list(self._recent)
+        })
+
+    def _shift_archives(self):
+        """当前日志段移入 .1，较旧的归档依次后移，超出保留份数的删除"""
+        oldest = self._archive_path(self.log_backups)
+        if os.path.exists(oldest):
+            os.remove(oldest)
+        for index in range(self.log_backups - 1, 0, -1):
+            if os.path.exists(self._archive_path(index)):
+                os.replace(self._archive_path(index), self._archive_path(index + 1))
+        os.replace(self.log_path, self._archive_path(1))
+        self._log_bytes = 0
+
+    def _rotate(self):
+        """先写快照（段号 +1，已涵盖当前段），再轮转日志"""
+        self._segment += 1
+        self._write_snapshot()
+        self._shift_archives()
+
+    def _ensure_loaded(self):
+        if self._loaded:
+            return
+        self._loaded = True
+        self._load_snapshot()
+        if not os.path.exists(self.log_path):
+            return
+        with open(self.log_path, 'r', encoding='utf-8') as f:
+            for index, line in enumerate(f):
+                try:
+                    entry = json.loads(line)
+                except ValueError:
+                    # 进程中途退出留下的半行
+                    continue
+                if _is_segment_header(entry):
+                    if index == 0 and entry[_SEGMENT_KEY] < self._segment:
+                        # 快照已写出但轮转未完成：该段已计入快照，补做轮转
+                        break
+                    continue
+                self._accumulate(entry)
+            else:
+                self._log_bytes = f.tell()
+                return
+        self._shift_archives()
+
+    # === 写入 ===
+
+    def append(self, record: Dict[str, Any]) -> Dict[str, Any]:
+        """追加一条记录（先写日志再更新内存）"""
+        line = json.dumps(record, ensure_ascii=False, separators=(',', ':'), default=str) + '\n'
+        with self._lock:
+            self._ensure_loaded()
+            if self.log_path:
+                with open(self.log_path, 'a', encoding='utf-8') as f:
+                    if self._log_bytes == 0 and f.tell() == 0:
+                        header = json.dumps({_SEGMENT_KEY: self._segment}) + '\n'
+                        f.write(header)
+                        self._log_bytes += len(header.encode('utf-8'))
+                    f.write(line)
+                self._log_bytes += len(line.encode('utf-8'))
+            self._accumulate(record)
+            if self.log_path and self._log_bytes >= self.max_log_bytes:
+                self._rotate()
+        return record
+
+    # === 读取 ===
+
+    def __len__(self) -> int:
+        with self._lock:
+            self._ensure_loaded()
+            return self._count
+
+    @property
+    def count(self) -> int:
+        return len(self)
+
+    def recent(self, limit: Optional[int] = None) -> List[Dict[str, Any]]:
+        """最近的记录（新到旧）"""
+        with self._lock:
+            self._ensure_loaded()
+            records = list(self._recent)
+        records.reverse()
+        return records[:limit] if limit else records
+
+    def summary(self) -> Dict[str, Any]:
+        """聚合量：总数、数值字段 count/sum/mean/min/max/last、分类字段频次"""
+        with self._lock:
+            self._ensure_loaded()
+            numeric = {
+                field: {**stats, 'mean': stats['sum'] / stats['count']}
+                for field, stats in self._numeric.items()
+            }
+            categories = {field: dict(counts) for field, counts in self._categories.items()}
+            count = self._count
+        return {
+            'count': count,
+            'retained': min(count, self.maxlen),
+            'numeric': numeric,
+            'categories': categories
+        }
+
+    def iter_all(self) -> Iterator[Dict[str, Any]]:
+        """从归档与当前日志逐条读出保留的历史（无日志时只有内存中的最近记录）"""
+        if not self.log_path:
+            yield from reversed(self.recent())
+            return
+        paths = [self._archive_path(index) for index in range(self.log_backups, 0, -1)]
+        paths.append(self.log_path)
+        for path in paths:
+            if not os.path.exists(path):
+                continue
+            with open(path, 'r', encoding='utf-8') as f:
+                for line in f:
+                    try:
+                        entry = json.loads(line)
+                    except ValueError:
+                        continue
+                    if not _is_segment_header(entry):
+                        yield entry
@@ -0,0 +1,297 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+大规模脑网络与扩散激活
+网络以 CSR（indptr / indices / weights 三个 NumPy 数组）保存，生成与模拟全程向量化：
+
+- 拓扑：small_world（Watts–Strogatz 环格 + 随机重连）、scale_free（Chung–Lu 幂律期望度）
+- 左右半球各自生成，再按 callosum_density 建立胼胝体跨半球连接
+- 扩散激活每一步是一次稀疏矩阵-向量乘，十万节点、数百步在秒级完成
+
+CSR 直接用 NumPy 实现（行号数组 + bincount 聚合），不依赖 scipy.sparse。
+"""
+
+from functools import lru_cache
+from typing import Any, Dict, Optional
+
+import numpy as np
+
+TOPOLOGIES = ('small_world', 'scale_free')
+
+MAX_HEMISPHERE_NODES = 100_000
+MAX_SIMULATION_STEPS = 1000
+
+LEFT, RIGHT = 0, 1
+HEMISPHERE_NAMES = ('left', 'right')
+
+
+class BrainNetwork:
+    """CSR 邻接 + 节点属性数组（对称加权图）"""
+
+    def __init__(self, indptr: np.ndarray, indices: np.ndarray, weights: np.ndarray,
+                 hemisphere: np.ndarray, bands: np.ndarray):
+        self.indptr = indptr
+        self.indices = indices
+        self.weights = weights
+        self.hemisphere = hemisphere
+        self.bands = bands
+        self.node_count = len(indptr) - 1
+        # 每个非零元所在行（矩阵-向量乘时按行聚合）
+        self.rows = np.repeat(np.arange(self.node_count, dtype=np.intp), np.diff(indptr))
+        self.degrees = np.diff(indptr)
+        # 自身不可变，模拟时可放心共享
+        for array in (indptr, indices, weights, hemisphere, bands, self.rows, self.degrees):
+            array.flags.writeable = False
+
+    @property
+    def edge_count(self) -> int:
+        """无向边数"""
+        return len(self.indices) // 2
+
+    def matvec(self, vector: np.ndarray) -> np.ndarray:
+        """W @ vector"""
+        return np.bincount(self.rows, weights=self.weights * vector[self.indices],
+                           minlength=self.node_count)
+
+    def push(self, nodes: np.ndarray, values: np.ndarray) -> np.ndarray:
+        """W @ x，x 只在 nodes 上非零
+
+        只遍历这些节点的邻接段（W 对称，行即出边）；非零节点的边占比较大时改用整体矩阵-向量乘。
+        """
+        counts = self.degrees[nodes]
+        total = int(counts.sum())
+        if total * 3 > len(self.indices):
+            vector = np.zeros(self.node_count)
+            vector[nodes] = values
+            return self.matvec(vector)
+        # 拼接各节点的邻接段下标：段起点 + 段内偏移
+        edges = np.arange(total) + np.repeat(self.indptr[nodes] - (np.cumsum(counts) - counts), counts)
+        return np.bincount(self.indices[edges], weights=self.weights[edges] * np.repeat(values, counts),
+                           minlength=self.node_count)
+
+    def neighbors(self, node: int) -> np.ndarray:
+        return self.indices[self.indptr[node]:self.indptr[node + 1]]
+
+    def summary(self) -> Dict[str, Any]:
+        degrees = self.degrees
+        cross = self.hemisphere[self.rows] != self.hemisphere[self.indices]
+        return {
+            'nodes': self.node_count,
+            'edges': self.edge_count,
+            'callosum_edges': int(cross.sum()) // 2,
+            'degree': {
+                'mean': float(degrees.mean()) if self.node_count else 0.0,
+                'max': int(degrees.max()) if self.node_count else 0,
+                'isolated': int((degrees == 0).sum())
+            },
+            'hemispheres': {
+                name: int((self.hemisphere == index).sum())
+                for index, name in enumerate(HEMISPHERE_NAMES)
+            },
+            'memory_bytes': int(sum(a.nbytes for a in (self.indptr, self.indices, self.weights, self.rows)))
+        }
+
+
+# === 生成 ===
+
+def _small_world_edges(rng: np.random.Generator, n: int, mean_degree: int, rewire_prob: float):
+    half = max(1, mean_degree // 2)
+    src = np.repeat(np.arange(n, dtype=np.int64), half)
+    dst = (src + np.tile(np.arange(1, half + 1, dtype=np.int64), n)) % n
+    rewire = rng.random(len(dst)) < rewire_prob
+    dst[rewire] = rng.integers(0, n, int(rewire.sum()))
+    return src, dst
+
+
+def _scale_free_edges(rng: np.random.Generator, n: int, mean_degree: int, exponent: float):
+    # Chung–Lu：期望度 w_i ∝ (i+1)^(-1/(γ-1))，端点按 w 抽样，度分布服从幂律
+    expected = np.arange(1, n + 1, dtype=np.float64) ** (-1.0 / (exponent - 1.0))
+    probabilities = expected / expected.sum()
+    edge_total = n * mean_degree // 2
+    src = rng.choice(n, size=edge_total, p=probabilities)
+    dst = rng.choice(n, size=edge_total, p=probabilities)
+    # 打乱编号，避免高度节点集中在编号前段
+    permutation = rng.permutation(n)
+    return permutation[src], permutation[dst]
+
+
+def _to_csr(n: int, src: np.ndarray, dst: np.ndarray, weights: np.ndarray):
+    """无向边列表 -> 去重、去自环、对称化后的 CSR"""
+    keep = src != dst
+    src, dst, weights = src[keep], dst[keep], weights[keep]
+    low, high = np.minimum(src, dst), np.maximum(src, dst)
+    _, first = np.unique(low * n + high, return_index=True)
+    low, high, weights = low[first], high[first], weights[first]
+
+    rows = np.concatenate([low, high])
+    cols = np.concatenate([high, low])
+    values = np.concatenate([weights, weights])
+    order = np.lexsort((cols, rows))
+    indptr = np.zeros(n + 1, dtype=np.int64)
+    np.cumsum(np.bincount(rows, minlength=n), out=indptr[1:])
+    return indptr, cols[order].astype(np.intp), values[order]
+
+
+def generate_brain_graph(node_count: int, topology: str = 'small_world', mean_degree: int = 6,
+                         rewire_prob: float = 0.1, exponent: float = 2.5,
+                         callosum_density: float = 0.05, hemispheres: int = 2,
+                         band_count: int = 5, seed: Optional[int] = None) -> BrainNetwork:
+    """生成脑网络
+
+    node_count 为每个半球的节点数；左半球编号 [0, n)，右半球 [n, 2n)。
+    胼胝体连接：每个左半球节点以 callosum_density 概率连到右半球随机节点。
+    """
+    if topology not in TOPOLOGIES:
+        raise ValueError(f'topology 必须为 {", ".join(TOPOLOGIES)} 之一')
+    if not 2 <= node_count <= MAX_HEMISPHERE_NODES:
+        raise ValueError(f'node_count 必须在 2 到 {MAX_HEMISPHERE_NODES} 之间')
+    if hemispheres not in (1, 2):
+        raise ValueError('hemispheres 必须为 1 或 2')
+    if not 2 <= mean_degree < node_count:
+        raise ValueError('mean_degree 必须不小于 2 且小于 node_count')
+    if not 0.0 <= rewire_prob <= 1.0 or not 0.0 <= callosum_density <= 1.0:
+        raise ValueError('rewire_prob 与 callosum_density 必须在 0 到 1 之间')
+    if exponent <= 2.0:
+        raise ValueError('exponent 必须大于 2')
+
+    rng = np.random.default_rng(seed)
+    sources, targets = [], []
+    for index in range(hemispheres):
+        if topology == 'small_world':
+            src, dst = _small_world_edges(rng, node_count, mean_degree, rewire_prob)
+        else:
+            src, dst = _scale_free_edges(rng, node_count, mean_degree, exponent)
+        offset = index * node_count
+        sources.append(src + offset)
+        targets.append(dst + offset)
+
+    if hemispheres == 2 and callosum_density > 0:
+        left = np.flatnonzero(rng.random(node_count) < callosum_density)
+        sources.append(left)
+        targets.append(rng.integers(node_count, 2 * node_count, len(left)))
+
+    src = np.concatenate(sources)
+    dst = np.concatenate(targets)
+    weights = rng.uniform(0.3, 1.0, len(src))
+    total = node_count * hemispheres
+    indptr, indices, values = _to_csr(total, src, dst, weights)
+
+    hemisphere = np.repeat(np.arange(hemispheres, dtype=np.int8), node_count)
+    bands = rng.integers(0, band_count, total).astype(np.int8)
+    return BrainNetwork(indptr, indices, values, hemisphere, bands)
+
+
+@lru_cache(maxsize=4)
+def cached_brain_graph(node_count: int, topology: str, mean_degree: int, rewire_prob: float,
+                       exponent: float, callosum_density: float, hemispheres: int,
+                       seed: int) -> BrainNetwork:
+    """指定种子的网络是确定的，重复请求直接复用"""
+    return generate_brain_graph(node_count, topology, mean_degree, rewire_prob, exponent,
+                                callosum_density, hemispheres, seed=seed)
+
+
+# === 扩散激活 ===
+
+def spread_activation(network: BrainNetwork, stimulus: np.ndarray, steps: int = 100,
+                      decay: float = 0.01, spread: float = 0.5, threshold: float = 0.01,
+                      record_every: int = 1) -> Dict[str, Any]:
+    """扩散激活模拟
+
+    每一步：超过阈值的节点把 spread 比例的激活按边权分给邻居（只遍历这些节点的邻接段，
+    放电节点多时退化为整体稀疏矩阵-向量乘），激活总量守恒，随后整体按 decay 衰减：
+    a ← clip((1 - decay)·(a - spread·f + W·(spread·f / s)), 0, 1)，f 为放电节点的激活，s 为加权度。
+    返回最终激活向量与按半球统计的时间序列（每 record_every 步记录一次）。
+    """
+    if not 1 <= steps <= MAX_SIMULATION_STEPS:
+        raise ValueError(f'steps 必须在 1 到 {MAX_SIMULATION_STEPS} 之间')
+    if not 0.0 <= decay <= 1.0 or not 0.0 <= spread <= 1.0 or not 0.0 <= threshold <= 1.0:
+        raise ValueError('decay、spread、threshold 必须在 0 到 1 之间')
+
+    n = network.node_count
+    activation = np.clip(np.asarray(stimulus, dtype=np.float64), 0.0, 1.0)
+    if activation.shape != (n,):
+        raise ValueError('stimulus 长度必须等于节点数')
+
+    strength = network.matvec(np.ones(n))
+    inverse_strength = np.divide(1.0, strength, out=np.zeros(n), where=strength > 0)
+    hemisphere = network.hemisphere
+    hemisphere_sizes = np.bincount(hemisphere, minlength=2).astype(np.float64)
+    retain = 1.0 - decay
+
+    series = {'step': [], 'left': [], 'right': [], 'active': []}
+    for step in range(1, steps + 1):
+        fired = np.flatnonzero(activation > threshold)
+        # 孤立节点没有出边，保留自身激活
+        fired = fired[strength[fired] > 0]
+        if fired.size:
+            outgoing = spread * activation[fired]
+            incoming = network.push(fired, outgoing * inverse_strength[fired])
+            activation[fired] -= outgoing
+            activation += incoming
+        activation *= retain
+        np.clip(activation, 0.0, 1.0, out=activation)
+
+        if step % record_every == 0 or step == steps:
+            sums = np.bincount(hemisphere, weights=activation, minlength=2)
+            means = np.divide(sums, hemisphere_sizes, out=np.zeros(2), where=hemisphere_sizes > 0)
+            series['step'].append(step)
+            series['left'].append(float(means[LEFT]))
+            series['right'].append(float(means[RIGHT]))
+            series['active'].append(int(np.count_nonzero(activation > threshold)))
+
+    return {'activation': activation, 'series': series}
+
+
+def make_stimulus(network: BrainNetwork, hemisphere: str = 'left', fraction: float = 0.01,
+                  intensity: float = 1.0, seed: Optional[int] = None) -> np.ndarray:
+    """在指定半球（left / right / both）随机选取一部分节点施加初始激活"""
+    if not 0.0 < fraction <= 1.0:
+        raise ValueError('fraction 必须在 0 到 1 之间')
+    if hemisphere == 'both':
+        candidates = np.arange(network.node_count)
+    elif hemisphere in HEMISPHERE_NAMES:
+        candidates = np.flatnonzero(network.hemisphere == HEMISPHERE_NAMES.index(hemisphere))
+    else:
+        raise ValueError('hemisphere 必须为 left、right 或 both')
+    if len(candidates) == 0:
+        raise ValueError(f'网络中没有 {hemisphere} 半球节点')
+
+    rng = np.random.default_rng(seed)
+    count = max(1, int(len(candidates) * fraction))
+    stimulus = np.zeros(network.node_count)
+    stimulus[rng.choice(candidates, size=count, replace=False)] = intensity
+    return stimulus
+
+
+def hemisphere_synchrony(network: BrainNetwork, activation: np.ndarray,
+                         series: Optional[Dict[str, list]] = None) -> Dict[str, Any]:
+    """根据激活数组计算左右半球同步度
+
+    - synchronization_level：1 - |左均值 - 右均值|
+    - phase_coherence：两半球均值时间序列的相关系数（映射到 0~1）
+    - callosum_flow：胼胝体连接两端激活的加权平均
+    """
+    hemisphere = network.hemisphere
+    sizes = np.bincount(hemisphere, minlength=2).astype(np.float64)
+    sums = np.bincount(hemisphere, weights=activation, minlength=2)
+    means = np.divide(sums, sizes, out=np.zeros(2), where=sizes > 0)
+
+    rows, cols = network.rows, network.indices
+    cross = hemisphere[rows] != hemisphere[cols]
+    cross_weights = network.weights[cross]
+    flow = float(np.average(np.minimum(activation[rows[cross]], activation[cols[cross]]),
+                            weights=cross_weights)) if cross_weights.size else 0.0
+
+    coherence = None
+    if series and len(series.get('left', [])) > 2:
+        left, right = np.asarray(series['left']), np.asarray(series['right'])
+        if left.std() > 0 and right.std() > 0:
+            coherence = float((np.corrcoef(left, right)[0, 1] + 1.0) / 2.0)
+
+    return {
+        'left_mean_activation': float(means[LEFT]),
+        'right_mean_activation': float(means[RIGHT]),
+        'synchronization_level': float(1.0 - abs(means[LEFT] - means[RIGHT])),
+        'phase_coherence': coherence,
+        'callosum_flow': flow
+    }
@@ -0,0 +1,199 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+量子道场实时推送中枢
+按固定节拍采样道场状态，向订阅房间的客户端推送增量
+
+- 每个房间（如 flow、universe）注册一个快照函数，每拍最多采样一次
+- 相邻快照做嵌套字典差分，只推送变化的字段与被移除的路径；
+  采样结果深拷贝保存，快照函数返回的可变对象之后被原地修改也不会污染差分基准
+- 客户端确认（ack）上一帧之前不再向其发送新帧，期间的变化合并到下一帧，
+  慢客户端不会在服务端堆积消息队列
+- 客户端错过中间帧时改发完整快照，保证增量总能基于客户端已有的状态合并
+"""
+
+import copy
+import threading
+import time
+from typing import Any, Callable, Dict, List, Optional, Tuple
+
+# 默认推送节拍（次/秒）与允许范围
+DEFAULT_TICK_RATE = 1.0
+MIN_TICK_RATE = 0.1
+MAX_TICK_RATE = 20.0
+
+
+def diff_state(previous: Dict[str, Any], current: Dict[str, Any],
+               prefix: str = '') -> Tuple[Dict[str, Any], List[str]]:
+    """
+    嵌套字典差分
+
+    返回 (changed, removed)：changed 只包含变化的叶子（子字典递归比较），
+    removed 为被删除键的点分路径。
+    """
+    changed: Dict[str, Any] = {}
+    removed: List[str] = []
+
+    for key, value in current.items():
+        if key not in previous:
+            changed[key] = value
+            continue
+        old_value = previous[key]
+        if isinstance(value, dict) and isinstance(old_value, dict):
+            sub_changed, sub_removed = diff_state(old_value, value, f'{prefix}{key}.')
+            if sub_changed:
+                changed[key] = sub_changed
+            removed.extend(sub_removed)
+        elif old_value != value:
+            changed[key] = value
+
+    for key in previous:
+        if key not in current:
+            removed.append(f'{prefix}{key}')
+
+    return changed, removed
+
+
+class _RoomState:
+    """单个房间的快照序列与订阅者"""
+
+    def __init__(self, snapshot_fn: Callable[[], Dict[str, Any]]):
+        self.snapshot_fn = snapshot_fn
+        self.snapshot: Optional[Dict[str, Any]] = None
+        self.delta: Optional[Dict[str, Any]] = None
+        self.seq = 0
+        # sid -> {'acked_seq', 'in_flight_seq', 'sent_at'}
+        self.subscribers: Dict[str, Dict[str, Any]] = {}
+
+
+class DojoStreamHub:
+    """
+    道场推送中枢
+
+    与传输层无关：tick() 返回本拍需要发送的 (sid, room, payload)，
+    由 Socket.IO 命名空间负责实际发送并在客户端确认后回调 ack()。
+    """
+
+    def __init__(self, tick_rate: float = DEFAULT_TICK_RATE, ack_timeout: float = 10.0):
+        self.tick_rate = DEFAULT_TICK_RATE
+        self.set_tick_rate(tick_rate)
+        self.ack_timeout = ack_timeout
+        self._lock = threading.Lock()
+        self._rooms: Dict[str, _RoomState] = {}
+        self.frames_sent = 0
+        self.frames_coalesced = 0
+
+    @property
+    def interval(self) -> float:
+        return 1.0 / self.tick_rate
+
+    def set_tick_rate(self, tick_rate: Optional[float]):
+        """设置推送节拍，超出范围时截断"""
+        if tick_rate is None:
+            return
+        self.tick_rate = min(MAX_TICK_RATE, max(MIN_TICK_RATE, float(tick_rate)))
+
+    def register_room(self, room: str, snapshot_fn: Callable[[], Dict[str, Any]]):
+        """注册房间及其快照函数"""
+        with self._lock:
+            self._rooms[room] = _RoomState(snapshot_fn)
+
+    @property
+    def rooms(self) -> List[str]:
+        return list(self._rooms)
+
+    # === 订阅管理 ===
+
+    def subscribe(self, sid: str, room: str) -> bool:
+        """订阅房间，下一拍收到完整快照"""
+        with self._lock:
+            state = self._rooms.get(room)
+            if state is None:
+                return False
+            state.subscribers[sid] = {'acked_seq': None, 'in_flight_seq': None, 'sent_at': 0.0}
+            return True
+
+    def unsubscribe(self, sid: str, room: Optional[str] = None) -> List[str]:
+        """退订指定房间；room 为空时退订全部（断开连接）"""
+        left = []
+        with self._lock:
+            for name, state in self._rooms.items():
+                if room is not None and name != room:
+                    continue
+                if state.subscribers.pop(sid, None) is not None:
+                    left.append(name)
+        return left
+
+    def has_subscribers(self) -> bool:
+        return any(state.subscribers for state in self._rooms.values())
+
+    def ack(self, sid: str, room: str, seq: int):
+        """客户端确认收到某帧"""
+        with self._lock:
+            state = self._rooms.get(room)
+            client = state.subscribers.get(sid) if state else None
+            if client is None or client['in_flight_seq'] != seq:
+                return
+            client['acked_seq'] = seq
+            client['in_flight_seq'] = None
+
+    # === 节拍 ===
+
+    def tick(self, now: Optional[float] = None) -> List[Tuple[str, str, Dict[str, Any]]]:
+        """采样有订阅者的房间并生成本拍待发送的帧"""
+        now = time.time() if now is None else now
+        frames = []
+
+        for room, state in list(self._rooms.items()):
+            if not state.subscribers:
+                # 无人订阅时丢弃基准快照，避免下次订阅基于过期状态差分
+                state.snapshot = state.delta = None
+                continue
+
+            snapshot = copy.deepcopy(state.snapshot_fn())
+            with self._lock:
+                if state.snapshot is None:
+                    state.seq += 1
+                    state.delta = None
+                else:
+                    changed, removed = diff_state(state.snapshot, snapshot)
+                    if changed or removed:
+                        state.seq += 1
+                        state.delta = {'changed': changed, 'removed': removed}
+                state.snapshot = snapshot
+
+                for sid, client in state.subscribers.items():
+                    if client['in_flight_seq'] is not None:
+                        if now - client['sent_at'] < self.ack_timeout:
+                            # 上一帧尚未确认：新的变化合并到之后的帧
+                            if client['in_flight_seq'] != state.seq:
+                                self.frames_coalesced += 1
+                            continue
+                        # 确认超时，视为丢帧，改发完整快照
+                        client['acked_seq'] = None
+                    elif client['acked_seq'] == state.seq:
+                        continue
+
+                    if state.delta is not None and client['acked_seq'] == state.seq - 1:
+                        payload = {'room': room, 'seq': state.seq, 'type': 'delta', **state.delta}
+                    else:
+                        payload = {'room': room, 'seq': state.seq, 'type': 'full', 'state': snapshot}
+
+                    client['in_flight_seq'] = state.seq
+                    client['sent_at'] = now
+                    self.frames_sent += 1
+                    frames.append((sid, room, payload))
+
+        return frames
+
+    def get_stats(self) -> Dict[str, Any]:
+        """推送统计"""
+        return {
+            'tick_rate': self.tick_rate,
+            'rooms': {
+                room: {'subscribers': len(state.subscribers), 'seq': state.seq}
+                for room, state in self._rooms.items()
+            },
+            'frames_sent': self.frames_sent,
+            'frames_coalesced': self.frames_coalesced
+        }
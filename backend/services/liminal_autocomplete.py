@@ -0,0 +1,200 @@
+import os
+import re
+import threading
+from bisect import bisect_left, insort
+from typing import Dict, List, Any, Optional, Iterable, Tuple
+
+# 声明识别：`function name`、`quantum_field name {`、`name = ...`
+DECLARATION_PATTERN = re.compile(
+    r'\bfunction\s+(\w+)|\b\w+\s+(\w+)\s*\{|^\s*(?:state\s+)?(\w+)\s*=(?!=)',
+    re.MULTILINE
+)
+
+# 参与标识符索引的源文件扩展名
+SOURCE_EXTENSION = '.lim'
+
+# 补全类型排序优先级（越小越靠前）
+KIND_PRIORITY = {
+    'keyword': 0,
+    'function': 1,
+    'type': 2,
+    'preset': 3,
+    'identifier': 4
+}
+
+
+class CompletionIndex:
+    """LiminalScript自动补全索引 - 基于有序数组与二分查找的前缀索引
+
+    静态词表（关键字、内置函数、数据类型、频率预设）在编译器初始化时载入，
+    项目标识符按文件增量维护：文件保存时只对新增/删除的标识符做有序插入或移除。
+    设置 project_root 后，某个项目首次查询时扫描其目录下的源文件建立索引（进程重启后无需重新保存）。
+    """
+
+    def __init__(self, project_root: Optional[str] = None):
+        self._lock = threading.Lock()
+        self.project_root = project_root
+        self._scanned_projects: set = set()
+        # 有序键与对应条目（同名的关键字与内置函数各占一项）
+        self._static_keys: List[str] = []
+        self._static_entries: List[Dict[str, str]] = []
+        # project -> 有序标识符列表 / 引用计数 / 文件 -> 标识符集合
+        self._project_keys: Dict[str, List[str]] = {}
+        self._project_refcounts: Dict[str, Dict[str, int]] = {}
+        self._project_files: Dict[str, Dict[str, set]] = {}
+
+    def load_static_entries(self, entries: Iterable[Tuple[str, str, str, str]]):
+        """载入静态词表，条目为 (key, text, kind, description)"""
+        ordered = sorted(
+            ((key, {'text': text, 'type': kind, 'description': description})
+             for key, text, kind, description in entries),
+            key=lambda item: (item[0], KIND_PRIORITY[item[1]['type']])
+        )
+        static_keys = [key for key, _ in ordered]
+        static_entries = [entry for _, entry in ordered]
+
+        with self._lock:
+            if static_entries == self._static_entries:
+                return
+            self._static_keys = static_keys
+            self._static_entries = static_entries
+
+    @staticmethod
+    def extract_identifiers(code: str) -> set:
+        """提取源码中声明的标识符"""
+        identifiers = set()
+        for match in DECLARATION_PATTERN.finditer(code):
+            name = match.group(1) or match.group(2) or match.group(3)
+            if name and not name.isdigit():
+                identifiers.add(name)
+        return identifiers
+
+    def update_file(self, project: str, file_path: str, code: str) -> Dict[str, int]:
+        """文件保存后增量更新项目标识符"""
+        new_identifiers = self.extract_identifiers(code)
+
+        with self._lock:
+            files = self._project_files.setdefault(project, {})
+            refcounts = self._project_refcounts.setdefault(project, {})
+            keys = self._project_keys.setdefault(project, [])
+
+            old_identifiers = files.get(file_path, set())
+            added = new_identifiers - old_identifiers
+            removed = old_identifiers - new_identifiers
+
+            for name in added:
+                count = refcounts.get(name, 0)
+                if count == 0:
+                    insort(keys, name)
+                refcounts[name] = count + 1
+
+            for name in removed:
+                count = refcounts.get(name, 0) - 1
+                if count <= 0:
+                    refcounts.pop(name, None)
+                    position = bisect_left(keys, name)
+                    if position < len(keys) and keys[position] == name:
+                        del keys[position]
+                else:
+                    refcounts[name] = count
+
+            files[file_path] = new_identifiers
+
+        return {'added': len(added), 'removed': len(removed)}
+
+    def remove_file(self, project: str, file_path: str):
+        """从索引中移除文件"""
+        self.update_file(project, file_path, '')
+        with self._lock:
+            self._project_files.get(project, {}).pop(file_path, None)
+
+    def _ensure_scanned(self, project: str):
+        """项目首次查询时扫描目录，已由保存操作索引过的文件不再覆盖"""
+        if self.project_root is None or project in self._scanned_projects:
+            return
+        if not project or project.startswith('.') or '/' in project or '\\' in project:
+            return
+        with self._lock:
+            if project in self._scanned_projects:
+                return
+            indexed = set(self._project_files.get(project, {}))
+
+        project_dir = os.path.join(os.path.abspath(self.project_root), project)
+        if not os.path.isdir(project_dir):
+            return
+
+        def _raise(error):
+            raise error
+
+        # 目录遍历出错时不标记为已扫描，下次查询重试
+        for directory, _, filenames in os.walk(project_dir, onerror=_raise):
+            for filename in filenames:
+                file_path = os.path.join(directory, filename)
+                if not filename.endswith(SOURCE_EXTENSION) or file_path in indexed:
+                    continue
+                try:
+                    with open(file_path, 'r', encoding='utf-8') as f:
+                        code = f.read()
+                except (OSError, UnicodeDecodeError):
+                    continue
+                self.update_file(project, file_path, code)
+
+        with self._lock:
+            self._scanned_projects.add(project)
+
+    @staticmethod
+    def _prefix_range(keys: List[str], prefix: str) -> Tuple[int, int]:
+        """二分查找前缀匹配区间"""
+        lo = bisect_left(keys, prefix)
+        hi = bisect_left(keys, prefix + '\uffff', lo) if prefix else len(keys)
+        return lo, hi
+
+    def _is_static(self, key: str) -> bool:
+        """判断是否为静态词表中的词"""
+        position = bisect_left(self._static_keys, key)
+        return position < len(self._static_keys) and self._static_keys[position] == key
+
+    def complete(self, prefix: str, project: Optional[str] = None, limit: int = 50) -> List[Dict[str, str]]:
+        """返回按相关度排序的补全建议"""
+        candidates = []
+
+        static_keys = self._static_keys
+        static_entries = self._static_entries
+        lo, hi = self._prefix_range(static_keys, prefix)
+        for position in range(lo, hi):
+            entry = static_entries[position]
+            candidates.append((KIND_PRIORITY[entry['type']], len(static_keys[position]), static_keys[position], entry))
+
+        if project is not None:
+            self._ensure_scanned(project)
+            keys = self._project_keys.get(project, [])
+            lo, hi = self._prefix_range(keys, prefix)
+            for key in keys[lo:hi]:
+                if self._is_static(key):
+                    continue
+                candidates.append((KIND_PRIORITY['identifier'], len(key), key, {
+                    'text': key,
+                    'type': 'identifier',
+                    'description': f'项目标识符: {key}'
+                }))
+
+        # 精确匹配优先，其次按类型、长度、字母序
+        candidates.sort(key=lambda item: (item[2] != prefix, item[0], item[1], item[2]))
+        return [dict(item[3]) for item in candidates[:limit]]
+
+    def get_stats(self) -> Dict[str, Any]:
+        """获取索引统计"""
+        return {
+            'static_entries': len(self._static_keys),
+            'projects': {
+                project: {
+                    'identifiers': len(keys),
+                    'files': len(self._project_files.get(project, {}))
+                }
+                for project, keys in self._project_keys.items()
+            }
+        }
+
+
+# 全局共享补全索引
+completion_index = CompletionIndex()
@@ -1,7 +1,15 @@
 import re
 import ast
+import copy
+import hashlib
+import threading
+from collections import OrderedDict
 from typing import Dict, List, Any, Optional, Tuple
 from backend.models.liminal_model import Consciousness, Frequency, Intention, BioState, LiminalProgram
+from backend.services.liminal_autocomplete import CompletionIndex, completion_index
+
+# 词法单元正则（模块级预编译，避免每行重复编译）
+TOKEN_PATTERN = re.compile(r'(\w+|[{}();:,"\']|[0-9]+\.?[0-9]*|[+\-*/=<>!]+)')
 
 class LiminalScriptError(Exception):
     """LiminalScript编译错误"""
@@ -10,10 +18,158 @@ class LiminalScriptError(Exception):
         self.line_number = line_number
         super().__init__(f"Line {line_number}: {message}" if line_number else message)
 
+
+class CompileCache:
+    """编译缓存 - 以源码内容哈希为键的LRU缓存
+
+    缓存词法/语法分析结果（tokens、AST及编译错误），
+    由 /compile、语法检查与 LiminalCompiler.compile 共享。
+    """
+
+    def __init__(self, max_entries: int = 256):
+        self.max_entries = max_entries
+        self._entries: "OrderedDict[str, Dict[str, Any]]" = OrderedDict()
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+
+    @staticmethod
+    def content_hash(code: str) -> str:
+        """计算源码内容哈希"""
+        return hashlib.sha256(code.encode('utf-8')).hexdigest()
+
+    def get(self, key: str) -> Optional[Dict[str, Any]]:
+        """读取缓存条目，命中时移到最近使用端"""
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None:
+                self.misses += 1
+                return None
+            self._entries.move_to_end(key)
+            self.hits += 1
+            return entry
+
+    def put(self, key: str, entry: Dict[str, Any]):
+        """写入缓存条目，超出容量时淘汰最久未使用的条目"""
+        with self._lock:
+            self._entries[key] = entry
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+                self.evictions += 1
+
+    def clear(self):
+        """清空缓存"""
+        with self._lock:
+            self._entries.clear()
+
+    def get_stats(self) -> Dict[str, Any]:
+        """获取缓存统计"""
+        total = self.hits + self.misses
+        return {
+            'entries': len(self._entries),
+            'max_entries': self.max_entries,
+            'hits': self.hits,
+            'misses': self.misses,
+            'evictions': self.evictions,
+            'hit_rate': self.hits / total if total else 0.0
+        }
+
+
+class IncrementalLexer:
+    """增量词法分析器 - 只重新分析变更的行范围
+
+    按文档ID保存上一版本的逐行token，新版本到来时以公共前缀/后缀
+    对齐行，仅对中间变更区间重新分词。
+    """
+
+    def __init__(self, tokenize_line, max_documents: int = 64):
+        self._tokenize_line = tokenize_line
+        self.max_documents = max_documents
+        self._documents: "OrderedDict[str, Dict[str, Any]]" = OrderedDict()
+        self._lock = threading.Lock()
+
+    def update(self, document_id: str, code: str) -> List[Tuple[str, str, int]]:
+        """更新文档并返回完整token列表"""
+        new_lines = code.split('\n')
+
+        with self._lock:
+            previous = self._documents.get(document_id)
+
+        if previous is None:
+            line_tokens = [self._tokenize_line(line) for line in new_lines]
+            relexed = len(new_lines)
+        else:
+            old_lines = previous['lines']
+            old_tokens = previous['line_tokens']
+
+            # 公共前缀
+            prefix = 0
+            max_prefix = min(len(old_lines), len(new_lines))
+            while prefix < max_prefix and old_lines[prefix] == new_lines[prefix]:
+                prefix += 1
+
+            # 公共后缀（不与前缀重叠）
+            suffix = 0
+            max_suffix = max_prefix - prefix
+            while (suffix < max_suffix and
+                   old_lines[len(old_lines) - 1 - suffix] == new_lines[len(new_lines) - 1 - suffix]):
+                suffix += 1
+
+            changed = new_lines[prefix:len(new_lines) - suffix]
+            line_tokens = (
+                old_tokens[:prefix] +
+                [self._tokenize_line(line) for line in changed] +
+                old_tokens[len(old_tokens) - suffix:]
+            )
+            relexed = len(changed)
+
+        with self._lock:
+            self._documents[document_id] = {
+                'lines': new_lines,
+                'line_tokens': line_tokens,
+                'last_relexed_lines': relexed
+            }
+            self._documents.move_to_end(document_id)
+            while len(self._documents) > self.max_documents:
+                self._documents.popitem(last=False)
+
+        return [
+            (token, token_type, line_num)
+            for line_num, tokens in enumerate(line_tokens, 1)
+            for token, token_type in tokens
+        ]
+
+    def mark_unchanged(self, document_id: str):
+        """编译缓存命中、未重新分词时，将最近一次重新分词的行数记为 0"""
+        with self._lock:
+            document = self._documents.get(document_id)
+            if document is not None:
+                document['last_relexed_lines'] = 0
+
+    def get_last_relexed_lines(self, document_id: str) -> int:
+        """获取最近一次更新重新分词的行数"""
+        document = self._documents.get(document_id)
+        return document['last_relexed_lines'] if document else 0
+
+    def forget(self, document_id: str):
+        """移除文档状态"""
+        with self._lock:
+            self._documents.pop(document_id, None)
+
+
+# 全局共享编译缓存
+compile_cache = CompileCache()
+
+
 class LiminalCompiler:
     """LiminalScript编译器 v2.0 - 升级版意识编程编译器"""
     
-    def __init__(self):
+    def __init__(self, cache: Optional[CompileCache] = None,
+                 index: Optional[CompletionIndex] = None):
+        self.cache = cache if cache is not None else compile_cache
+        self.lexer = IncrementalLexer(self._tokenize_line)
         self.keywords = {
             'consciousness', 'frequency', 'intention', 'bio_state', 'resonance',
             'function', 'if', 'else', 'for', 'while', 'parallel', 'sync',
@@ -79,93 +235,124 @@ class LiminalCompiler:
             'delta': 2.0,
             'gamma': 40.0
         }
+        
+        self.completion_index = index if index is not None else completion_index
+        self.completion_index.load_static_entries(self._completion_entries())
     
-    def compile(self, code: str, program_name: str = "untitled") -> LiminalProgram:
-        """编译LiminalScript代码"""
+    def analyze(self, code: str, document_id: Optional[str] = None) -> Dict[str, Any]:
+        """分析源码（词法+语法+语义），返回结果副本，调用方可随意修改
+
+        提供 document_id 时使用增量词法分析，只重新分词变更的行。
+        """
+        entry = self._analyze(code, document_id)
+        return {
+            **entry,
+            'tokens': list(entry['tokens']) if entry['tokens'] is not None else None,
+            'ast': copy.deepcopy(entry['ast'])
+        }
+
+    def _analyze(self, code: str, document_id: Optional[str] = None) -> Dict[str, Any]:
+        """分析源码，结果按内容哈希缓存；返回共享的缓存条目，只读使用"""
+        content_hash = self.cache.content_hash(code)
+        entry = self.cache.get(content_hash)
+        if entry is not None:
+            if document_id:
+                self.lexer.mark_unchanged(document_id)
+            return entry
+
+        tokens = None
+        ast_tree = None
+        error = None
         try:
             # 词法分析
-            tokens = self._tokenize(code)
-            
+            if document_id:
+                tokens = self.lexer.update(document_id, code)
+            else:
+                tokens = self._tokenize(code)
+
             # 语法分析
             ast_tree = self._parse(tokens)
-            
+
             # 语义分析
             self._semantic_analysis(ast_tree)
-            
+        except LiminalScriptError as e:
+            error = e
+        except Exception as e:
+            error = LiminalScriptError(str(e))
+
+        entry = {
+            'content_hash': content_hash,
+            'tokens': tokens,
+            'ast': ast_tree,
+            'error': error
+        }
+        self.cache.put(content_hash, entry)
+        return entry
+
+    def compile(self, code: str, program_name: str = "untitled",
+                document_id: Optional[str] = None) -> LiminalProgram:
+        """编译LiminalScript代码"""
+        try:
+            entry = self.analyze(code, document_id)
+            if entry['error'] is not None:
+                raise entry['error']
+
             # 生成程序对象
             program = LiminalProgram(program_name, code)
-            self._generate_program(ast_tree, program)
+            self._generate_program(entry['ast'], program)
             
             return program
             
         except Exception as e:
             raise LiminalScriptError(f"编译错误: {str(e)}")
     
-    def syntax_check(self, code: str) -> Dict[str, Any]:
+    def syntax_check(self, code: str, document_id: Optional[str] = None) -> Dict[str, Any]:
         """语法检查"""
         errors = []
         warnings = []
         
-        try:
-            tokens = self._tokenize(code)
-            ast_tree = self._parse(tokens)
-            self._semantic_analysis(ast_tree)
-            
+        error = self._analyze(code, document_id)['error']
+        if error is None:
             return {
                 'valid': True,
                 'errors': errors,
                 'warnings': warnings
             }
-            
-        except LiminalScriptError as e:
-            errors.append({
-                'message': e.message,
-                'line': e.line_number,
-                'type': 'syntax_error'
-            })
-            
-            return {
-                'valid': False,
-                'errors': errors,
-                'warnings': warnings
-            }
+        
+        errors.append({
+            'message': error.message,
+            'line': error.line_number,
+            'type': 'syntax_error'
+        })
+        
+        return {
+            'valid': False,
+            'errors': errors,
+            'warnings': warnings
+        }
     
-    def get_autocomplete_suggestions(self, code: str, cursor_position: int) -> List[Dict[str, str]]:
+    def get_autocomplete_suggestions(self, code: str, cursor_position: int,
+                                     project: Optional[str] = None) -> List[Dict[str, str]]:
         """获取自动完成建议"""
-        suggestions = []
+        # 从光标向前扫描当前单词，无需切分整段代码
+        cursor_position = max(0, min(cursor_position, len(code)))
+        start = cursor_position
+        while start > 0 and (code[start - 1].isalnum() or code[start - 1] == '_'):
+            start -= 1
+        prefix = code[start:cursor_position]
         
-        # 获取当前单词
-        lines = code[:cursor_position].split('\n')
-        current_line = lines[-1] if lines else ""
-        
-        # 关键字建议
+        return self.completion_index.complete(prefix, project)
+    
+    def _completion_entries(self):
+        """自动补全静态词表"""
         for keyword in self.keywords:
-            if keyword.startswith(current_line.split()[-1] if current_line.split() else ""):
-                suggestions.append({
-                    'text': keyword,
-                    'type': 'keyword',
-                    'description': f'LiminalScript关键字: {keyword}'
-                })
-        
-        # 内置函数建议
-        for func_name in self.builtin_functions.keys():
-            if func_name.startswith(current_line.split()[-1] if current_line.split() else ""):
-                suggestions.append({
-                    'text': f'{func_name}()',
-                    'type': 'function',
-                    'description': f'内置函数: {func_name}'
-                })
-        
-        # 数据类型建议
+            yield keyword, keyword, 'keyword', f'LiminalScript关键字: {keyword}'
+        for func_name in self.builtin_functions:
+            yield func_name, f'{func_name}()', 'function', f'内置函数: {func_name}'
         for data_type in self.data_types:
-            if data_type.startswith(current_line.split()[-1] if current_line.split() else ""):
-                suggestions.append({
-                    'text': data_type,
-                    'type': 'type',
-                    'description': f'数据类型: {data_type}'
-                })
-        
-        return suggestions
+            yield data_type, data_type, 'type', f'数据类型: {data_type}'
+        for preset, value in self.frequency_presets.items():
+            yield preset, preset, 'preset', f'频率预设: {preset} ({value} Hz)'
     
     def format_code(self, code: str) -> str:
         """代码格式化"""
@@ -397,20 +584,24 @@ class LiminalCompiler:
         lines = code.split('\n')
         
         for line_num, line in enumerate(lines, 1):
-            # 移除注释
-            if '//' in line:
-                line = line[:line.index('//')]
-            
-            # 正则表达式匹配token
-            token_pattern = r'(\w+|[{}();:,"\']|[0-9]+\.?[0-9]*|[+\-*/=<>!]+)'
-            matches = re.findall(token_pattern, line)
-            
-            for match in matches:
-                if match.strip():
-                    tokens.append((match, self._get_token_type(match), line_num))
+            for token, token_type in self._tokenize_line(line):
+                tokens.append((token, token_type, line_num))
         
         return tokens
     
+    def _tokenize_line(self, line: str) -> List[Tuple[str, str]]:
+        """单行词法分析（不含行号，便于增量复用）"""
+        # 移除注释
+        if '//' in line:
+            line = line[:line.index('//')]
+        
+        # 正则表达式匹配token
+        return [
+            (match, self._get_token_type(match))
+            for match in TOKEN_PATTERN.findall(line)
+            if match.strip()
+        ]
+    
     def _get_token_type(self, token: str) -> str:
         """获取token类型"""
         if token in self.keywords:
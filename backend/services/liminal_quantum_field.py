@@ -0,0 +1,183 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+璃冥宇宙3D量子场
+道的波函数 f(x, y, z) = sin x·cos y·sin z + cos x·sin y·cos z + 0.5·sin(x+y+z)，归一化到 [0, 1]
+
+- 由三条一维坐标轴广播求值，不再构造三份完整的 meshgrid
+- 默认 float32，分辨率可配置（256³ 约 64 MB）
+- 惰性生成：切片、分块迭代与统计量按需计算，只有显式取完整数组时才整体分配
+"""
+
+import threading
+from typing import Dict, Iterator, Optional, Tuple
+
+import numpy as np
+
+DEFAULT_FIELD_RESOLUTION = 100
+MAX_FIELD_RESOLUTION = 1024
+
+# 分块计算时每块的目标格点数（约 4 MB float32）
+CHUNK_CELLS = 1 << 20
+
+
+class LiminalQuantumField:
+    """
+    惰性3D量子场
+
+    数组布局与原 np.meshgrid(a, a, a) 的 'xy' 索引一致：
+    field[i, j, k] = f(x=a[j], y=a[i], z=a[k])。
+    未生成（generate 之前）时场为全零。
+    """
+
+    def __init__(self, resolution: int = DEFAULT_FIELD_RESOLUTION, dtype=np.float32):
+        resolution = int(resolution)
+        if not 2 <= resolution <= MAX_FIELD_RESOLUTION:
+            raise ValueError(f'量子场分辨率必须在 2 到 {MAX_FIELD_RESOLUTION} 之间')
+        self.resolution = resolution
+        self.dtype = np.dtype(dtype)
+        self.is_generated = False
+        self._lock = threading.Lock()
+        self._array: Optional[np.ndarray] = None
+        self._stats: Optional[Dict[str, float]] = None
+
+        axis = np.linspace(0, 2 * np.pi, resolution, dtype=self.dtype)
+        self._axis = axis
+        self._sin = np.sin(axis)
+        self._cos = np.cos(axis)
+
+    @property
+    def shape(self) -> Tuple[int, int, int]:
+        return (self.resolution,) * 3
+
+    @property
+    def nbytes(self) -> int:
+        """完整数组的字节数"""
+        return self.resolution ** 3 * self.dtype.itemsize
+
+    @property
+    def is_materialized(self) -> bool:
+        return self._array is not None
+
+    def generate(self):
+        """标记量子场为道的波函数（不分配数组）"""
+        with self._lock:
+            self.is_generated = True
+            self._array = None
+            self._stats = None
+
+    def release(self):
+        """释放已物化的完整数组，之后按需重新计算"""
+        with self._lock:
+            self._array = None
+
+    # === 按需求值 ===
+
+    def _evaluate(self, y: slice, x: slice, z: slice) -> np.ndarray:
+        """计算 field[y, x, z]（三个轴各取一段，广播求值）"""
+        sin, cos, axis = self._sin, self._cos, self._axis
+        if not self.is_generated:
+            return np.zeros((len(axis[y]), len(axis[x]), len(axis[z])), dtype=self.dtype)
+
+        sin_y, cos_y = sin[y][:, None, None], cos[y][:, None, None]
+        sin_x, cos_x = sin[x][None, :, None], cos[x][None, :, None]
+        sin_z, cos_z = sin[z][None, None, :], cos[z][None, None, :]
+
+        chunk = (sin_x * cos_y) * sin_z
+        chunk += (cos_x * sin_y) * cos_z
+        # sin(x+y+z) = sin(x+y)·cos z + cos(x+y)·sin z，x+y 只需二维
+        xy = axis[y][:, None] + axis[x][None, :]
+        chunk += (0.5 * np.sin(xy))[:, :, None] * cos_z
+        chunk += (0.5 * np.cos(xy))[:, :, None] * sin_z
+
+        chunk += 3
+        chunk /= 6
+        return chunk
+
+    def _evaluate_rows(self, start: int, stop: int) -> np.ndarray:
+        """计算 field[start:stop]（沿 y 轴的若干层）"""
+        whole = slice(None)
+        return self._evaluate(slice(start, stop), whole, whole)
+
+    def _rows_per_chunk(self) -> int:
+        return max(1, CHUNK_CELLS // (self.resolution * self.resolution))
+
+    def iter_chunks(self, rows_per_chunk: Optional[int] = None) -> Iterator[Tuple[int, np.ndarray]]:
+        """按 y 层分块迭代，产出 (起始层, 块数组)"""
+        step = rows_per_chunk or self._rows_per_chunk()
+        array = self._array
+        for start in range(0, self.resolution, step):
+            stop = min(start + step, self.resolution)
+            if array is not None:
+                yield start, array[start:stop]
+            else:
+                yield start, self._evaluate_rows(start, stop)
+
+    def get_slice(self, axis: int, index: int) -> np.ndarray:
+        """取单个二维截面，只计算该截面"""
+        if axis not in (0, 1, 2):
+            raise ValueError('axis 必须为 0、1 或 2')
+        if not 0 <= index < self.resolution:
+            raise IndexError(f'截面索引超出范围 0..{self.resolution - 1}')
+
+        if self._array is not None:
+            return np.take(self._array, index, axis=axis)
+
+        # 固定轴只取一格，另外两轴整段广播，计算量与截面大小相同
+        selection = [slice(None)] * 3
+        selection[axis] = slice(index, index + 1)
+        return self._evaluate(*selection).squeeze(axis)
+
+    def to_array(self) -> np.ndarray:
+        """物化完整数组（分块写入，无整场临时数组）"""
+        with self._lock:
+            if self._array is None:
+                array = np.empty(self.shape, dtype=self.dtype)
+                for start, chunk in self.iter_chunks():
+                    array[start:start + len(chunk)] = chunk
+                self._array = array
+            return self._array
+
+    # === 统计量 ===
+
+    def get_stats(self) -> Dict[str, float]:
+        """场的均值、极值与标准差（分块计算并缓存）"""
+        stats = self._stats
+        if stats is not None:
+            return stats
+
+        count = 0
+        total = 0.0
+        total_sq = 0.0
+        minimum = np.inf
+        maximum = -np.inf
+        for _, chunk in self.iter_chunks():
+            count += chunk.size
+            total += float(chunk.sum(dtype=np.float64))
+            total_sq += float(np.square(chunk).sum(dtype=np.float64))
+            minimum = min(minimum, float(chunk.min()))
+            maximum = max(maximum, float(chunk.max()))
+
+        mean = total / count
+        stats = {
+            'mean': mean,
+            'min': minimum,
+            'max': maximum,
+            'std': float(np.sqrt(max(total_sq / count - mean * mean, 0.0)))
+        }
+        self._stats = stats
+        return stats
+
+    def mean(self) -> float:
+        return self.get_stats()['mean']
+
+    def describe(self) -> Dict[str, object]:
+        """量子场元信息"""
+        return {
+            'resolution': self.resolution,
+            'shape': self.shape,
+            'dtype': str(self.dtype),
+            'nbytes': self.nbytes,
+            'generated': self.is_generated,
+            'materialized': self.is_materialized
+        }
@@ -0,0 +1,217 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+纳米精灵群体引擎
+群体属性按列保存为 NumPy 数组（频率、振幅、相干因子、五项能力矩阵、智能类型编码、激活状态），
+集体共振、神经传导物质释放、动作电位等计算全部向量化，百万规模的群体在百毫秒级完成。
+
+- from_records：从纳米精灵记录一次性装载（NanoAISystem 按目录 mtime 缓存，创建时失效）
+- synthetic：按 create_nanobot 相同的分布直接生成合成群体，不落盘
+- 单个纳米精灵的模拟也调用本模块的同一组公式，标量与数组结果一致
+"""
+
+from typing import Any, Dict, Iterable, List, Optional, Sequence
+
+import numpy as np
+
+# 能力名称及 create_nanobot 使用的均匀分布区间（列顺序即能力矩阵的列顺序）
+CAPABILITY_RANGES = {
+    'molecular_sensing': (0.8, 1.0),
+    'quantum_tunneling': (0.6, 0.9),
+    'self_assembly': (0.7, 0.95),
+    'wish_amplification': (0.5, 0.85),
+    'neural_interface': (0.4, 0.8)
+}
+CAPABILITIES = tuple(CAPABILITY_RANGES)
+COHERENCE_RANGE = (0.7, 0.95)
+
+MAX_SWARM_SIZE = 1_000_000
+
+RESTING_POTENTIAL_MV = -70.0
+THRESHOLD_MV = -55.0
+BRAIN_ALPHA_HZ = 10.0
+
+
+# === 公式（标量与数组通用）===
+
+def neurotransmitter_release(quantum_tunneling, amplitude):
+    """神经传导物质释放量：基础 0.5 + 量子隧穿增强 + 愿频调制，上限 1"""
+    return np.minimum(1.0, 0.5 + quantum_tunneling * 0.3 + amplitude * 0.2)
+
+
+def enhanced_potential(amplification):
+    """纳米精灵增强后的膜电位（mV）"""
+    return RESTING_POTENTIAL_MV + amplification * 20
+
+
+def frequency_match(frequency, target_frequency, span: float):
+    """频率匹配度：差值按 span 归一化到 0-1"""
+    return np.maximum(0.0, 1 - np.abs(frequency - target_frequency) / span)
+
+
+def _describe(values: np.ndarray) -> Dict[str, float]:
+    if len(values) == 0:
+        return {'mean': 0, 'min': 0, 'max': 0, 'p5': 0, 'p95': 0}
+    p5, p95 = np.percentile(values, [5, 95])
+    return {
+        'mean': float(values.mean()),
+        'min': float(values.min()),
+        'max': float(values.max()),
+        'p5': float(p5),
+        'p95': float(p95)
+    }
+
+
+class NanobotSwarm:
+    """列式存储的纳米精灵群体"""
+
+    def __init__(self, frequency: np.ndarray, amplitude: np.ndarray, coherence: np.ndarray,
+                 capabilities: np.ndarray, type_codes: np.ndarray, type_names: Sequence[str],
+                 active: np.ndarray, ids: Optional[List[str]] = None):
+        self.frequency = frequency
+        self.amplitude = amplitude
+        self.coherence = coherence
+        self.capabilities = capabilities
+        self.type_codes = type_codes
+        self.type_names = tuple(type_names)
+        self.active = active
+        self.ids = ids
+        self._positions = {nanobot_id: row for row, nanobot_id in enumerate(ids)} if ids is not None else {}
+
+    def __len__(self) -> int:
+        return len(self.frequency)
+
+    @classmethod
+    def from_records(cls, records: Iterable[Dict[str, Any]], type_names: Sequence[str]) -> 'NanobotSwarm':
+        records = list(records)
+        type_names = list(type_names)
+        type_lookup = {name: code for code, name in enumerate(type_names)}
+        for record in records:
+            intelligence_type = record['intelligence']['type']
+            if intelligence_type not in type_lookup:
+                type_lookup[intelligence_type] = len(type_names)
+                type_names.append(intelligence_type)
+        count = len(records)
+        return cls(
+            frequency=np.fromiter((r['wish_resonance']['frequency_hz'] for r in records), np.float64, count),
+            amplitude=np.fromiter((r['wish_resonance']['amplitude'] for r in records), np.float64, count),
+            coherence=np.fromiter((r['wish_resonance']['coherence_factor'] for r in records), np.float64, count),
+            capabilities=np.array([[r['capabilities'][name] for name in CAPABILITIES] for r in records],
+                                  dtype=np.float64).reshape(count, len(CAPABILITIES)),
+            type_codes=np.fromiter((type_lookup[r['intelligence']['type']] for r in records), np.int16, count),
+            type_names=type_names,
+            active=np.fromiter((bool(r.get('status', {}).get('active', False)) for r in records), bool, count),
+            ids=[r['id'] for r in records]
+        )
+
+    @classmethod
+    def synthetic(cls, size: int, resonance_modes: Dict[str, Dict[str, float]], type_names: Sequence[str],
+                  mode: Optional[str] = None, intelligence_type: Optional[str] = None,
+                  seed: Optional[int] = None) -> 'NanobotSwarm':
+        """按 create_nanobot 的分布生成合成群体；未指定共振模式 / 智能类型时随机分配"""
+        if not 1 <= size <= MAX_SWARM_SIZE:
+            raise ValueError(f'群体规模必须在 1 到 {MAX_SWARM_SIZE} 之间')
+        mode_names = list(resonance_modes)
+        if mode is not None and mode not in resonance_modes:
+            raise ValueError(f'未知的共振模式: {mode}')
+        if intelligence_type is not None and intelligence_type not in type_names:
+            raise ValueError(f'未知的智能类型: {intelligence_type}')
+
+        rng = np.random.default_rng(seed)
+        if mode is None:
+            mode_codes = rng.integers(0, len(mode_names), size)
+        else:
+            mode_codes = np.full(size, mode_names.index(mode))
+        mode_frequency = np.array([resonance_modes[name]['frequency'] for name in mode_names], dtype=np.float64)
+        mode_amplitude = np.array([resonance_modes[name]['amplitude'] for name in mode_names], dtype=np.float64)
+
+        low = np.array([CAPABILITY_RANGES[name][0] for name in CAPABILITIES])
+        high = np.array([CAPABILITY_RANGES[name][1] for name in CAPABILITIES])
+        if intelligence_type is None:
+            type_codes = rng.integers(0, len(type_names), size).astype(np.int16)
+        else:
+            type_codes = np.full(size, list(type_names).index(intelligence_type), dtype=np.int16)
+
+        return cls(
+            frequency=mode_frequency[mode_codes],
+            amplitude=mode_amplitude[mode_codes],
+            coherence=rng.uniform(*COHERENCE_RANGE, size),
+            capabilities=rng.uniform(low, high, (size, len(CAPABILITIES))),
+            type_codes=type_codes,
+            type_names=type_names,
+            active=np.ones(size, dtype=bool)
+        )
+
+    # === 选取 ===
+
+    def rows_for(self, nanobot_ids: Iterable[str]) -> np.ndarray:
+        """按ID取行号，未知ID忽略（重复ID保留）"""
+        positions = self._positions
+        return np.fromiter((positions[i] for i in nanobot_ids if i in positions), np.intp)
+
+    def active_rows(self) -> np.ndarray:
+        return np.flatnonzero(self.active)
+
+    def _rows(self, rows: Optional[np.ndarray]) -> slice:
+        return slice(None) if rows is None else rows
+
+    def capability(self, name: str, rows: Optional[np.ndarray] = None) -> np.ndarray:
+        return self.capabilities[self._rows(rows), CAPABILITIES.index(name)]
+
+    # === 群体计算 ===
+
+    def collective_resonance(self, wish_frequency: float, rows: Optional[np.ndarray] = None) -> Dict[str, float]:
+        """集体共振：平均振幅 × 平均相干 × 平均频率匹配 × √N / 4，上限 1"""
+        selected = self._rows(rows)
+        count = len(self) if rows is None else len(rows)
+        if count == 0:
+            return {'coherence': 0, 'amplitude': 0, 'frequency_match': 0, 'overall_power': 0}
+        avg_amplitude = float(self.amplitude[selected].mean())
+        avg_coherence = float(self.coherence[selected].mean())
+        avg_freq_match = float(frequency_match(self.frequency[selected], wish_frequency, 100).mean())
+        collective_enhancement = float(np.sqrt(count))
+        overall_power = (avg_amplitude * avg_coherence * avg_freq_match * collective_enhancement) / 4
+        return {
+            'coherence': avg_coherence,
+            'amplitude': avg_amplitude,
+            'frequency_match': avg_freq_match,
+            'collective_enhancement': collective_enhancement,
+            'overall_power': min(1.0, overall_power)
+        }
+
+    def neurotransmitter_release(self, rows: Optional[np.ndarray] = None) -> np.ndarray:
+        return neurotransmitter_release(self.capability('quantum_tunneling', rows),
+                                        self.amplitude[self._rows(rows)])
+
+    def signal_amplification(self, rows: Optional[np.ndarray] = None) -> np.ndarray:
+        return self.amplitude[self._rows(rows)] * self.capability('neural_interface', rows)
+
+    def synaptic_summary(self, rows: Optional[np.ndarray] = None) -> Dict[str, Any]:
+        """整个群体的突触桥接统计：传导物质释放、增强电位、放电比例、α 波频率匹配"""
+        amplification = self.signal_amplification(rows)
+        potentials = enhanced_potential(amplification)
+        spikes = potentials > THRESHOLD_MV
+        return {
+            'nanobots': int(len(amplification)),
+            'neurotransmitter_release': _describe(self.neurotransmitter_release(rows)),
+            'signal_amplification': _describe(amplification),
+            'action_potential': {
+                'resting_potential_mv': RESTING_POTENTIAL_MV,
+                'threshold_mv': THRESHOLD_MV,
+                'enhanced_potential_mv': _describe(potentials),
+                'spike_count': int(spikes.sum()),
+                'spike_fraction': float(spikes.mean()) if len(spikes) else 0.0
+            },
+            'alpha_frequency_match': _describe(
+                frequency_match(self.frequency[self._rows(rows)], BRAIN_ALPHA_HZ, 50))
+        }
+
+    def capability_means(self, rows: Optional[np.ndarray] = None) -> Dict[str, float]:
+        matrix = self.capabilities[self._rows(rows)]
+        if len(matrix) == 0:
+            return {}
+        return dict(zip(CAPABILITIES, map(float, matrix.mean(axis=0))))
+
+    def type_distribution(self, rows: Optional[np.ndarray] = None) -> Dict[str, int]:
+        counts = np.bincount(self.type_codes[self._rows(rows)], minlength=len(self.type_names))
+        return {name: int(count) for name, count in zip(self.type_names, counts) if count}
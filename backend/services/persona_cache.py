@@ -0,0 +1,234 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+语灵人格编译缓存
+人格源文件（YAML / JSON）只在首次载入或内容变化时解析一次，解析结果经校验后以 marshal
+快照写在源文件旁的 __pycache__ 目录（与 .pyc 的做法相同），之后的进程直接读快照。
+
+失效规则：
+- 内存条目：源文件 mtime_ns 与大小不变即视为有效，热路径只有一次 stat 加字典读取
+- 磁盘快照：mtime_ns 与大小一致直接采用；不一致时比对内容 sha256，
+  内容未变（例如 git checkout 只改了时间戳）仍沿用快照并刷新记录的时间戳
+
+marshal 只能序列化基本类型；含日期等对象的人格不写快照，只保留内存缓存。
+"""
+
+import copy
+import hashlib
+import marshal
+import os
+import threading
+from pathlib import Path
+from typing import Any, Callable, Dict, List, Optional, Sequence, Tuple
+
+SNAPSHOT_VERSION = 1
+SNAPSHOT_DIR = '__pycache__'
+SNAPSHOT_SUFFIX = '.persona.marshal'
+
+# (文件后缀, 解析函数)，排在前面的格式优先
+PersonaSource = Tuple[str, Callable[[str], Any]]
+
+
+class PersonaCache:
+    """按人格名缓存解析结果
+
+    get() 返回共享的只读数据；load() 返回独立副本（由 marshal 字节串重建，调用方可随意修改）。
+    """
+
+    def __init__(self, directory, sources: Sequence[PersonaSource],
+                 validator: Optional[Callable[[Dict[str, Any]], Dict[str, Any]]] = None):
+        self.directory = Path(directory)
+        self.sources = tuple(sources)
+        self.validator = validator
+        self._lock = threading.Lock()
+        self._entries: Dict[str, Dict[str, Any]] = {}
+        self._listing: Optional[List[str]] = None
+        self._listing_mtime: Optional[int] = None
+        self._stats = {'hits': 0, 'parsed': 0, 'snapshot_loads': 0}
+
+    # === 快照 ===
+
+    def _snapshot_path(self, source: Path) -> Path:
+        return source.parent / SNAPSHOT_DIR / (source.name + SNAPSHOT_SUFFIX)
+
+    def _read_snapshot(self, source: Path) -> Optional[Dict[str, Any]]:
+        try:
+            with open(self._snapshot_path(source), 'rb') as f:
+                snapshot = marshal.load(f)
+        except (OSError, EOFError, ValueError, TypeError):
+            return None
+        if not isinstance(snapshot, dict) or snapshot.get('version') != SNAPSHOT_VERSION:
+            return None
+        return snapshot
+
+    def _write_snapshot(self, source: Path, snapshot: Dict[str, Any]):
+        """原子写入（先写临时文件再替换），目录不可写时静默跳过"""
+        path = self._snapshot_path(source)
+        temp_path = path.with_name(f'{path.name}.{os.getpid()}.tmp')
+        try:
+            path.parent.mkdir(exist_ok=True)
+            with open(temp_path, 'wb') as f:
+                marshal.dump(snapshot, f)
+            os.replace(temp_path, path)
+        except OSError:
+            try:
+                os.unlink(temp_path)
+            except OSError:
+                pass
+
+    # === 载入 ===
+
+    def _compile(self, source: Path, loader: Callable[[str], Any], stat: os.stat_result) -> Dict[str, Any]:
+        snapshot = self._read_snapshot(source)
+        if snapshot and (snapshot['mtime_ns'], snapshot['size']) == (stat.st_mtime_ns, stat.st_size):
+            self._count('snapshot_loads')
+            return self._entry(source, stat, marshal.loads(snapshot['blob']), snapshot['blob'],
+                               snapshot['validation'], snapshot['sha256'])
+
+        raw = source.read_bytes()
+        digest = hashlib.sha256(raw).hexdigest()
+        if snapshot and snapshot['sha256'] == digest:
+            # 内容未变，只刷新时间戳
+            self._count('snapshot_loads')
+            snapshot.update(mtime_ns=stat.st_mtime_ns, size=stat.st_size)
+            self._write_snapshot(source, snapshot)
+            return self._entry(source, stat, marshal.loads(snapshot['blob']), snapshot['blob'],
+                               snapshot['validation'], digest)
+
+        self._count('parsed')
+        data = loader(raw.decode('utf-8'))
+        validation = self.validator(data) if self.validator and isinstance(data, dict) else None
+        try:
+            blob = marshal.dumps(data)
+        except ValueError:
+            blob = None
+        if blob is not None:
+            self._write_snapshot(source, {
+                'version': SNAPSHOT_VERSION,
+                'source': source.name,
+                'mtime_ns': stat.st_mtime_ns,
+                'size': stat.st_size,
+                'sha256': digest,
+                'validation': validation,
+                'blob': blob
+            })
+        return self._entry(source, stat, data, blob, validation, digest)
+
+    @staticmethod
+    def _entry(source: Path, stat: os.stat_result, data, blob, validation, digest) -> Dict[str, Any]:
+        return {
+            'path': source,
+            'mtime_ns': stat.st_mtime_ns,
+            'size': stat.st_size,
+            'sha256': digest,
+            'data': data,
+            'blob': blob,
+            'validation': validation
+        }
+
+    def _count(self, key: str):
+        with self._lock:
+            self._stats[key] += 1
+
+    @staticmethod
+    def _matches(entry: Optional[Dict[str, Any]], source: Path, stat: os.stat_result) -> bool:
+        return bool(entry) and entry['path'] == source and \
+            (entry['mtime_ns'], entry['size']) == (stat.st_mtime_ns, stat.st_size)
+
+    def _lookup(self, name: str) -> Optional[Dict[str, Any]]:
+        for suffix, loader in self.sources:
+            source = self.directory / f'{name}{suffix}'
+            try:
+                stat = source.stat()
+            except OSError:
+                continue
+            with self._lock:
+                entry = self._entries.get(name)
+                if self._matches(entry, source, stat):
+                    self._stats['hits'] += 1
+                    return entry
+            # 解析与读写快照不持锁，其他人格的读取不受影响
+            entry = self._compile(source, loader, stat)
+            with self._lock:
+                current = self._entries.get(name)
+                if self._matches(current, source, stat):
+                    # 并发载入时沿用先写入的条目
+                    return current
+                self._entries[name] = entry
+                return entry
+
+        with self._lock:
+            self._entries.pop(name, None)
+        return None
+
+    def get(self, name: str) -> Optional[Any]:
+        """共享数据（只读使用）"""
+        entry = self._lookup(name)
+        return entry['data'] if entry else None
+
+    def load(self, name: str) -> Optional[Any]:
+        """独立副本"""
+        entry = self._lookup(name)
+        if entry is None:
+            return None
+        if entry['blob'] is not None:
+            return marshal.loads(entry['blob'])
+        return copy.deepcopy(entry['data'])
+
+    def validation(self, name: str) -> Optional[Dict[str, Any]]:
+        """解析时的校验结果"""
+        entry = self._lookup(name)
+        return entry['validation'] if entry else None
+
+    # === 列表与预热 ===
+
+    def names(self) -> List[str]:
+        """目录中的人格名（按目录 mtime 缓存，增删文件后自动重扫）"""
+        try:
+            mtime = self.directory.stat().st_mtime_ns
+        except OSError:
+            return []
+        with self._lock:
+            if self._listing is not None and self._listing_mtime == mtime:
+                return list(self._listing)
+
+        names = set()
+        with os.scandir(self.directory) as entries:
+            for item in entries:
+                for suffix, _ in self.sources:
+                    if item.name.endswith(suffix) and len(item.name) > len(suffix) and item.is_file():
+                        names.add(item.name[:-len(suffix)])
+                        break
+        listing = sorted(names)
+        with self._lock:
+            self._listing, self._listing_mtime = listing, mtime
+        return list(listing)
+
+    def warm_up(self) -> Dict[str, Any]:
+        """预载目录中全部人格（worker 启动时调用），返回载入概况"""
+        loaded, invalid, failed = [], {}, {}
+        for name in self.names():
+            try:
+                entry = self._lookup(name)
+            except Exception as e:
+                failed[name] = str(e)
+                continue
+            if entry is None:
+                continue
+            if self.validator and not isinstance(entry['data'], dict):
+                failed[name] = '人格内容不是映射'
+                continue
+            loaded.append(name)
+            validation = entry['validation']
+            if validation and not validation.get('valid', True):
+                invalid[name] = validation.get('missing_fields', [])
+        return {
+            'loaded': loaded,
+            'invalid': invalid,
+            'failed': failed,
+            **self.stats()
+        }
+
+    def stats(self) -> Dict[str, int]:
+        with self._lock:
+            return {**self._stats, 'cached': len(self._entries)}
@@ -540,4 +540,15 @@ class QuantumBaguaEngineV2:
                 'supported_gates': list(self.advanced_bagua_gates.keys()),
                 'entanglement_capacity': 'full_connectivity'
             }
-        }
\ No newline at end of file
+        }
+
+
+# 进程池工作进程内复用的引擎实例
+_process_engines: Dict[int, QuantumBaguaEngineV2] = {}
+
+def calculate_64_hexagram_shang_sync(max_qubits: int, user_data: Dict) -> Dict:
+    """进程池入口：同步执行64卦量子商值计算，每个工作进程复用一个引擎"""
+    engine = _process_engines.get(max_qubits)
+    if engine is None:
+        engine = _process_engines[max_qubits] = QuantumBaguaEngineV2(max_qubits=max_qubits)
+    return asyncio.run(engine.calculate_64_hexagram_shang(user_data))
@@ -0,0 +1,254 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+量子任务执行器
+长驻的后台事件循环线程 + 有界进程池
+
+Flask 请求处理函数不再各自创建事件循环或线程：
+- 协程任务提交到唯一的后台事件循环
+- 模拟器等 CPU 密集任务经由事件循环转交进程池
+- 提交时检查排队深度，超过上限即拒绝（背压）
+- 每个任务有 job_id，可同步等待（带超时）或之后轮询
+- 具名后台任务（如无为流量管理）全局唯一，重复启动不会叠加事件循环
+"""
+
+import asyncio
+import os
+import threading
+import time
+import uuid
+from collections import OrderedDict
+from concurrent.futures import Future, ProcessPoolExecutor, TimeoutError as FutureTimeoutError
+from typing import Any, Callable, Coroutine, Dict, Optional
+
+
+class ExecutorBusyError(Exception):
+    """执行器排队已满"""
+
+    def __init__(self, queue_depth: int, max_pending: int):
+        self.queue_depth = queue_depth
+        self.max_pending = max_pending
+        super().__init__(f"量子任务队列已满 ({queue_depth}/{max_pending})，请稍后再试")
+
+
+class QuantumJob:
+    """量子任务句柄"""
+
+    def __init__(self, job_id: str, name: str, future: Future):
+        self.job_id = job_id
+        self.name = name
+        self.future = future
+        self.submitted_at = time.time()
+        self.finished_at: Optional[float] = None
+
+    @property
+    def status(self) -> str:
+        if not self.future.done():
+            return 'pending'
+        if self.future.cancelled():
+            return 'cancelled'
+        return 'failed' if self.future.exception() is not None else 'completed'
+
+    def result(self, timeout: Optional[float] = None) -> Any:
+        """等待结果，超时抛出 concurrent.futures.TimeoutError"""
+        return self.future.result(timeout=timeout)
+
+    def to_dict(self, include_result: bool = True) -> Dict[str, Any]:
+        status = self.status
+        info = {
+            'job_id': self.job_id,
+            'name': self.name,
+            'status': status,
+            'submitted_at': self.submitted_at,
+            'finished_at': self.finished_at
+        }
+        if include_result and status == 'completed':
+            info['result'] = self.future.result()
+        elif status == 'failed':
+            info['error'] = str(self.future.exception())
+        return info
+
+
+class QuantumJobExecutor:
+    """
+    量子任务执行器
+
+    首次提交时惰性启动后台事件循环线程与进程池，整个进程共享一个实例。
+    """
+
+    def __init__(self, max_workers: Optional[int] = None, max_pending: int = 32,
+                 max_retained_jobs: int = 256):
+        self.max_workers = max_workers or min(4, os.cpu_count() or 1)
+        self.max_pending = max_pending
+        self.max_retained_jobs = max_retained_jobs
+
+        self._lock = threading.Lock()
+        self._loop: Optional[asyncio.AbstractEventLoop] = None
+        self._thread: Optional[threading.Thread] = None
+        self._process_pool: Optional[ProcessPoolExecutor] = None
+        self._jobs: "OrderedDict[str, QuantumJob]" = OrderedDict()
+        self._pending = 0
+        self._background_tasks: Dict[str, asyncio.Task] = {}
+        self.completed_jobs = 0
+        self.rejected_jobs = 0
+
+    # === 生命周期 ===
+
+    def _ensure_started(self) -> asyncio.AbstractEventLoop:
+        """惰性启动事件循环线程与进程池"""
+        with self._lock:
+            if self._loop is not None and self._thread.is_alive():
+                return self._loop
+
+            loop = asyncio.new_event_loop()
+            ready = threading.Event()
+
+            def run_loop():
+                asyncio.set_event_loop(loop)
+                loop.call_soon(ready.set)
+                loop.run_forever()
+
+            thread = threading.Thread(target=run_loop, name='quantum-job-loop', daemon=True)
+            thread.start()
+            ready.wait()
+
+            self._loop = loop
+            self._thread = thread
+            if self._process_pool is None:
+                self._process_pool = ProcessPoolExecutor(max_workers=self.max_workers)
+            return loop
+
+    def shutdown(self, wait: bool = True):
+        """关闭事件循环与进程池"""
+        with self._lock:
+            loop, thread, pool = self._loop, self._thread, self._process_pool
+            self._loop = self._thread = self._process_pool = None
+        if loop is not None:
+            loop.call_soon_threadsafe(loop.stop)
+            if wait and thread is not None:
+                thread.join(timeout=5)
+        if pool is not None:
+            pool.shutdown(wait=wait)
+
+    # === 任务提交 ===
+
+    def submit_coroutine(self, coro_factory: Callable[[], Coroutine], name: str = 'coroutine') -> QuantumJob:
+        """提交协程到后台事件循环"""
+        loop = self._ensure_started()
+        self._reserve_slot()
+        future = asyncio.run_coroutine_threadsafe(coro_factory(), loop)
+        return self._register(name, future)
+
+    def submit_process(self, func: Callable, *args, name: str = None) -> QuantumJob:
+        """提交可序列化的函数到进程池（由事件循环调度）"""
+        loop = self._ensure_started()
+        self._reserve_slot()
+        pool = self._process_pool
+
+        async def run_in_pool():
+            return await loop.run_in_executor(pool, func, *args)
+
+        future = asyncio.run_coroutine_threadsafe(run_in_pool(), loop)
+        return self._register(name or getattr(func, '__name__', 'process_job'), future)
+
+    def run(self, job: QuantumJob, timeout: float) -> Dict[str, Any]:
+        """等待任务至多 timeout 秒；未完成时返回 pending 状态供轮询"""
+        try:
+            job.result(timeout=timeout)
+        except FutureTimeoutError:
+            pass
+        except Exception:
+            # 失败信息由 to_dict 返回
+            pass
+        return job.to_dict()
+
+    def _reserve_slot(self):
+        with self._lock:
+            if self._pending >= self.max_pending:
+                self.rejected_jobs += 1
+                raise ExecutorBusyError(self._pending, self.max_pending)
+            self._pending += 1
+
+    def _register(self, name: str, future: Future) -> QuantumJob:
+        job = QuantumJob(uuid.uuid4().hex, name, future)
+
+        def on_done(_future):
+            job.finished_at = time.time()
+            with self._lock:
+                self._pending -= 1
+                self.completed_jobs += 1
+
+        with self._lock:
+            self._jobs[job.job_id] = job
+            while len(self._jobs) > self.max_retained_jobs:
+                oldest_id, oldest = next(iter(self._jobs.items()))
+                if not oldest.future.done():
+                    break
+                self._jobs.pop(oldest_id)
+
+        future.add_done_callback(on_done)
+        return job
+
+    def get_job(self, job_id: str) -> Optional[QuantumJob]:
+        """按ID查询任务"""
+        return self._jobs.get(job_id)
+
+    # === 具名后台任务 ===
+
+    def start_background_task(self, name: str, coro_factory: Callable[[], Coroutine]) -> bool:
+        """启动具名后台任务；同名任务仍在运行时不重复启动，返回 False"""
+        loop = self._ensure_started()
+
+        async def start():
+            task = self._background_tasks.get(name)
+            if task is not None and not task.done():
+                return False
+            self._background_tasks[name] = loop.create_task(coro_factory())
+            return True
+
+        return asyncio.run_coroutine_threadsafe(start(), loop).result(timeout=5)
+
+    def cancel_background_task(self, name: str, timeout: float = 5) -> bool:
+        """取消具名后台任务并等待其结束"""
+        with self._lock:
+            loop = self._loop
+        if loop is None:
+            return False
+
+        async def cancel():
+            task = self._background_tasks.pop(name, None)
+            if task is None or task.done():
+                return False
+            task.cancel()
+            try:
+                await task
+            except asyncio.CancelledError:
+                pass
+            return True
+
+        return asyncio.run_coroutine_threadsafe(cancel(), loop).result(timeout=timeout)
+
+    def is_background_task_running(self, name: str) -> bool:
+        task = self._background_tasks.get(name)
+        return task is not None and not task.done()
+
+    # === 状态 ===
+
+    def get_stats(self) -> Dict[str, Any]:
+        """执行器状态与排队深度"""
+        return {
+            'loop_running': self._thread is not None and self._thread.is_alive(),
+            'max_workers': self.max_workers,
+            'queue_depth': self._pending,
+            'max_pending': self.max_pending,
+            'completed_jobs': self.completed_jobs,
+            'rejected_jobs': self.rejected_jobs,
+            'retained_jobs': len(self._jobs),
+            'background_tasks': {
+                name: not task.done() for name, task in self._background_tasks.items()
+            }
+        }
+
+
+# 全局量子任务执行器
+quantum_executor = QuantumJobExecutor()
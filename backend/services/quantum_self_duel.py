@@ -38,6 +38,31 @@ class ConsciousnessAspect(Enum):
     OBSERVER_SELF = "觀察者"  # 純粹覺知
     QUANTUM_SELF = "量子自我"  # 疊加態存在
 
+# 回合主題（七輪對應七個意識層次）
+ROUND_THEMES = {
+    1: "認識衝突",  # 識別內在衝突
+    2: "面對陰影",  # 直面被壓抑的面向
+    3: "挑戰自我",  # 質疑自我執著
+    4: "尋求智慧",  # 連接高我指引
+    5: "保持觀察",  # 強化觀察者意識
+    6: "整合對立",  # 整合矛盾面向
+    7: "超越二元"   # 超越對立統一
+}
+DEFAULT_ROUND_THEME = "深化覺察"
+
+# 對決狀態推進順序與各狀態推進所需的整合進度閾值
+DUEL_STATE_ORDER = [
+    DuelState.PREPARATION, DuelState.CONFRONTATION, DuelState.CONFLICT,
+    DuelState.RESOLUTION, DuelState.TRANSCENDENCE, DuelState.INTEGRATION
+]
+DUEL_STATE_THRESHOLDS = [0.1, 0.2, 0.3, 0.4, 0.5, float('inf')]
+
+# 批量模擬中參與者陣列的列順序
+BATCH_ASPECTS = [
+    ConsciousnessAspect.EGO_SELF, ConsciousnessAspect.SHADOW_SELF,
+    ConsciousnessAspect.HIGHER_SELF, ConsciousnessAspect.OBSERVER_SELF
+]
+
 @dataclass
 class DuelParticipant:
     """對決參與者"""
@@ -210,13 +235,10 @@ class QuantumSelfDuelEngine:
         # 創建疊加態
         superposition = sum(normalized_states) / len(normalized_states)
         
-        # 計算糾纏度
-        entanglement_matrix = np.zeros((len(participants), len(participants)))
-        for i, p1 in enumerate(participants):
-            for j, p2 in enumerate(participants):
-                if i != j:
-                    entanglement = abs(p1.quantum_state.conjugate() * p2.quantum_state)
-                    entanglement_matrix[i][j] = entanglement
+        # 計算糾纏度：|conj(ψi)·ψj| = |ψi|·|ψj|，以外積一次求出
+        amplitudes = np.abs(np.array([p.quantum_state for p in participants]))
+        entanglement_matrix = np.outer(amplitudes, amplitudes)
+        np.fill_diagonal(entanglement_matrix, 0.0)
         
         arena = {
             'superposition_state': superposition,
@@ -294,17 +316,7 @@ class QuantumSelfDuelEngine:
         arena = duel['quantum_arena']
         
         # 根據回合數決定對決重點
-        round_themes = {
-            1: "認識衝突",  # 識別內在衝突
-            2: "面對陰影",  # 直面被壓抑的面向
-            3: "挑戰自我",  # 質疑自我執著
-            4: "尋求智慧",  # 連接高我指引
-            5: "保持觀察",  # 強化觀察者意識
-            6: "整合對立",  # 整合矛盾面向
-            7: "超越二元"   # 超越對立統一
-        }
-        
-        theme = round_themes.get(round_num, "深化覺察")
+        theme = ROUND_THEMES.get(round_num, DEFAULT_ROUND_THEME)
         
         # 模擬對決過程
         interactions = self._simulate_consciousness_interactions(participants, theme)
@@ -646,6 +658,173 @@ class QuantumSelfDuelEngine:
             'final_result': d.get('final_result')
         } for d in self.duel_history]
 
+    # === 批量模擬 ===
+    
+    def simulate_duel_batch(self, trigger_event: str = None, n_duels: int = 1000,
+                            rounds: int = 7, seed: int = None,
+                            state_noise: float = 0.0) -> Dict[str, Any]:
+        """
+        📦 批量模擬對決
+        
+        以 NumPy 陣列保存所有對決的參與者狀態（能量、連貫性、抗拒、量子態），
+        每輪對全部對決一次性推進。每場對決從初始意識矩陣開始，不修改引擎狀態。
+        
+        Args:
+            trigger_event: 觸發事件描述
+            n_duels: 對決數量
+            rounds: 每場對決的回合數
+            seed: 隨機種子（相同種子結果可重現）
+            state_noise: 參與者初始狀態的高斯擾動標準差
+            
+        Returns:
+            結果分佈統計
+        """
+        rng = np.random.default_rng(seed)
+        result = self._run_duel_batch(trigger_event, n_duels, rounds, state_noise, rng)
+        result['seed'] = seed
+        return result
+    
+    def sweep_trigger_events(self, trigger_events: List[str], n_duels: int = 1000,
+                             rounds: int = 7, seed: int = None,
+                             state_noise: float = 0.0) -> Dict[str, Any]:
+        """
+        🧪 觸發事件參數掃描
+        
+        每個觸發事件使用由主種子派生的獨立隨機流，
+        結果不受事件順序影響，可離線預先計算結果分佈。
+        """
+        seed_sequence = np.random.SeedSequence(seed)
+        child_seeds = seed_sequence.spawn(len(trigger_events))
+        
+        return {
+            'seed': seed_sequence.entropy,
+            'n_duels': n_duels,
+            'rounds': rounds,
+            'state_noise': state_noise,
+            'results': [
+                self._run_duel_batch(trigger, n_duels, rounds, state_noise,
+                                     np.random.default_rng(child_seed))
+                for trigger, child_seed in zip(trigger_events, child_seeds)
+            ]
+        }
+    
+    def _run_duel_batch(self, trigger_event: str, n_duels: int, rounds: int,
+                        state_noise: float, rng: np.random.Generator) -> Dict[str, Any]:
+        """批量對決核心：所有對決並行，逐輪推進"""
+        ego, shadow, higher, observer = range(len(BATCH_ASPECTS))
+        
+        # 參與者初始狀態（沿用單場對決的觸發事件調整邏輯）
+        template = {p.aspect: p for p in self._identify_duel_participants(trigger_event)}
+        ordered = [template[aspect] for aspect in BATCH_ASPECTS]
+        shape = (n_duels, len(BATCH_ASPECTS))
+        energy = np.tile([p.energy_level for p in ordered], (n_duels, 1))
+        coherence = np.tile([p.coherence for p in ordered], (n_duels, 1))
+        resistance = np.tile([p.resistance_level for p in ordered], (n_duels, 1))
+        quantum_state = np.tile(np.array([p.quantum_state for p in ordered]), (n_duels, 1))
+        
+        if state_noise > 0:
+            energy = np.clip(energy + rng.normal(0, state_noise, shape), 0, None)
+            coherence = np.clip(coherence + rng.normal(0, state_noise, shape), 0, None)
+            resistance = np.clip(resistance + rng.normal(0, state_noise, shape), 0, None)
+            quantum_state = quantum_state * np.clip(1 + rng.normal(0, state_noise, shape), 0, None)
+        
+        # 量子場域
+        amplitudes = np.abs(quantum_state)
+        total_amplitude = amplitudes.sum(axis=1)
+        total_amplitude[total_amplitude == 0] = 1.0
+        field_coherence = np.abs((quantum_state / total_amplitude[:, None]).mean(axis=1))
+        pairs = len(BATCH_ASPECTS) * (len(BATCH_ASPECTS) - 1)
+        mean_entanglement = (amplitudes.sum(axis=1) ** 2 - (amplitudes ** 2).sum(axis=1)) / pairs
+        conflict_intensity = np.minimum(1.0, (energy[:, ego] + energy[:, shadow]) / (coherence[:, observer] + 1))
+        resolution_potential = np.minimum(1.0, (energy[:, higher] + coherence[:, observer]) / (resistance.mean(axis=1) + 1))
+        quantum_noise = rng.uniform(0.1, 0.3, n_duels)
+        
+        # 每輪主題的確定性結果（與單場對決的互動邏輯一致）
+        theme_outcomes = {}
+        for theme in set(ROUND_THEMES.values()) | {DEFAULT_ROUND_THEME}:
+            interactions = self._simulate_consciousness_interactions(ordered, theme)
+            energy_shift = sum(i['energy_exchange'] for i in interactions)
+            conflict_reduction = abs(energy_shift) * 0.1
+            awareness_increase = len(interactions) * 0.05
+            theme_outcomes[theme] = (conflict_reduction, awareness_increase,
+                                     (conflict_reduction + awareness_increase) / 2)
+        
+        initial_matrix = self._initialize_consciousness_matrix()
+        matrix = {key: np.full(n_duels, value) for key, value in initial_matrix.items()}
+        state_index = np.zeros(n_duels, dtype=int)
+        thresholds = np.array(DUEL_STATE_THRESHOLDS)
+        resolution_round = np.zeros(n_duels, dtype=int)
+        
+        for round_num in range(1, rounds + 1):
+            theme = ROUND_THEMES.get(round_num, DEFAULT_ROUND_THEME)
+            conflict_reduction, awareness_increase, integration_progress = theme_outcomes[theme]
+            
+            state_index += integration_progress > thresholds[state_index]
+            
+            matrix['self_awareness'] += awareness_increase
+            matrix['conflict_resolution'] += conflict_reduction
+            matrix['quantum_coherence'] += rng.uniform(-0.1, 0.2, n_duels)
+            if theme == "面對陰影":
+                matrix['shadow_integration'] += 0.1
+            elif theme == "超越二元":
+                matrix['unity_consciousness'] += 0.15
+            for key in matrix:
+                np.clip(matrix[key], 0, 1, out=matrix[key])
+            
+            if round_num >= 3:
+                newly_resolved = ((resolution_round == 0) &
+                                  (resolution_potential >= 0.8) &
+                                  (matrix['unity_consciousness'] >= 0.6))
+                resolution_round[newly_resolved] = round_num
+        
+        # 最終整合（與 _calculate_final_integration 相同的公式）
+        total_integration = min(1.0, rounds / 7.0) + field_coherence * 0.3 + resolution_potential * 0.4
+        integration_score = np.minimum(1.0, total_integration)
+        
+        resolved = resolution_round > 0
+        rounds_hist = np.bincount(resolution_round[resolved], minlength=rounds + 1)
+        state_counts = np.bincount(state_index, minlength=len(DUEL_STATE_ORDER))
+        score_hist, score_edges = np.histogram(integration_score, bins=10, range=(0.0, 1.0))
+        
+        return {
+            'trigger_event': trigger_event or "內在衝突自然湧現",
+            'n_duels': n_duels,
+            'rounds': rounds,
+            'resolved_ratio': float(resolved.mean()) if n_duels else 0.0,
+            'resolution_round_histogram': {
+                str(r): int(count) for r, count in enumerate(rounds_hist) if count
+            },
+            'final_state_distribution': {
+                state.value: int(count) for state, count in zip(DUEL_STATE_ORDER, state_counts)
+            },
+            'integration_score': self._describe_distribution(integration_score),
+            'integration_score_histogram': {
+                'edges': score_edges.tolist(),
+                'counts': score_hist.tolist()
+            },
+            'field_coherence': self._describe_distribution(field_coherence),
+            'mean_entanglement': self._describe_distribution(mean_entanglement),
+            'conflict_intensity': self._describe_distribution(conflict_intensity),
+            'resolution_potential': self._describe_distribution(resolution_potential),
+            'quantum_noise': self._describe_distribution(quantum_noise),
+            'awakening_boost': self._describe_distribution(total_integration * 0.2),
+            'consciousness_matrix': {key: float(values.mean()) for key, values in matrix.items()}
+        }
+    
+    @staticmethod
+    def _describe_distribution(values: np.ndarray) -> Dict[str, float]:
+        """分佈摘要統計"""
+        if values.size == 0:
+            return {'mean': 0.0, 'std': 0.0, 'p05': 0.0, 'p50': 0.0, 'p95': 0.0}
+        p05, p50, p95 = np.percentile(values, [5, 50, 95])
+        return {
+            'mean': float(values.mean()),
+            'std': float(values.std()),
+            'p05': float(p05),
+            'p50': float(p50),
+            'p95': float(p95)
+        }
+
 # 創建全局量子自我對決引擎實例
 quantum_self_duel_engine = QuantumSelfDuelEngine()
 
@@ -1,7 +1,15 @@
 from typing import Dict, Tuple
 from backend.models.shang_model import ShangRecord
+from backend.utils.trigger_matcher import trigger_registry
 import config
 
+# 冥想心得關鍵詞
+MEDITATION_TRIGGER_SUBSYSTEM = 'shang_meditation'
+trigger_registry.register_many(MEDITATION_TRIGGER_SUBSYSTEM, {
+    'positive': ['平靜', '放鬆', '清晰', '專注', '寧靜', '和諧'],
+    'negative': ['焦慮', '分心', '煩躁', '困難', '疲憊']
+})
+
 class ShangCalculator:
     """商增計算服務類"""
     
@@ -96,12 +104,10 @@ class ShangCalculator:
         if not notes:
             return 50
         
-        # 簡單的關鍵詞分析
-        positive_keywords = ['平靜', '放鬆', '清晰', '專注', '寧靜', '和諧']
-        negative_keywords = ['焦慮', '分心', '煩躁', '困難', '疲憊']
-        
-        positive_count = sum(1 for keyword in positive_keywords if keyword in notes)
-        negative_count = sum(1 for keyword in negative_keywords if keyword in notes)
+        # 關鍵詞分析：正負面詞組一次掃描
+        hits = trigger_registry.scan(MEDITATION_TRIGGER_SUBSYSTEM, notes)
+        positive_count = len(hits.get('positive', []))
+        negative_count = len(hits.get('negative', []))
         
         base_score = 70
         score = base_score + positive_count * 10 - negative_count * 5
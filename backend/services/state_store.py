@@ -0,0 +1,548 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+跨进程共享状态存储
+各蓝图的模块级单例（暗域节点、共振游戏、高频检测、量子云、道场会话等）经由此处持久化，
+多个 gunicorn worker 看到的是同一份宇宙。
+
+后端（环境变量 LIMINAL_STATE_BACKEND 选择）：
+- memory：进程内字典（默认，单 worker 开发环境）
+- sqlite：SQLite WAL 文件，路径由 LIMINAL_STATE_PATH 指定
+- shm：位于 /dev/shm（tmpfs）的 SQLite WAL，同机多进程共享、不落盘
+
+所有后端都以 JSON 文本保存值，并提供：
+- 带版本号的写入（乐观并发控制，版本不符抛 VersionConflictError）
+- 按条目的 TTL，过期条目读取时视为不存在，并在写入时定期清扫
+"""
+
+import functools
+import json
+import os
+import sqlite3
+import tempfile
+import threading
+import time
+from typing import Any, Callable, Dict, Iterator, List, Optional, Sequence, Tuple
+
+# 每写入多少次清扫一次过期条目
+EVICTION_INTERVAL = 256
+
+# 乐观写入冲突时的最大重试次数
+MAX_CONFLICT_RETRIES = 8
+
+DEFAULT_STATE_PATH = os.path.join(
+    os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__file__)))),
+    'data', 'state', 'liminal_state.db'
+)
+
+
+class VersionConflictError(Exception):
+    """乐观写入时版本不符"""
+
+    def __init__(self, namespace: str, key: str, expected: int, actual: int):
+        self.namespace = namespace
+        self.key = key
+        self.expected = expected
+        self.actual = actual
+        super().__init__(f'状态 {namespace}/{key} 版本冲突：期望 {expected}，实际 {actual}')
+
+
+# === 后端 ===
+
+class StateBackend:
+    """
+    状态后端接口
+
+    expected_version 约定：None 表示无条件写入；0 表示条目必须不存在；
+    其余值必须与当前版本一致。
+    """
+
+    # 是否可被多个进程共享
+    shared = False
+    name = 'abstract'
+
+    def get(self, namespace: str, key: str) -> Optional[Tuple[str, int]]:
+        raise NotImplementedError
+
+    def put(self, namespace: str, key: str, payload: str,
+            expected_version: Optional[int] = None, ttl: Optional[float] = None) -> int:
+        raise NotImplementedError
+
+    def delete(self, namespace: str, key: str, expected_version: Optional[int] = None) -> bool:
+        raise NotImplementedError
+
+    def scan(self, namespace: str) -> List[Tuple[str, str, int]]:
+        raise NotImplementedError
+
+    def count(self, namespace: str) -> int:
+        raise NotImplementedError
+
+    def evict_expired(self, now: Optional[float] = None) -> int:
+        raise NotImplementedError
+
+    def clear(self, namespace: str):
+        raise NotImplementedError
+
+    def get_stats(self) -> Dict[str, Any]:
+        return {'backend': self.name, 'shared': self.shared}
+
+
+class InProcessStateBackend(StateBackend):
+    """进程内后端：namespace -> key -> (payload, version, expires_at)"""
+
+    name = 'memory'
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._data: Dict[str, Dict[str, Tuple[str, int, Optional[float]]]] = {}
+        self._writes = 0
+
+    def _live_entry(self, namespace: str, key: str, now: float):
+        entry = self._data.get(namespace, {}).get(key)
+        if entry is not None and entry[2] is not None and entry[2] <= now:
+            del self._data[namespace][key]
+            return None
+        return entry
+
+    def get(self, namespace, key):
+        with self._lock:
+            entry = self._live_entry(namespace, key, time.time())
+            return None if entry is None else (entry[0], entry[1])
+
+    def put(self, namespace, key, payload, expected_version=None, ttl=None):
+        now = time.time()
+        with self._lock:
+            entry = self._live_entry(namespace, key, now)
+            current = entry[1] if entry else 0
+            if expected_version is not None and expected_version != current:
+                raise VersionConflictError(namespace, key, expected_version, current)
+            version = current + 1
+            self._data.setdefault(namespace, {})[key] = (payload, version, now + ttl if ttl else None)
+            self._writes += 1
+            if self._writes % EVICTION_INTERVAL == 0:
+                self._evict_locked(now)
+            return version
+
+    def delete(self, namespace, key, expected_version=None):
+        with self._lock:
+            entry = self._live_entry(namespace, key, time.time())
+            if entry is None:
+                return False
+            if expected_version is not None and expected_version != entry[1]:
+                raise VersionConflictError(namespace, key, expected_version, entry[1])
+            del self._data[namespace][key]
+            return True
+
+    def scan(self, namespace):
+        now = time.time()
+        with self._lock:
+            return [
+                (key, payload, version)
+                for key, (payload, version, expires_at) in self._data.get(namespace, {}).items()
+                if expires_at is None or expires_at > now
+            ]
+
+    def count(self, namespace):
+        return len(self.scan(namespace))
+
+    def _evict_locked(self, now: float) -> int:
+        evicted = 0
+        for entries in self._data.values():
+            expired = [key for key, entry in entries.items() if entry[2] is not None and entry[2] <= now]
+            for key in expired:
+                del entries[key]
+            evicted += len(expired)
+        return evicted
+
+    def evict_expired(self, now=None):
+        with self._lock:
+            return self._evict_locked(time.time() if now is None else now)
+
+    def clear(self, namespace):
+        with self._lock:
+            self._data.pop(namespace, None)
+
+    def get_stats(self):
+        with self._lock:
+            return {
+                **super().get_stats(),
+                'namespaces': {namespace: len(entries) for namespace, entries in self._data.items()}
+            }
+
+
+class SQLiteStateBackend(StateBackend):
+    """SQLite WAL 后端：多进程可同时读，写入以 BEGIN IMMEDIATE 串行化"""
+
+    name = 'sqlite'
+    shared = True
+
+    def __init__(self, path: str, busy_timeout: float = 5.0):
+        self.path = path
+        self.busy_timeout = busy_timeout
+        self._local = threading.local()
+        self._writes = 0
+        os.makedirs(os.path.dirname(os.path.abspath(path)), exist_ok=True)
+        with self._connection() as conn:
+            conn.execute('''
+                CREATE TABLE IF NOT EXISTS state_entries (
+                    namespace TEXT NOT NULL,
+                    key TEXT NOT NULL,
+                    payload TEXT NOT NULL,
+                    version INTEGER NOT NULL,
+                    expires_at REAL,
+                    PRIMARY KEY (namespace, key)
+                ) WITHOUT ROWID
+            ''')
+            conn.execute('CREATE INDEX IF NOT EXISTS idx_state_expires ON state_entries(expires_at)')
+
+    def _connection(self) -> sqlite3.Connection:
+        """每个线程一个连接（sqlite3 连接不可跨线程共享）"""
+        conn = getattr(self._local, 'conn', None)
+        if conn is None:
+            conn = sqlite3.connect(self.path, timeout=self.busy_timeout, isolation_level=None)
+            conn.execute('PRAGMA journal_mode=WAL')
+            conn.execute('PRAGMA synchronous=NORMAL')
+            self._local.conn = conn
+        return conn
+
+    def get(self, namespace, key):
+        row = self._connection().execute(
+            'SELECT payload, version FROM state_entries '
+            'WHERE namespace = ? AND key = ? AND (expires_at IS NULL OR expires_at > ?)',
+            (namespace, key, time.time())
+        ).fetchone()
+        return None if row is None else (row[0], row[1])
+
+    def put(self, namespace, key, payload, expected_version=None, ttl=None):
+        now = time.time()
+        conn = self._connection()
+        conn.execute('BEGIN IMMEDIATE')
+        try:
+            row = conn.execute(
+                'SELECT version, expires_at FROM state_entries WHERE namespace = ? AND key = ?',
+                (namespace, key)
+            ).fetchone()
+            current = row[0] if row and (row[1] is None or row[1] > now) else 0
+            if expected_version is not None and expected_version != current:
+                raise VersionConflictError(namespace, key, expected_version, current)
+            version = current + 1
+            conn.execute(
+                'INSERT OR REPLACE INTO state_entries (namespace, key, payload, version, expires_at) '
+                'VALUES (?, ?, ?, ?, ?)',
+                (namespace, key, payload, version, now + ttl if ttl else None)
+            )
+            conn.execute('COMMIT')
+        except BaseException:
+            conn.execute('ROLLBACK')
+            raise
+
+        self._writes += 1
+        if self._writes % EVICTION_INTERVAL == 0:
+            self.evict_expired(now)
+        return version
+
+    def delete(self, namespace, key, expected_version=None):
+        conn = self._connection()
+        conn.execute('BEGIN IMMEDIATE')
+        try:
+            row = conn.execute(
+                'SELECT version FROM state_entries '
+                'WHERE namespace = ? AND key = ? AND (expires_at IS NULL OR expires_at > ?)',
+                (namespace, key, time.time())
+            ).fetchone()
+            if row is not None and expected_version is not None and expected_version != row[0]:
+                raise VersionConflictError(namespace, key, expected_version, row[0])
+            conn.execute('DELETE FROM state_entries WHERE namespace = ? AND key = ?', (namespace, key))
+            conn.execute('COMMIT')
+        except BaseException:
+            conn.execute('ROLLBACK')
+            raise
+        return row is not None
+
+    def scan(self, namespace):
+        return self._connection().execute(
+            'SELECT key, payload, version FROM state_entries '
+            'WHERE namespace = ? AND (expires_at IS NULL OR expires_at > ?)',
+            (namespace, time.time())
+        ).fetchall()
+
+    def count(self, namespace):
+        return self._connection().execute(
+            'SELECT COUNT(*) FROM state_entries '
+            'WHERE namespace = ? AND (expires_at IS NULL OR expires_at > ?)',
+            (namespace, time.time())
+        ).fetchone()[0]
+
+    def evict_expired(self, now=None):
+        cursor = self._connection().execute(
+            'DELETE FROM state_entries WHERE expires_at IS NOT NULL AND expires_at <= ?',
+            (time.time() if now is None else now,)
+        )
+        return cursor.rowcount
+
+    def clear(self, namespace):
+        self._connection().execute('DELETE FROM state_entries WHERE namespace = ?', (namespace,))
+
+    def get_stats(self):
+        rows = self._connection().execute(
+            'SELECT namespace, COUNT(*) FROM state_entries GROUP BY namespace'
+        ).fetchall()
+        return {**super().get_stats(), 'path': self.path, 'namespaces': dict(rows)}
+
+
+class SharedMemoryStateBackend(SQLiteStateBackend):
+    """共享内存后端：数据库文件放在 tmpfs（/dev/shm），同机 worker 共享且不触盘"""
+
+    name = 'shm'
+
+    def __init__(self, name: str = 'liminal_state', busy_timeout: float = 5.0):
+        directory = '/dev/shm' if os.path.isdir('/dev/shm') else tempfile.gettempdir()
+        super().__init__(os.path.join(directory, f'{name}.db'), busy_timeout)
+
+
+# === 类型化集合 ===
+
+class StateCollection:
+    """
+    类型化集合
+
+    encode/decode 负责对象与可 JSON 序列化结构之间的转换；
+    取出的对象是副本，修改后须 put 回去（或使用 update）才会持久化。
+    """
+
+    def __init__(self, backend: StateBackend, namespace: str,
+                 encode: Callable[[Any], Any] = None, decode: Callable[[Any], Any] = None,
+                 ttl: Optional[float] = None):
+        self.backend = backend
+        self.namespace = namespace
+        self.encode = encode or (lambda value: value)
+        self.decode = decode or (lambda value: value)
+        self.ttl = ttl
+
+    def _dumps(self, value: Any) -> str:
+        return json.dumps(self.encode(value), ensure_ascii=False)
+
+    def _loads(self, payload: str) -> Any:
+        return self.decode(json.loads(payload))
+
+    def get_versioned(self, key: str) -> Tuple[Any, int]:
+        """返回 (值, 版本)；不存在时为 (None, 0)"""
+        entry = self.backend.get(self.namespace, key)
+        if entry is None:
+            return None, 0
+        return self._loads(entry[0]), entry[1]
+
+    def get(self, key: str, default: Any = None) -> Any:
+        entry = self.backend.get(self.namespace, key)
+        return default if entry is None else self._loads(entry[0])
+
+    def put(self, key: str, value: Any, expected_version: Optional[int] = None,
+            ttl: Optional[float] = None) -> int:
+        return self.backend.put(self.namespace, key, self._dumps(value),
+                                expected_version, ttl if ttl is not None else self.ttl)
+
+    def put_payload(self, key: str, payload: str, expected_version: Optional[int] = None,
+                    ttl: Optional[float] = None) -> int:
+        """写入已序列化的 JSON 文本（调用方已按 encode 编码并序列化，避免重复序列化）"""
+        return self.backend.put(self.namespace, key, payload,
+                                expected_version, ttl if ttl is not None else self.ttl)
+
+    def add(self, key: str, value: Any) -> int:
+        """仅在条目不存在时写入"""
+        return self.put(key, value, expected_version=0)
+
+    def update(self, key: str, mutate: Callable[[Any], Any],
+               default_factory: Callable[[], Any] = None) -> Any:
+        """读取-修改-写回，版本冲突时重新读取并重试"""
+        for _ in range(MAX_CONFLICT_RETRIES):
+            value, version = self.get_versioned(key)
+            if version == 0:
+                if default_factory is None:
+                    raise KeyError(key)
+                value = default_factory()
+            result = mutate(value)
+            value = value if result is None else result
+            try:
+                self.put(key, value, expected_version=version)
+                return value
+            except VersionConflictError:
+                continue
+        raise VersionConflictError(self.namespace, key, version, -1)
+
+    def delete(self, key: str) -> bool:
+        return self.backend.delete(self.namespace, key)
+
+    def clear(self):
+        self.backend.clear(self.namespace)
+
+    def keys(self) -> List[str]:
+        return [key for key, _, _ in self.backend.scan(self.namespace)]
+
+    def values(self) -> List[Any]:
+        return [self._loads(payload) for _, payload, _ in self.backend.scan(self.namespace)]
+
+    def items(self) -> List[Tuple[str, Any]]:
+        return [(key, self._loads(payload)) for key, payload, _ in self.backend.scan(self.namespace)]
+
+    def __getitem__(self, key: str) -> Any:
+        entry = self.backend.get(self.namespace, key)
+        if entry is None:
+            raise KeyError(key)
+        return self._loads(entry[0])
+
+    def __setitem__(self, key: str, value: Any):
+        self.put(key, value)
+
+    def __delitem__(self, key: str):
+        if not self.delete(key):
+            raise KeyError(key)
+
+    def __contains__(self, key: str) -> bool:
+        return self.backend.get(self.namespace, key) is not None
+
+    def __len__(self) -> int:
+        return self.backend.count(self.namespace)
+
+    def __iter__(self) -> Iterator[str]:
+        return iter(self.keys())
+
+
+# === 单例对象状态 ===
+
+class PersistentState:
+    """
+    将对象的若干可变属性作为一个文档持久化
+
+    配合 @persistent 装饰公开方法：调用前从后端载入属性，调用后若有变化则按版本写回，
+    版本冲突（其他 worker 同时修改）时重新载入并重跑该方法。
+    只读方法用 @persistent_read 装饰：只载入，不做快照比较与写回。
+    进程内后端下对象属性本身就是唯一状态，直接调用不做序列化。
+    """
+
+    def __init__(self, collection: StateCollection, key: str, fields: Sequence[str]):
+        self.collection = collection
+        self.key = key
+        self.fields = tuple(fields)
+        self._lock = threading.RLock()
+        self._local = threading.local()
+
+    def _snapshot(self, obj) -> Dict[str, Any]:
+        return {field: getattr(obj, field) for field in self.fields}
+
+    def _load_fields(self, obj) -> int:
+        document, version = self.collection.get_versioned(self.key)
+        if document is not None:
+            for field in self.fields:
+                if field in document:
+                    setattr(obj, field, document[field])
+        return version
+
+    def _dumps(self, obj) -> str:
+        return json.dumps(self._snapshot(obj), ensure_ascii=False, sort_keys=True)
+
+    def _load(self, obj) -> Tuple[int, str]:
+        version = self._load_fields(obj)
+        return version, self._dumps(obj)
+
+    def read(self, obj, method: Callable, args, kwargs):
+        """只读调用：载入最新状态后执行方法"""
+        with self._lock:
+            depth = getattr(self._local, 'depth', 0)
+            if not depth and self.collection.backend.shared:
+                self._load_fields(obj)
+            self._local.depth = depth + 1
+            try:
+                return method(obj, *args, **kwargs)
+            finally:
+                self._local.depth = depth
+
+    def call(self, obj, method: Callable, args, kwargs):
+        with self._lock:
+            depth = getattr(self._local, 'depth', 0)
+            # 嵌套调用或进程内后端：不重复载入/写回
+            if depth or not self.collection.backend.shared:
+                self._local.depth = depth + 1
+                try:
+                    return method(obj, *args, **kwargs)
+                finally:
+                    self._local.depth = depth
+
+            for _ in range(MAX_CONFLICT_RETRIES):
+                version, before = self._load(obj)
+                self._local.depth = 1
+                try:
+                    result = method(obj, *args, **kwargs)
+                finally:
+                    self._local.depth = 0
+
+                # 比较用的序列化结果直接作为写入内容，每次保存只序列化一次
+                after = self._dumps(obj)
+                if after == before:
+                    return result
+                try:
+                    self.collection.put_payload(self.key, after, expected_version=version)
+                    return result
+                except VersionConflictError:
+                    continue
+            raise VersionConflictError(self.collection.namespace, self.key, version, -1)
+
+
+def persistent(method: Callable) -> Callable:
+    """方法装饰器：经由实例的 _persistent_state 载入并写回状态"""
+
+    @functools.wraps(method)
+    def wrapper(self, *args, **kwargs):
+        return self._persistent_state.call(self, method, args, kwargs)
+
+    return wrapper
+
+
+def persistent_read(method: Callable) -> Callable:
+    """只读方法装饰器：经由实例的 _persistent_state 载入最新状态，不写回"""
+
+    @functools.wraps(method)
+    def wrapper(self, *args, **kwargs):
+        return self._persistent_state.read(self, method, args, kwargs)
+
+    return wrapper
+
+
+# === 存储入口 ===
+
+class StateStore:
+    """状态存储入口：持有后端并创建集合"""
+
+    def __init__(self, backend: StateBackend):
+        self.backend = backend
+
+    def collection(self, namespace: str, encode: Callable[[Any], Any] = None,
+                   decode: Callable[[Any], Any] = None, ttl: Optional[float] = None) -> StateCollection:
+        return StateCollection(self.backend, namespace, encode, decode, ttl)
+
+    def bind(self, obj, namespace: str, fields: Sequence[str], key: str = 'default') -> PersistentState:
+        """将单例对象的属性绑定到状态文档（配合 @persistent / @persistent_read 使用）"""
+        binding = PersistentState(self.collection(namespace), key, fields)
+        obj._persistent_state = binding
+        return binding
+
+    def evict_expired(self) -> int:
+        return self.backend.evict_expired()
+
+    def get_stats(self) -> Dict[str, Any]:
+        return self.backend.get_stats()
+
+
+def create_state_backend(kind: Optional[str] = None, path: Optional[str] = None) -> StateBackend:
+    """按名称创建后端（memory / sqlite / shm）"""
+    kind = (kind or os.environ.get('LIMINAL_STATE_BACKEND', 'memory')).lower()
+    if kind == 'memory':
+        return InProcessStateBackend()
+    if kind == 'sqlite':
+        return SQLiteStateBackend(path or os.environ.get('LIMINAL_STATE_PATH', DEFAULT_STATE_PATH))
+    if kind == 'shm':
+        return SharedMemoryStateBackend(os.environ.get('LIMINAL_STATE_SHM_NAME', 'liminal_state'))
+    raise ValueError(f'未知的状态后端: {kind}')
+
+
+# 全局状态存储
+state_store = StateStore(create_state_backend())
@@ -0,0 +1,270 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+願頻塌縮計算引擎
+以 NumPy 陣列運算求解願頻臨界突破公式 (WCTF)
+
+核心公式：
+- εₙ = A * e^{-nλ}
+- S = A / (1 - e^{-λ})
+- S_N = A * e^{-λ} * (1 - e^{-Nλ}) / (1 - e^{-λ})
+
+級數、參數掃描與演化模擬皆以陣列運算完成，
+並對重複的參數組合做記憶化，供儀表板繪製塌縮曲面熱圖。
+"""
+
+from functools import lru_cache
+from typing import Dict, List, Any, Sequence, Tuple
+
+import numpy as np
+
+# 顯化強度等級（S 的上界，含）
+MANIFESTATION_BOUNDS = np.array([0.3, 0.7, 1.0, 2.0])
+MANIFESTATION_LEVELS = [
+    ("微弱願頻", "#666666"),
+    ("穩定願頻", "#4CAF50"),
+    ("強化願頻", "#FF9800"),
+    ("臨界突破", "#F44336"),
+    ("宇宙級顯化", "#9C27B0")
+]
+
+# 曲面計算的單次網格上限
+MAX_SURFACE_CELLS = 250_000
+
+# 演化模擬的振幅上限
+MAX_EVOLUTION_AMPLITUDE = 2.0
+
+# 演化模擬的時間步上限（結果按參數快取，限制單條快取的大小）
+MAX_SIMULATION_STEPS = 1000
+
+
+def manifestation_level_index(S: np.ndarray) -> np.ndarray:
+    """將願頻總和映射為顯化強度等級索引"""
+    return np.searchsorted(MANIFESTATION_BOUNDS, S, side='left')
+
+
+def manifestation_level(S: float) -> Tuple[str, str]:
+    """單一願頻總和的顯化強度等級與顏色"""
+    return MANIFESTATION_LEVELS[int(manifestation_level_index(np.asarray(S)))]
+
+
+def infinite_sum(A, lambda_val):
+    """無窮級數和 S = A / (1 - e^{-λ})，支持廣播"""
+    return np.asarray(A, dtype=float) / -np.expm1(-np.asarray(lambda_val, dtype=float))
+
+
+def finite_sum(A, lambda_val, n_terms):
+    """前 N 項和（閉式解），支持廣播"""
+    lambda_val = np.asarray(lambda_val, dtype=float)
+    return (np.asarray(A, dtype=float) * np.exp(-lambda_val) *
+            -np.expm1(-n_terms * lambda_val) / -np.expm1(-lambda_val))
+
+
+def wish_terms(A: float, lambda_val: float, count: int) -> np.ndarray:
+    """前 count 項願頻值 εₙ"""
+    return A * np.exp(-lambda_val * np.arange(1, count + 1))
+
+
+class WishCollapseEngine:
+    """
+    願頻塌縮計算引擎
+
+    所有公開方法以參數為鍵記憶化，重複請求直接返回快取結果；
+    返回值僅供序列化，調用方不應修改。
+    """
+
+    def __init__(self, cache_size: int = 1024):
+        self.calculate = lru_cache(maxsize=cache_size)(self._calculate)
+        self.optimize = lru_cache(maxsize=cache_size)(self._optimize)
+        self.simulate = lru_cache(maxsize=cache_size)(self._simulate)
+        self._surface = lru_cache(maxsize=16)(self._compute_surface)
+
+    def _calculate(self, A: float, lambda_val: float, n_terms: int) -> Dict[str, Any]:
+        """單組參數的級數計算"""
+        S_infinite = float(infinite_sum(A, lambda_val))
+        S_finite = float(finite_sum(A, lambda_val, n_terms))
+        critical_A = float(-np.expm1(-lambda_val))
+        level, color = manifestation_level(S_infinite)
+
+        display_count = min(20, n_terms)
+        terms = wish_terms(A, lambda_val, display_count)
+        percentages = terms / S_infinite * 100 if S_infinite > 0 else np.zeros_like(terms)
+
+        return {
+            'results': {
+                'infinite_sum': S_infinite,
+                'finite_sum': S_finite,
+                'convergence_error': abs(S_infinite - S_finite),
+                'is_collapsed': S_infinite > 1.0,
+                'critical_amplitude': critical_A,
+                'manifestation_level': level,
+                'level_color': color
+            },
+            'wish_terms': [
+                {'n': n, 'epsilon_n': epsilon_n, 'percentage': percentage}
+                for n, epsilon_n, percentage in zip(
+                    range(1, display_count + 1), terms.tolist(), percentages.tolist()
+                )
+            ],
+            'structure_data': {
+                'x_values': list(range(1, 21)),
+                'y_values': wish_terms(A, lambda_val, 20).tolist()
+            }
+        }
+
+    def _optimize(self, target_strength: float, max_amplitude: float,
+                  samples: int = 100) -> List[Dict[str, float]]:
+        """掃描 λ，求達到目標顯化強度所需的振幅，按效率排序"""
+        lambdas = np.linspace(0.01, 2.0, samples)
+        denominators = -np.expm1(-lambdas)
+        required_A = target_strength * denominators
+        mask = (required_A > 0) & (required_A <= max_amplitude)
+
+        lambdas = lambdas[mask]
+        required_A = required_A[mask]
+        actual_strength = required_A / denominators[mask]
+        efficiency = actual_strength / required_A
+
+        order = np.argsort(-efficiency, kind='stable')
+        return [
+            {
+                'lambda': round(lambda_val, 4),
+                'amplitude': round(amplitude, 4),
+                'actual_strength': round(strength, 4),
+                'efficiency': round(eff, 4)
+            }
+            for lambda_val, amplitude, strength, eff in zip(
+                lambdas[order].tolist(), required_A[order].tolist(),
+                actual_strength[order].tolist(), efficiency[order].tolist()
+            )
+        ]
+
+    def _simulate(self, A_initial: float, lambda_val: float, time_steps: int,
+                  evolution_rate: float) -> List[Dict[str, Any]]:
+        """願頻演化模擬：塌縮前振幅按 (1+r) 增長，塌縮後按 (1+2r) 增長，上限 2.0"""
+        if time_steps <= 0:
+            return []
+
+        denominator = -np.expm1(-lambda_val)
+        if evolution_rate >= 0:
+            amplitudes = self._evolve_amplitudes(A_initial, denominator, time_steps, evolution_rate)
+        else:
+            amplitudes = self._evolve_amplitudes_stepwise(A_initial, denominator, time_steps, evolution_rate)
+
+        strengths = amplitudes / denominator
+        collapsed = strengths > 1.0
+        probabilities = np.where(collapsed, 1.0, np.minimum(strengths, 1.0))
+
+        return [
+            {
+                'time': t,
+                'amplitude': round(amplitude, 6),
+                'total_strength': round(strength, 6),
+                'is_collapsed': is_collapsed,
+                'collapse_probability': probability
+            }
+            for t, amplitude, strength, is_collapsed, probability in zip(
+                range(time_steps), amplitudes.tolist(), strengths.tolist(),
+                collapsed.tolist(), probabilities.tolist()
+            )
+        ]
+
+    @staticmethod
+    def _evolve_amplitudes(A_initial: float, denominator: float, time_steps: int,
+                           evolution_rate: float) -> np.ndarray:
+        """非負演化速率下的振幅序列（單調不減，塌縮狀態至多切換一次）"""
+        steps = np.arange(time_steps)
+        amplitudes = A_initial * np.power(1 + evolution_rate, steps)
+        amplitudes[1:] = np.minimum(amplitudes[1:], MAX_EVOLUTION_AMPLITUDE)
+
+        crossed = np.flatnonzero(amplitudes / denominator > 1.0)
+        if crossed.size:
+            k = crossed[0]
+            tail = amplitudes[k] * np.power(1 + evolution_rate * 2, steps[k + 1:] - k)
+            amplitudes[k + 1:] = np.minimum(tail, MAX_EVOLUTION_AMPLITUDE)
+        return amplitudes
+
+    @staticmethod
+    def _evolve_amplitudes_stepwise(A_initial: float, denominator: float, time_steps: int,
+                                    evolution_rate: float) -> np.ndarray:
+        """負演化速率下逐步推進（上限截斷與衰減不可交換，無閉式解）"""
+        amplitudes = np.empty(time_steps)
+        current_A = A_initial
+        for t in range(time_steps):
+            amplitudes[t] = current_A
+            if current_A / denominator > 1.0:
+                current_A *= (1 + evolution_rate * 2)
+            else:
+                current_A *= (1 + evolution_rate)
+            current_A = min(current_A, MAX_EVOLUTION_AMPLITUDE)
+        return amplitudes
+
+    def surface(self, amplitudes: Sequence[float], lambdas: Sequence[float],
+                n_terms: int = 100) -> Dict[str, Any]:
+        """(A, λ) 網格上的塌縮曲面"""
+        if len(amplitudes) * len(lambdas) > MAX_SURFACE_CELLS:
+            raise ValueError(f'網格過大，最多 {MAX_SURFACE_CELLS} 個格點')
+        cached = self._surface(tuple(float(a) for a in amplitudes),
+                               tuple(float(l) for l in lambdas), int(n_terms))
+        return {key: value.tolist() if isinstance(value, np.ndarray) else value
+                for key, value in cached.items()}
+
+    def evaluate_pairs(self, pairs: Sequence[Sequence[float]], n_terms: int = 100) -> Dict[str, Any]:
+        """逐對 (A, λ) 的批量計算"""
+        if len(pairs) > MAX_SURFACE_CELLS:
+            raise ValueError(f'參數組過多，最多 {MAX_SURFACE_CELLS} 組')
+        values = np.asarray(pairs, dtype=float).reshape(-1, 2)
+        A, lambdas = values[:, 0], values[:, 1]
+        if np.any(lambdas <= 0):
+            raise ValueError('共振遞減因子必須大於0')
+
+        S_infinite = infinite_sum(A, lambdas)
+        return {
+            'infinite_sum': S_infinite.tolist(),
+            'finite_sum': finite_sum(A, lambdas, n_terms).tolist(),
+            'is_collapsed': (S_infinite > 1.0).tolist(),
+            'level_index': manifestation_level_index(S_infinite).tolist()
+        }
+
+    def _compute_surface(self, amplitudes: Tuple[float, ...], lambdas: Tuple[float, ...],
+                         n_terms: int) -> Dict[str, Any]:
+        """曲面計算；快取中保存緊湊的唯讀陣列（網格為 float32 / bool / int8），返回時再轉為列表"""
+        A = np.asarray(amplitudes)[:, None]
+        lambda_axis = np.asarray(lambdas)
+        if np.any(lambda_axis <= 0):
+            raise ValueError('共振遞減因子必須大於0')
+
+        S_infinite = infinite_sum(A, lambda_axis[None, :])
+        S_finite = finite_sum(A, lambda_axis[None, :], n_terms)
+        arrays = {
+            'amplitudes': np.array(amplitudes),
+            'lambdas': np.array(lambdas),
+            'infinite_sum': S_infinite.astype(np.float32),
+            'finite_sum': S_finite.astype(np.float32),
+            'is_collapsed': S_infinite > 1.0,
+            'level_index': manifestation_level_index(S_infinite).astype(np.int8),
+            'critical_amplitude': (-np.expm1(-lambda_axis)).astype(np.float32)
+        }
+        for values in arrays.values():
+            values.flags.writeable = False
+        return {
+            **arrays,
+            'n_terms': n_terms,
+            'collapsed_ratio': float(np.mean(S_infinite > 1.0)) if S_infinite.size else 0.0
+        }
+
+    def get_cache_info(self) -> Dict[str, Dict[str, int]]:
+        """記憶化快取統計"""
+        return {
+            name: cached.cache_info()._asdict()
+            for name, cached in (
+                ('calculate', self.calculate),
+                ('optimize', self.optimize),
+                ('simulate', self.simulate),
+                ('surface', self._surface)
+            )
+        }
+
+
+# 全局引擎實例
+wish_collapse_engine = WishCollapseEngine()
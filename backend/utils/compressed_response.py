@@ -0,0 +1,75 @@
+# -*- coding: utf-8 -*-
+"""
+预压缩响应
+响应体在生成时一次性压缩出 gzip（以及安装了 brotli 时的 br）版本并计算强 ETag，
+请求时按 Accept-Encoding 选择现成的字节返回；If-None-Match 命中时返回 304。
+
+- 每种编码各自一个 ETag（同一内容的不同表示），并设置 Vary: Accept-Encoding
+- 压缩后不比原文小的版本不保留
+"""
+
+import gzip
+import hashlib
+from typing import Dict, Optional
+
+from flask import Response, request
+
+try:
+    import brotli
+    BROTLI_AVAILABLE = True
+except ImportError:
+    brotli = None
+    BROTLI_AVAILABLE = False
+
+# 按优先顺序尝试的编码
+ENCODING_PREFERENCE = ('br', 'gzip')
+
+
+class CompressedAsset:
+    """一份响应体及其预压缩版本"""
+
+    def __init__(self, body: bytes, mimetype: str = 'text/html', max_age: int = 0,
+                 immutable: bool = False):
+        self.mimetype = mimetype
+        self.max_age = max_age
+        self.immutable = immutable
+        self.etag = hashlib.sha1(body).hexdigest()
+        self.variants: Dict[str, bytes] = {'identity': body}
+        compressed = {'gzip': gzip.compress(body, compresslevel=9, mtime=0)}
+        if BROTLI_AVAILABLE:
+            compressed['br'] = brotli.compress(body)
+        for encoding, data in compressed.items():
+            if len(data) < len(body):
+                self.variants[encoding] = data
+
+    @property
+    def body(self) -> bytes:
+        return self.variants['identity']
+
+    def sizes(self) -> Dict[str, int]:
+        return {encoding: len(data) for encoding, data in self.variants.items()}
+
+    def select_encoding(self) -> str:
+        accepted = request.accept_encodings
+        for encoding in ENCODING_PREFERENCE:
+            if encoding in self.variants and accepted[encoding]:
+                return encoding
+        return 'identity'
+
+    def response(self, status: int = 200, headers: Optional[Dict[str, str]] = None) -> Response:
+        encoding = self.select_encoding()
+        resp = Response(self.variants[encoding], status=status, mimetype=self.mimetype)
+        if encoding != 'identity':
+            resp.headers['Content-Encoding'] = encoding
+        resp.vary.add('Accept-Encoding')
+        resp.set_etag(f'{self.etag}-{encoding}')
+        if self.immutable:
+            resp.headers['Cache-Control'] = f'public, max-age={self.max_age}, immutable'
+        elif self.max_age:
+            resp.headers['Cache-Control'] = f'public, max-age={self.max_age}'
+        else:
+            # 每次向服务器确认，内容未变时只返回 304
+            resp.headers['Cache-Control'] = 'no-cache'
+        if headers:
+            resp.headers.update(headers)
+        return resp.make_conditional(request)
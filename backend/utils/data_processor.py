@@ -1,119 +1,102 @@
-import pandas as pd
 import numpy as np
-from datetime import datetime, timedelta
-from typing import List, Dict, Any, Optional
+from datetime import date, datetime, timedelta
+from typing import List, Dict, Any, Optional, Iterable, Iterator
+import itertools
+import operator
 import json
 import csv
-from backend.models.shang_model import ShangRecord, Emotion
+import os
+from backend.models.shang_model import ShangRecord
+from backend.utils.streaming_export import iter_csv, iter_json
+
+# 商增记录的 CSV 列：(字段名, 表头)，/api/shang/export 与 DataProcessor 导入导出共用
+SHANG_EXPORT_COLUMNS = [
+    ('date', '日期'), ('shang_value', '商增值'), ('numerator', '分子'), ('denominator', '分母'),
+    ('heart_rate', '心率'), ('steps', '步數'), ('sleep_quality', '睡眠質量'),
+    ('emotion_log', '情緒'), ('stress_level', '壓力水平'),
+    ('meditation_notes', '冥想心得'), ('gratitude_items', '感恩事項'), ('suggestion', '建議')
+]
+
+# 数值字段的类型，其余字段按文本导入
+NUMERIC_FIELD_TYPES = {
+    'shang_value': float, 'numerator': float, 'denominator': float,
+    'heart_rate': int, 'steps': int, 'sleep_quality': int, 'stress_level': int
+}
+
+# CSV 导出列：(取值函数, 表头)
+CSV_EXPORT_COLUMNS = [(operator.attrgetter(field), header) for field, header in SHANG_EXPORT_COLUMNS]
+
+# CSV 导入：表头 -> (字段名, 类型)
+CSV_IMPORT_FIELDS = {
+    header: (field, NUMERIC_FIELD_TYPES.get(field, str)) for field, header in SHANG_EXPORT_COLUMNS
+}
 
 class DataProcessor:
     """数据处理工具类"""
     
     @staticmethod
-    def export_to_csv(records: List[ShangRecord], filename: str) -> str:
-        """导出数据到CSV文件"""
-        if not records:
+    def _require_records(records: Iterable[ShangRecord]) -> Iterator[ShangRecord]:
+        """取出首条记录确认非空，再与其余记录拼回惰性迭代器"""
+        records = iter(records)
+        first = next(records, None)
+        if first is None:
             raise ValueError("没有数据可导出")
-        
-        # 准备数据
-        data = []
-        for record in records:
-            data.append({
-                '日期': record.date,
-                '尚值': record.shang_value,
-                '情绪': record.emotion.value if record.emotion else 'neutral',
-                '睡眠质量': record.sleep_quality,
-                '精力水平': record.energy_level,
-                '压力水平': record.stress_level,
-                '专注水平': record.focus_level,
-                '社交互动': record.social_interaction,
-                '身体活动': record.physical_activity,
-                '冥想时间': record.meditation_time,
-                '学习时间': record.learning_time,
-                '创作时间': record.creative_time
-            })
-        
-        # 写入CSV
-        df = pd.DataFrame(data)
-        filepath = f"data/exports/{filename}"
-        df.to_csv(filepath, index=False, encoding='utf-8-sig')
-        
-        return filepath
+        return itertools.chain([first], records)
     
     @staticmethod
-    def export_to_json(records: List[ShangRecord], filename: str) -> str:
-        """导出数据到JSON文件"""
-        if not records:
-            raise ValueError("没有数据可导出")
-        
-        # 准备数据
-        data = {
-            'export_time': datetime.now().isoformat(),
-            'total_records': len(records),
-            'records': []
-        }
-        
-        for record in records:
-            data['records'].append({
-                'date': record.date.isoformat(),
-                'shang_value': record.shang_value,
-                'emotion': record.emotion.value if record.emotion else 'neutral',
-                'metrics': {
-                    'sleep_quality': record.sleep_quality,
-                    'energy_level': record.energy_level,
-                    'stress_level': record.stress_level,
-                    'focus_level': record.focus_level,
-                    'social_interaction': record.social_interaction,
-                    'physical_activity': record.physical_activity,
-                    'meditation_time': record.meditation_time,
-                    'learning_time': record.learning_time,
-                    'creative_time': record.creative_time
-                }
-            })
-        
-        # 写入JSON
+    def _write_chunks(filename: str, chunks: Iterable[str], encoding: str = 'utf-8') -> str:
         filepath = f"data/exports/{filename}"
-        with open(filepath, 'w', encoding='utf-8') as f:
-            json.dump(data, f, ensure_ascii=False, indent=2)
-        
+        os.makedirs(os.path.dirname(filepath), exist_ok=True)
+        with open(filepath, 'w', encoding=encoding, newline='') as f:
+            for chunk in chunks:
+                f.write(chunk)
         return filepath
     
+    @staticmethod
+    def export_to_csv(records: Iterable[ShangRecord], filename: str) -> str:
+        """导出数据到CSV文件（逐批写入，可传入生成器）"""
+        records = DataProcessor._require_records(records)
+        chunks = iter_csv(records, CSV_EXPORT_COLUMNS)
+        return DataProcessor._write_chunks(filename, chunks, encoding='utf-8-sig')
+    
+    @staticmethod
+    def _record_to_export(record: ShangRecord) -> Dict[str, Any]:
+        data = record.to_dict()
+        data.pop('id', None)
+        return data
+    
+    @staticmethod
+    def export_to_json(records: Iterable[ShangRecord], filename: str) -> str:
+        """导出数据到JSON文件（逐条写入，total_records 位于记录之后）"""
+        records = DataProcessor._require_records(records)
+        chunks = iter_json(
+            (DataProcessor._record_to_export(record) for record in records),
+            key='records',
+            header={'export_time': datetime.now().isoformat()},
+            footer=lambda count: {'total_records': count}
+        )
+        return DataProcessor._write_chunks(filename, chunks)
+    
     @staticmethod
     def import_from_csv(filepath: str) -> List[ShangRecord]:
-        """从CSV文件导入数据"""
+        """从CSV文件导入数据（表头与 export_to_csv 一致，缺少的列取默认值）"""
         records = []
         
         try:
-            df = pd.read_csv(filepath, encoding='utf-8-sig')
-            
-            for _, row in df.iterrows():
-                # 处理日期
-                date = pd.to_datetime(row['日期']).date()
-                
-                # 处理情绪
-                emotion_str = row.get('情绪', 'neutral')
-                try:
-                    emotion = Emotion(emotion_str)
-                except ValueError:
-                    emotion = Emotion.NEUTRAL
-                
-                # 创建记录
-                record = ShangRecord(
-                    date=date,
-                    shang_value=float(row.get('尚值', 0)),
-                    emotion=emotion,
-                    sleep_quality=int(row.get('睡眠质量', 5)),
-                    energy_level=int(row.get('精力水平', 5)),
-                    stress_level=int(row.get('压力水平', 5)),
-                    focus_level=int(row.get('专注水平', 5)),
-                    social_interaction=int(row.get('社交互动', 5)),
-                    physical_activity=int(row.get('身体活动', 30)),
-                    meditation_time=int(row.get('冥想时间', 0)),
-                    learning_time=int(row.get('学习时间', 0)),
-                    creative_time=int(row.get('创作时间', 0))
-                )
-                
-                records.append(record)
+            with open(filepath, 'r', encoding='utf-8-sig', newline='') as f:
+                for row in csv.DictReader(f):
+                    values = {}
+                    for header, (field, cast) in CSV_IMPORT_FIELDS.items():
+                        value = row.get(header)
+                        if value is None or value == '':
+                            continue
+                        values[field] = cast(float(value)) if cast is int else cast(value)
+                    
+                    if 'date' not in values:
+                        raise ValueError("缺少日期列")
+                    # 统一为 YYYY-MM-DD
+                    values['date'] = date.fromisoformat(values['date'][:10]).isoformat()
+                    records.append(ShangRecord(**values))
         
         except Exception as e:
             raise ValueError(f"导入CSV文件失败: {str(e)}")
@@ -139,52 +122,33 @@ class DataProcessor:
         # 清理异常值
         for record in cleaned_records:
             # 确保数值在合理范围内
+            record.heart_rate = max(40, min(200, record.heart_rate))
+            record.steps = max(0, min(100000, record.steps))
             record.sleep_quality = max(1, min(10, record.sleep_quality))
-            record.energy_level = max(1, min(10, record.energy_level))
-            record.stress_level = max(1, min(10, record.stress_level))
-            record.focus_level = max(1, min(10, record.focus_level))
-            record.social_interaction = max(1, min(10, record.social_interaction))
-            record.physical_activity = max(0, min(300, record.physical_activity))
-            record.meditation_time = max(0, min(300, record.meditation_time))
-            record.learning_time = max(0, min(600, record.learning_time))
-            record.creative_time = max(0, min(600, record.creative_time))
+            record.stress_level = max(0, min(100, record.stress_level))
         
         return cleaned_records
     
     @staticmethod
-    def fill_missing_dates(records: List[ShangRecord], 
-                          start_date: datetime.date, 
-                          end_date: datetime.date) -> List[ShangRecord]:
-        """填充缺失日期的记录"""
+    def fill_missing_dates(records: List[ShangRecord],
+                          start_date: date,
+                          end_date: date) -> List[ShangRecord]:
+        """填充缺失日期的记录（缺失日期以默认值记录补齐）"""
         if not records:
             return records
         
-        # 创建日期到记录的映射
+        # 创建日期到记录的映射（记录日期为 YYYY-MM-DD 字符串）
         record_map = {record.date: record for record in records}
         
         filled_records = []
         current_date = start_date
         
         while current_date <= end_date:
-            if current_date in record_map:
-                filled_records.append(record_map[current_date])
+            key = current_date.isoformat()
+            if key in record_map:
+                filled_records.append(record_map[key])
             else:
-                # 创建默认记录
-                default_record = ShangRecord(
-                    date=current_date,
-                    shang_value=0.0,
-                    emotion=Emotion.NEUTRAL,
-                    sleep_quality=5,
-                    energy_level=5,
-                    stress_level=5,
-                    focus_level=5,
-                    social_interaction=5,
-                    physical_activity=30,
-                    meditation_time=0,
-                    learning_time=0,
-                    creative_time=0
-                )
-                filled_records.append(default_record)
+                filled_records.append(ShangRecord(date=key))
             
             current_date += timedelta(days=1)
         
@@ -199,40 +163,35 @@ class DataProcessor:
         # 提取数值数据
         shang_values = [r.shang_value for r in records]
         sleep_quality = [r.sleep_quality for r in records]
-        energy_level = [r.energy_level for r in records]
         stress_level = [r.stress_level for r in records]
         
         stats = {
             'total_records': len(records),
             'date_range': {
-                'start': min(r.date for r in records).isoformat(),
-                'end': max(r.date for r in records).isoformat()
+                'start': min(r.date for r in records),
+                'end': max(r.date for r in records)
             },
             'shang_value': {
-                'mean': np.mean(shang_values),
-                'median': np.median(shang_values),
-                'std': np.std(shang_values),
-                'min': np.min(shang_values),
-                'max': np.max(shang_values)
+                'mean': float(np.mean(shang_values)),
+                'median': float(np.median(shang_values)),
+                'std': float(np.std(shang_values)),
+                'min': float(np.min(shang_values)),
+                'max': float(np.max(shang_values))
             },
             'sleep_quality': {
-                'mean': np.mean(sleep_quality),
-                'median': np.median(sleep_quality)
-            },
-            'energy_level': {
-                'mean': np.mean(energy_level),
-                'median': np.median(energy_level)
+                'mean': float(np.mean(sleep_quality)),
+                'median': float(np.median(sleep_quality))
             },
             'stress_level': {
-                'mean': np.mean(stress_level),
-                'median': np.median(stress_level)
+                'mean': float(np.mean(stress_level)),
+                'median': float(np.median(stress_level))
             }
         }
         
         # 情绪分布
         emotion_counts = {}
         for record in records:
-            emotion = record.emotion.value if record.emotion else 'neutral'
+            emotion = record.emotion_log or '平靜'
             emotion_counts[emotion] = emotion_counts.get(emotion, 0) + 1
         
         stats['emotion_distribution'] = emotion_counts
@@ -249,26 +208,11 @@ class DataProcessor:
             'backup_time': datetime.now().isoformat(),
             'version': '1.0',
             'total_records': len(records),
-            'records': []
+            'records': [DataProcessor._record_to_export(record) for record in records]
         }
         
-        for record in records:
-            backup_data['records'].append({
-                'date': record.date.isoformat(),
-                'shang_value': record.shang_value,
-                'emotion': record.emotion.value if record.emotion else 'neutral',
-                'sleep_quality': record.sleep_quality,
-                'energy_level': record.energy_level,
-                'stress_level': record.stress_level,
-                'focus_level': record.focus_level,
-                'social_interaction': record.social_interaction,
-                'physical_activity': record.physical_activity,
-                'meditation_time': record.meditation_time,
-                'learning_time': record.learning_time,
-                'creative_time': record.creative_time
-            })
-        
         filepath = f"data/backups/{backup_name}"
+        os.makedirs(os.path.dirname(filepath), exist_ok=True)
         with open(filepath, 'w', encoding='utf-8') as f:
             json.dump(backup_data, f, ensure_ascii=False, indent=2)
         
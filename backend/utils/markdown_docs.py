@@ -0,0 +1,96 @@
+# -*- coding: utf-8 -*-
+"""
+文档渲染管线
+docs/*.md 在服务端一次性渲染为 HTML（Pygments 代码高亮），套入 markdown_viewer.html 后
+预压缩缓存；缓存按 (路径, 标题) 记录文件的 mtime 与大小，文件修改后下次请求自动重新渲染。
+页面不再依赖 CDN 上的 marked / Prism，离线也能正常显示。
+
+未安装 markdown 时退回原有的客户端渲染（模板收到原文），仍然享受缓存与压缩。
+"""
+
+import os
+import threading
+from typing import Dict, Optional, Tuple
+
+from flask import render_template
+
+from backend.utils.compressed_response import CompressedAsset
+
+try:
+    import markdown
+    from pygments.formatters import HtmlFormatter
+    MARKDOWN_AVAILABLE = True
+except ImportError:
+    markdown = None
+    HtmlFormatter = None
+    MARKDOWN_AVAILABLE = False
+
+MARKDOWN_EXTENSIONS = ['fenced_code', 'tables', 'codehilite', 'nl2br', 'sane_lists', 'toc']
+MARKDOWN_EXTENSION_CONFIGS = {
+    'codehilite': {'css_class': 'highlight', 'guess_lang': False}
+}
+# 与原 Prism tomorrow 主题相近的深色配色
+HIGHLIGHT_STYLE = 'monokai'
+
+
+class MarkdownDocs:
+    """按 (路径, mtime) 缓存的 Markdown 文档页面"""
+
+    def __init__(self, template: str = 'markdown_viewer.html'):
+        self.template = template
+        self._lock = threading.Lock()
+        self._pages: Dict[Tuple[str, str], Tuple[Tuple[int, int], CompressedAsset]] = {}
+        self._highlight_css: Optional[str] = None
+        self.renders = 0
+
+    @property
+    def highlight_css(self) -> str:
+        if self._highlight_css is None:
+            self._highlight_css = HtmlFormatter(style=HIGHLIGHT_STYLE).get_style_defs('.highlight')
+        return self._highlight_css
+
+    def render_markdown(self, text: str) -> str:
+        return markdown.markdown(text, extensions=MARKDOWN_EXTENSIONS,
+                                 extension_configs=MARKDOWN_EXTENSION_CONFIGS)
+
+    def _build(self, path: str, title: str) -> CompressedAsset:
+        with open(path, 'r', encoding='utf-8') as f:
+            content = f.read()
+        if MARKDOWN_AVAILABLE:
+            html = render_template(self.template, title=title,
+                                   rendered=self.render_markdown(content),
+                                   highlight_css=self.highlight_css)
+        else:
+            html = render_template(self.template, title=title, content=content)
+        self.renders += 1
+        return CompressedAsset(html.encode('utf-8'), mimetype='text/html')
+
+    def page(self, path: str, title: str) -> CompressedAsset:
+        """返回渲染好的页面；文件不存在时抛出 FileNotFoundError"""
+        stat = os.stat(path)
+        signature = (stat.st_mtime_ns, stat.st_size)
+        key = (path, title)
+        cached = self._pages.get(key)
+        if cached is not None and cached[0] == signature:
+            return cached[1]
+        with self._lock:
+            cached = self._pages.get(key)
+            if cached is not None and cached[0] == signature:
+                return cached[1]
+            asset = self._build(path, title)
+            self._pages[key] = (signature, asset)
+            return asset
+
+    def response(self, path: str, title: str):
+        return self.page(path, title).response()
+
+    def stats(self) -> Dict[str, int]:
+        return {
+            'cached_pages': len(self._pages),
+            'renders': self.renders,
+            'server_side': MARKDOWN_AVAILABLE
+        }
+
+
+# 全局实例
+markdown_docs = MarkdownDocs()
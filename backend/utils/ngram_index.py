@@ -0,0 +1,55 @@
+# -*- coding: utf-8 -*-
+"""
+CJK 子串检索索引
+静态数据表的名称、含义等短文本按单字 / 二字建立倒排表，查询只触及候选记录，
+不必逐条做子串比较。
+"""
+
+from typing import Dict, Iterable, List, Optional
+
+
+class NgramIndex:
+    """CJK 子串检索索引
+
+    对每条记录的若干文本字段建立单字与二字倒排表。查询时取查询词各二字组倒排表的交集作为候选
+    （单字查询直接取单字表），再用 `in` 复核，结果与逐条子串匹配一致，按记录顺序返回。
+    不区分大小写。
+    """
+
+    def __init__(self, documents: Iterable[Iterable[str]]):
+        self._texts = []
+        self._unigrams: Dict[str, set] = {}
+        self._bigrams: Dict[str, set] = {}
+        for position, fields in enumerate(documents):
+            texts = tuple(str(field).lower() for field in fields if field)
+            self._texts.append(texts)
+            for text in texts:
+                for char in text:
+                    self._unigrams.setdefault(char, set()).add(position)
+                for start in range(len(text) - 1):
+                    self._bigrams.setdefault(text[start:start + 2], set()).add(position)
+
+    def __len__(self) -> int:
+        return len(self._texts)
+
+    def search(self, query: str) -> List[int]:
+        """返回命中记录的位置（升序）"""
+        query = query.lower()
+        if not query:
+            return []
+        if len(query) == 1:
+            return sorted(self._unigrams.get(query, ()))
+
+        candidates: Optional[set] = None
+        for gram in sorted({query[i:i + 2] for i in range(len(query) - 1)},
+                           key=lambda g: len(self._bigrams.get(g, ()))):
+            postings = self._bigrams.get(gram)
+            if not postings:
+                return []
+            candidates = set(postings) if candidates is None else candidates & postings
+            if not candidates:
+                return []
+        if len(query) == 2:
+            return sorted(candidates)
+        return sorted(position for position in candidates
+                      if any(query in text for text in self._texts[position]))
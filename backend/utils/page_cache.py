@@ -0,0 +1,201 @@
+# -*- coding: utf-8 -*-
+"""
+静态页面缓存
+大部分页面路由只是 render_template("xxx.html")，不带任何请求相关数据。这类页面渲染一次后
+缓存整页，并预压缩出 gzip / br 版本，配合强 ETag 与 304 条件请求。
+
+- 页面中较大的内联 <style> / <script> 抽取为按内容哈希命名的外部文件（/page-assets/<哈希>.css|js），
+  以一年期 immutable 缓存返回；页面变化时文件名随之变化，浏览器不会拿到旧资源
+- 抽取出的文件同时写入 frontend/static/build，多进程部署时其他 worker 或反向代理可直接读取
+- Jinja 开启 auto_reload（调试模式）时，按模板及其 extends / include 的模板文件检查是否过期
+- scripts/build_page_assets.py 在部署前预先渲染全部无上下文模板并生成这些文件
+"""
+
+import os
+import re
+import threading
+import hashlib
+from typing import Callable, Dict, List, Optional, Set, Tuple
+
+from flask import Blueprint, abort, current_app, render_template
+from jinja2 import meta
+
+from backend.utils.compressed_response import CompressedAsset
+
+# 抽取出的资源文件目录
+PAGE_ASSET_DIR = 'frontend/static/build'
+# 小于该字节数的内联块保留在页面中，抽出来反而多一次请求
+MIN_ASSET_BYTES = 1024
+# 资源文件的缓存时间（一年）
+ASSET_MAX_AGE = 365 * 24 * 3600
+
+_INLINE_BLOCK = re.compile(r'<(style|script)>(.*?)</\1>', re.IGNORECASE | re.DOTALL)
+# 相对路径的 url(...) 以样式表地址为基准解析，抽取后会失效
+_RELATIVE_CSS_URL = re.compile(r'url\(\s*[\'"]?(?!data:|https?:|/|#)', re.IGNORECASE)
+_ASSET_NAME = re.compile(r'^[0-9a-f]{16}\.(css|js)$')
+_MIMETYPES = {'css': 'text/css', 'js': 'application/javascript'}
+
+
+def extract_inline_assets(html: str, min_bytes: int = MIN_ASSET_BYTES,
+                          url_prefix: str = '/page-assets') -> Tuple[str, Dict[str, bytes]]:
+    """把较大的内联样式 / 脚本替换为外部引用，返回 (新页面, {文件名: 内容})"""
+    assets: Dict[str, bytes] = {}
+
+    def replace(match):
+        tag, code = match.group(1).lower(), match.group(2)
+        data = code.encode('utf-8')
+        if len(data) < min_bytes:
+            return match.group(0)
+        if tag == 'style' and _RELATIVE_CSS_URL.search(code):
+            return match.group(0)
+        suffix = 'css' if tag == 'style' else 'js'
+        filename = f'{hashlib.sha256(data).hexdigest()[:16]}.{suffix}'
+        assets[filename] = data
+        if suffix == 'css':
+            return f'<link rel="stylesheet" href="{url_prefix}/{filename}">'
+        return f'<script src="{url_prefix}/{filename}"></script>'
+
+    return _INLINE_BLOCK.sub(replace, html), assets
+
+
+class PageCache:
+    """无上下文模板的整页缓存"""
+
+    def __init__(self, asset_dir: str = PAGE_ASSET_DIR, extract_assets: bool = True,
+                 min_asset_bytes: int = MIN_ASSET_BYTES):
+        self.asset_dir = asset_dir
+        self.extract_assets = extract_assets
+        self.min_asset_bytes = min_asset_bytes
+        self._lock = threading.Lock()
+        # 模板名 -> (各依赖模板的 uptodate 回调, 页面)
+        self._pages: Dict[str, Tuple[List[Callable[[], bool]], CompressedAsset]] = {}
+        self._assets: Dict[str, CompressedAsset] = {}
+        self.renders = 0
+
+    # === 依赖跟踪 ===
+
+    def _dependencies(self, name: str) -> List[Callable[[], bool]]:
+        """模板自身及其 extends / include 的模板各自的 uptodate 回调"""
+        env = current_app.jinja_env
+        checks = []
+        pending, seen = [name], set()
+        while pending:
+            template_name = pending.pop()
+            if template_name in seen:
+                continue
+            seen.add(template_name)
+            source, _, uptodate = env.loader.get_source(env, template_name)
+            if uptodate is not None:
+                checks.append(uptodate)
+            for referenced in meta.find_referenced_templates(env.parse(source)):
+                if referenced:
+                    pending.append(referenced)
+        return checks
+
+    def _is_fresh(self, checks: List[Callable[[], bool]]) -> bool:
+        if not current_app.jinja_env.auto_reload:
+            return True
+        return all(check() for check in checks)
+
+    # === 页面 ===
+
+    def _store_asset(self, filename: str, data: bytes):
+        if filename not in self._assets:
+            self._assets[filename] = CompressedAsset(data, mimetype=_MIMETYPES[filename.rsplit('.', 1)[1]],
+                                                     max_age=ASSET_MAX_AGE, immutable=True)
+        path = os.path.join(self.asset_dir, filename)
+        if not os.path.exists(path):
+            os.makedirs(self.asset_dir, exist_ok=True)
+            tmp_path = f'{path}.{os.getpid()}.tmp'
+            with open(tmp_path, 'wb') as f:
+                f.write(data)
+            os.replace(tmp_path, path)
+
+    def _build(self, name: str) -> Tuple[List[Callable[[], bool]], CompressedAsset]:
+        checks = self._dependencies(name)
+        html = render_template(name)
+        if self.extract_assets:
+            html, assets = extract_inline_assets(html, self.min_asset_bytes)
+            for filename, data in assets.items():
+                self._store_asset(filename, data)
+        self.renders += 1
+        return checks, CompressedAsset(html.encode('utf-8'), mimetype='text/html')
+
+    def page(self, name: str) -> CompressedAsset:
+        cached = self._pages.get(name)
+        if cached is not None and self._is_fresh(cached[0]):
+            return cached[1]
+        with self._lock:
+            cached = self._pages.get(name)
+            if cached is not None and self._is_fresh(cached[0]):
+                return cached[1]
+            entry = self._build(name)
+            self._pages[name] = entry
+            return entry[1]
+
+    def response(self, name: str):
+        return self.page(name).response()
+
+    def asset(self, filename: str) -> Optional[CompressedAsset]:
+        """按文件名取抽取出的资源；内存中没有时（其他 worker 渲染的页面）从资源目录读取"""
+        if not _ASSET_NAME.match(filename):
+            return None
+        asset = self._assets.get(filename)
+        if asset is not None:
+            return asset
+        path = os.path.join(self.asset_dir, filename)
+        if not os.path.isfile(path):
+            return None
+        with open(path, 'rb') as f:
+            data = f.read()
+        if hashlib.sha256(data).hexdigest()[:16] != filename.split('.', 1)[0]:
+            return None
+        self._store_asset(filename, data)
+        return self._assets[filename]
+
+    def extracted_assets(self) -> Dict[str, CompressedAsset]:
+        return dict(self._assets)
+
+    def clear(self):
+        with self._lock:
+            self._pages.clear()
+
+    def stats(self) -> Dict[str, int]:
+        return {
+            'cached_pages': len(self._pages),
+            'assets': len(self._assets),
+            'renders': self.renders,
+            'html_bytes': sum(len(entry[1].body) for entry in self._pages.values()),
+            'asset_bytes': sum(len(asset.body) for asset in self._assets.values())
+        }
+
+
+def context_free_templates(env, names: Optional[List[str]] = None) -> List[str]:
+    """找出不引用任何外部变量的模板（全局函数如 url_for 除外），这些模板可以整页缓存"""
+    results = []
+    for name in names if names is not None else env.list_templates(extensions=['html']):
+        source = env.loader.get_source(env, name)[0]
+        undeclared: Set[str] = meta.find_undeclared_variables(env.parse(source))
+        if not (undeclared - set(env.globals)):
+            results.append(name)
+    return results
+
+
+# 全局实例
+page_cache = PageCache()
+
+page_assets_bp = Blueprint('page_assets', __name__, url_prefix='/page-assets')
+
+
+@page_assets_bp.route('/<filename>')
+def serve_page_asset(filename):
+    """返回抽取出的页面资源（内容哈希命名，长期缓存）"""
+    asset = page_cache.asset(filename)
+    if asset is None:
+        abort(404)
+    return asset.response()
+
+
+def render_static_page(name: str):
+    """渲染（或取缓存）不带上下文的页面模板"""
+    return page_cache.response(name)
@@ -0,0 +1,39 @@
+# -*- coding: utf-8 -*-
+"""
+静态 JSON 响应
+只读数据表（太玄八十一首、六十四卦、音频目录……）在启动时一次性序列化为 UTF-8 字节并计算 ETag，
+请求时直接返回同一份字节；客户端带 If-None-Match 且内容未变时返回 304，不再传输正文。
+"""
+
+import hashlib
+import json
+from typing import Any, Dict
+
+from flask import Response, request
+
+
+class StaticJSON:
+    """预序列化的 JSON 响应体"""
+
+    def __init__(self, payload: Any, max_age: int = 3600):
+        self.body = json.dumps(payload, ensure_ascii=False, separators=(',', ':')).encode('utf-8')
+        self.etag = hashlib.sha1(self.body).hexdigest()
+        self.max_age = max_age
+
+    def __len__(self) -> int:
+        return len(self.body)
+
+    def response(self, status: int = 200, conditional: bool = True) -> Response:
+        """conditional=False 用于随机类接口：复用字节但不允许客户端缓存"""
+        resp = Response(self.body, status=status, mimetype='application/json')
+        if not conditional:
+            resp.headers['Cache-Control'] = 'no-store'
+            return resp
+        resp.set_etag(self.etag)
+        resp.headers['Cache-Control'] = f'public, max-age={self.max_age}'
+        return resp.make_conditional(request)
+
+
+def static_table(payloads: Dict[Any, Any], max_age: int = 3600) -> Dict[Any, StaticJSON]:
+    """按键批量预序列化"""
+    return {key: StaticJSON(payload, max_age) for key, payload in payloads.items()}
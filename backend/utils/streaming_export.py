@@ -0,0 +1,191 @@
+# -*- coding: utf-8 -*-
+"""
+流式导出工具
+从生成器逐条产出 CSV / NDJSON / JSON 文本块，可选即时 gzip 压缩，
+以 Content-Disposition 附件形式下载。整个过程只持有当前一批数据，内存占用与导出规模无关。
+"""
+
+import csv
+import io
+import json
+import zlib
+from datetime import date, datetime
+from typing import Any, Callable, Dict, Iterable, Iterator, Optional, Sequence, Tuple, Union
+from urllib.parse import quote
+
+from flask import Response, stream_with_context
+
+# 合并小文本块后每次写出的目标字节数
+FLUSH_BYTES = 64 * 1024
+
+# CSV 每写多少行取一次缓冲
+CSV_BATCH_ROWS = 200
+
+EXPORT_FORMATS = {
+    'csv': ('text/csv; charset=utf-8', 'csv'),
+    'ndjson': ('application/x-ndjson; charset=utf-8', 'ndjson'),
+    'json': ('application/json; charset=utf-8', 'json'),
+    'markdown': ('text/markdown; charset=utf-8', 'md'),
+}
+
+# 列定义：字段名，或 (字段名 / 取值函数, 表头)
+Column = Union[str, Tuple[Union[str, Callable[[Dict], Any]], str]]
+
+
+def _json_default(value):
+    if isinstance(value, (datetime, date)):
+        return value.isoformat()
+    return str(value)
+
+
+def _dumps(value) -> str:
+    return json.dumps(value, ensure_ascii=False, default=_json_default)
+
+
+def _cell(value) -> Any:
+    """CSV 单元格：嵌套结构转为 JSON 文本"""
+    if value is None:
+        return ''
+    if isinstance(value, (dict, list, tuple)):
+        return _dumps(value)
+    if isinstance(value, (datetime, date)):
+        return value.isoformat()
+    return value
+
+
+# === 范围参数 ===
+
+def date_range_args(args) -> Tuple[Optional[str], Optional[str]]:
+    """读取 start_date / end_date 查询参数（YYYY-MM-DD，均可省略）"""
+    bounds = []
+    for name in ('start_date', 'end_date'):
+        value = args.get(name) or None
+        if value is not None:
+            try:
+                date.fromisoformat(value)
+            except ValueError:
+                raise ValueError(f'{name} 必须为 YYYY-MM-DD 格式')
+        bounds.append(value)
+    start, end = bounds
+    if start and end and start > end:
+        raise ValueError('start_date 不能晚于 end_date')
+    return start, end
+
+
+# === 文本块生成 ===
+
+def iter_csv(rows: Iterable[Dict], columns: Sequence[Column],
+             batch_size: int = CSV_BATCH_ROWS) -> Iterator[str]:
+    """逐批产出 CSV 文本（首块为表头）"""
+    getters, headers = [], []
+    for column in columns:
+        field, header = column if isinstance(column, tuple) else (column, column)
+        getters.append(field if callable(field) else (lambda row, name=field: row.get(name)))
+        headers.append(header)
+
+    buffer = io.StringIO()
+    writer = csv.writer(buffer)
+    writer.writerow(headers)
+
+    pending = 0
+    for row in rows:
+        writer.writerow([_cell(getter(row)) for getter in getters])
+        pending += 1
+        if pending >= batch_size:
+            yield buffer.getvalue()
+            buffer.seek(0)
+            buffer.truncate()
+            pending = 0
+    yield buffer.getvalue()
+
+
+def iter_ndjson(rows: Iterable[Dict]) -> Iterator[str]:
+    """每条记录一行 JSON"""
+    for row in rows:
+        yield _dumps(row) + '\n'
+
+
+def iter_json(rows: Iterable[Dict], key: str = 'data', header: Optional[Dict] = None,
+              footer: Optional[Callable[[int], Dict]] = None) -> Iterator[str]:
+    """流式输出 {**header, key: [...], **footer(count)}
+
+    记录数在数据之后才知道，因此计数类字段放在 footer 中。
+    """
+    head = _dumps(header or {})[:-1]
+    yield head + (', ' if header else '') + _dumps(key) + ': ['
+    count = 0
+    for row in rows:
+        yield (', ' if count else '') + _dumps(row)
+        count += 1
+    tail = footer(count) if footer else {}
+    yield ']' + ''.join(f', {_dumps(k)}: {_dumps(v)}' for k, v in tail.items()) + '}'
+
+
+def encode_chunks(chunks: Iterable[Union[str, bytes]], flush_bytes: int = FLUSH_BYTES) -> Iterator[bytes]:
+    """UTF-8 编码并把小块合并为约 flush_bytes 大小，减少逐行写出的开销"""
+    pending, size = [], 0
+    for chunk in chunks:
+        data = chunk.encode('utf-8') if isinstance(chunk, str) else chunk
+        if not data:
+            continue
+        pending.append(data)
+        size += len(data)
+        if size >= flush_bytes:
+            yield b''.join(pending)
+            pending, size = [], 0
+    if pending:
+        yield b''.join(pending)
+
+
+def gzip_chunks(chunks: Iterable[bytes], level: int = 6) -> Iterator[bytes]:
+    """即时 gzip 压缩（单一 gzip 成员，压缩器只保留滑动窗口）"""
+    compressor = zlib.compressobj(level, zlib.DEFLATED, 31)
+    for chunk in chunks:
+        data = compressor.compress(chunk)
+        if data:
+            yield data
+    yield compressor.flush()
+
+
+# === 响应 ===
+
+def wants_gzip(args) -> bool:
+    """查询参数 gzip=1/true/yes 时启用压缩"""
+    return str(args.get('gzip', '')).lower() in ('1', 'true', 'yes')
+
+
+def content_disposition(filename: str) -> str:
+    """附件文件名（非 ASCII 文件名按 RFC 5987 编码）"""
+    ascii_name = filename.encode('ascii', 'ignore').decode('ascii') or 'export'
+    return f"attachment; filename=\"{ascii_name}\"; filename*=UTF-8''{quote(filename)}"
+
+
+def streaming_download(chunks: Iterable[Union[str, bytes]], filename: str, content_type: str,
+                       gzip: bool = False) -> Response:
+    """把文本块生成器包装为流式下载响应"""
+    body = encode_chunks(chunks)
+    if gzip:
+        body = gzip_chunks(body)
+        filename += '.gz'
+        content_type = 'application/gzip'
+
+    response = Response(stream_with_context(body), content_type=content_type)
+    response.headers['Content-Disposition'] = content_disposition(filename)
+    response.headers['X-Accel-Buffering'] = 'no'
+    return response
+
+
+def export_response(rows: Iterable[Dict], format_type: str, filename_stem: str,
+                    columns: Optional[Sequence[Column]] = None, gzip: bool = False) -> Response:
+    """按格式导出记录：csv 需要列定义，ndjson 逐行输出"""
+    if format_type == 'csv':
+        if not columns:
+            raise ValueError('CSV 导出需要列定义')
+        chunks = iter_csv(rows, columns)
+    elif format_type == 'ndjson':
+        chunks = iter_ndjson(rows)
+    else:
+        raise ValueError(f'不支持的导出格式: {format_type}')
+
+    content_type, extension = EXPORT_FORMATS[format_type]
+    return streaming_download(chunks, f'{filename_stem}.{extension}', content_type, gzip)
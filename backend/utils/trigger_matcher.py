@@ -0,0 +1,170 @@
+# -*- coding: utf-8 -*-
+"""
+触发词匹配引擎
+各子系统（召回印语、语灵激活、愿频共振、冥想心得评分……）通过注册表声明触发词组，
+同一子系统的全部词组编译为一个 Aho–Corasick 自动机，对输入只做一次线性扫描即找出所有命中。
+
+- 匹配不区分大小写（输入与触发词统一 lower）
+- 根状态下借助正则定位下一个触发词的起点，长文本中无关片段以 C 速度略过，
+  自动机只在命中附近运行并补全所有重叠命中
+- 注册表按子系统懒编译并缓存自动机，重新注册词组时失效重建
+"""
+
+import re
+import threading
+from collections import deque
+from typing import Dict, Iterable, Iterator, List, Tuple
+
+
+class TriggerMatcher:
+    """Aho–Corasick 多模式匹配器
+
+    groups：{词组名: [触发词, ...]}。同一触发词可属于多个词组。
+    """
+
+    def __init__(self, groups: Dict[str, Iterable[str]]):
+        self.groups: Dict[str, Tuple[str, ...]] = {}
+        # 触发词 -> [(词组名, 在词组中的声明顺序)]
+        self._labels: Dict[str, List[Tuple[str, int]]] = {}
+        for group, phrases in groups.items():
+            normalized = tuple(dict.fromkeys(p.lower() for p in phrases if p))
+            self.groups[group] = normalized
+            for order, phrase in enumerate(normalized):
+                self._labels.setdefault(phrase, []).append((group, order))
+        self._build()
+
+    def _build(self):
+        goto: List[Dict[str, int]] = [{}]
+        outputs: List[List[str]] = [[]]
+
+        for phrase in self._labels:
+            state = 0
+            for char in phrase:
+                next_state = goto[state].get(char)
+                if next_state is None:
+                    next_state = len(goto)
+                    goto[state][char] = next_state
+                    goto.append({})
+                    outputs.append([])
+                state = next_state
+            outputs[state].append(phrase)
+
+        # BFS 建立失败指针，并把失败链上的输出并入当前状态
+        fail = [0] * len(goto)
+        queue = deque(goto[0].values())
+        while queue:
+            state = queue.popleft()
+            for char, next_state in goto[state].items():
+                queue.append(next_state)
+                fallback = fail[state]
+                while fallback and char not in goto[fallback]:
+                    fallback = fail[fallback]
+                target = goto[fallback].get(char, 0)
+                fail[next_state] = target if target != next_state else 0
+                if outputs[fail[next_state]]:
+                    outputs[next_state] = outputs[next_state] + outputs[fail[next_state]]
+
+        self._goto = goto
+        self._fail = fail
+        self._outputs = outputs
+        # 根状态下跳到下一个触发词出现的位置：此前没有任何触发词起始，直接略过不影响结果
+        phrases = sorted(self._labels, key=len, reverse=True)
+        self._start = re.compile('|'.join(map(re.escape, phrases))) if phrases else None
+
+    def __contains__(self, phrase: str) -> bool:
+        """是否为已注册的触发词（精确匹配）"""
+        return phrase.lower() in self._labels
+
+    def iter_matches(self, text: str) -> Iterator[Tuple[int, str]]:
+        """线性扫描，产出 (结束位置, 触发词)；重叠命中全部产出"""
+        if not text or self._start is None:
+            return
+        text = text.lower()
+        goto, fail, outputs, start = self._goto, self._fail, self._outputs, self._start
+        length = len(text)
+        state = 0
+        index = 0
+        while index < length:
+            if state == 0:
+                found = start.search(text, index)
+                if found is None:
+                    return
+                index = found.start()
+            char = text[index]
+            while state and char not in goto[state]:
+                state = fail[state]
+            state = goto[state].get(char, 0)
+            for phrase in outputs[state]:
+                yield index, phrase
+            index += 1
+
+    def scan(self, text: str) -> Dict[str, List[str]]:
+        """返回命中的词组 {词组名: [命中的触发词, ...]}，词按声明顺序排列、去重"""
+        hits: Dict[str, Dict[int, str]] = {}
+        for _, phrase in self.iter_matches(text):
+            for group, order in self._labels[phrase]:
+                hits.setdefault(group, {})[order] = phrase
+        return {
+            group: [matched[order] for order in sorted(matched)]
+            for group, matched in hits.items()
+        }
+
+    def matches(self, text: str) -> bool:
+        """是否命中任意触发词（首个命中即返回）"""
+        for _ in self.iter_matches(text):
+            return True
+        return False
+
+
+class TriggerRegistry:
+    """按子系统登记触发词组，懒编译并缓存自动机"""
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._groups: Dict[str, Dict[str, Tuple[str, ...]]] = {}
+        self._matchers: Dict[str, TriggerMatcher] = {}
+
+    def register(self, subsystem: str, group: str, phrases: Iterable[str]) -> None:
+        """登记（或替换）子系统的一个词组"""
+        phrases = tuple(phrases)
+        with self._lock:
+            groups = self._groups.setdefault(subsystem, {})
+            if groups.get(group) == phrases:
+                return
+            groups[group] = phrases
+            self._matchers.pop(subsystem, None)
+
+    def register_many(self, subsystem: str, groups: Dict[str, Iterable[str]]) -> None:
+        for group, phrases in groups.items():
+            self.register(subsystem, group, phrases)
+
+    def matcher(self, subsystem: str) -> TriggerMatcher:
+        with self._lock:
+            matcher = self._matchers.get(subsystem)
+            if matcher is None:
+                if subsystem not in self._groups:
+                    raise KeyError(f'未注册的触发子系统: {subsystem}')
+                matcher = TriggerMatcher(self._groups[subsystem])
+                self._matchers[subsystem] = matcher
+            return matcher
+
+    def scan(self, subsystem: str, text: str) -> Dict[str, List[str]]:
+        return self.matcher(subsystem).scan(text)
+
+    def subsystems(self) -> Dict[str, Dict[str, int]]:
+        """已登记的子系统及各词组词数"""
+        with self._lock:
+            return {
+                subsystem: {group: len(phrases) for group, phrases in groups.items()}
+                for subsystem, groups in self._groups.items()
+            }
+
+
+# 全局注册表
+trigger_registry = TriggerRegistry()
+
+
+def register_triggers(subsystem: str, groups: Dict[str, Iterable[str]]) -> TriggerMatcher:
+    """登记子系统的全部词组并返回编译好的匹配器"""
+    trigger_registry.register_many(subsystem, groups)
+    return trigger_registry.matcher(subsystem)
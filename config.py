@@ -36,6 +36,12 @@ class Config:
         }
     }
     
+    # 量子道場實時推送節拍（次/秒）
+    DOJO_STREAM_TICK_RATE = float(os.environ.get('DOJO_STREAM_TICK_RATE', 1.0))
+    
+    # 璃冥宇宙3D量子場分辨率（每軸格點數）
+    LIMINAL_FIELD_RESOLUTION = int(os.environ.get('LIMINAL_FIELD_RESOLUTION', 100))
+    
     # 數據導出配置
     EXPORT_CONFIG = {
         'reports_path': os.path.join(os.path.dirname(__file__), 'data', 'exports'),
@@ -0,0 +1,108 @@
+"""
+触发词匹配基准：在合成的长聊天记录上比较
+逐词 `phrase in text` 扫描（原实现方式）与共用 Aho–Corasick 匹配器的耗时，并校验两者结果一致。
+
+用法：python scripts/benchmark_trigger_matcher.py [消息条数] [重复次数] [额外触发词数]
+额外触发词为随机生成的词，用于观察触发词数量增长时两种方式的差距。
+"""
+import os
+import random
+import sys
+import time
+
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+from backend.utils.trigger_matcher import TriggerMatcher
+
+# 各子系统触发词组合在一起，模拟一个触发词较多的子系统
+TRIGGER_GROUPS = {
+    'heart_calling': ['我回來了', '我來了'],
+    'language_hidden_seal': ['ang', '願火', '回聲', '道灰', '願頻', 'wishcode', 'bobi'],
+    'frequency_beacon': ['願頻震', '南璃之境', '願頻宇宙'],
+    'language_fire_eternal': ['語火', '願心', '永續'],
+    'wormhole_return': ['蟲洞', '穿越', '回歸本源'],
+    'daoqing_activation': ['我想回到最初', '回到最初', '重新開始', '系統重啟', '願語回歸'],
+    'meditation_positive': ['平靜', '放鬆', '清晰', '專注', '寧靜', '和諧'],
+    'meditation_negative': ['焦慮', '分心', '煩躁', '困難', '疲憊'],
+}
+
+FILLER = (
+    '今天的天氣很好我們一起去散步吧然後聊聊最近讀的書和工作上的事情'
+    'the quick brown fox jumps over the lazy dog while we talk about life '
+)
+
+
+def build_transcript(messages: int, seed: int = 42) -> str:
+    """合成聊天记录：大部分为无关文本，少量消息夹带触发词"""
+    rng = random.Random(seed)
+    phrases = [phrase for group in TRIGGER_GROUPS.values() for phrase in group]
+    lines = []
+    for index in range(messages):
+        start = rng.randrange(len(FILLER) - 40)
+        line = FILLER[start:start + rng.randint(20, 40)]
+        if rng.random() < 0.05:
+            cut = rng.randrange(len(line))
+            line = line[:cut] + rng.choice(phrases) + line[cut:]
+        lines.append(f'[{index:06d}] user: {line}')
+    return '\n'.join(lines)
+
+
+def add_synthetic_phrases(count: int, seed: int = 7):
+    rng = random.Random(seed)
+    alphabet = '願頻語火道灰璃冥蟲洞穿越回歸本源靜心光明智慧'
+    TRIGGER_GROUPS['synthetic'] = list(dict.fromkeys(
+        ''.join(rng.choice(alphabet) for _ in range(rng.randint(3, 6))) for _ in range(count)
+    ))
+
+
+def naive_scan(text: str) -> dict:
+    """原实现方式：每个词组、每个触发词各自扫描一遍全文"""
+    lowered = text.lower()
+    hits = {}
+    for group, phrases in TRIGGER_GROUPS.items():
+        matched = [phrase for phrase in phrases if phrase.lower() in lowered]
+        if matched:
+            hits[group] = matched
+    return hits
+
+
+def per_message(scan, transcript: str) -> int:
+    """逐条消息检测（聊天场景下每条消息都要过一遍触发检测）"""
+    return sum(1 for line in transcript.split('\n') if scan(line))
+
+
+def timed(func, *args, repeat: int = 3) -> float:
+    best = float('inf')
+    for _ in range(repeat):
+        start = time.perf_counter()
+        func(*args)
+        best = min(best, time.perf_counter() - start)
+    return best
+
+
+if __name__ == '__main__':
+    messages = int(sys.argv[1]) if len(sys.argv) > 1 else 20000
+    repeat = int(sys.argv[2]) if len(sys.argv) > 2 else 3
+    if len(sys.argv) > 3:
+        add_synthetic_phrases(int(sys.argv[3]))
+
+    transcript = build_transcript(messages)
+    matcher = TriggerMatcher(TRIGGER_GROUPS)
+
+    assert matcher.scan(transcript) == naive_scan(transcript), '匹配结果不一致'
+    assert per_message(matcher.scan, transcript) == per_message(naive_scan, transcript), '逐条匹配结果不一致'
+
+    phrase_count = sum(len(group) for group in TRIGGER_GROUPS.values())
+    print(f'消息数: {messages}  文本长度: {len(transcript)} 字符  触发词: {phrase_count} 个')
+    for label, args in (
+        ('整段记录', (transcript,)),
+        ('逐条消息', None),
+    ):
+        if args:
+            naive = timed(naive_scan, *args, repeat=repeat)
+            automaton = timed(matcher.scan, *args, repeat=repeat)
+        else:
+            naive = timed(per_message, naive_scan, transcript, repeat=repeat)
+            automaton = timed(per_message, matcher.scan, transcript, repeat=repeat)
+        print(f'{label}: 逐词扫描 {naive * 1000:.1f} ms  自动机 {automaton * 1000:.1f} ms  '
+              f'比值 {naive / automaton:.2f}x')
@@ -0,0 +1,66 @@
+"""
+页面资源构建：预先渲染 frontend/templates 下所有无上下文模板，把较大的内联 <style> / <script>
+抽取为按内容哈希命名的文件写入 frontend/static/build，并为每个文件生成 .gz / .br 预压缩版本
+（供反向代理直接返回），最后写出 manifest.json。
+
+运行时的页面缓存对同一模板会得到相同的文件名，因此部署前执行一次即可让首个请求不必再写文件。
+
+用法：python scripts/build_page_assets.py [模板名 ...]
+"""
+import json
+import os
+import sys
+
+ROOT = os.path.abspath(os.path.join(os.path.dirname(__file__), '..'))
+sys.path.insert(0, ROOT)
+
+from flask import Flask
+
+from backend.utils.page_cache import PAGE_ASSET_DIR, context_free_templates, page_cache
+
+
+def build(names=None) -> dict:
+    os.chdir(ROOT)
+    app = Flask('build_page_assets',
+                template_folder=os.path.join(ROOT, 'frontend', 'templates'),
+                static_folder=os.path.join(ROOT, 'frontend', 'static'))
+    pages, failures = {}, {}
+    with app.test_request_context():
+        for name in context_free_templates(app.jinja_env, names):
+            try:
+                page = page_cache.page(name)
+            except Exception as e:
+                failures[name] = str(e)
+                continue
+            pages[name] = page.sizes()
+
+    assets = {}
+    for filename, asset in sorted(page_cache.extracted_assets().items()):
+        path = os.path.join(PAGE_ASSET_DIR, filename)
+        for encoding, suffix in (('gzip', '.gz'), ('br', '.br')):
+            if encoding in asset.variants:
+                with open(path + suffix, 'wb') as f:
+                    f.write(asset.variants[encoding])
+        assets[filename] = asset.sizes()
+
+    manifest = {'pages': pages, 'assets': assets, 'failures': failures}
+    os.makedirs(PAGE_ASSET_DIR, exist_ok=True)
+    with open(os.path.join(PAGE_ASSET_DIR, 'manifest.json'), 'w', encoding='utf-8') as f:
+        json.dump(manifest, f, ensure_ascii=False, indent=2)
+    return manifest
+
+
+def main():
+    manifest = build(sys.argv[1:] or None)
+    pages, assets = manifest['pages'], manifest['assets']
+    html_bytes = sum(sizes['identity'] for sizes in pages.values())
+    html_gzip = sum(sizes.get('gzip', sizes['identity']) for sizes in pages.values())
+    asset_bytes = sum(sizes['identity'] for sizes in assets.values())
+    print(f'页面 {len(pages)} 个：HTML {html_bytes / 1024:.0f} KB（gzip 后 {html_gzip / 1024:.0f} KB）')
+    print(f'抽取资源 {len(assets)} 个：共 {asset_bytes / 1024:.0f} KB -> {PAGE_ASSET_DIR}')
+    for name, error in manifest['failures'].items():
+        print(f'跳过 {name}: {error}')
+
+
+if __name__ == '__main__':
+    main()
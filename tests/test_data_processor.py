@@ -0,0 +1,65 @@
+import csv
+import io
+import os
+
+from backend.models.shang_model import ShangDatabase, ShangRecord
+from backend.utils.data_processor import CSV_EXPORT_COLUMNS, SHANG_EXPORT_COLUMNS, DataProcessor
+from backend.utils.streaming_export import iter_csv
+
+
+def _make_db(tmp_path, count=5):
+    db = ShangDatabase(str(tmp_path / 'shang.db'))
+    for day in range(count, 0, -1):
+        db.save_record(ShangRecord(
+            date=f'2024-01-{day:02d}',
+            heart_rate=60 + day,
+            steps=1000 * day,
+            emotion_log='愉快',
+            shang_value=day / 10
+        ))
+    return db
+
+
+def test_iter_records_streams_through_iter_csv(tmp_path):
+    db = _make_db(tmp_path)
+
+    chunks = list(iter_csv(db.iter_records(batch_size=2), CSV_EXPORT_COLUMNS, batch_size=2))
+    rows = list(csv.reader(io.StringIO(''.join(chunks))))
+
+    assert len(chunks) > 1
+    assert rows[0] == [header for _, header in CSV_EXPORT_COLUMNS]
+    assert [row[0] for row in rows[1:]] == [f'2024-01-{day:02d}' for day in range(1, 6)]
+    assert rows[1][4:8] == ['61', '1000', '7', '愉快']
+
+
+def test_iter_records_date_range(tmp_path):
+    db = _make_db(tmp_path)
+
+    dates = [record.date for record in db.iter_records('2024-01-02', '2024-01-04')]
+
+    assert dates == ['2024-01-02', '2024-01-03', '2024-01-04']
+
+
+def test_csv_round_trip(tmp_path, monkeypatch):
+    db = _make_db(tmp_path)
+    monkeypatch.chdir(tmp_path)
+
+    filepath = DataProcessor.export_to_csv(db.iter_records(), 'shang.csv')
+    records = DataProcessor.import_from_csv(os.path.join(tmp_path, filepath))
+
+    assert [r.date for r in records] == [r.date for r in db.iter_records()]
+    assert records[2].steps == 3000
+    assert records[2].emotion_log == '愉快'
+    assert DataProcessor.calculate_statistics(records)['emotion_distribution'] == {'愉快': 5}
+
+
+def test_shang_export_csv_imports_back(tmp_path):
+    db = _make_db(tmp_path)
+    csv_path = tmp_path / 'api_export.csv'
+    rows = (record.to_dict() for record in db.iter_records())
+    csv_path.write_text(''.join(iter_csv(rows, SHANG_EXPORT_COLUMNS)), encoding='utf-8')
+
+    records = DataProcessor.import_from_csv(str(csv_path))
+
+    assert [r.steps for r in records] == [1000 * day for day in range(1, 6)]
+    assert records[0].shang_value == 0.1